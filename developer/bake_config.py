@@ -28,7 +28,7 @@ sys.path.insert(0, python_folder)
 import functools
 
 # sgtk imports
-from tank import LogManager
+from tank import LogManager, TankError, compiled_config
 from tank.bootstrap import constants as bootstrap_constants
 from tank.descriptor import (
     Descriptor,
@@ -140,6 +140,16 @@ def bake_config(sg_connection, config_uri, target_path, do_zip, skip_bundles_typ
     logger.info("Copying config data across...")
     filesystem.copy_folder(config_descriptor.get_path(), target_path)
 
+    # Compile the config, so that its yaml files don't have to be read when it
+    # is used.
+    logger.info("Compiling config...")
+    try:
+        compiled_config.compile_config(
+            target_path, compiled_config.get_config_file_location(target_path)
+        )
+    except TankError as e:
+        logger.warning("Could not compile the config: %s" % e)
+
     # Create bundle cache and cache all apps, engines and frameworks
     logger.info("Creating bundle cache folder...")
     bundle_cache_root = os.path.join(target_path, BUNDLE_CACHE_ROOT_FOLDER_NAME)
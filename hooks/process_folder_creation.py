@@ -17,6 +17,7 @@ import os
 import shutil
 
 from tank import Hook
+from tank.folder import FolderCreationExecutor
 from tank.util import is_windows
 
 
@@ -98,10 +99,18 @@ class ProcessFolderCreation(Hook):
         - **path** (:class:`str`) - the path to the symbolic link
         - **target** (:class:`str`) - the target to which the symbolic link should point
 
+        When the ``TK_FOLDER_CREATION_THREADS`` environment variable is set to more
+        than ``1``, the items are processed concurrently by a
+        :class:`~tank.folder.FolderCreationExecutor`, which performs the same actions.
+
         :returns: List of files and folders that have been created.
         :rtype: list(str)
         """
 
+        max_workers = FolderCreationExecutor.get_max_workers()
+        if max_workers > 1:
+            return FolderCreationExecutor(max_workers).execute(items, preview_mode)
+
         # set the umask so that we get true permissions
         old_umask = os.umask(0)
         locations = []
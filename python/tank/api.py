@@ -25,8 +25,9 @@ from . import (
     pipelineconfig_utils,
 )
 from .errors import TankError, TankMultipleMatchingTemplatesError
-from .path_cache import PathCache
+from .path_cache import PathCachePool
 from .template import read_templates
+from .template_matcher import TemplateMatcher
 from .util import shotgun, yaml_cache
 
 log = LogManager.get_logger(__name__)
@@ -78,6 +79,7 @@ class Sgtk(object):
             self.__templates = read_templates(self.__pipeline_config)
         except TankError as e:
             raise TankError("Could not read templates configuration: %s" % e)
+        self.__template_matcher = TemplateMatcher(self.__templates)
 
         # execute a tank_init hook for developers to use.
         self.execute_core_hook(constants.TANK_INIT_HOOK_NAME)
@@ -85,6 +87,12 @@ class Sgtk(object):
         # cache of local storages
         self.__cache = {}
 
+        # path cache instances reused for lookups
+        self.__path_cache_pool = PathCachePool()
+
+        # contexts built from paths and entities
+        self.__context_cache = context.ContextCache()
+
     def __repr__(self):
         return "<Sgtk Core %s@0x%08x Config %s>" % (
             self.version,
@@ -110,6 +118,30 @@ class Sgtk(object):
         """
         return self.__pipeline_config
 
+    def get_path_cache(self):
+        """
+        Internal Use Only - We provide no guarantees that this method
+        will be backwards compatible.
+
+        Returns a path cache instance to do lookups with. The instance is
+        shared by all the calls made from the current thread and must not be
+        closed.
+
+        :returns: :class:`~tank.path_cache.PathCache` instance.
+        """
+        return self.__path_cache_pool.get(self)
+
+    @property
+    def context_cache(self):
+        """
+        Internal Use Only - We provide no guarantees that this method
+        will be backwards compatible.
+
+        The :class:`~tank.context.ContextCache` holding the contexts built
+        by this instance.
+        """
+        return self.__context_cache
+
     def execute_core_hook(self, hook_name, **kwargs):
         """
         Executes a core level hook, passing it any keyword arguments supplied.
@@ -371,6 +403,7 @@ class Sgtk(object):
         to not change the interface.
         """
         self.__templates = value
+        self.__template_matcher = TemplateMatcher(value)
 
     ##########################################################################################
     # public methods
@@ -390,10 +423,13 @@ class Sgtk(object):
 
         :raises: :class:`TankError`
         """
+        # the compiled config may be out of date with the edited files.
+        self.__pipeline_config.reload_compiled_config()
         try:
             self.__templates = read_templates(self.__pipeline_config)
         except TankError as e:
             raise TankError("Templates could not be reloaded: %s" % e)
+        self.__template_matcher = TemplateMatcher(self.__templates)
 
     def list_commands(self):
         """
@@ -450,8 +486,13 @@ class Sgtk(object):
         :param path: Path to match against a template
         :returns: list of :class:`TemplatePath` or [] if no match could be found.
         """
+        # The templates dictionary can be modified in place, in which case the
+        # matcher needs to be rebuilt.
+        if not self.__template_matcher.is_current(self.__templates):
+            self.__template_matcher = TemplateMatcher(self.__templates)
+
         matched_templates = []
-        for key, template in self.templates.items():
+        for template in self.__template_matcher.get_candidates(path):
             if template.validate(path):
                 matched_templates.append(template)
         return matched_templates
@@ -749,9 +790,8 @@ class Sgtk(object):
         """
 
         # Use the path cache to look up all paths associated with this entity
-        path_cache = PathCache(self)
+        path_cache = self.get_path_cache()
         paths = path_cache.get_paths(entity_type, entity_id, primary_only=True)
-        path_cache.close()
 
         return paths
 
@@ -767,12 +807,51 @@ class Sgtk(object):
                   if no path was associated.
         """
         # Use the path cache to look up all paths associated with this entity
-        path_cache = PathCache(self)
+        path_cache = self.get_path_cache()
         entity = path_cache.get_entity(path)
-        path_cache.close()
 
         return entity
 
+    def paths_from_entities(self, entities):
+        """
+        Finds paths associated with a list of Shotgun entities.
+
+        This is the bulk version of :meth:`paths_from_entity`, which resolves
+        all the entities at once.
+
+        .. note:: Only paths that have been generated by :meth:`create_filesystem_structure` will
+                 be returned. Such paths are stored in Shotgun as ``FilesystemLocation`` entities.
+
+        :param entities: List of ``(entity_type, entity_id)`` tuples.
+        :returns: Dictionary keyed by ``(entity_type, entity_id)`` tuples of lists
+                  of matching file paths.
+        """
+        # Use the path cache to look up all paths associated with these entities
+        path_cache = self.get_path_cache()
+        paths = path_cache.get_paths_many(entities, primary_only=True)
+
+        return paths
+
+    def entities_from_paths(self, paths):
+        """
+        Returns the shotgun entities associated with a list of paths.
+
+        This is the bulk version of :meth:`entity_from_path`, which resolves
+        all the paths at once.
+
+        .. note:: Only paths that have been generated by :meth:`create_filesystem_structure` will
+                 be returned. Such paths are stored in Shotgun as ``FilesystemLocation`` entities.
+
+        :param paths: List of paths to folders or files
+        :returns: Dictionary keyed by path of Shotgun dictionaries containing name,
+                  type and id or None if no entity was associated with the path.
+        """
+        # Use the path cache to look up all entities associated with these paths
+        path_cache = self.get_path_cache()
+        entities = path_cache.get_entities(paths)
+
+        return entities
+
     def context_empty(self):
         """
         Factory method that constructs an empty Context object.
@@ -8,9 +8,11 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import contextlib
 import os
 
 from sgtk import LogManager, hook
+from sgtk.util.shotgun import get_sg_connection_lock
 
 log = LogManager.get_logger(__name__)
 
@@ -21,8 +23,15 @@ class BundleDownloader(object):
 
     It is written as a separate file that cab be reimported by the bootstrapper
     after the core swap.
+
+    Bundles can be downloaded from multiple threads. Unless the bootstrap hook
+    declares itself thread safe, calls to the hook are serialized with any other
+    use of the Shotgun connection it shares.
     """
 
+    # indicates to the bootstrap logic that bundles can be downloaded concurrently.
+    THREAD_SAFE = True
+
     def __init__(self, connection, pipeline_config_id, descriptor):
         """
         :param connection: Connection to Shotgun.
@@ -52,6 +61,17 @@ class BundleDownloader(object):
         )
         self._hook_instance.init(connection, pipeline_config_id, descriptor)
 
+        if getattr(self._hook_instance, "THREAD_SAFE", False):
+            # the hook locks the connection around its own Shotgun calls.
+            self._hook_lock = contextlib.nullcontext()
+        else:
+            self._hook_lock = get_sg_connection_lock(connection)
+            if len(hook_inheritance_chain) > 1:
+                log.debug(
+                    "The bootstrap hook %s is not thread safe, bundles will be "
+                    "downloaded through it one at a time." % hook_path
+                )
+
     def download_bundle(self, descriptor):
         """
         Downloads a bundle referenced by a descriptor.
@@ -61,10 +81,12 @@ class BundleDownloader(object):
 
         :param descriptor: Descriptor of the bundle to download.
         """
-        if self._hook_instance.can_cache_bundle(descriptor):
-            with descriptor._io_descriptor.open_write_location() as temporary_folder:
-                self._hook_instance.populate_bundle_cache_entry(
-                    temporary_folder, descriptor
-                )
-        else:
-            descriptor.download_local()
+        with self._hook_lock:
+            if self._hook_instance.can_cache_bundle(descriptor):
+                with descriptor._io_descriptor.open_write_location() as temporary_folder:
+                    self._hook_instance.populate_bundle_cache_entry(
+                        temporary_folder, descriptor
+                    )
+                return
+
+        descriptor.download_local()
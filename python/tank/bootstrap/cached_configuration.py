@@ -8,15 +8,16 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import concurrent.futures
 import os
 import pprint
 import traceback
 
 from tank_vendor import yaml
 
-from .. import LogManager
+from .. import LogManager, compiled_config
 from ..descriptor import Descriptor, create_descriptor
-from ..util import filesystem
+from ..util import filesystem, get_positive_int_env_var
 from . import constants
 from .configuration import Configuration
 from .configuration_writer import ConfigurationWriter
@@ -32,6 +33,9 @@ class CachedConfiguration(Configuration):
     automatic updates.
     """
 
+    # default number of bundles downloaded concurrently by cache_bundles
+    BUNDLE_DOWNLOAD_THREADS = 4
+
     def __init__(
         self,
         path,
@@ -386,13 +390,46 @@ class CachedConfiguration(Configuration):
             )
             log.debug("Latest backup cleanup complete.")
 
-        # @todo - prime caches (yaml, path cache)
+            # prime the compiled config, so that the yaml files of the new
+            # config don't have to be read when it is loaded.
+            self._compile_config()
+
+        # @todo - prime path cache
 
         # make sure tank command and interpreter files are up to date
         self._config_writer.create_tank_command()
 
         self._config_writer.end_transaction()
 
+    def _compile_config(self):
+        """
+        Writes the compiled config of the installed configuration.
+
+        The config is still usable if it can't be compiled, so errors are
+        only logged.
+        """
+        if (
+            self._descriptor.get_associated_core_feature_info(
+                "bootstrap.lean_config.version", 0
+            )
+            < 1
+        ):
+            config_location = os.path.join(self._path.current_os, "config")
+        else:
+            config_location = self._descriptor.get_config_folder()
+
+        try:
+            path = compiled_config.compile_config(
+                config_location,
+                os.path.join(
+                    self._path.current_os, compiled_config.COMPILED_CONFIG_FILE
+                ),
+            )
+        except Exception as e:
+            log.warning("Could not compile configuration %s: %s" % (config_location, e))
+        else:
+            log.debug("Wrote compiled config %s" % path)
+
     def _ensure_core_local(self):
         """
         Ensures that the core for the current config has been cached to disk.
@@ -512,32 +549,101 @@ class CachedConfiguration(Configuration):
                 descriptors[descriptor.get_uri()] = descriptor
 
         # pass 2 - download all apps
-        for idx, descriptor in enumerate(descriptors.values()):
-            if not descriptor.exists_local():
-                message = "Downloading %s (%s of %s)..." % (
-                    descriptor,
-                    idx + 1,
-                    len(descriptors),
+        self._download_bundles(list(descriptors.values()), progress_cb)
+
+    def _download_bundles(self, descriptors, progress_cb):
+        """
+        Downloads the bundles which are not cached locally.
+
+        Bundles are downloaded concurrently by a bounded number of threads.
+        Descriptors sharing a bundle cache location are downloaded only once.
+        Progress is always reported from the calling thread.
+
+        :param descriptors: List of descriptors of the bundles to cache.
+        :param progress_cb: Callback to invoke to report progress on bundle caching. The expected
+            signature is: ``def progress_cb(message, current_bundle_idx, nb_total_bundles)``
+        """
+        total = len(descriptors)
+        idx = 0
+
+        # descriptors to download, keyed by the location they are downloaded to.
+        pending = {}
+        for descriptor in descriptors:
+            if descriptor.exists_local():
+                message = "Checking %s (%s of %s)." % (descriptor, idx + 1, total)
+                log.debug(
+                    "%s exists locally at '%s'.", descriptor, descriptor.get_path()
+                )
+                progress_cb(message, idx, total)
+                idx += 1
+            else:
+                pending.setdefault(self._get_download_location(descriptor), []).append(
+                    descriptor
+                )
+
+        if not pending:
+            return
+
+        nb_threads = min(self._get_bundle_download_threads(), len(pending))
+        log.debug("Downloading %d bundles with %d threads...", len(pending), nb_threads)
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=nb_threads, thread_name_prefix="sgtk_bundle_download"
+        ) as executor:
+            futures = dict(
+                (
+                    executor.submit(self._download_bundle, same_location[0]),
+                    same_location,
                 )
-                progress_cb(message, idx, len(descriptors))
+                for same_location in pending.values()
+            )
+            for future in concurrent.futures.as_completed(futures):
                 try:
-                    self._download_bundle(descriptor)
+                    future.result()
                 except Exception as e:
                     log.error(
                         "Downloading %r failed to complete successfully. This bundle will be skipped.",
                         e,
                     )
                     log.exception(e)
-            else:
-                message = "Checking %s (%s of %s)." % (
-                    descriptor,
-                    idx + 1,
-                    len(descriptors),
-                )
-                log.debug(
-                    "%s exists locally at '%s'.", descriptor, descriptor.get_path()
-                )
-                progress_cb(message, idx, len(descriptors))
+                    status = "Failed to download"
+                else:
+                    status = "Downloaded"
+
+                for descriptor in futures[future]:
+                    message = "%s %s (%s of %s)." % (status, descriptor, idx + 1, total)
+                    progress_cb(message, idx, total)
+                    idx += 1
+
+    def _get_download_location(self, descriptor):
+        """
+        Returns the bundle cache location a descriptor is downloaded to.
+
+        :param descriptor: Descriptor of the bundle.
+        :returns: Path to the location, or the descriptor uri if the bundle
+            is not stored in the bundle cache.
+        """
+        try:
+            return descriptor._io_descriptor._get_primary_cache_path()
+        except NotImplementedError:
+            return descriptor.get_uri()
+
+    def _get_bundle_download_threads(self):
+        """
+        Returns the number of threads used to download bundles.
+
+        :returns: Number of threads, at least 1.
+        """
+        # bundle downloaders from cores which predate concurrent downloads
+        # share a single Shotgun connection between all the downloads.
+        if self._bundle_downloader and not getattr(
+            self._bundle_downloader, "THREAD_SAFE", False
+        ):
+            return 1
+
+        return get_positive_int_env_var(
+            constants.BUNDLE_DOWNLOAD_THREADS_ENV_VAR, self.BUNDLE_DOWNLOAD_THREADS
+        )
 
     def _cleanup_backup_folders(
         self, config_backup_folder_path, core_backup_folder_path
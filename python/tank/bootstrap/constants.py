@@ -73,6 +73,10 @@ PIPELINE_CONFIG_ID_ENV_VAR = "SHOTGUN_PIPELINE_CONFIGURATION_ID"
 # environment variable that is used to indicate which bundle caches to be used.
 BUNDLE_CACHE_FALLBACK_PATHS_ENV_VAR = "SHOTGUN_BUNDLE_CACHE_FALLBACK_PATHS"
 
+# environment variable setting how many bundles are downloaded concurrently
+# when a configuration is cached.
+BUNDLE_DOWNLOAD_THREADS_ENV_VAR = "TK_BUNDLE_DOWNLOAD_THREADS"
+
 # the name of the folder within the config where bundles are cached.
 BUNDLE_CACHE_FOLDER_NAME = "bundle_cache"
 
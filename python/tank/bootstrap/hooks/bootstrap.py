@@ -25,6 +25,16 @@ from sgtk import get_hook_baseclass
 
 
 class Bootstrap(get_hook_baseclass()):
+
+    #: Indicates if :meth:`can_cache_bundle` and :meth:`populate_bundle_cache_entry`
+    #: can be called from several threads at the same time, to download bundles
+    #: concurrently. Otherwise, calls to the hook are serialized with any other use
+    #: of the ``shotgun`` connection. A thread safe hook must lock the connection
+    #: around its own Shotgun calls with
+    #: :func:`sgtk.util.shotgun.get_sg_connection_lock`, since a connection can't
+    #: be used by several threads at the same time.
+    THREAD_SAFE = False
+
     def init(
         self, shotgun, pipeline_configuration_id, configuration_descriptor, **kwargs
     ):
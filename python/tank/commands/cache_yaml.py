@@ -11,6 +11,7 @@
 import fnmatch
 import os
 
+from .. import compiled_config
 from ..errors import TankError
 from ..util import pickle, yaml_cache
 from .action_base import Action
@@ -93,5 +94,15 @@ class CacheYamlAction(Action):
         except Exception as e:
             raise TankError("Unable to dump pickled cache data: %s" % e)
 
+        # the compiled config is used instead of the yaml cache when it is
+        # up to date, so refresh it as well.
+        pipeline_configuration = self.tk.pipeline_configuration
+        compiled_path = compiled_config.compile_config(
+            pipeline_configuration.get_config_location(),
+            pipeline_configuration.get_compiled_config_location(),
+            pipeline_configuration,
+        )
+        log.debug("Wrote compiled config to %s" % compiled_path)
+
         log.info("")
         log.info("Cache yaml completed!")
@@ -0,0 +1,88 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from .. import compiled_config
+from ..errors import TankError
+from .action_base import Action
+
+
+class CompileConfigAction(Action):
+    """
+    Action that compiles the environments, templates and core hooks of a
+    config, so they can be loaded without reading any YAML file.
+    """
+
+    def __init__(self):
+        Action.__init__(
+            self,
+            "compile_config",
+            Action.TK_INSTANCE,
+            "Compiles the environments and templates of the config into a binary file.",
+            "Admin",
+        )
+
+        # this method can be executed via the API
+        self.supports_api = True
+
+        self.parameters = {}
+        self.parameters["return_value"] = {
+            "description": "Path to the compiled config file.",
+            "type": "str",
+        }
+
+    def run_noninteractive(self, log, parameters):
+        """
+        Tank command API accessor.
+        Called when someone runs a tank command through the core API.
+
+        This command takes no parameters, so an empty dictionary
+        should be passed. The parameters argument is there because
+        we are deriving from the Action base class which requires
+        this parameter to be present.
+
+        :param log: std python logger
+        :param parameters: dictionary with tank command parameters
+        """
+        return self._run(log)
+
+    def run_interactive(self, log, args):
+        """
+        Tank command accessor
+
+        :param log: std python logger
+        :param args: command line args
+        """
+        if len(args) != 0:
+            raise TankError("This command takes no arguments!")
+        return self._run(log)
+
+    def _run(self, log):
+        """
+        Actual execution payload
+        """
+        log.info(
+            "This command will resolve all the environments and templates of the "
+            "configuration and store them in a compiled config file."
+        )
+
+        pipeline_configuration = self.tk.pipeline_configuration
+        path = compiled_config.compile_config(
+            pipeline_configuration.get_config_location(),
+            pipeline_configuration.get_compiled_config_location(),
+            pipeline_configuration,
+        )
+
+        log.info("")
+        log.info("Compiled config written to %s" % path)
+        log.info(
+            "It will be used as long as the configuration files it was compiled "
+            "from are unchanged."
+        )
+        return path
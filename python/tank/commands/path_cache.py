@@ -109,6 +109,122 @@ class SynchronizePathCache(Action):
             )
 
 
+class PathCacheSnapshotAction(Action):
+    """
+    Tank command to export the path cache to a snapshot, or to seed the
+    path cache from a snapshot, so that new machines don't have to do a
+    full sync.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Action.__init__(
+            self,
+            "path_cache_snapshot",
+            Action.TK_INSTANCE,
+            (
+                "Exports a snapshot of the folders synchronized with Flow Production "
+                "Tracking, or seeds the local folder information from a snapshot."
+            ),
+            "Admin",
+        )
+
+        # this method can be executed via the API
+        self.supports_api = True
+        self.parameters = {}
+        self.parameters["operation"] = {
+            "description": "Either 'export' or 'import'.",
+            "default": "export",
+            "type": "str",
+        }
+        self.parameters["path"] = {
+            "description": (
+                "Path to the snapshot file, or to a folder where snapshots "
+                "are stored."
+            ),
+            "default": None,
+            "type": "str",
+        }
+        self.parameters["return_value"] = {
+            "description": "Path to the snapshot file.",
+            "type": "str",
+        }
+
+    def run_noninteractive(self, log, parameters):
+        """
+        Tank command API accessor.
+        Called when someone runs a tank command through the core API.
+
+        :param log: std python logger
+        :param parameters: dictionary with tank command parameters
+        """
+        # validate params and seed default values
+        computed_params = self._validate_parameters(parameters)
+        return self._run(log, computed_params["operation"], computed_params["path"])
+
+    def run_interactive(self, log, args):
+        """
+        Tank command accessor
+
+        :param log: std python logger
+        :param args: command line args
+        """
+        if len(args) != 2:
+            raise TankError("Syntax: path_cache_snapshot export|import path")
+
+        return self._run(log, args[0], args[1])
+
+    def _run(self, log, operation, snapshot_path):
+        """
+        Actual business logic for command
+
+        :param log: logger
+        :param operation: 'export' or 'import'
+        :param snapshot_path: Path to the snapshot file or folder.
+        :returns: Path to the snapshot file.
+        """
+        if operation not in ("export", "import"):
+            raise TankError(
+                "Unknown operation '%s', expected 'export' or 'import'." % operation
+            )
+
+        if snapshot_path is None:
+            raise TankError("A snapshot path is required.")
+
+        if not self.tk.pipeline_configuration.get_shotgun_path_cache_enabled():
+            raise TankError(
+                "Looks like this project doesn't synchronize its folders with Flow "
+                "Production Tracking! Snapshots can only be used once synchronization "
+                "has been turned on with the 'upgrade_folders' tank command."
+            )
+
+        pc = path_cache.PathCache(self.tk)
+        try:
+            if operation == "export":
+                log.info(
+                    "Ensuring that the local folder representation is up to date..."
+                )
+                pc.synchronize()
+                snapshot_file = pc.export_snapshot(snapshot_path)
+                log.info("Exported a path cache snapshot to %s." % snapshot_file)
+            else:
+                snapshot_file = pc.get_snapshot_file(snapshot_path)
+                event_log_id = pc.import_snapshot(snapshot_file)
+                log.info(
+                    "Imported the path cache snapshot %s, synchronized up to event "
+                    "log entry %s." % (snapshot_file, event_log_id)
+                )
+                log.info("Synchronizing the folders created since the snapshot...")
+                pc.synchronize()
+                log.info("Local folder information has been synchronized.")
+        finally:
+            pc.close()
+
+        return snapshot_file
+
+
 class PathCacheMigrationAction(Action):
     """
     Tank command for migrating an existing project to use the new FilesystemLocation
@@ -24,6 +24,7 @@ from . import (
     cache_apps,
     cache_yaml,
     clone_configuration,
+    compile_config,
     constants,
     copy_apps,
     core_localize,
@@ -77,12 +78,14 @@ BUILT_IN_ACTIONS = [
     move_pc.MovePCAction,
     pc_overview.PCBreakdownAction,
     path_cache.SynchronizePathCache,
+    path_cache.PathCacheSnapshotAction,
     path_cache.PathCacheMigrationAction,
     unregister_folders.UnregisterFoldersAction,
     clone_configuration.CloneConfigAction,
     copy_apps.CopyAppsAction,
     desktop_migration.DesktopMigration,
     cache_yaml.CacheYamlAction,
+    compile_config.CompileConfigAction,
     get_entity_commands.GetEntityCommandsAction,
 ]
 
@@ -0,0 +1,567 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Compiled configurations.
+
+A compiled configuration stores the fully resolved environments and templates
+of a configuration, as well as the list of its core hooks, so that they can be
+loaded without reading and resolving any YAML file. When it is compiled for a
+pipeline configuration, the :class:`~sgtk.Template` objects built for its
+storage roots are stored as well.
+
+The compiled data is written in a single binary file with the following layout::
+
+    header: magic, format version, marshal version, source hash, index size
+    index: marshalled dictionary {section name: (offset, size)}
+    sections: marshalled data for each section
+
+The header has a fixed size and sections are addressed by offset, so the file
+is read in one go and sections are only unmarshalled when they are needed. The
+file is only used if the hash of the source files it was compiled from is
+unchanged, and the source files of an environment or of the templates are
+checked again each time they are read.
+
+Compiled configs are written by the ``compile_config`` and ``cache_yaml``
+tank commands, when the bootstrap installs a configuration and when a
+configuration is baked.
+"""
+
+import glob
+import hashlib
+import marshal
+import os
+import pickle
+import struct
+
+from . import LogManager, constants, template, template_includes, templatekey
+from . import template_path_parser
+from .errors import TankError
+from .platform import environment_includes
+from .util import filesystem, yaml_cache
+from .util.includes import resolve_include
+
+log = LogManager.get_logger(__name__)
+
+# name of the compiled configuration file, stored at the root of the
+# pipeline configuration, or in the core folder of a baked configuration
+COMPILED_CONFIG_FILE = "compiled_config.bin"
+
+_MAGIC = b"TKCC"
+# version of the file format, to be incremented when the layout or the content
+# of the sections changes.
+FORMAT_VERSION = 2
+# magic, format version, marshal version, source hash, index size
+_HEADER = struct.Struct("<4sHH32sI")
+
+_TEMPLATES_SECTION = "templates"
+_RESOLVED_TEMPLATES_SECTION = "resolved_templates"
+_CORE_HOOKS_SECTION = "core_hooks"
+_SOURCES_SECTION = "sources"
+_ENVIRONMENT_SECTION_PREFIX = "env:"
+
+
+class CompiledConfig(object):
+    """
+    Read access to a compiled configuration file.
+
+    Use :meth:`load` to open a compiled configuration.
+    """
+
+    def __init__(self, path, config_location, data, index, sources):
+        """
+        :param path: Path to the compiled configuration file.
+        :param config_location: Path to the config folder it was compiled from.
+        :param bytes data: Content of the file.
+        :param dict index: Sections of the file, {name: (offset, size)}.
+        :param dict sources: Digests of the source files, keyed by their path
+                             relative to the config folder.
+        """
+        self._path = path
+        self._config_location = config_location
+        self._data = memoryview(data)
+        self._index = index
+        self._sources = sources
+        # stat of the source files when their digest was last checked
+        self._source_stats = {}
+        self._core_hooks = None
+
+    def __repr__(self):
+        return "<Compiled config %s>" % self._path
+
+    @classmethod
+    def load(cls, path, config_location):
+        """
+        Opens a compiled configuration file.
+
+        :param path: Path to the compiled configuration file.
+        :param config_location: Path to the config folder of the pipeline
+                                configuration it was compiled from.
+        :returns: A :class:`CompiledConfig` or None if the file doesn't exist,
+                  is invalid or is out of date.
+        """
+        if not os.path.exists(path):
+            return None
+
+        # the file is read at once rather than memory mapped, so that it can
+        # be replaced while it is used.
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except (IOError, OSError) as e:
+            log.warning("Could not read compiled config %s: %s" % (path, e))
+            return None
+
+        try:
+            (
+                magic,
+                format_version,
+                marshal_version,
+                source_hash,
+                index_size,
+            ) = _HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                raise ValueError("not a compiled config")
+            if format_version != FORMAT_VERSION or marshal_version != marshal.version:
+                log.debug(
+                    "Compiled config %s has format %s.%s, expected %s.%s. "
+                    "Ignoring it."
+                    % (
+                        path,
+                        format_version,
+                        marshal_version,
+                        FORMAT_VERSION,
+                        marshal.version,
+                    )
+                )
+                return None
+            index = marshal.loads(data[_HEADER.size : _HEADER.size + index_size])
+            compiled_config = cls(path, config_location, data, index, {})
+            sources = dict(compiled_config._get_section(_SOURCES_SECTION))
+        except (ValueError, EOFError, TypeError, struct.error) as e:
+            log.warning("Invalid compiled config %s: %s" % (path, e))
+            return None
+
+        compiled_config._sources = sources
+        if _get_source_hash(config_location, sources) != source_hash:
+            log.debug("Compiled config %s is out of date. Ignoring it." % path)
+            return None
+        # the digests were just computed from the files.
+        for source in sources:
+            compiled_config._source_stats[source] = _get_stat(
+                os.path.join(config_location, source)
+            )
+
+        log.debug("Loaded compiled config %s" % path)
+        return compiled_config
+
+    def _get_section(self, name):
+        """
+        Unmarshals a section of the file.
+
+        :param name: Name of the section.
+        :returns: The section data or None if the section doesn't exist.
+        """
+        section = self._index.get(name)
+        if section is None:
+            return None
+        offset, size = section
+        return marshal.loads(self._data[offset : offset + size])
+
+    def _sources_unchanged(self, sources):
+        """
+        Checks that source files are unchanged since they were compiled.
+
+        Only files whose modification time or size changed since they were
+        last checked are read again.
+
+        :param list sources: Paths of the source files, relative to the
+                             config folder.
+        :returns: True if the files are unchanged.
+        """
+        for source in sources:
+            path = os.path.join(self._config_location, source)
+            stat = _get_stat(path)
+            if stat is not None and stat == self._source_stats.get(source):
+                continue
+            if _get_file_digest(path) != self._sources.get(source):
+                log.debug(
+                    "%s changed since %s was compiled, reading it instead."
+                    % (path, self._path)
+                )
+                return False
+            self._source_stats[source] = stat
+        return True
+
+    def get_templates_config(self):
+        """
+        Returns the templates configuration with all includes resolved.
+
+        :returns: Dictionary with the keys, paths and strings sections, or None
+                  if the templates were not compiled or changed since.
+        """
+        data = self._get_section(_TEMPLATES_SECTION)
+        if data is None:
+            return None
+        sources, templates_config = data
+        if not self._sources_unchanged(sources):
+            return None
+        return templates_config
+
+    def get_templates(self, per_platform_roots, default_root):
+        """
+        Returns the templates built when the configuration was compiled.
+
+        :param dict per_platform_roots: Root paths for all platforms, keyed by
+            storage root name and then by sys.platform-style os name.
+        :param str default_root: Name of the default storage root.
+        :returns: Dictionary of form {template name: template object}, or None
+                  if the templates were not built for these roots or by this
+                  version of the code, or if they changed since.
+        """
+        data = self._get_section(_RESOLVED_TEMPLATES_SECTION)
+        if data is None:
+            return None
+        sources, roots, root_name, code_signature, templates_data = data
+        if (
+            roots != per_platform_roots
+            or root_name != default_root
+            or code_signature != _get_template_code_signature()
+            or not self._sources_unchanged(sources)
+        ):
+            return None
+        try:
+            return pickle.loads(templates_data)
+        except Exception as e:
+            log.debug("Could not load the templates of %s: %s" % (self._path, e))
+            return None
+
+    def get_environment_data(self, env_path, context):
+        """
+        Returns the data of an environment with all includes resolved.
+
+        :param env_path: Path to the environment file.
+        :param context: Context the environment is loaded for.
+        :returns: Dictionary with the environment data, or None if the
+                  environment was not compiled, its includes depend on the
+                  context or its files changed since.
+        """
+        data = self._get_section(
+            _ENVIRONMENT_SECTION_PREFIX
+            + _get_relative_path(self._config_location, env_path)
+        )
+        if data is None:
+            return None
+        context_dependent, sources, env_data = data
+        if context_dependent and context is not None:
+            return None
+        if not self._sources_unchanged(sources):
+            return None
+        return env_data
+
+    def has_core_hook(self, file_name):
+        """
+        Checks if a core hook is overridden in the configuration.
+
+        :param file_name: File name of the hook.
+        :returns: True if the hook exists in the core hooks folder.
+        """
+        if self._core_hooks is None:
+            self._core_hooks = frozenset(self._get_section(_CORE_HOOKS_SECTION))
+        return file_name in self._core_hooks
+
+
+def get_config_file_location(config_location):
+    """
+    Returns the location of the compiled config shipped with a configuration,
+    which is used when its pipeline configuration has none.
+
+    :param config_location: Path to the config folder.
+    :returns: Path to the compiled configuration file.
+    """
+    return os.path.join(config_location, "core", COMPILED_CONFIG_FILE)
+
+
+def compile_config(config_location, path, pipeline_configuration=None):
+    """
+    Compiles the environments, templates and core hooks of a configuration.
+
+    Environments with includes which depend on environment variables are not
+    compiled and are read from their YAML files when used.
+
+    :param config_location: Path to the config folder to compile.
+    :param path: Path to the compiled configuration file.
+    :param pipeline_configuration: Pipeline configuration using the config.
+        If set, the templates are also built for its storage roots.
+    :returns: Path to the compiled configuration file.
+    :raises: :class:`TankError` if the configuration can't be compiled.
+    """
+    sections = {}
+    sources = set()
+
+    # templates
+    templates_file = os.path.join(
+        config_location, "core", constants.CONTENT_TEMPLATES_FILE
+    )
+    if os.path.exists(templates_file):
+        template_sources = set([templates_file])
+        if _get_include_files(templates_file, template_sources) is not None:
+            data = yaml_cache.g_yaml_cache.get(templates_file, deepcopy_data=False)
+            templates_config = template_includes.process_includes(
+                templates_file, data or {}
+            )
+            template_sources = _get_relative_paths(config_location, template_sources)
+            sections[_TEMPLATES_SECTION] = (template_sources, templates_config)
+            if pipeline_configuration:
+                sections[_RESOLVED_TEMPLATES_SECTION] = _get_resolved_templates(
+                    pipeline_configuration, template_sources, templates_config
+                )
+            sources.update(template_sources)
+        else:
+            log.debug("Templates include dynamic paths and won't be compiled.")
+
+    # environments
+    env_paths = glob.glob(os.path.join(config_location, "env", "*.yml"))
+    for env_path in sorted(env_paths):
+        env_sources = set([env_path])
+        context_dependent = _get_include_files(env_path, env_sources)
+        if context_dependent is None:
+            log.debug(
+                "Environment %s includes dynamic paths and won't be compiled."
+                % env_path
+            )
+            continue
+        data = yaml_cache.g_yaml_cache.get(env_path, frozen_data=True) or {}
+        env_data = environment_includes.process_includes(env_path, data, None)
+        env_sources = _get_relative_paths(config_location, env_sources)
+        sections[
+            _ENVIRONMENT_SECTION_PREFIX + _get_relative_path(config_location, env_path)
+        ] = (context_dependent, env_sources, env_data)
+        sources.update(env_sources)
+
+    # core hooks
+    sections[_CORE_HOOKS_SECTION] = _get_core_hooks(config_location)
+
+    blobs = []
+    for name, data in sections.items():
+        if data is None:
+            continue
+        try:
+            blobs.append((name, marshal.dumps(data)))
+        except ValueError as e:
+            # values which can't be stored, e.g. dates, are only
+            # supported by the YAML files.
+            log.debug("Section %s can't be compiled: %s" % (name, e))
+
+    sources = dict(
+        (source, _get_file_digest(os.path.join(config_location, source)))
+        for source in sorted(sources)
+    )
+    blobs.append((_SOURCES_SECTION, marshal.dumps(sorted(sources.items()))))
+
+    # the offsets of the sections depend on the size of the index, so compute
+    # the index until its size is stable.
+    index_size = 0
+    while True:
+        index = {}
+        offset = _HEADER.size + index_size
+        for name, blob in blobs:
+            index[name] = (offset, len(blob))
+            offset += len(blob)
+        index_blob = marshal.dumps(index)
+        if len(index_blob) == index_size:
+            break
+        index_size = len(index_blob)
+
+    header = _HEADER.pack(
+        _MAGIC,
+        FORMAT_VERSION,
+        marshal.version,
+        _get_source_hash(config_location, sources),
+        index_size,
+    )
+
+    try:
+        with filesystem.atomic_write(path) as temp_path:
+            with open(temp_path, "wb") as fh:
+                fh.write(header)
+                fh.write(index_blob)
+                for _, blob in blobs:
+                    fh.write(blob)
+    except OSError as e:
+        raise TankError("Could not write compiled config '%s': %s" % (path, e))
+
+    return path
+
+
+def _get_resolved_templates(pipeline_configuration, sources, templates_config):
+    """
+    Builds the templates of a pipeline configuration and returns the data of
+    the resolved templates section.
+
+    :param pipeline_configuration: Pipeline configuration the templates are
+        built for.
+    :param list sources: Paths of the templates source files, relative to the
+        config folder.
+    :param dict templates_config: Templates configuration.
+    :returns: Section data, or None if the templates can't be stored.
+    """
+    per_platform_roots = pipeline_configuration.get_all_platform_data_roots()
+    default_root = pipeline_configuration.get_primary_data_root_name()
+    try:
+        templates = template.make_templates(
+            templates_config, per_platform_roots, default_root
+        )
+        templates_data = pickle.dumps(templates, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        log.debug("Templates can't be compiled: %s" % e)
+        return None
+    return (
+        sources,
+        per_platform_roots,
+        default_root,
+        _get_template_code_signature(),
+        templates_data,
+    )
+
+
+def _get_template_code_signature():
+    """
+    Identifies the code of the template classes, which stored templates have
+    to be loaded with.
+
+    :returns: List of (file name, modification time, size) lists.
+    """
+    signature = []
+    for module in (template, templatekey, template_path_parser):
+        stat = _get_stat(module.__file__)
+        signature.append([os.path.basename(module.__file__), stat])
+    return signature
+
+
+def _get_include_files(file_name, include_files):
+    """
+    Recursively collects the files included by a YAML file.
+
+    :param file_name: Path to the YAML file.
+    :param set include_files: Set the paths of the included files are added to.
+    :returns: True if some includes depend on the context, False if they
+              don't, or None if some includes depend on environment variables
+              and the file can't be compiled.
+    """
+    data = yaml_cache.g_yaml_cache.get(file_name, frozen_data=True)
+    if not isinstance(data, dict):
+        return False
+
+    includes = []
+    if constants.SINGLE_INCLUDE_SECTION in data:
+        includes.append(data[constants.SINGLE_INCLUDE_SECTION])
+    if constants.MULTI_INCLUDE_SECTION in data:
+        includes.extend(data[constants.MULTI_INCLUDE_SECTION] or [])
+
+    context_dependent = False
+    for include in includes:
+        if "{" in include:
+            # template based include, resolved with the context.
+            context_dependent = True
+            continue
+        if os.path.expanduser(os.path.expandvars(include)) != include:
+            return None
+        path = resolve_include(file_name, include)
+        if path is None or path in include_files:
+            continue
+        include_files.add(path)
+        included_context_dependent = _get_include_files(path, include_files)
+        if included_context_dependent is None:
+            return None
+        context_dependent = context_dependent or included_context_dependent
+
+    return context_dependent
+
+
+def _get_core_hooks(config_location):
+    """
+    Lists the core hooks of a configuration.
+
+    :param config_location: Path to the config folder.
+    :returns: Sorted list of hook file names.
+    """
+    hooks_folder = os.path.join(config_location, "core", "hooks")
+    if not os.path.isdir(hooks_folder):
+        return []
+    return sorted(
+        x
+        for x in os.listdir(hooks_folder)
+        if os.path.isfile(os.path.join(hooks_folder, x))
+    )
+
+
+def _get_relative_path(config_location, path):
+    """
+    Returns a path relative to the config folder, with forward slashes, or the
+    normalized absolute path if the path is outside of the config folder.
+    """
+    path = os.path.normpath(path)
+    relative_path = os.path.relpath(path, config_location)
+    if relative_path.startswith(os.pardir):
+        return path.replace(os.sep, "/")
+    return relative_path.replace(os.sep, "/")
+
+
+def _get_relative_paths(config_location, paths):
+    """
+    Returns the sorted list of the given paths, relative to the config folder.
+    """
+    return sorted(_get_relative_path(config_location, x) for x in paths)
+
+
+def _get_stat(path):
+    """
+    Returns the modification time and size of a file, or None if it doesn't
+    exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _get_file_digest(path):
+    """
+    Returns the sha256 digest of the content of a file, or None if it can't
+    be read.
+    """
+    try:
+        with open(path, "rb") as fh:
+            return hashlib.sha256(fh.read()).digest()
+    except (IOError, OSError):
+        return None
+
+
+def _get_source_hash(config_location, sources):
+    """
+    Computes the hash of the source files of a compiled configuration.
+
+    :param config_location: Path to the config folder.
+    :param sources: Paths of the source files, relative to the config folder.
+    :returns: The sha256 digest of the content of the files and of the list
+              of core hooks.
+    """
+    source_hash = hashlib.sha256()
+    for source in sorted(sources):
+        source_hash.update(source.encode("utf-8") + b"\0")
+        digest = _get_file_digest(os.path.join(config_location, source))
+        # the file was removed, the hash can't match.
+        source_hash.update(digest or b"\0missing")
+        source_hash.update(b"\0")
+    for hook in _get_core_hooks(config_location):
+        source_hash.update(hook.encode("utf-8") + b"\0")
+    return source_hash.digest()
@@ -82,6 +82,30 @@ PROFILING_LOG_CHANNEL = "sgtk.stopwatch"
 # environment variable that if set, enables debug logging in the engine
 DEBUG_LOGGING_ENV_VAR = "TK_DEBUG"
 
+# environment variable that if set to 1, compiles templates into regular
+# expressions to speed up path parsing
+COMPILED_TEMPLATE_PARSING_ENV_VAR = "TK_COMPILED_TEMPLATE_PARSING"
+
+# environment variable that if set to 1, makes path cache lookups use a read-only
+# replica of the path cache database stored on local storage
+PATH_CACHE_REPLICA_ENV_VAR = "TK_PATH_CACHE_REPLICA"
+
+# environment variable pointing at a path cache snapshot, or a folder of snapshots,
+# used to seed empty path caches instead of doing a full sync
+PATH_CACHE_SNAPSHOT_ENV_VAR = "TK_PATH_CACHE_SNAPSHOT"
+
+# environment variable setting the maximum number of contexts cached by each
+# toolkit instance. Setting it to 0 disables the context cache.
+CONTEXT_CACHE_SIZE_ENV_VAR = "TK_CONTEXT_CACHE_SIZE"
+
+# environment variable that if set to 1, also caches the contexts built from
+# entities, whose Shotgun data is not refreshed while they are cached.
+CONTEXT_CACHE_ENTITIES_ENV_VAR = "TK_CONTEXT_CACHE_ENTITIES"
+
+# environment variable that if set to 1, stores the compiled code of hooks and
+# the hook class found in them in a persistent index shared by all processes
+HOOK_INDEX_ENV_VAR = "TK_HOOK_INDEX"
+
 # cache data for toolkit init
 TOOLKIT_INIT_CACHE_FILE = "toolkit_init.cache"
 
@@ -15,21 +15,25 @@ Management of the current context, e.g. the current shotgun entity/step/task.
 
 from __future__ import annotations  # needed for python 3.9 support
 
+import collections
+import contextlib
 import copy
 import json
 import os
+import threading
 
 from tank_vendor import yaml
 from tank_vendor.flow_integration_sdk import sandbox
 
-from . import authentication, constants
+from . import LogManager, authentication, constants
 from .authentication import flow_auth
 from .errors import TankContextDeserializationError, TankError
 from .flowam import constants as flow_const
-from .path_cache import PathCache
 from .template import TemplatePath
 from .util import login, pickle, shotgun, shotgun_entity
 
+log = LogManager.get_logger(__name__)
+
 
 class Context(object):
     """
@@ -645,24 +649,7 @@ class Context(object):
                             and any of the context fields for the template weren't found.
         """
         # Get all entities into a dictionary
-        entities = {}
-
-        if self.entity:
-            entities[self.entity["type"]] = self.entity
-        if self.step:
-            entities["Step"] = self.step
-        if self.task:
-            entities["Task"] = self.task
-        if self.user:
-            entities["HumanUser"] = self.user
-        if self.project:
-            entities["Project"] = self.project
-
-        # If there are any additional entities, use them as long as they don't
-        # conflict with types we already have values for (Step, Task, Shot/Asset/etc)
-        for add_entity in self.additional_entities:
-            if add_entity["type"] not in entities:
-                entities[add_entity["type"]] = add_entity
+        entities = self._get_template_entities()
 
         fields = {}
 
@@ -982,11 +969,42 @@ class Context(object):
     ################################################################################################
     # private methods
 
+    def _get_template_entities(self):
+        """
+        Returns the entities of the context which can provide template fields.
+
+        :returns: Dictionary of entities keyed by entity type.
+        """
+        entities = {}
+
+        if self.entity:
+            entities[self.entity["type"]] = self.entity
+        if self.step:
+            entities["Step"] = self.step
+        if self.task:
+            entities["Task"] = self.task
+        if self.user:
+            entities["HumanUser"] = self.user
+        if self.project:
+            entities["Project"] = self.project
+
+        # If there are any additional entities, use them as long as they don't
+        # conflict with types we already have values for (Step, Task, Shot/Asset/etc)
+        for add_entity in self.additional_entities:
+            if add_entity["type"] not in entities:
+                entities[add_entity["type"]] = add_entity
+
+        return entities
+
     def _fields_from_shotgun(self, template, entities, validate):
         """
         Query Shotgun server for keys used by this template whose values come directly
         from Shotgun fields.
 
+        All the fields needed from an entity are retrieved with a single query.
+        Values are cached on the context and, inside a :func:`shotgun_fields_memo`
+        block, shared with other contexts.
+
         :param template: Template to retrieve Shotgun fields for.
         :param entities: Dictionary of entities for the current context.
         :param validate: If True, missing fields will raise a TankError.
@@ -997,6 +1015,14 @@ class Context(object):
         :raises TankError: Raised if a key is missing from the entities list when ``validate`` is ``True``.
         """
         fields = {}
+        memo = _get_shotgun_fields_memo()
+        if memo is not None:
+            # retrieve the values prefetched for all the contexts at once.
+            memo.resolve()
+
+        # keys which need to be fetched from shotgun, by entity type
+        pending_keys = {}
+
         # for any sg query field
         for key in template.keys.values():
 
@@ -1024,63 +1050,95 @@ class Context(object):
                     # already have the value cached - no need to fetch from shotgun
                     fields[key.name] = self._entity_fields_cache[cache_key]
 
+                elif memo is not None and (self.__tk, cache_key) in memo.values:
+                    # value retrieved for another context, which may have
+                    # used a different key to validate it.
+                    processed_val = memo.values[(self.__tk, cache_key)]
+                    self._validate_shotgun_value(key, template, entity, processed_val)
+                    fields[key.name] = processed_val
+                    self._entity_fields_cache[cache_key] = processed_val
+
                 else:
-                    # get the value from shotgun
-                    filters = [["id", "is", entity["id"]]]
-                    query_fields = [key.shotgun_field_name]
-                    result = self.__tk.shotgun.find_one(
-                        key.shotgun_entity_type, filters, query_fields
-                    )
-                    if not result:
-                        # no record with that id in shotgun!
-                        raise TankError(
-                            "Could not retrieve PTR data for key '%s' in "
-                            "template '%s'. No records in PTR are matching "
-                            "entity '%s' (Which is part of the current "
-                            "context '%s')" % (key, template, entity, self)
-                        )
+                    pending_keys.setdefault(key.shotgun_entity_type, []).append(key)
 
-                    value = result.get(key.shotgun_field_name)
+        for entity_type, keys in pending_keys.items():
+            entity = entities[entity_type]
 
-                    # note! It is perfectly possible (and may be valid) to return None values from
-                    # shotgun at this point. In these cases, a None field will be returned in the
-                    # fields dictionary from as_template_fields, and this may be injected into
-                    # a template with optional fields.
+            # get all the values for this entity from shotgun at once
+            filters = [["id", "is", entity["id"]]]
+            query_fields = sorted(set(key.shotgun_field_name for key in keys))
+            results = self.__tk.shotgun.find(entity_type, filters, query_fields)
+            if not results:
+                # no record with that id in shotgun!
+                raise TankError(
+                    "Could not retrieve PTR data for key '%s' in "
+                    "template '%s'. No records in PTR are matching "
+                    "entity '%s' (Which is part of the current "
+                    "context '%s')" % (keys[0], template, entity, self)
+                )
 
-                    if value is None:
-                        processed_val = None
+            for key in keys:
+                cache_key = (entity["type"], entity["id"], key.shotgun_field_name)
+                if cache_key in self._entity_fields_cache:
+                    # field shared with a key processed earlier
+                    fields[key.name] = self._entity_fields_cache[cache_key]
+                    continue
 
-                    else:
+                value = results[0].get(key.shotgun_field_name)
 
-                        # now convert the shotgun value to a string.
-                        # note! This means that there is no way currently to create an int key
-                        # in a tank template which matches an int field in shotgun, since we are
-                        # force converting everything into strings...
-
-                        processed_val = shotgun_entity.sg_entity_to_string(
-                            self.__tk,
-                            key.shotgun_entity_type,
-                            entity.get("id"),
-                            key.shotgun_field_name,
-                            value,
-                        )
+                # note! It is perfectly possible (and may be valid) to return None values from
+                # shotgun at this point. In these cases, a None field will be returned in the
+                # fields dictionary from as_template_fields, and this may be injected into
+                # a template with optional fields.
 
-                        if not key.validate(processed_val):
-                            raise TankError(
-                                "Template validation failed for value '%s'. This "
-                                "value was retrieved from entity %s in PTR to "
-                                "represent key '%s' in "
-                                "template '%s'."
-                                % (processed_val, entity, key, template)
-                            )
-
-                    # all good!
-                    # populate dictionary and cache
-                    fields[key.name] = processed_val
-                    self._entity_fields_cache[cache_key] = processed_val
+                if value is None:
+                    processed_val = None
+
+                else:
+
+                    # now convert the shotgun value to a string.
+                    # note! This means that there is no way currently to create an int key
+                    # in a tank template which matches an int field in shotgun, since we are
+                    # force converting everything into strings...
+
+                    processed_val = shotgun_entity.sg_entity_to_string(
+                        self.__tk,
+                        key.shotgun_entity_type,
+                        entity.get("id"),
+                        key.shotgun_field_name,
+                        value,
+                    )
+
+                    self._validate_shotgun_value(key, template, entity, processed_val)
+
+                # all good!
+                # populate dictionary and cache
+                fields[key.name] = processed_val
+                self._entity_fields_cache[cache_key] = processed_val
+                if memo is not None:
+                    memo.values[(self.__tk, cache_key)] = processed_val
 
         return fields
 
+    def _validate_shotgun_value(self, key, template, entity, processed_val):
+        """
+        Checks that a value retrieved from Shotgun is valid for a template key.
+
+        :param key: :class:`TemplateKey` the value was retrieved for.
+        :param template: Template the key belongs to.
+        :param entity: Entity the value was retrieved from.
+        :param processed_val: String value, or None.
+
+        :raises TankError: Raised if the value isn't valid for the key.
+        """
+        if processed_val is not None and not key.validate(processed_val):
+            raise TankError(
+                "Template validation failed for value '%s'. This "
+                "value was retrieved from entity %s in PTR to "
+                "represent key '%s' in "
+                "template '%s'." % (processed_val, entity, key, template)
+            )
+
     def _fields_from_entity_paths(self, template):
         """
         Determines a template's key values based on context by walking up the context entities paths until
@@ -1175,110 +1233,106 @@ class Context(object):
         found_fields = {}
 
         # get a path cache handle
-        path_cache = PathCache(self.__tk)
-        try:
-            for template in templates:
-                # iterate over all keys in the list of keys for the template
-                # from lowest to highest looking for any that represent context
-                # entities (key name == entity type)
-                for key in reversed(template.ordered_keys):
-                    key_name = key.name
-                    # Check to see if we already have a value for this key:
-                    if key_name in known_fields or key_name in found_fields:
-                        # already have a value so skip
-                        continue
-
-                    if key_name not in context_entities:
-                        # key doesn't represent an entity so skip
-                        continue
-
-                    # find fields for any paths associated with this entity by looking in the path cache:
-                    entity_fields = _values_from_path_cache(
-                        context_entities[key_name],
-                        template,
-                        path_cache,
-                        required_fields=found_fields,
-                    )
+        path_cache = self.__tk.get_path_cache()
+        for template in templates:
+            # iterate over all keys in the list of keys for the template
+            # from lowest to highest looking for any that represent context
+            # entities (key name == entity type)
+            for key in reversed(template.ordered_keys):
+                key_name = key.name
+                # Check to see if we already have a value for this key:
+                if key_name in known_fields or key_name in found_fields:
+                    # already have a value so skip
+                    continue
+
+                if key_name not in context_entities:
+                    # key doesn't represent an entity so skip
+                    continue
+
+                # find fields for any paths associated with this entity by looking in the path cache:
+                entity_fields = _values_from_path_cache(
+                    context_entities[key_name],
+                    template,
+                    path_cache,
+                    required_fields=found_fields,
+                )
 
-                    # entity_fields may contain additional fields that correspond to entities
-                    # so we should be sure to validate these as well if we can.
-                    #
-                    # The following example illustrates where the code could previously return incorrect entity
-                    # information from this method:
-                    #
-                    # With the following template:
-                    #    /{Sequence}/{Shot}/{Step}
-                    #
-                    # And a path cache that contains:
-                    #    Type     | Id  | Name     | Path
-                    #    ----------------------------------------------------
-                    #    Sequence | 001 | Seq_001  | /Seq_001
-                    #    Shot     | 002 | Shot_A   | /Seq_001/Shot_A
-                    #    Step     | 003 | Lighting | /Seq_001/Shot_A/Lighting
-                    #    Step     | 003 | Lighting | /Seq_001/blah/Shot_B/Lighting   <- this is out of date!
-                    #    Shot     | 004 | Shot_B   | /Seq_001/blah/Shot_B            <- this is out of date!
-                    #
-                    # (Note: the schema/templates have been changed since the entries for Shot_b were added)
-                    #
-                    # The sub-templates used to search for fields are:
-                    #    /{Sequence}
-                    #    /{Sequence}/{Shot}
-                    #    /{Sequence}/{Shot}/{Step}
-                    #
-                    # And the entities passed into the method are:
-                    #    Sequence:   Seq_001
-                    #    Shot:       Shot_B
-                    #    Step:       Lighting
-                    #
-                    # We are searching for fields for 'Shot_B' that has a broken entry in the path cache so the fields
-                    # returned for each level of the template will be:
-                    #    /{Sequence}                 -> {"Sequence":"Seq_001"} <- Correct
-                    #    /{Sequence}/{Shot}          -> {}                     <- entry not found for Shot_B matching
-                    #                                                             the template
-                    #    /{Sequence}/{Shot}/{Step}   -> {"Sequence":"Seq_001", <- Correct
-                    #                                    "Shot":"Shot_A",      <- Wrong!
-                    #                                    "Step":"Lighting"}    <- Correct
-                    #
-                    # In previous implementations, the final fields would incorrectly be returned as:
-                    #
-                    #     {"Sequence":"Seq_001",
-                    #      "Shot":"Shot_A",
-                    #      "Step":"Lighting"}
-                    #
-                    # The wrong Shot (Shot_A) is returned and not caught because the code only tested that the Step
-                    # entity matches and just assumes that the rest is correct - this isn't the case when there is
-                    # a one-to-many relationship between entities!
-                    #
-                    # Therefore, we need to validate that we didn't find any entity fields that we should have found
-                    # previously/higher up in the template definition.  If we did then the entries that were found
-                    # may not be correct so we have to discard them!
-                    found_mismatching_field = False
-                    for field_name, field_value in entity_fields.items():
-                        if field_name in known_fields:
-                            # We found a field we already knew about...
-                            if field_value != known_fields[field_name]:
-                                # ...but it doesn't match!
-                                found_mismatching_field = True
-                        elif field_name in found_fields:
-                            # We found a field we found before...
-                            if field_value != found_fields[field_name]:
-                                # ...but it doesn't match!
-                                found_mismatching_field = True
-                        elif field_name == key_name:
-                            # We found a field that matches the entity we were searching for so it must be valid!
-                            found_fields[field_name] = field_value
-                        elif field_name in context_entities:
-                            # We found an entity type that we should have found before (in a previous/shorter
-                            # template).  This means we can't trust any other fields that were found as they
-                            # may belong to a completely different entity/path!
+                # entity_fields may contain additional fields that correspond to entities
+                # so we should be sure to validate these as well if we can.
+                #
+                # The following example illustrates where the code could previously return incorrect entity
+                # information from this method:
+                #
+                # With the following template:
+                #    /{Sequence}/{Shot}/{Step}
+                #
+                # And a path cache that contains:
+                #    Type     | Id  | Name     | Path
+                #    ----------------------------------------------------
+                #    Sequence | 001 | Seq_001  | /Seq_001
+                #    Shot     | 002 | Shot_A   | /Seq_001/Shot_A
+                #    Step     | 003 | Lighting | /Seq_001/Shot_A/Lighting
+                #    Step     | 003 | Lighting | /Seq_001/blah/Shot_B/Lighting   <- this is out of date!
+                #    Shot     | 004 | Shot_B   | /Seq_001/blah/Shot_B            <- this is out of date!
+                #
+                # (Note: the schema/templates have been changed since the entries for Shot_b were added)
+                #
+                # The sub-templates used to search for fields are:
+                #    /{Sequence}
+                #    /{Sequence}/{Shot}
+                #    /{Sequence}/{Shot}/{Step}
+                #
+                # And the entities passed into the method are:
+                #    Sequence:   Seq_001
+                #    Shot:       Shot_B
+                #    Step:       Lighting
+                #
+                # We are searching for fields for 'Shot_B' that has a broken entry in the path cache so the fields
+                # returned for each level of the template will be:
+                #    /{Sequence}                 -> {"Sequence":"Seq_001"} <- Correct
+                #    /{Sequence}/{Shot}          -> {}                     <- entry not found for Shot_B matching
+                #                                                             the template
+                #    /{Sequence}/{Shot}/{Step}   -> {"Sequence":"Seq_001", <- Correct
+                #                                    "Shot":"Shot_A",      <- Wrong!
+                #                                    "Step":"Lighting"}    <- Correct
+                #
+                # In previous implementations, the final fields would incorrectly be returned as:
+                #
+                #     {"Sequence":"Seq_001",
+                #      "Shot":"Shot_A",
+                #      "Step":"Lighting"}
+                #
+                # The wrong Shot (Shot_A) is returned and not caught because the code only tested that the Step
+                # entity matches and just assumes that the rest is correct - this isn't the case when there is
+                # a one-to-many relationship between entities!
+                #
+                # Therefore, we need to validate that we didn't find any entity fields that we should have found
+                # previously/higher up in the template definition.  If we did then the entries that were found
+                # may not be correct so we have to discard them!
+                found_mismatching_field = False
+                for field_name, field_value in entity_fields.items():
+                    if field_name in known_fields:
+                        # We found a field we already knew about...
+                        if field_value != known_fields[field_name]:
+                            # ...but it doesn't match!
                             found_mismatching_field = True
-
-                    if not found_mismatching_field:
-                        # all fields are ok so we can add them all to the list of found fields :)
-                        found_fields.update(entity_fields)
-
-        finally:
-            path_cache.close()
+                    elif field_name in found_fields:
+                        # We found a field we found before...
+                        if field_value != found_fields[field_name]:
+                            # ...but it doesn't match!
+                            found_mismatching_field = True
+                    elif field_name == key_name:
+                        # We found a field that matches the entity we were searching for so it must be valid!
+                        found_fields[field_name] = field_value
+                    elif field_name in context_entities:
+                        # We found an entity type that we should have found before (in a previous/shorter
+                        # template).  This means we can't trust any other fields that were found as they
+                        # may belong to a completely different entity/path!
+                        found_mismatching_field = True
+
+                if not found_mismatching_field:
+                    # all fields are ok so we can add them all to the list of found fields :)
+                    found_fields.update(entity_fields)
 
         return found_fields
 
@@ -1292,6 +1346,226 @@ class Context(object):
         return list(self.__tk.pipeline_configuration.get_data_roots().values())
 
 
+class ContextCache(object):
+    """
+    Bounded cache of the contexts built by a Toolkit instance from paths, so
+    that building the same context again doesn't have to query the path cache
+    and the core hooks.
+
+    Cached contexts depend on the path cache, so they are discarded when the
+    path cache database is modified. The cache is owned by a Toolkit instance,
+    so entries are never shared between pipeline configurations.
+
+    The maximum number of contexts is set with the ``TK_CONTEXT_CACHE_SIZE``
+    environment variable. Setting it to 0 disables the cache.
+
+    Contexts built from entities are made of Shotgun data, which changes
+    without the path cache being modified. They are only cached when the
+    ``TK_CONTEXT_CACHE_ENTITIES`` environment variable is set to ``1``.
+    """
+
+    # default maximum number of cached contexts
+    DEFAULT_SIZE = 100
+
+    def __init__(self):
+        try:
+            self._size = int(
+                os.environ.get(constants.CONTEXT_CACHE_SIZE_ENV_VAR, self.DEFAULT_SIZE)
+            )
+        except ValueError:
+            log.warning(
+                "Invalid value for %s, using the default context cache size."
+                % constants.CONTEXT_CACHE_SIZE_ENV_VAR
+            )
+            self._size = self.DEFAULT_SIZE
+        self._cache_entities = (
+            os.environ.get(constants.CONTEXT_CACHE_ENTITIES_ENV_VAR) == "1"
+        )
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self):
+        """
+        Whether contexts are cached.
+        """
+        return self._size > 0
+
+    @property
+    def entities_enabled(self):
+        """
+        Whether contexts built from entities are cached.
+        """
+        return self.enabled and self._cache_entities
+
+    def get(self, tk, key, factory):
+        """
+        Returns the cached data for a key, or builds and caches it.
+
+        A copy of the cached data is returned, so it can be modified.
+
+        :param tk: Toolkit instance the data is built with.
+        :param key: Hashable key identifying the data.
+        :param factory: Callable without arguments building the data.
+        :returns: The data.
+        """
+        if not self.enabled:
+            return factory()
+
+        version = tk.get_path_cache().get_data_version()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(entry[1])
+            self._misses += 1
+
+        data = factory()
+
+        with self._lock:
+            self._entries[key] = (version, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+        return copy.deepcopy(data)
+
+    def clear(self):
+        """
+        Discards all the cached contexts.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Returns the hit and miss counts of the cache.
+
+        :returns: Dictionary with keys ``hits``, ``misses`` and ``size``, the
+                  number of cached contexts.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._entries),
+            }
+
+
+class _ShotgunFieldsMemo(object):
+    """
+    Values retrieved from Shotgun by :meth:`Context.as_template_fields`,
+    shared between the contexts used inside a :func:`shotgun_fields_memo` block.
+    """
+
+    def __init__(self):
+        # processed values, keyed by toolkit instance and (entity type,
+        # entity id, field name) tuples.
+        self.values = {}
+        # entity ids and field names to retrieve, keyed by toolkit instance
+        # and entity type.
+        self._pending = {}
+
+    def prefetch(self, context, template):
+        """
+        Registers the Shotgun fields a context will need to resolve the fields
+        of a template.
+
+        The fields registered for all the contexts are retrieved with a single
+        query per entity type, the next time :meth:`Context.as_template_fields`
+        is called inside the block.
+
+        :param context: :class:`Context` which will be used.
+        :param template: :class:`Template` the context fields will be resolved for.
+        """
+        tk = context.sgtk
+        entities = context._get_template_entities()
+        for key in template.keys.values():
+            if not key.shotgun_field_name or key.shotgun_entity_type not in entities:
+                continue
+            entity = entities[key.shotgun_entity_type]
+            cache_key = (entity["type"], entity["id"], key.shotgun_field_name)
+            if (tk, cache_key) in self.values:
+                continue
+            entity_ids, field_names = self._pending.setdefault(
+                (tk, entity["type"]), (set(), set())
+            )
+            entity_ids.add(entity["id"])
+            field_names.add(key.shotgun_field_name)
+
+    def resolve(self):
+        """
+        Retrieves the fields registered with :meth:`prefetch`.
+        """
+        pending = self._pending
+        self._pending = {}
+        for (tk, entity_type), (entity_ids, field_names) in pending.items():
+            results = tk.shotgun.find(
+                entity_type, [["id", "in", sorted(entity_ids)]], sorted(field_names)
+            )
+            # records which are not found are queried again by their context,
+            # which reports the error.
+            for result in results:
+                for field_name in field_names:
+                    value = result.get(field_name)
+                    if value is not None:
+                        value = shotgun_entity.sg_entity_to_string(
+                            tk, entity_type, result["id"], field_name, value
+                        )
+                    self.values[(tk, (entity_type, result["id"], field_name))] = value
+
+
+# memo of the current thread inside a shotgun_fields_memo block
+_g_shotgun_fields_memo = threading.local()
+
+
+@contextlib.contextmanager
+def shotgun_fields_memo():
+    """
+    Shares the values retrieved from Shotgun by :meth:`Context.as_template_fields`
+    between all the contexts used in the current thread inside this block, e.g.
+    while resolving the fields of all the items of a publish::
+
+        with sgtk.context.shotgun_fields_memo() as memo:
+            for item in items:
+                memo.prefetch(item.context, template)
+            for item in items:
+                fields = item.context.as_template_fields(template)
+
+    Calling ``memo.prefetch(context, template)`` beforehand is optional. It
+    registers the Shotgun fields a context needs for a template, so that the
+    fields of all the registered contexts are retrieved with a single query
+    per entity type, instead of one query per context.
+
+    Values are discarded at the end of the block, so changes made in Shotgun
+    afterwards are picked up. Blocks can be nested, in which case the values
+    are kept until the end of the outermost block.
+    """
+    memo = getattr(_g_shotgun_fields_memo, "memo", None)
+    if memo is not None:
+        yield memo
+        return
+
+    _g_shotgun_fields_memo.memo = _ShotgunFieldsMemo()
+    try:
+        yield _g_shotgun_fields_memo.memo
+    finally:
+        _g_shotgun_fields_memo.memo = None
+
+
+def _get_shotgun_fields_memo():
+    """
+    Returns the memo of the current :func:`shotgun_fields_memo` block.
+
+    :returns: :class:`_ShotgunFieldsMemo` instance, or None outside of a block.
+    """
+    return getattr(_g_shotgun_fields_memo, "memo", None)
+
+
 ################################################################################################
 # factory methods for constructing new Context objects, primarily called from the Tank object
 
@@ -1317,7 +1591,13 @@ def from_entity(tk, entity_type, entity_id):
 
     :returns: :class:`Context`
     """
-    return _from_entity_type_and_id(tk, dict(type=entity_type, id=entity_id))
+    if not tk.context_cache.entities_enabled:
+        return _from_entity_type_and_id(tk, dict(type=entity_type, id=entity_id))
+    return tk.context_cache.get(
+        tk,
+        ("entity", entity_type, entity_id),
+        lambda: _from_entity_type_and_id(tk, dict(type=entity_type, id=entity_id)),
+    )
 
 
 def _from_entity_type_and_id(tk, entity, source_entity=None):
@@ -1613,9 +1893,52 @@ def from_path(tk, path, previous_context=None):
     :returns: :class:`Context`
     """
 
+    context = tk.context_cache.get(
+        tk, ("path", path), lambda: _context_data_from_path(tk, path)
+    )
+    context["tk"] = tk
+
+    # see if we can populate it based on the previous context
+    if (
+        previous_context
+        and context.get("entity") == previous_context.entity
+        and context.get("additional_entities") == previous_context.additional_entities
+    ):
+
+        # cool, everything is matching down to the step/task level.
+        # if context is missing a step and a task, we try to auto populate it.
+        # (note: weird edge that a context can have a task but no step)
+        if context.get("task") is None and context.get("step") is None:
+            context["step"] = previous_context.step
+
+        # now try to assign previous task but only if the step matches!
+        if context.get("task") is None and context.get("step") == previous_context.step:
+            context["task"] = previous_context.task
+
+    # ensure that we don't have a Project as the entity. Projects should only
+    # appear on the projects level, despite being entities.
+    if (
+        context["project"]
+        and context["entity"]
+        and context["entity"]["type"] == "Project"
+    ):
+        # remove double entry!
+        context["entity"] = None
+
+    return Context._from_dict(context)
+
+
+def _context_data_from_path(tk, path):
+    """
+    Builds the context data for a path from the entities registered in the
+    path cache for the path and its parent folders.
+
+    :param tk: Sgtk API handle
+    :param path: a file system path
+    :returns: Dictionary with the context fields, without the tk instance.
+    """
     # prep our return data structure
     context = {
-        "tk": tk,
         "project": None,
         "entity": None,
         "step": None,
@@ -1630,42 +1953,45 @@ def from_path(tk, path, previous_context=None):
     )
 
     # get a cache handle
-    path_cache = PathCache(tk)
+    path_cache = tk.get_path_cache()
 
     # gather all roots as lower case
-    project_roots = [
+    project_roots = set(
         x.lower() for x in tk.pipeline_configuration.get_data_roots().values()
-    ]
+    )
+
+    # gather the path and its parent folders up to the project root, so that
+    # all their entities can be looked up at once.
+    ancestors = [path]
+    curr_path = path
+    while curr_path.lower() not in project_roots:
+        # TODO this could fail with windows path variations
+        if len(ancestors) == 1:
+            parent_path = os.path.abspath(os.path.join(curr_path, ".."))
+        else:
+            # the path is already normalized
+            parent_path = os.path.dirname(curr_path)
+
+        if curr_path == parent_path:
+            # We're at the disk root, probably a degenerate path
+            break
+        ancestors.append(parent_path)
+        curr_path = parent_path
+
+    path_entities = path_cache.get_path_entities(ancestors)
 
-    # first gather entities
+    # first gather entities, from the path up to the root
     entities = []
     secondary_entities = []
-    curr_path = path
-    while True:
-        curr_entity = path_cache.get_entity(curr_path)
+    for curr_path in ancestors:
+        curr_entity, curr_secondary_entities = path_entities[curr_path]
         if curr_entity:
             # Don't worry about entity types we've already got in the context. In the future
             # we should look for entity ids that conflict in order to flag a degenerate schema.
             entities.append(curr_entity)
 
         # add secondary entities
-        secondary_entities.extend(path_cache.get_secondary_entities(curr_path))
-
-        if curr_path.lower() in project_roots:
-            # TODO this could fail with windows path variations
-            # we have reached a root!
-            break
-
-        # and continue with parent path
-        parent_path = os.path.abspath(os.path.join(curr_path, ".."))
-
-        if curr_path == parent_path:
-            # We're at the disk root, probably a degenerate path
-            break
-        else:
-            curr_path = parent_path
-
-    path_cache.close()
+        secondary_entities.extend(curr_secondary_entities)
 
     # now populate the context
     # go from the root down, so that in the case there are a path with
@@ -1715,34 +2041,7 @@ def from_path(tk, path, previous_context=None):
             if context["entity"] is None:
                 context["entity"] = curr_entity
 
-    # see if we can populate it based on the previous context
-    if (
-        previous_context
-        and context.get("entity") == previous_context.entity
-        and context.get("additional_entities") == previous_context.additional_entities
-    ):
-
-        # cool, everything is matching down to the step/task level.
-        # if context is missing a step and a task, we try to auto populate it.
-        # (note: weird edge that a context can have a task but no step)
-        if context.get("task") is None and context.get("step") is None:
-            context["step"] = previous_context.step
-
-        # now try to assign previous task but only if the step matches!
-        if context.get("task") is None and context.get("step") == previous_context.step:
-            context["task"] = previous_context.task
-
-    # ensure that we don't have a Project as the entity. Projects should only
-    # appear on the projects level, despite being entities.
-    if (
-        context["project"]
-        and context["entity"]
-        and context["entity"]["type"] == "Project"
-    ):
-        # remove double entry!
-        context["entity"] = None
-
-    return Context._from_dict(context)
+    return context
 
 
 ################################################################################################
@@ -1985,7 +2284,7 @@ def _context_data_from_cache(tk, entity_type, entity_id):
 
     # Use the path cache to look up all paths linked to the entity and use that to extract
     # extra entities we should include in the context
-    path_cache = PathCache(tk)
+    path_cache = tk.get_path_cache()
 
     # Grab all project roots
     project_roots = list(tk.pipeline_configuration.get_data_roots().values())
@@ -2002,10 +2301,27 @@ def _context_data_from_cache(tk, entity_type, entity_id):
 
     paths = path_cache.get_paths(entity_type, entity_id, primary_only=True)
 
+    # gather the paths and their parent folders, so that all their entities
+    # can be looked up at once.
+    # note - paths returned by get_paths are always prefixed with a
+    # project root so there is no risk we end up with an infinite loop here..
+    paths_ancestors = []
     for path in paths:
+        ancestors = []
+        curr_path = path
+        while curr_path not in project_roots:
+            curr_path = os.path.abspath(os.path.join(curr_path, ".."))
+            ancestors.append(curr_path)
+        paths_ancestors.append((path, ancestors))
+
+    path_entities = path_cache.get_entities(
+        paths + [p for _, ancestors in paths_ancestors for p in ancestors]
+    )
+
+    for path, ancestors in paths_ancestors:
         # now recurse upwards and look for entity types we haven't found yet
         curr_path = path
-        curr_entity = path_cache.get_entity(curr_path)
+        curr_entity = path_entities[curr_path]
 
         if curr_entity is None:
             # this is some sort of anomaly! the path returned by get_paths
@@ -2025,18 +2341,14 @@ def _context_data_from_cache(tk, entity_type, entity_id):
         if curr_entity["type"] == entity_type and curr_entity["id"] == entity_id:
             context["entity"]["name"] = curr_entity["name"]
 
-        # note - paths returned by get_paths are always prefixed with a
-        # project root so there is no risk we end up with an infinite loop here..
-        while curr_path not in project_roots:
-            curr_path = os.path.abspath(os.path.join(curr_path, ".."))
-            curr_entity = path_cache.get_entity(curr_path)
+        for curr_path in ancestors:
+            curr_entity = path_entities[curr_path]
             if curr_entity:
                 cur_type = curr_entity["type"]
                 if cur_type in types_fields:
                     field_name = types_fields[cur_type]
                     context[field_name] = curr_entity
 
-    path_cache.close()
     return context
 
 
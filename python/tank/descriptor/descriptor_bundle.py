@@ -456,6 +456,18 @@ class AppDescriptor(BundleDescriptor):
         """
         super().__init__(sg_connection, io_descriptor)
 
+    def supports_lazy_init(self):
+        """
+        Returns a boolean indicating whether the app can be initialized when
+        one of its commands is first run rather than when its engine starts.
+        Apps opt in by setting ``lazy_init`` to true in their manifest.
+
+        :returns: True if the app can be initialized lazily
+        """
+        manifest = self._get_manifest()
+        # always return a bool
+        return bool(manifest.get("lazy_init"))
+
 
 class FrameworkDescriptor(BundleDescriptor):
     """
@@ -18,6 +18,7 @@ import http.client
 import json
 import os
 import sys
+import threading
 import typing
 import urllib.parse
 import urllib.request
@@ -61,8 +62,9 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
     """
 
-    # cache app store connections for performance
-    _app_store_connections = {}
+    # cache app store connections for performance. Shotgun API instances
+    # can't be shared between threads, so connections are cached per thread.
+    _app_store_connections = threading.local()
 
     # internal app store mappings
     APP, FRAMEWORK, ENGINE, CONFIG, CORE = range(5)
@@ -976,27 +978,36 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         sg_url = self._sg_connection.base_url
 
-        if sg_url not in self._app_store_connections:
+        connections = getattr(self._app_store_connections, "connections", None)
+        if connections is None:
+            connections = self._app_store_connections.connections = {}
+
+        if sg_url not in connections:
 
             # Connect to associated Shotgun site and retrieve the credentials to use to
             # connect to the app store site
-            try:
-                script_name, script_key = self.__get_app_store_key_from_shotgun()
-            except urllib.error.HTTPError as e:
-                if e.code == 403:
-                    # edge case alert!
-                    # this is likely because our session token in shotgun has expired.
-                    # The authentication system is based around wrapping the shotgun API,
-                    # and requesting authentication if needed. Because the app store
-                    # credentials is a separate endpoint and doesn't go via the shotgun
-                    # API, we have to explicitly check.
-                    #
-                    # trigger a refresh of our session token by issuing a shotgun API call
-                    self._sg_connection.find_one("HumanUser", [])
-                    # and retry
+            # bundles may be downloaded concurrently, but the site connection
+            # can only be used by one thread at a time.
+            with shotgun.get_sg_connection_lock(self._sg_connection):
+                try:
                     script_name, script_key = self.__get_app_store_key_from_shotgun()
-                else:
-                    raise
+                except urllib.error.HTTPError as e:
+                    if e.code == 403:
+                        # edge case alert!
+                        # this is likely because our session token in shotgun has expired.
+                        # The authentication system is based around wrapping the shotgun API,
+                        # and requesting authentication if needed. Because the app store
+                        # credentials is a separate endpoint and doesn't go via the shotgun
+                        # API, we have to explicitly check.
+                        #
+                        # trigger a refresh of our session token by issuing a shotgun API call
+                        self._sg_connection.find_one("HumanUser", [])
+                        # and retry
+                        script_name, script_key = (
+                            self.__get_app_store_key_from_shotgun()
+                        )
+                    else:
+                        raise
 
             app_store = os.environ.get("SGTK_APP_STORE", constants.SGTK_APP_STORE)
 
@@ -1057,9 +1068,9 @@ class IODescriptorAppStore(IODescriptorDownloadable):
                     "Could not evaluate the current App Store User! Please contact support."
                 )
 
-            self._app_store_connections[sg_url] = (app_store_sg, script_user)
+            connections[sg_url] = (app_store_sg, script_user)
 
-        return self._app_store_connections[sg_url]
+        return connections[sg_url]
 
     def __get_app_store_proxy_setting(self):
         """
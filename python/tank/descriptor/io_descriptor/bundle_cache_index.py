@@ -0,0 +1,334 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import contextlib
+import os
+import threading
+import uuid
+
+from ... import LogManager
+from ...util import filesystem
+from .. import constants
+
+log = LogManager.get_logger(__name__)
+
+
+class BundleCacheIndex(object):
+    """
+    Index of the bundles which are fully downloaded in a bundle cache root.
+
+    Finding a bundle in the bundle cache takes several filesystem calls
+    for each cache root, which adds up when fallback roots are on network
+    shares. The index lists the bundles of a root in a single file, so the
+    root can be queried with one file read per process.
+
+    Every download is staged in the ``tmp`` folder of the root, so the index
+    records the modification time of that folder when it is written. If the
+    folder has changed since, e.g. because an older core downloaded a bundle
+    without updating the index, the index is stale and is ignored. It is
+    rebuilt by scanning the root the next time a bundle is downloaded to it.
+
+    Downloads made by this process are staged in a folder of ``tmp`` which
+    is shared by all of them and only created and removed once, so that
+    concurrent downloads don't make the index stale for each other.
+
+    .. note:: Bundles copied into a cache root by other means than the
+              descriptor API are not detected. Delete the index file of
+              the root after doing so.
+    """
+
+    # name of the index file, at the top of the bundle cache root
+    FILE_NAME = "bundle_cache_index.json"
+
+    # version of the index file format
+    FORMAT_VERSION = 1
+
+    # maximum depth of a bundle folder in a cache root, e.g.
+    # github_release/organization/repository/version
+    _MAX_SCAN_DEPTH = 6
+
+    _indexes = {}
+    _indexes_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, root):
+        """
+        Returns the index of a bundle cache root.
+
+        Indexes are shared by all the descriptors of the process.
+
+        :param str root: Path to the bundle cache root.
+        :returns: :class:`BundleCacheIndex` instance.
+        """
+        root = os.path.normpath(root)
+        with cls._indexes_lock:
+            if root not in cls._indexes:
+                cls._indexes[root] = cls(root)
+            return cls._indexes[root]
+
+    def __init__(self, root):
+        """
+        :param str root: Path to the bundle cache root.
+        """
+        self._root = root
+        self._path = os.path.join(root, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self._loaded = False
+        # relative paths of the indexed bundles, None if the index is unusable.
+        self._bundles = None
+        # folder in which the downloads of this process are staged and number
+        # of downloads using it.
+        self._staging_folder = None
+        self._staging_count = 0
+        # tokens the index file and the root are expected to have if nothing
+        # but this process changed the root since the staging folder was
+        # created, None if this can't be told.
+        self._expected_tokens = None
+
+    def get_token(self):
+        """
+        Returns a value identifying the current state of the downloads staging
+        folder of the root.
+
+        :returns: Modification time of the folder, or None if it doesn't exist.
+        """
+        try:
+            return os.stat(os.path.join(self._root, "tmp")).st_mtime_ns
+        except OSError:
+            return None
+
+    def contains(self, path):
+        """
+        Checks if a bundle is listed in the index.
+
+        The index file is read the first time this method is called.
+
+        :param str path: Path to the bundle.
+        :returns: True or False, or None if the index can't tell because it is
+            missing or stale, or because the path is not inside the root.
+        """
+        relative_path = self._get_relative_path(path)
+        if relative_path is None:
+            return None
+
+        with self._lock:
+            if not self._loaded:
+                data = self._read()
+                if data is not None and data["token"] == self.get_token():
+                    self._bundles = set(data["bundles"])
+                else:
+                    log.debug("Bundle cache index for '%s' can't be used." % self._root)
+                self._loaded = True
+
+            if self._bundles is None:
+                return None
+            return relative_path in self._bundles
+
+    @contextlib.contextmanager
+    def open_staging_folder(self):
+        """
+        Provides the folder in which a download of this process is staged.
+
+        The folder is created in ``tmp`` by the first download and removed
+        once the last concurrent download is done with it. This way, the
+        downloads of this process only change the modification time of
+        ``tmp`` once and :meth:`add` can tell them apart from downloads made
+        by other processes.
+
+        This method should be used with the ``with`` statement:
+
+            with index.open_staging_folder() as staging_folder:
+                # Download the bundle in a sub folder of staging_folder.
+
+        :returns: Yields the path of the staging folder.
+        """
+        with self._lock:
+            if self._staging_count == 0:
+                index_token = self.get_token()
+                self._staging_folder = os.path.join(self._root, "tmp", uuid.uuid4().hex)
+                try:
+                    os.makedirs(self._staging_folder)
+                except OSError as e:
+                    # downloads are staged in tmp directly and the index is
+                    # rebuilt after each of them.
+                    log.debug(
+                        "Could not create staging folder '%s': %s"
+                        % (self._staging_folder, e)
+                    )
+                    self._staging_folder = os.path.join(self._root, "tmp")
+                    self._expected_tokens = None
+                else:
+                    self._expected_tokens = (index_token, self.get_token())
+            self._staging_count += 1
+            staging_folder = self._staging_folder
+
+        try:
+            yield staging_folder
+        finally:
+            with self._lock:
+                self._staging_count -= 1
+                if self._staging_count == 0:
+                    self._remove_staging_folder()
+
+    def add(self, path):
+        """
+        Adds a bundle which was just downloaded to the index.
+
+        This method must be called while the staging folder of the download
+        is open. If the index or the root were changed by another process
+        during the download, the index is rebuilt by scanning the root.
+
+        :param str path: Path to the bundle.
+        """
+        relative_path = self._get_relative_path(path)
+        if relative_path is None:
+            return
+
+        with self._lock:
+            data = self._read()
+            token = self.get_token()
+            if self._is_expected(data, token):
+                bundles = set(data["bundles"])
+            else:
+                log.debug("Rebuilding the bundle cache index for '%s'..." % self._root)
+                bundles = self._scan()
+            bundles.add(relative_path)
+
+            if self._write(bundles, token):
+                self._bundles = bundles
+                self._loaded = True
+                if self._expected_tokens is not None:
+                    self._expected_tokens = (token, token)
+
+    def _is_expected(self, data, token):
+        """
+        Checks that nothing but this process changed the index and the root
+        since the staging folder was created.
+
+        :param dict data: Content of the index file, as returned by :meth:`_read`.
+        :param token: Current value returned by :meth:`get_token`.
+        :returns: True or False.
+        """
+        return (
+            data is not None
+            and self._expected_tokens is not None
+            and (data["token"], token) == self._expected_tokens
+        )
+
+    def _remove_staging_folder(self):
+        """
+        Removes the staging folder once no download uses it anymore.
+
+        The index is updated with the new state of ``tmp`` if it was
+        up to date.
+        """
+        if self._expected_tokens is None:
+            return
+
+        data = self._read()
+        is_expected = self._is_expected(data, self.get_token())
+        try:
+            os.rmdir(self._staging_folder)
+        except OSError as e:
+            # a failed download may have been left in it for troubleshooting.
+            log.debug(
+                "Could not remove staging folder '%s': %s" % (self._staging_folder, e)
+            )
+            return
+        finally:
+            self._expected_tokens = None
+
+        if is_expected:
+            self._write(set(data["bundles"]), self.get_token())
+
+    def _get_relative_path(self, path):
+        """
+        Returns the path of a bundle relative to the root, using forward slashes.
+
+        :param str path: Path to the bundle.
+        :returns: Relative path, or None if the bundle is not inside the root.
+        """
+        try:
+            relative_path = os.path.relpath(os.path.normpath(path), self._root)
+        except ValueError:
+            # on Windows, the path is on another drive.
+            return None
+        if relative_path.startswith(os.pardir) or os.path.isabs(relative_path):
+            return None
+        return relative_path.replace(os.sep, "/")
+
+    def _read(self):
+        """
+        Reads the index file.
+
+        :returns: Dictionary with keys ``token`` and ``bundles``, or None if
+            the file doesn't exist or can't be read.
+        """
+        return filesystem.read_versioned_json(self._path, self.FORMAT_VERSION)
+
+    def _write(self, bundles, token):
+        """
+        Atomically replaces the index file.
+
+        :param set bundles: Relative paths of the indexed bundles.
+        :param token: Value returned by :meth:`get_token` for the bundles.
+        :returns: True if the file was written.
+        """
+        # a bundle cache root may be read-only, the index is just not used then.
+        return filesystem.write_versioned_json(
+            self._path,
+            self.FORMAT_VERSION,
+            {"token": token, "bundles": sorted(bundles)},
+        )
+
+    def _scan(self):
+        """
+        Lists the bundles which are fully downloaded in the root.
+
+        :returns: Set of relative paths.
+        """
+        bundles = set()
+        folders = [("", 0)]
+        while folders:
+            relative_folder, depth = folders.pop()
+            try:
+                entries = list(os.scandir(os.path.join(self._root, relative_folder)))
+            except OSError:
+                continue
+
+            names = set(entry.name for entry in entries)
+            if depth > 0 and (
+                "tk-metadata" in names or constants.BUNDLE_METADATA_FILE in names
+            ):
+                # this is a bundle, check that it was fully downloaded, like
+                # IODescriptorDownloadable._exists_local does. Bundles downloaded
+                # before core v0.18.120 have no metadata folder.
+                if "tk-metadata" not in names or os.path.exists(
+                    os.path.join(
+                        self._root, relative_folder, "tk-metadata", "install_complete"
+                    )
+                ):
+                    bundles.add(relative_folder)
+                continue
+
+            if depth >= self._MAX_SCAN_DEPTH:
+                continue
+
+            for entry in entries:
+                if depth == 0 and entry.name == "tmp":
+                    continue
+                if entry.is_dir() and not entry.name.startswith((".", "_")):
+                    folders.append(
+                        (
+                            "/".join(filter(None, [relative_folder, entry.name])),
+                            depth + 1,
+                        )
+                    )
+        return bundles
@@ -16,6 +16,7 @@ from ... import LogManager
 from ...util import filesystem
 from ..errors import TankDescriptorIOError
 from .base import IODescriptorBase
+from .bundle_cache_index import BundleCacheIndex
 
 log = LogManager.get_logger(__name__)
 
@@ -67,7 +68,7 @@ class IODescriptorDownloadable(IODescriptorBase):
         Writes a bundle to the primary bundle cache.
 
         It does so in a two step process. First, it yields a temporary location
-        where the caller should write the bundle (typically in a 'tmp/<uuid>' directory
+        where the caller should write the bundle (typically in a 'tmp/<uuid>/<uuid>' directory
         in the bundle cache path), then, by moving the data to the primary bundle
         cache path for that descriptor. This helps to guard against multiple
         processes attempting to download the same descriptor simultaneously.
@@ -79,150 +80,157 @@ class IODescriptorDownloadable(IODescriptorBase):
 
         :returns: Yields the path where the bundle should be written.
         """
-        # download it into a unique temporary location
-        temporary_path = self._get_temporary_cache_path()
-
-        # compute the location where we eventually want to move into
-        target = self._get_primary_cache_path()
-
-        # ensure that the parent directory of the target is present.
-        # make sure we guard against multiple processes attempting to create it simultaneously.
-        target_parent = os.path.dirname(target)
-        try:
-            filesystem.ensure_folder_exists(target_parent)
-        except Exception as e:
-            if not os.path.exists(target_parent):
-                log.error("Failed to create directory %s: %s" % (target_parent, e))
+        index = BundleCacheIndex.get(self._bundle_cache_root)
+        with index.open_staging_folder() as staging_folder:
+            # download it into a unique temporary location
+            temporary_path = self._get_temporary_cache_path(staging_folder)
+
+            # compute the location where we eventually want to move into
+            target = self._get_primary_cache_path()
+
+            # ensure that the parent directory of the target is present.
+            # make sure we guard against multiple processes attempting to create it simultaneously.
+            target_parent = os.path.dirname(target)
+            try:
+                filesystem.ensure_folder_exists(target_parent)
+            except Exception as e:
+                if not os.path.exists(target_parent):
+                    log.error("Failed to create directory %s: %s" % (target_parent, e))
+                    raise TankDescriptorIOError(
+                        "Failed to create directory %s: %s" % (target_parent, e)
+                    )
+
+            try:
+                yield temporary_path
+
+                # download completed without issue. Now create settings folder
+                metadata_folder = self._get_metadata_folder(temporary_path)
+                filesystem.ensure_folder_exists(metadata_folder)
+            except Exception as e:
+                # something went wrong during the download, remove the temporary files.
+                log.error(
+                    "Failed to download into path %s: %s. Attempting to remove it."
+                    % (temporary_path, e)
+                )
+                # note - safe_delete_folder will not raise if something goes wrong, it will just log.
+                filesystem.safe_delete_folder(temporary_path)
                 raise TankDescriptorIOError(
-                    "Failed to create directory %s: %s" % (target_parent, e)
+                    "Failed to download into path %s: %s" % (temporary_path, e)
                 )
 
-        try:
-            yield temporary_path
-
-            # download completed without issue. Now create settings folder
-            metadata_folder = self._get_metadata_folder(temporary_path)
-            filesystem.ensure_folder_exists(metadata_folder)
-        except Exception as e:
-            # something went wrong during the download, remove the temporary files.
-            log.error(
-                "Failed to download into path %s: %s. Attempting to remove it."
-                % (temporary_path, e)
-            )
-            # note - safe_delete_folder will not raise if something goes wrong, it will just log.
-            filesystem.safe_delete_folder(temporary_path)
-            raise TankDescriptorIOError(
-                "Failed to download into path %s: %s" % (temporary_path, e)
-            )
-
-        log.debug(
-            "Attempting to move descriptor %s from temporary path %s to target path %s."
-            % (self, temporary_path, target)
-        )
-
-        move_succeeded = False
-
-        try:
-            # atomically rename the directory temporary_path to the target.
-            # note: this is so that we don't end up with a partial payload in the target
-            # location. All or nothing.
-            os.rename(temporary_path, target)
-            # write end receipt
-            filesystem.touch_file(
-                os.path.join(
-                    self._get_metadata_folder(target),
-                    self._DOWNLOAD_TRANSACTION_COMPLETE_FILE,
-                )
-            )
-            move_succeeded = True
             log.debug(
-                "Successfully moved the downloaded descriptor to target path: %s."
-                % target
+                "Attempting to move descriptor %s from temporary path %s to target path %s."
+                % (self, temporary_path, target)
             )
 
-        except Exception as e:
-
-            # if the target path already exists, this means someone else is either
-            # moving things right now or have moved it already, so we are ok.
-            if not self._exists_local(target):
-                # the target path does not exist. so the rename failed for other reasons.
-
-                # if the rename did not work, it may be because the files are locked and
-                # cannot be deleted. This can for example happen if an antivirus software
-                # (on windows) has been triggered because of the download and has locked on
-                # to the files. In this case, we try to copy the files and then remove the
-                # temp payload - this is slower, but safer, and we can gracefully fail and
-                # continue in case the deletion fails.
-                log.warning(
-                    "Failed to move descriptor %s from the temporary path %s "
-                    "to the bundle cache %s. Will attempt to copy it instead. "
-                    "Error: %s" % (self, temporary_path, target, e)
-                )
-
-                try:
-                    # copy first then delete all files in target.
-                    # if deletion fails this will log and gracefully continue.
-                    log.debug(
-                        "Performing 'copy then delete' style move on %s -> %s"
-                        % (temporary_path, target)
+            move_succeeded = False
+
+            try:
+                # atomically rename the directory temporary_path to the target.
+                # note: this is so that we don't end up with a partial payload in the target
+                # location. All or nothing.
+                os.rename(temporary_path, target)
+                # write end receipt
+                filesystem.touch_file(
+                    os.path.join(
+                        self._get_metadata_folder(target),
+                        self._DOWNLOAD_TRANSACTION_COMPLETE_FILE,
                     )
+                )
+                move_succeeded = True
+                log.debug(
+                    "Successfully moved the downloaded descriptor to target path: %s."
+                    % target
+                )
 
-                    # first write out our metadata folder where we store the transaction marker.
-                    # this marks the beginning of the 'copy transaction' and will make sure that
-                    # the logic in _exists_local() will not think the folder is a legacy format
-                    # which doesn't implement transaction handling.
-                    metadata_folder = self._get_metadata_folder(target)
-                    filesystem.ensure_folder_exists(metadata_folder)
-
-                    filesystem.move_folder(temporary_path, target)
-                    # write end receipt
-                    filesystem.touch_file(
-                        os.path.join(
-                            self._get_metadata_folder(target),
-                            self._DOWNLOAD_TRANSACTION_COMPLETE_FILE,
-                        )
+            except Exception as e:
+
+                # if the target path already exists, this means someone else is either
+                # moving things right now or have moved it already, so we are ok.
+                if not self._exists_local(target):
+                    # the target path does not exist. so the rename failed for other reasons.
+
+                    # if the rename did not work, it may be because the files are locked and
+                    # cannot be deleted. This can for example happen if an antivirus software
+                    # (on windows) has been triggered because of the download and has locked on
+                    # to the files. In this case, we try to copy the files and then remove the
+                    # temp payload - this is slower, but safer, and we can gracefully fail and
+                    # continue in case the deletion fails.
+                    log.warning(
+                        "Failed to move descriptor %s from the temporary path %s "
+                        "to the bundle cache %s. Will attempt to copy it instead. "
+                        "Error: %s" % (self, temporary_path, target, e)
                     )
-                    # move_folder leaves all folders in the filesystem
-                    # clean out these as well in a graceful way.
-                    filesystem.safe_delete_folder(temporary_path)
-                    move_succeeded = True
 
-                except Exception as e:
-                    # something during the copy went wrong. Attempt to roll back the target
-                    # so we aren't left with any corrupt bundle cache items.
-                    if os.path.exists(target):
+                    try:
+                        # copy first then delete all files in target.
+                        # if deletion fails this will log and gracefully continue.
                         log.debug(
-                            "Move failed. Attempting to clear out target path '%s'"
-                            % target
+                            "Performing 'copy then delete' style move on %s -> %s"
+                            % (temporary_path, target)
                         )
-                        filesystem.safe_delete_folder(target)
 
-                    # ...and raise an error. Include callstack so we get full visibility here.
-                    log.exception(
-                        "Failed to copy descriptor %s from the temporary path %s "
-                        "to the bundle cache %s. Error: %s"
-                        % (self, temporary_path, target, e)
-                    )
-                    raise TankDescriptorIOError(
-                        "Failed to copy descriptor %s from the temporary path %s "
-                        "to the bundle cache %s. Error: %s"
-                        % (self, temporary_path, target, e)
-                    )
-            else:
-                # note - safe_delete_folder will not raise if something goes wrong, it will just log.
-                log.debug("Target location %s already exists." % target)
-                log.debug("Removing temporary download %s" % temporary_path)
-                filesystem.safe_delete_folder(temporary_path)
+                        # first write out our metadata folder where we store the transaction marker.
+                        # this marks the beginning of the 'copy transaction' and will make sure that
+                        # the logic in _exists_local() will not think the folder is a legacy format
+                        # which doesn't implement transaction handling.
+                        metadata_folder = self._get_metadata_folder(target)
+                        filesystem.ensure_folder_exists(metadata_folder)
+
+                        filesystem.move_folder(temporary_path, target)
+                        # write end receipt
+                        filesystem.touch_file(
+                            os.path.join(
+                                self._get_metadata_folder(target),
+                                self._DOWNLOAD_TRANSACTION_COMPLETE_FILE,
+                            )
+                        )
+                        # move_folder leaves all folders in the filesystem
+                        # clean out these as well in a graceful way.
+                        filesystem.safe_delete_folder(temporary_path)
+                        move_succeeded = True
+
+                    except Exception as e:
+                        # something during the copy went wrong. Attempt to roll back the target
+                        # so we aren't left with any corrupt bundle cache items.
+                        if os.path.exists(target):
+                            log.debug(
+                                "Move failed. Attempting to clear out target path '%s'"
+                                % target
+                            )
+                            filesystem.safe_delete_folder(target)
+
+                        # ...and raise an error. Include callstack so we get full visibility here.
+                        log.exception(
+                            "Failed to copy descriptor %s from the temporary path %s "
+                            "to the bundle cache %s. Error: %s"
+                            % (self, temporary_path, target, e)
+                        )
+                        raise TankDescriptorIOError(
+                            "Failed to copy descriptor %s from the temporary path %s "
+                            "to the bundle cache %s. Error: %s"
+                            % (self, temporary_path, target, e)
+                        )
+                else:
+                    # note - safe_delete_folder will not raise if something goes wrong, it will just log.
+                    log.debug("Target location %s already exists." % target)
+                    log.debug("Removing temporary download %s" % temporary_path)
+                    filesystem.safe_delete_folder(temporary_path)
+                    index.add(target)
 
-        if move_succeeded:
-            # download completed ok! Run post processing
-            self._post_download(target)
+            if move_succeeded:
+                index.add(target)
+                # download completed ok! Run post processing
+                self._post_download(target)
 
-    def _get_temporary_cache_path(self):
+    def _get_temporary_cache_path(self, staging_folder):
         """
         Returns a temporary download cache path for this descriptor.
+
+        :param str staging_folder: Folder in which the downloads of the
+            process are staged, see :meth:`BundleCacheIndex.open_staging_folder`.
         """
-        return os.path.join(self._bundle_cache_root, "tmp", uuid.uuid4().hex)
+        return os.path.join(staging_folder, uuid.uuid4().hex)
 
     def _download_local(self, destination_path):
         """
@@ -248,6 +256,43 @@ class IODescriptorDownloadable(IODescriptorBase):
         """
         pass
 
+    def get_path(self):
+        """
+        Returns the path to the folder where this item resides. If no
+        cache exists for this path, None is returned.
+
+        Fallback roots are looked up in their :class:`BundleCacheIndex`
+        and only probed when their index can't be used.
+        """
+        for path in self._get_cache_paths():
+            indexed = self._is_indexed(path)
+            if indexed is None:
+                if self._exists_local(path):
+                    return path
+            elif indexed and os.path.isdir(path):
+                # the bundle may have been removed since the index was written.
+                return path
+
+        return None
+
+    def _is_indexed(self, path):
+        """
+        Looks up a bundle path in the index of the fallback root it belongs to.
+
+        Bundles in the primary root are always probed, since they may be
+        downloaded, repaired or removed while the process is running.
+
+        :param str path: Path to the bundle in a cache root.
+        :returns: True or False, or None if the path needs to be probed.
+        """
+        primary_root = os.path.normpath(self._bundle_cache_root)
+        for root in self._fallback_roots:
+            if os.path.normpath(root) != primary_root:
+                indexed = BundleCacheIndex.get(root).contains(path)
+                if indexed is not None:
+                    return indexed
+        return None
+
     def _exists_local(self, path):
         """
         Checks is the bundle exists on disk and ensures that it has been completely
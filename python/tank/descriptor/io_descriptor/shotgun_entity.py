@@ -206,12 +206,15 @@ class IODescriptorShotgunEntity(IODescriptorDownloadable):
             # while downloading, enable the auto detect flag. This provides
             # some additional structural flexibility, allowing for multiple
             # ways to zip up a bundle attachment.
-            shotgun.download_and_unpack_attachment(
-                self._sg_connection,
-                self._version,
-                destination_path,
-                auto_detect_bundle=True,
-            )
+            # bundles may be downloaded concurrently, but the site connection
+            # can only be used by one thread at a time.
+            with shotgun.get_sg_connection_lock(self._sg_connection):
+                shotgun.download_and_unpack_attachment(
+                    self._sg_connection,
+                    self._version,
+                    destination_path,
+                    auto_detect_bundle=True,
+                )
         except ShotgunAttachmentDownloadError as e:
             raise TankDescriptorError(
                 "Failed to download %s from %s. Error: %s"
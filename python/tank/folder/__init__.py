@@ -13,5 +13,6 @@ This module contains functionality relating to folder creation.
 
 """
 
-from .configuration import read_ignore_files
+from .configuration import clear_schema_cache, read_ignore_files
+from .executor import FolderCreationExecutor
 from .operations import process_filesystem_structure, synchronize_folders
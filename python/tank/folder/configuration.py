@@ -13,11 +13,17 @@ Handles the creation of a configuration object structure based on the folder con
 
 """
 
+import copy
 import fnmatch
+import hashlib
+import json
 import os
+import threading
 
+from .. import LogManager
 from ..errors import TankError, TankUnreadableFileError
-from ..util import yaml_cache
+from ..util import filesystem, yaml_cache
+from . import constants
 from .folder_types import (
     Entity,
     ListField,
@@ -28,6 +34,8 @@ from .folder_types import (
     UserWorkspace,
 )
 
+log = LogManager.get_logger(__name__)
+
 
 def read_ignore_files(schema_config_path):
     """
@@ -51,11 +59,41 @@ def read_ignore_files(schema_config_path):
     return ignore_files
 
 
+def clear_schema_cache():
+    """
+    Discards the folder schemas cached in memory, so that changes made to
+    schemas are picked up the next time folders are created.
+    """
+    FolderConfiguration.clear_schema_cache()
+
+
 class FolderConfiguration(object):
     """
     Class that loads the schema from disk and constructs folder objects.
+
+    Scanning the schema reads every folder and metadata file in it. The result
+    of the scan is cached in memory for each schema location, and reused as long
+    as the schema folder and the files and folders directly inside it are
+    unchanged. Changes made deeper in the schema are picked up once the cache
+    is cleared with :func:`clear_schema_cache`, e.g. when the engine is
+    restarted.
+
+    When the ``TK_FOLDER_SCHEMA_CACHE`` environment variable is set to ``1``,
+    the scan is also stored in the cache folder of the pipeline configuration,
+    together with a fingerprint of all the schema files, so that other
+    processes can reuse it until one of the files changes.
     """
 
+    # version of the format of the schema cache file
+    SCHEMA_CACHE_FORMAT_VERSION = 1
+
+    # name of the schema cache file, in the pipeline configuration cache folder
+    SCHEMA_CACHE_FILE_NAME = "folder_schema.json"
+
+    # (signature, schema scan) tuples, keyed by schema location
+    _schema_scans = {}
+    _schema_scans_lock = threading.Lock()
+
     def __init__(self, tk, schema_config_path):
         """
         Constructor
@@ -68,11 +106,14 @@ class FolderConfiguration(object):
         # maintain a list of all Step nodes for special introspection
         self._step_fields = []
 
+        # scan the schema, unless it hasn't changed since it was last scanned
+        schema_scan = self._get_schema_scan(schema_config_path)
+
         # read skip files config
-        self._ignore_files = read_ignore_files(schema_config_path)
+        self._ignore_files = schema_scan["ignore_files"]
 
         # load schema
-        self._load_schema(schema_config_path)
+        self._load_schema(schema_config_path, schema_scan)
 
     ##########################################################################################
     # public methods
@@ -215,22 +256,215 @@ class FolderConfiguration(object):
         return metadata
 
     ##########################################################################################
-    # internal stuff
+    # schema scan
 
-    def _load_schema(self, schema_config_path):
+    @classmethod
+    def _get_schema_fingerprint(cls, schema_config_path):
         """
-        Scan the config and build objects structure
+        Computes a fingerprint of the files and folders of a schema, which
+        changes when any of them is added, removed or modified.
+
+        :param str schema_config_path: Path to the schema.
+        :returns: Fingerprint string.
         """
+        fingerprint = hashlib.sha1()
+        folders = [schema_config_path]
+        while folders:
+            folder = folders.pop()
+            entries = sorted(os.scandir(folder), key=lambda entry: entry.name)
+            for entry in entries:
+                stat = entry.stat()
+                is_dir = entry.is_dir()
+                fingerprint.update(
+                    (
+                        "%s|%s|%d|%d\n"
+                        % (
+                            os.path.relpath(entry.path, schema_config_path),
+                            is_dir,
+                            stat.st_mtime_ns,
+                            0 if is_dir else stat.st_size,
+                        )
+                    ).encode("utf-8")
+                )
+                if is_dir:
+                    folders.append(entry.path)
+        return fingerprint.hexdigest()
+
+    @classmethod
+    def _get_schema_signature(cls, schema_config_path):
+        """
+        Computes a signature of the schema folder and of the files and folders
+        directly inside it, which is cheap to check.
+
+        :param str schema_config_path: Path to the schema.
+        :returns: Tuple of the names, modification times and sizes of the entries.
+        """
+        stat = os.stat(schema_config_path)
+        signature = [("", stat.st_mtime_ns, 0)]
+        for entry in os.scandir(schema_config_path):
+            stat = entry.stat()
+            signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(signature))
+
+    @classmethod
+    def clear_schema_cache(cls):
+        """
+        Discards the schema scans cached in memory, so that schemas are read
+        again from disk.
+        """
+        with cls._schema_scans_lock:
+            cls._schema_scans.clear()
 
-        project_folders = self._get_sub_directories(schema_config_path)
+    def _get_schema_scan(self, schema_config_path):
+        """
+        Returns the scan of a schema, scanning it only if it has changed since
+        it was last scanned by this process, or by any process if the schema
+        cache file is enabled.
 
+        :param str schema_config_path: Path to the schema.
+        :returns: Dictionary with keys ``ignore_files`` and ``projects``.
+            See :meth:`_scan_schema`.
+        """
+        schema_config_path = os.path.normpath(schema_config_path)
+        signature = self._get_schema_signature(schema_config_path)
+
+        with self._schema_scans_lock:
+            cached = self._schema_scans.get(schema_config_path)
+        if cached is not None and cached[0] == signature:
+            return copy.deepcopy(cached[1])
+
+        cache_path = self._get_schema_cache_path()
+        schema_scan = None
+        if cache_path is not None:
+            fingerprint = self._get_schema_fingerprint(schema_config_path)
+            schema_scan = self._read_schema_cache(
+                cache_path, schema_config_path, fingerprint
+            )
+        if schema_scan is None:
+            schema_scan = self._scan_schema(schema_config_path)
+            if cache_path is not None:
+                self._write_schema_cache(
+                    cache_path, schema_config_path, fingerprint, schema_scan
+                )
+
+        with self._schema_scans_lock:
+            self._schema_scans[schema_config_path] = (signature, schema_scan)
+        return copy.deepcopy(schema_scan)
+
+    def _scan_schema(self, schema_config_path):
+        """
+        Reads the folders, metadata files, symlinks and files of a schema.
+
+        :param str schema_config_path: Path to the schema.
+        :returns: Dictionary with keys ``ignore_files``, the patterns of files
+            to ignore, and ``projects``, the list of project folders. Each folder
+            is a dictionary with keys ``path``, relative to the schema,
+            ``metadata``, ``children``, ``symlinks`` and ``files``.
+        """
+        # the ignore list is used while scanning the folders
+        self._ignore_files = read_ignore_files(schema_config_path)
+
+        def scan_folder(full_path):
+            folder = {
+                "path": os.path.relpath(full_path, schema_config_path),
+                "metadata": self._read_metadata(full_path),
+                "children": [],
+                "symlinks": [],
+                "files": [],
+            }
+            for child_path in self._get_sub_directories(full_path):
+                folder["children"].append(scan_folder(child_path))
+            for name, target, metadata in self._get_symlinks_in_folder(full_path):
+                folder["symlinks"].append([name, target, metadata])
+            for file_path in self._get_files_in_folder(full_path):
+                folder["files"].append(os.path.relpath(file_path, schema_config_path))
+            return folder
+
+        return {
+            "ignore_files": self._ignore_files,
+            "projects": [
+                scan_folder(project_folder)
+                for project_folder in self._get_sub_directories(schema_config_path)
+            ],
+        }
+
+    def _get_schema_cache_path(self):
+        """
+        Returns the path to the schema cache file of the pipeline configuration.
+
+        :returns: Path, or None if the schema cache file is disabled.
+        """
+        if os.environ.get(constants.FOLDER_SCHEMA_CACHE_ENV_VAR) != "1":
+            return None
+        return os.path.join(
+            self._tk.pipeline_configuration.get_shotgun_menu_cache_location(),
+            self.SCHEMA_CACHE_FILE_NAME,
+        )
+
+    def _read_schema_cache(self, cache_path, schema_config_path, fingerprint):
+        """
+        Reads the schema scan stored in the schema cache file.
+
+        :param str cache_path: Path to the schema cache file.
+        :param str schema_config_path: Path to the schema.
+        :param str fingerprint: Current fingerprint of the schema.
+        :returns: Schema scan, or None if the file doesn't exist or is outdated.
+        """
+        data = filesystem.read_versioned_json(
+            cache_path, self.SCHEMA_CACHE_FORMAT_VERSION
+        )
+        if (
+            data is None
+            or data.get("schema_path") != schema_config_path
+            or data.get("fingerprint") != fingerprint
+        ):
+            return None
+        log.debug("Loaded schema '%s' from '%s'." % (schema_config_path, cache_path))
+        return data["schema"]
+
+    def _write_schema_cache(self, cache_path, schema_config_path, fingerprint, scan):
+        """
+        Atomically replaces the schema cache file.
+
+        :param str cache_path: Path to the schema cache file.
+        :param str schema_config_path: Path to the schema.
+        :param str fingerprint: Fingerprint of the schema.
+        :param dict scan: Schema scan.
+        """
+        data = {
+            "schema_path": schema_config_path,
+            "fingerprint": fingerprint,
+            "schema": scan,
+        }
+        try:
+            can_be_stored = json.loads(json.dumps(data)) == data
+        except (TypeError, ValueError):
+            can_be_stored = False
+        if not can_be_stored:
+            # the metadata files contain values json can't represent, the
+            # cache is just not used then.
+            log.debug("The schema '%s' can't be cached." % schema_config_path)
+            return
+        filesystem.write_versioned_json(
+            cache_path, self.SCHEMA_CACHE_FORMAT_VERSION, data
+        )
+
+    ##########################################################################################
+    # internal stuff
+
+    def _load_schema(self, schema_config_path, schema_scan):
+        """
+        Build objects structure from the scan of the config
+        """
         # make some space in our obj/entity type mapping
         self._entity_nodes_by_type["Project"] = []
 
-        for project_folder in project_folders:
+        for project_scan in schema_scan["projects"]:
+
+            project_folder = os.path.join(schema_config_path, project_scan["path"])
 
             # read metadata to determine root path
-            metadata = self._read_metadata(project_folder)
+            metadata = project_scan["metadata"]
 
             if metadata is None:
                 if os.path.basename(project_folder) == "project":
@@ -269,18 +503,19 @@ class FolderConfiguration(object):
             self._entity_nodes_by_type["Project"].append(project_obj)
 
             # recursively process the rest
-            self._process_config_r(project_obj, project_folder)
+            self._process_config_r(project_obj, schema_config_path, project_scan)
 
-    def _process_config_r(self, parent_node, parent_path):
+    def _process_config_r(self, parent_node, schema_config_path, parent_scan):
         """
-        Recursively scan the file system and construct an object
-        hierarchy.
+        Recursively construct an object hierarchy from the scan of the
+        file system.
 
         Factory method for Folder objects.
         """
-        for full_path in self._get_sub_directories(parent_path):
+        for folder_scan in parent_scan["children"]:
+            full_path = os.path.join(schema_config_path, folder_scan["path"])
             # check for metadata (non-static folder)
-            metadata = self._read_metadata(full_path)
+            metadata = folder_scan["metadata"]
             if metadata:
                 node_type = metadata.get("type", "undefined")
 
@@ -332,12 +567,12 @@ class FolderConfiguration(object):
                 )
 
             # and process children
-            self._process_config_r(cur_node, full_path)
+            self._process_config_r(cur_node, schema_config_path, folder_scan)
 
         # process symlinks
-        for path, target, metadata in self._get_symlinks_in_folder(parent_path):
+        for path, target, metadata in parent_scan["symlinks"]:
             parent_node.add_symlink(path, target, metadata)
 
         # now process all files and add them to the parent_node token
-        for f in self._get_files_in_folder(parent_path):
-            parent_node.add_file(f)
+        for f in parent_scan["files"]:
+            parent_node.add_file(os.path.join(schema_config_path, f))
@@ -14,3 +14,11 @@ PRIMARY_STORAGE_NAME = "primary"
 
 # hooks that are used during folder creation.
 PROCESS_FOLDER_CREATION_HOOK_NAME = "process_folder_creation"
+
+# environment variable setting how many threads the default process_folder_creation
+# hook creates folders with.
+FOLDER_CREATION_THREADS_ENV_VAR = "TK_FOLDER_CREATION_THREADS"
+
+# environment variable that if set to 1, stores the scan of the folder schema in the
+# cache folder of the pipeline configuration, so it is shared by all processes.
+FOLDER_SCHEMA_CACHE_ENV_VAR = "TK_FOLDER_SCHEMA_CACHE"
@@ -0,0 +1,351 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Concurrent execution of the file system operations of folder creation.
+
+"""
+
+import os
+import shutil
+import threading
+from concurrent import futures
+
+from .. import LogManager
+from ..util import get_positive_int_env_var, is_windows
+from . import constants
+
+log = LogManager.get_logger(__name__)
+
+
+class FolderCreationExecutor(object):
+    """
+    Executes the items passed to the ``process_folder_creation`` core hook
+    on a thread pool.
+
+    Each item is processed the same way as by the default hook, but the items
+    of different branches of the folder tree are processed concurrently, which
+    hides the latency of file systems like NFS. An item is only processed once
+    the folder item it is in has been processed, so folders are always created
+    before their content.
+
+    The executor also remembers which folders it found or created, so it
+    doesn't check whether the content of a folder it just created exists.
+
+    The list of created paths returned by :meth:`execute` is the same as the
+    one returned by the default hook, in the same order. To customize how
+    an action is executed, derive from this class and override the method
+    of the action.
+    """
+
+    # number of threads used by default
+    DEFAULT_MAX_WORKERS = 8
+
+    @classmethod
+    def get_max_workers(cls):
+        """
+        Returns the number of threads to process folder creation items with,
+        as set by the ``TK_FOLDER_CREATION_THREADS`` environment variable.
+
+        :returns: Number of threads, 1 if items should be processed one after
+            the other, which is the default.
+        """
+        return get_positive_int_env_var(constants.FOLDER_CREATION_THREADS_ENV_VAR, 1)
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        :param int max_workers: Number of threads to process the items with.
+        """
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        # paths known to exist, or to be missing.
+        self._exists = {}
+        # folders which didn't exist before the items were processed, so
+        # nothing inside them existed either.
+        self._new_folders = set()
+
+    def execute(self, items, preview_mode):
+        """
+        Processes folder creation items.
+
+        :param list items: Items passed to the ``process_folder_creation`` core hook.
+        :param bool preview_mode: If True, nothing is created on disk.
+        :returns: List of files and folders that have been created.
+        """
+        children = self._get_item_tree(items)
+        results = [[] for _ in items]
+
+        # set the umask so that we get true permissions
+        old_umask = os.umask(0)
+        try:
+            with futures.ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="folder_creation",
+            ) as executor:
+
+                def submit(index):
+                    future = executor.submit(
+                        self._execute_item, items[index], preview_mode
+                    )
+                    pending[future] = index
+
+                pending = {}
+                for index in children[None]:
+                    submit(index)
+
+                while pending:
+                    done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        try:
+                            results[index] = future.result()
+                        except Exception:
+                            for other_future in pending:
+                                other_future.cancel()
+                            raise
+                        # the content of the folder can now be processed.
+                        for child_index in children.get(index, []):
+                            submit(child_index)
+        finally:
+            # reset umask
+            os.umask(old_umask)
+
+        return [location for result in results for location in result]
+
+    def _get_item_tree(self, items):
+        """
+        Orders items so folders are processed before their content.
+
+        :param list items: Folder creation items.
+        :returns: Dictionary of the indices of the items to process once an
+            item has been processed, keyed by the index of that item. The items
+            which can be processed right away are keyed by None.
+        """
+        # index of the first item for each path, and of each folder item
+        path_indices = {}
+        folder_indices = {}
+        for index, item in enumerate(items):
+            path = self._get_item_path(item)
+            if path is None:
+                continue
+            path = os.path.normpath(path)
+            path_indices.setdefault(path, index)
+            if item.get("action") in ["entity_folder", "folder"]:
+                folder_indices.setdefault(path, index)
+
+        children = {None: []}
+        for index, item in enumerate(items):
+            path = self._get_item_path(item)
+            parent_index = None
+            if path is not None:
+                path = os.path.normpath(path)
+                if path_indices[path] != index:
+                    # the same path is processed twice, process it after the
+                    # first one like the default hook would.
+                    parent_index = path_indices[path]
+                else:
+                    # find the folder item this item is in.
+                    parent = os.path.dirname(path)
+                    while parent not in folder_indices and parent != os.path.dirname(
+                        parent
+                    ):
+                        parent = os.path.dirname(parent)
+                    parent_index = folder_indices.get(parent)
+            children.setdefault(parent_index, []).append(index)
+        return children
+
+    def _get_item_path(self, item):
+        """
+        Returns the path an item creates.
+
+        :param dict item: Folder creation item.
+        :returns: Path, or None for items which create nothing.
+        """
+        action = item.get("action")
+        if action in ["entity_folder", "folder", "symlink", "create_file"]:
+            return item.get("path")
+        elif action == "copy":
+            return item.get("target_path")
+        return None
+
+    def _execute_item(self, item, preview_mode):
+        """
+        Processes a single folder creation item.
+
+        :param dict item: Folder creation item.
+        :param bool preview_mode: If True, nothing is created on disk.
+        :returns: List of the paths created by the item.
+        """
+        action = item.get("action")
+        if action in ["entity_folder", "folder"]:
+            return self._create_folder(item, preview_mode)
+        elif action == "symlink":
+            return self._create_symlink(item, preview_mode)
+        elif action == "copy":
+            return self._copy_file(item, preview_mode)
+        elif action == "create_file":
+            return self._create_file(item, preview_mode)
+        # remote folders have already been created on the remote storage.
+        return []
+
+    def _create_folder(self, item, preview_mode):
+        """
+        Processes a ``folder`` or ``entity_folder`` item.
+
+        :param dict item: Folder creation item.
+        :param bool preview_mode: If True, nothing is created on disk.
+        :returns: List of the paths created by the item.
+        """
+        path = item.get("path")
+        if self._path_exists(path):
+            return []
+        if not preview_mode:
+            # create the folder using open permissions
+            os.makedirs(path, 0o777)
+        self._add_new_folder(path, exists=not preview_mode)
+        return [path]
+
+    def _create_symlink(self, item, preview_mode):
+        """
+        Processes a ``symlink`` item. Symbolic links are not created on Windows.
+
+        :param dict item: Folder creation item.
+        :param bool preview_mode: If True, nothing is created on disk.
+        :returns: List of the paths created by the item.
+        """
+        if is_windows():
+            # no windows support
+            return []
+        path = item.get("path")
+        target = item.get("target")
+        # note use of lexists to check existance of symlink
+        # rather than what symlink is pointing at
+        with self._lock:
+            exists = self._exists.get(os.path.normpath(path))
+        if exists is None:
+            exists = not self._is_in_new_folder(path) and os.path.lexists(path)
+        if exists:
+            return []
+        if not preview_mode:
+            os.symlink(target, path)
+            self._set_exists(path)
+        return [path]
+
+    def _copy_file(self, item, preview_mode):
+        """
+        Processes a ``copy`` item.
+
+        :param dict item: Folder creation item.
+        :param bool preview_mode: If True, nothing is created on disk.
+        :returns: List of the paths created by the item.
+        """
+        source_path = item.get("source_path")
+        target_path = item.get("target_path")
+        if self._path_exists(target_path, cache=False):
+            return []
+        if not preview_mode:
+            # do a standard file copy
+            shutil.copy(source_path, target_path)
+            # set permissions to open
+            os.chmod(target_path, 0o666)
+            self._set_exists(target_path)
+        return [target_path]
+
+    def _create_file(self, item, preview_mode):
+        """
+        Processes a ``create_file`` item.
+
+        :param dict item: Folder creation item.
+        :param bool preview_mode: If True, nothing is created on disk.
+        :returns: List of the paths created by the item.
+        """
+        path = item.get("path")
+        parent_folder = os.path.dirname(path)
+        content = item.get("content", "")
+        if not preview_mode and not self._path_exists(parent_folder):
+            # other items may be creating the same folder concurrently.
+            os.makedirs(parent_folder, 0o777, exist_ok=True)
+            self._set_exists(parent_folder)
+        if self._path_exists(path, cache=False):
+            return []
+        if not preview_mode:
+            # create the file
+            with open(path, "wb") as fp:
+                fp.write(content.encode("utf-8"))
+            # and set permissions to open
+            os.chmod(path, 0o666)
+            self._set_exists(path)
+        return [path]
+
+    def _path_exists(self, path, cache=True):
+        """
+        Checks if a path exists, using what is known of the folders that were
+        processed to avoid accessing the file system.
+
+        :param str path: Path to check.
+        :param bool cache: If True, the result of the check is remembered. Files
+            are only remembered once they have been created.
+        :returns: True if the path exists.
+        """
+        path = os.path.normpath(path)
+        with self._lock:
+            exists = self._exists.get(path)
+        if exists is not None:
+            return exists
+
+        if self._is_in_new_folder(path):
+            exists = False
+        else:
+            exists = os.path.exists(path)
+        if cache:
+            with self._lock:
+                self._exists[path] = exists
+        return exists
+
+    def _is_in_new_folder(self, path):
+        """
+        Checks if a path is inside a folder which didn't exist before the items
+        were processed, in which case the path didn't exist either.
+
+        :param str path: Path to check.
+        :returns: True if the path is in a new folder.
+        """
+        path = os.path.normpath(path)
+        parent = os.path.dirname(path)
+        with self._lock:
+            while parent != path:
+                if parent in self._new_folders:
+                    return True
+                if self._exists.get(parent):
+                    # an existing folder may contain anything.
+                    return False
+                path, parent = parent, os.path.dirname(parent)
+        return False
+
+    def _set_exists(self, path):
+        """
+        Records a path which has been created.
+
+        :param str path: Path to the file or folder.
+        """
+        with self._lock:
+            self._exists[os.path.normpath(path)] = True
+
+    def _add_new_folder(self, path, exists):
+        """
+        Records a folder which didn't exist before the items were processed.
+
+        :param str path: Path to the folder.
+        :param bool exists: True if the folder has been created.
+        """
+        path = os.path.normpath(path)
+        with self._lock:
+            self._exists[path] = exists
+            self._new_folders.add(path)
@@ -19,6 +19,7 @@ Known constraints:
 from ..errors import TankError
 from ..path_cache import PathCache
 from . import constants
+from .shotgun_cache import ShotgunDataCache
 
 
 class FolderIOReceiver(object):
@@ -42,6 +43,17 @@ class FolderIOReceiver(object):
         self._secondary_cache_entries = list()
         self._entity_type = entity_type
         self._entity_ids = entity_ids
+        self._shotgun_cache = None
+
+    @property
+    def shotgun_cache(self):
+        """
+        :class:`ShotgunDataCache` through which the folder classes query Shotgun,
+        so the data is retrieved once per folder creation.
+        """
+        if self._shotgun_cache is None:
+            self._shotgun_cache = ShotgunDataCache(self._tk.shotgun)
+        return self._shotgun_cache
 
     ####################################################################################
     # methods to call to actually execute the folder creation logic
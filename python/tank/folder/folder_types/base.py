@@ -83,6 +83,46 @@ class Folder(object):
         else:
             return self._parent.extract_shotgun_data_upwards(sg, shotgun_data)
 
+    def prefetch_shotgun_data_upwards(self, shotgun_cache, shotgun_data_list):
+        """
+        Retrieves in batch the data needed by this node for several calls to
+        :meth:`extract_shotgun_data_upwards` and returns the data to prefetch
+        for the parent node.
+
+        This is subclassed by deriving classes which process Shotgun data.
+
+        :param shotgun_cache: :class:`ShotgunDataCache` instance of the folder creation.
+        :param shotgun_data_list: Shotgun data dictionaries passed to this node.
+        :returns: List of the shotgun data dictionaries passed to the parent node.
+        """
+        return shotgun_data_list
+
+    def prefetch_shotgun_data(self, shotgun_cache, sg_data_list, engine):
+        """
+        Retrieves in batch the Shotgun data needed to create the folders of
+        this node under several parent folders.
+
+        This is subclassed by deriving classes which process Shotgun data.
+
+        :param shotgun_cache: :class:`ShotgunDataCache` instance of the folder creation.
+        :param sg_data_list: Shotgun data dictionaries of the parent folders.
+        :param engine: Engine to create folders for / indicate second pass if not None.
+        """
+        pass
+
+    def prefetch_children_shotgun_data(self, shotgun_cache, sg_data_list, engine):
+        """
+        Retrieves in batch the Shotgun data needed to create the folders of the
+        children of this node which are created with it.
+
+        :param shotgun_cache: :class:`ShotgunDataCache` instance of the folder creation.
+        :param sg_data_list: Shotgun data dictionaries of the folders of this node.
+        :param engine: Engine to create folders for / indicate second pass if not None.
+        """
+        for cp in self._children:
+            if cp._should_item_be_processed(engine, False):
+                cp.prefetch_shotgun_data(shotgun_cache, sg_data_list, engine)
+
     def get_parents(self):
         """
         Returns all parent nodes as a list with the top most item last in the list
@@ -206,6 +246,15 @@ class Folder(object):
 
         else:
             # no explicit list! instead process all children.
+            # retrieve the shotgun data for the children of all the new folders
+            # at once rather than running the same queries for each folder.
+            if len(created_data) > 1:
+                self.prefetch_children_shotgun_data(
+                    io_receiver.shotgun_cache,
+                    [sg_data_dict for (_, sg_data_dict) in created_data],
+                    engine,
+                )
+
             # run the folder creation for all new folders created and for all
             # configuration children
             for created_folder, sg_data_dict in created_data:
@@ -139,7 +139,7 @@ class Entity(Folder):
         """
         items_created = []
 
-        for entity in self.__get_entities(sg_data):
+        for entity in self.__get_entities(io_receiver, sg_data):
 
             # generate the field name
             folder_name = self._entity_expression.generate_name(entity)
@@ -199,9 +199,12 @@ class Entity(Folder):
                 path, entity_link, self._config_metadata
             )
 
-    def __get_entities(self, sg_data):
+    def _get_entity_filters(self, sg_data):
         """
-        Returns shotgun data for folder creation
+        Returns the filters used to find the entities to create folders for.
+
+        :param sg_data: Shotgun data dictionary for the parent folders.
+        :returns: Shotgun filters dictionary.
         """
         # first check the constraints: if tokens contains a type/id pair our our type,
         # we should only process this single entity. If not, then use the query filter
@@ -220,6 +223,14 @@ class Entity(Folder):
             )
             # get data - can be None depending on external filters
 
+        return resolved_filters
+
+    def _get_entity_fields(self):
+        """
+        Returns the fields to retrieve for the entities to create folders for.
+
+        :returns: List of Shotgun field names.
+        """
         # figure out which fields to retrieve
         fields = self._entity_expression.get_shotgun_fields()
 
@@ -234,15 +245,42 @@ class Entity(Folder):
             fields.add(custom_field)
 
         # convert to a list - sets wont work with the PTR API
-        fields_list = list(fields)
+        return list(fields)
 
+    def __get_entities(self, io_receiver, sg_data):
+        """
+        Returns shotgun data for folder creation
+        """
         # now find all the items (e.g. shots) matching this query
-        entities = self._tk.shotgun.find(
-            self._entity_type, resolved_filters, fields_list
+        entities = io_receiver.shotgun_cache.find(
+            self._entity_type,
+            self._get_entity_filters(sg_data),
+            self._get_entity_fields(),
         )
 
         return entities
 
+    def prefetch_shotgun_data(self, shotgun_cache, sg_data_list, engine):
+        """
+        Retrieves in batch the entities to create folders for under several
+        parent folders.
+
+        :param shotgun_cache: :class:`ShotgunDataCache` instance of the folder creation.
+        :param sg_data_list: Shotgun data dictionaries of the parent folders.
+        :param engine: Engine to create folders for / indicate second pass if not None.
+        """
+        filters_list = []
+        for sg_data in sg_data_list:
+            try:
+                filters_list.append(self._get_entity_filters(sg_data))
+            except TankError:
+                # reported when the folders are created.
+                pass
+
+        shotgun_cache.prefetch(
+            self._entity_type, filters_list, self._get_entity_fields()
+        )
+
     def extract_shotgun_data_upwards(self, sg, shotgun_data):
         """
         Extracts the shotgun data necessary to create this object and all its parents.
@@ -288,124 +326,7 @@ class Entity(Folder):
         # by its children as we move upwards - for example a step.
         my_sg_data_key = FilterExpressionToken.sg_data_key_for_folder_obj(self)
         if my_sg_data_key in tokens:
-
-            link_map = {}
-            fields_to_retrieve = []
-            additional_filters = []
-
-            # TODO: Support nested conditions
-            for condition in self._filters["conditions"]:
-                vals = condition["values"]
-
-                # note the $FROM$ condition below - this is a bit of a hack to make sure we exclude
-                # the special $FROM$ step based culling filter that is commonly used. Because steps are
-                # sort of free floating and not associated with an entity, removing them from the
-                # resolve should be fine in most cases.
-
-                # so - if at the shot level, we have defined the following filter:
-                # filters: [ { "path": "sg_sequence", "relation": "is", "values": [ "$sequence" ] } ]
-                # the $sequence will be represented by a Token object and we need to get a value for
-                # this token. We fetch the id for this token and then, as we recurse upwards, and process
-                # the parent folder level (the sequence), this id will be the "seed" when we populate that
-                # level.
-
-                if (
-                    vals[0]
-                    and isinstance(vals[0], FilterExpressionToken)
-                    and not condition["path"].startswith("$FROM$")
-                ):
-                    expr_token = vals[0]
-                    # we should get this field (eg. 'sg_sequence')
-                    fields_to_retrieve.append(condition["path"])
-                    # add to our map for later processing map['sg_sequence'] = 'Sequence'
-                    # note that for List fields, the key is EntityType.field
-                    link_map[condition["path"]] = expr_token
-
-                elif not condition["path"].startswith("$FROM$"):
-                    # this is a normal filter (we exclude the $FROM$ stuff since it is weird
-                    # and specific to steps.) So for example 'name must begin with X' - we want
-                    # to include these in the query where we are looking for the object, to
-                    # ensure that assets with names starting with X are not created for an
-                    # asset folder node which explicitly excludes these via its filters.
-                    additional_filters.append(condition)
-
-            # add some extra fields apart from the stuff in the config
-            field_name = shotgun_entity.get_sg_entity_name_field(self._entity_type)
-            fields_to_retrieve.append(field_name)
-
-            # TODO: AND the id query with this folder's query to make sure this path is
-            # valid for the current entity. Throw error if not so driver code knows to
-            # stop processing. This would be needed in a setup where (for example) Asset
-            # appears in several locations in the filesystem and that the filters are responsible
-            # for determining which location to use for a particular asset.
-            my_id = tokens[my_sg_data_key]["id"]
-            additional_filters.append(
-                {"path": "id", "relation": "is", "values": [my_id]}
-            )
-
-            # append additional filter cruft
-            filter_dict = {"logical_operator": "and", "conditions": additional_filters}
-
-            # carry out find
-            rec = sg.find_one(self._entity_type, filter_dict, fields_to_retrieve)
-
-            # there are now two reasons why find_one did not return:
-            # - the specified entity id does not exist or has been deleted
-            # - there are filters which has filtered it out. For example imagine that you
-            #   have one folder structure for all assets starting with A and a second structure
-            #   for the rest. This would be a filter condition (code does not start with A, and
-            #   code starts with A respectively). In these cases, the object does exist but has been
-            #   explicitly filtered out - which is not an error!
-
-            if not rec:
-
-                # check if it is a missing id or just a filtered out thing
-                if sg.find_one(self._entity_type, [["id", "is", my_id]]) is None:
-                    raise TankError(
-                        "Could not find PTR %s with id %s as required by "
-                        "the folder creation setup." % (self._entity_type, my_id)
-                    )
-                else:
-                    raise EntityLinkTypeMismatch()
-
-            # and append the 'name field' which is always needed.
-            # we are OK with getting back a None value as its used for error reporting
-            name = rec.get(field_name)
-            if name is not None:
-                tokens[my_sg_data_key][field_name] = name
-
-            # Step through our token key map and process
-            #
-            # This is on the form
-            # link_map['sg_sequence'] = link_obj
-            #
-            for field in link_map:
-
-                # do some juggling to make sure we don't double process the
-                # name fields.
-                value = rec[field]
-                link_obj = link_map[field]
-
-                if value is None:
-                    # field was none! - cannot handle that!
-                    raise TankError(
-                        "The %s %s has a required field %s that \ndoes not have a value "
-                        "set in Flow Production Tracking. \nDouble check the values and try "
-                        "again!\n" % (self._entity_type, name, field)
-                    )
-
-                if isinstance(value, dict):
-                    # If the value is a dict, assume it comes from a entity link.
-
-                    # now make sure that this link is actually relevant for us,
-                    # e.g. that it points to an entity of the right type.
-                    # this may be a problem whenever a link can link to more
-                    # than one type. See the EntityLinkTypeMismatch docs for example.
-                    if value["type"] != link_obj.get_entity_type():
-                        raise EntityLinkTypeMismatch()
-
-                # store it in our sg_data prefetch chunk
-                tokens[link_obj.get_sg_data_key()] = value
+            self.__extract_shotgun_data(sg, tokens)
 
         # now keep recursing upwards
         if self._parent is None:
@@ -413,3 +334,182 @@ class Entity(Folder):
 
         else:
             return self._parent.extract_shotgun_data_upwards(sg, tokens)
+
+    def prefetch_shotgun_data_upwards(self, shotgun_cache, shotgun_data_list):
+        """
+        Retrieves in batch the data needed by this node for several calls to
+        :meth:`extract_shotgun_data_upwards` and returns the data to prefetch
+        for the parent node.
+
+        :param shotgun_cache: :class:`ShotgunDataCache` instance of the folder creation.
+        :param shotgun_data_list: Shotgun data dictionaries passed to this node.
+        :returns: List of the shotgun data dictionaries passed to the parent node.
+        """
+        my_sg_data_key = FilterExpressionToken.sg_data_key_for_folder_obj(self)
+        seeded_data_list = [
+            shotgun_data
+            for shotgun_data in shotgun_data_list
+            if my_sg_data_key in shotgun_data
+        ]
+        if seeded_data_list:
+            queries = [self.__get_upward_query(tokens) for tokens in seeded_data_list]
+            shotgun_cache.prefetch(
+                self._entity_type,
+                [filter_dict for (filter_dict, _, _) in queries],
+                queries[0][1],
+            )
+
+        parent_data_list = []
+        for shotgun_data in shotgun_data_list:
+            tokens = copy.deepcopy(shotgun_data)
+            if my_sg_data_key in tokens:
+                try:
+                    self.__extract_shotgun_data(shotgun_cache, tokens)
+                except (TankError, EntityLinkTypeMismatch):
+                    # reported when the data is extracted for folder creation.
+                    continue
+            parent_data_list.append(tokens)
+        return parent_data_list
+
+    def __get_upward_query(self, tokens):
+        """
+        Returns the query retrieving the data of the entity of this node seeded
+        in a shotgun data dictionary.
+
+        :param tokens: Shotgun data dictionary containing a seed for this node.
+        :returns: Tuple of the filters dictionary, the list of fields to retrieve
+                  and a dictionary of the expression tokens of the link fields
+                  to retrieve, keyed by field name.
+        """
+        link_map = {}
+        fields_to_retrieve = []
+        additional_filters = []
+
+        # TODO: Support nested conditions
+        for condition in self._filters["conditions"]:
+            vals = condition["values"]
+
+            # note the $FROM$ condition below - this is a bit of a hack to make sure we exclude
+            # the special $FROM$ step based culling filter that is commonly used. Because steps are
+            # sort of free floating and not associated with an entity, removing them from the
+            # resolve should be fine in most cases.
+
+            # so - if at the shot level, we have defined the following filter:
+            # filters: [ { "path": "sg_sequence", "relation": "is", "values": [ "$sequence" ] } ]
+            # the $sequence will be represented by a Token object and we need to get a value for
+            # this token. We fetch the id for this token and then, as we recurse upwards, and process
+            # the parent folder level (the sequence), this id will be the "seed" when we populate that
+            # level.
+
+            if (
+                vals[0]
+                and isinstance(vals[0], FilterExpressionToken)
+                and not condition["path"].startswith("$FROM$")
+            ):
+                expr_token = vals[0]
+                # we should get this field (eg. 'sg_sequence')
+                fields_to_retrieve.append(condition["path"])
+                # add to our map for later processing map['sg_sequence'] = 'Sequence'
+                # note that for List fields, the key is EntityType.field
+                link_map[condition["path"]] = expr_token
+
+            elif not condition["path"].startswith("$FROM$"):
+                # this is a normal filter (we exclude the $FROM$ stuff since it is weird
+                # and specific to steps.) So for example 'name must begin with X' - we want
+                # to include these in the query where we are looking for the object, to
+                # ensure that assets with names starting with X are not created for an
+                # asset folder node which explicitly excludes these via its filters.
+                additional_filters.append(condition)
+
+        # add some extra fields apart from the stuff in the config
+        field_name = shotgun_entity.get_sg_entity_name_field(self._entity_type)
+        fields_to_retrieve.append(field_name)
+
+        # TODO: AND the id query with this folder's query to make sure this path is
+        # valid for the current entity. Throw error if not so driver code knows to
+        # stop processing. This would be needed in a setup where (for example) Asset
+        # appears in several locations in the filesystem and that the filters are responsible
+        # for determining which location to use for a particular asset.
+        my_sg_data_key = FilterExpressionToken.sg_data_key_for_folder_obj(self)
+        my_id = tokens[my_sg_data_key]["id"]
+        additional_filters.append({"path": "id", "relation": "is", "values": [my_id]})
+
+        # append additional filter cruft
+        filter_dict = {"logical_operator": "and", "conditions": additional_filters}
+
+        return filter_dict, fields_to_retrieve, link_map
+
+    def __extract_shotgun_data(self, sg, tokens):
+        """
+        Retrieves the data of the entity of this node seeded in a shotgun data
+        dictionary and adds it to the dictionary, together with seeds for the
+        parent nodes.
+
+        :param sg: Shotgun API instance
+        :param tokens: Shotgun data dictionary containing a seed for this node.
+        """
+        my_sg_data_key = FilterExpressionToken.sg_data_key_for_folder_obj(self)
+        my_id = tokens[my_sg_data_key]["id"]
+        filter_dict, fields_to_retrieve, link_map = self.__get_upward_query(tokens)
+        field_name = shotgun_entity.get_sg_entity_name_field(self._entity_type)
+
+        # carry out find
+        rec = sg.find_one(self._entity_type, filter_dict, fields_to_retrieve)
+
+        # there are now two reasons why find_one did not return:
+        # - the specified entity id does not exist or has been deleted
+        # - there are filters which has filtered it out. For example imagine that you
+        #   have one folder structure for all assets starting with A and a second structure
+        #   for the rest. This would be a filter condition (code does not start with A, and
+        #   code starts with A respectively). In these cases, the object does exist but has been
+        #   explicitly filtered out - which is not an error!
+
+        if not rec:
+
+            # check if it is a missing id or just a filtered out thing
+            if sg.find_one(self._entity_type, [["id", "is", my_id]]) is None:
+                raise TankError(
+                    "Could not find PTR %s with id %s as required by "
+                    "the folder creation setup." % (self._entity_type, my_id)
+                )
+            else:
+                raise EntityLinkTypeMismatch()
+
+        # and append the 'name field' which is always needed.
+        # we are OK with getting back a None value as its used for error reporting
+        name = rec.get(field_name)
+        if name is not None:
+            tokens[my_sg_data_key][field_name] = name
+
+        # Step through our token key map and process
+        #
+        # This is on the form
+        # link_map['sg_sequence'] = link_obj
+        #
+        for field in link_map:
+
+            # do some juggling to make sure we don't double process the
+            # name fields.
+            value = rec[field]
+            link_obj = link_map[field]
+
+            if value is None:
+                # field was none! - cannot handle that!
+                raise TankError(
+                    "The %s %s has a required field %s that \ndoes not have a value "
+                    "set in Flow Production Tracking. \nDouble check the values and try "
+                    "again!\n" % (self._entity_type, name, field)
+                )
+
+            if isinstance(value, dict):
+                # If the value is a dict, assume it comes from a entity link.
+
+                # now make sure that this link is actually relevant for us,
+                # e.g. that it points to an entity of the right type.
+                # this may be a problem whenever a link can link to more
+                # than one type. See the EntityLinkTypeMismatch docs for example.
+                if value["type"] != link_obj.get_entity_type():
+                    raise EntityLinkTypeMismatch()
+
+            # store it in our sg_data prefetch chunk
+            tokens[link_obj.get_sg_data_key()] = value
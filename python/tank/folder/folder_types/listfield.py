@@ -184,7 +184,9 @@ class ListField(Folder):
                 field_name = self._field_name
 
             try:
-                resp = self._tk.shotgun.schema_field_read(entity_type, field_name)
+                resp = io_receiver.shotgun_cache.schema_field_read(
+                    entity_type, field_name
+                )
 
                 # validate that the data type is of type list
                 field_type = resp[field_name]["data_type"]["value"]
@@ -208,9 +210,13 @@ class ListField(Folder):
             values = resp[field_name]["properties"]["valid_values"]["value"]
 
             if self._skip_unused:
-                # cull values based on their usage - EXPENSIVE WITH ONE PTR QUERY PER VALUE
+                # cull values based on their usage
                 values = self.__filter_unused_list_values(
-                    entity_type, field_name, values, sg_data.get("Project")
+                    io_receiver.shotgun_cache,
+                    entity_type,
+                    field_name,
+                    values,
+                    sg_data.get("Project"),
                 )
 
         # process each value independently
@@ -242,11 +248,14 @@ class ListField(Folder):
 
         return products
 
-    def __filter_unused_list_values(self, entity_type, field_name, values, project):
+    def __filter_unused_list_values(
+        self, shotgun_cache, entity_type, field_name, values, project
+    ):
         """
         Remove values which are not used by entities in this project.
 
-        - WARNING! SLOW! Will do a shotgun query for every value in values.
+        - The usage of all the values is retrieved with a single grouped summary
+          query, which is cached for the duration of the folder creation.
         - WARNING! This logic will check if a value is 'unused' by looking at all items
                    for that entity type. This may be perfectly fine (in the case of asset type
                    and asset for example, however it will not be relevant if other filter criteria
@@ -254,19 +263,21 @@ class ListField(Folder):
                    tasks of type Foo then we would ideally want to query the unused-ness based on
                    this subset, not based on all tasks in the project.
         """
-        used_values = []
+        filters = []
+        if project:
+            filters.append(["project", "is", project])
 
-        for value in values:
-
-            # eg. sg_asset_type is prop
-            filters = [[field_name, "is", value]]
-            if project:
-                filters.append(["project", "is", project])
+        # eg. count the assets of each asset type
+        summary = shotgun_cache.summarize(
+            entity_type,
+            filters,
+            [{"field": field_name, "type": "count"}],
+            grouping=[{"field": field_name, "type": "exact", "direction": "asc"}],
+        )
 
-            summary = self._tk.shotgun.summarize(
-                entity_type, filters, [{"field": field_name, "type": "count"}]
-            )
-            if summary.get("summaries", {}).get(field_name):
-                used_values.append(value)
+        used_values = set()
+        for group in summary.get("groups", []):
+            if group.get("summaries", {}).get(field_name):
+                used_values.add(group.get("group_value"))
 
-        return used_values
+        return [value for value in values if value in used_values]
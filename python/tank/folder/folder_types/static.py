@@ -121,8 +121,6 @@ class Static(Folder):
         self._create_with_parent = create_with_parent
         self._tk = tk
 
-        self._cached_sg_data = {}
-
     def is_dynamic(self):
         """
         Returns true if this folder node requires some sort of dynamic input
@@ -141,6 +139,69 @@ class Static(Folder):
         # base class implementation
         return super()._should_item_be_processed(engine_str, is_primary)
 
+    def prefetch_shotgun_data(self, shotgun_cache, sg_data_list, engine):
+        """
+        Retrieves in batch the constraint data of this node and the Shotgun
+        data of its children for several parent folders.
+
+        :param shotgun_cache: :class:`ShotgunDataCache` instance of the folder creation.
+        :param sg_data_list: Shotgun data dictionaries of the parent folders.
+        :param engine: Engine to create folders for / indicate second pass if not None.
+        """
+        if self._constrain_node:
+            filters_list = []
+            for sg_data in sg_data_list:
+                try:
+                    filters_list.append(self._get_constraints_filter(sg_data))
+                except (TankError, KeyError):
+                    # reported when the folders are created.
+                    pass
+            shotgun_cache.prefetch(self._constrain_node.get_entity_type(), filters_list)
+
+        # static folders pass the shotgun data of their parent down to their children
+        self.prefetch_children_shotgun_data(shotgun_cache, sg_data_list, engine)
+
+    def _get_constraints_filter(self, sg_data):
+        """
+        Returns the filters used to check if this folder should be created.
+
+        :param sg_data: Shotgun data dictionary for the parent folders.
+        :returns: Shotgun filters dictionary.
+        """
+        # resolve our sg filter expression based on the current shotgun data
+        # for the current parent objects (for example if the query expression
+        # contains $shot or other dynamic tokens)
+        resolved_filters = resolve_shotgun_filters(self._constraints_filter, sg_data)
+
+        # so now resolved_filters is something like:
+        # {'logical_operator': 'and',
+        #  'conditions': [{'path': 'code', 'values': ['a'], 'relation': 'contains'}] }
+        #
+        # and the configuration states that the constraint object is $shot
+        # which is resolved into self._constrain_node
+        #
+        # now we want to get the current parent $shot id. This can be extrated
+        # from the sg_data dict which is on the form:
+        # {'Project': {'id': 88, 'type': 'Project'},
+        # 'Sequence': {'id': 32, 'type': 'Sequence'},
+        # 'Shot': {'id': 1184, 'type': 'Shot'},
+        # 'Step': {'id': 5, 'type': 'Step'}}
+        #
+        # once extracted, we can add that to the sg filter to get our final filter:
+        #
+        # {'logical_operator': 'and',
+        #  'conditions': [{'path': 'code', 'values': ['a'], 'relation': 'contains'},
+        #                 {'path': 'id', 'values': [1184], 'relation': 'is'} ] }
+
+        constrain_entity_id = sg_data[self._constrain_node.get_entity_type()]["id"]
+        id_filter = {
+            "path": "id",
+            "values": [constrain_entity_id],
+            "relation": "is",
+        }
+        resolved_filters["conditions"].append(id_filter)
+        return resolved_filters
+
     def _create_folders_impl(self, io_receiver, parent_path, sg_data):
         """
         Creates a static folder.
@@ -149,56 +210,14 @@ class Static(Folder):
         # first check if we have any conditionals that need evaluating
         if self._constrain_node:
 
-            # resolve our sg filter expression based on the current shotgun data
-            # for the current parent objects (for example if the query expression
-            # contains $shot or other dynamic tokens)
-            resolved_filters = resolve_shotgun_filters(
-                self._constraints_filter, sg_data
-            )
-
-            # so now resolved_filters is something like:
-            # {'logical_operator': 'and',
-            #  'conditions': [{'path': 'code', 'values': ['a'], 'relation': 'contains'}] }
-            #
-            # and the configuration states that the constraint object is $shot
-            # which is resolved into self._constrain_node
-            #
-            # now we want to get the current parent $shot id. This can be extrated
-            # from the sg_data dict which is on the form:
-            # {'Project': {'id': 88, 'type': 'Project'},
-            # 'Sequence': {'id': 32, 'type': 'Sequence'},
-            # 'Shot': {'id': 1184, 'type': 'Shot'},
-            # 'Step': {'id': 5, 'type': 'Step'}}
-            #
-            # once extracted, we can add that to the sg filter to get our final filter:
-            #
-            # {'logical_operator': 'and',
-            #  'conditions': [{'path': 'code', 'values': ['a'], 'relation': 'contains'},
-            #                 {'path': 'id', 'values': [1184], 'relation': 'is'} ] }
-
-            constrain_entity_id = sg_data[self._constrain_node.get_entity_type()]["id"]
-            id_filter = {
-                "path": "id",
-                "values": [constrain_entity_id],
-                "relation": "is",
-            }
-            resolved_filters["conditions"].append(id_filter)
+            resolved_filters = self._get_constraints_filter(sg_data)
 
             # depending on the filter, it is possible that the same static query will
-            # be generated more than once - so cache the results so that we can minimize
-            # shotgun queries.
-            hash_key = hash(str(resolved_filters))
-
-            if hash_key in self._cached_sg_data:
-                data = self._cached_sg_data[hash_key]
-
-            else:
-                # call out to shotgun
-                data = self._tk.shotgun.find_one(
-                    self._constrain_node.get_entity_type(), resolved_filters
-                )
-                # and cache it
-                self._cached_sg_data[hash_key] = data
+            # be generated more than once - the folder creation caches the results so
+            # that we can minimize shotgun queries.
+            data = io_receiver.shotgun_cache.find_one(
+                self._constrain_node.get_entity_type(), resolved_filters
+            )
 
             if data is None:
                 # no match! this means that our constraints filter did not match the current object
@@ -73,6 +73,17 @@ class UserWorkspace(Entity):
             create_with_parent=True,
         )
 
+    def prefetch_shotgun_data(self, shotgun_cache, sg_data_list, engine):
+        """
+        Inherited and wrapps base class implementation
+        """
+        # the current user is only looked up when folders are created, so there
+        # is nothing to prefetch until then.
+        if not self._user_initialized:
+            return
+
+        Entity.prefetch_shotgun_data(self, shotgun_cache, sg_data_list, engine)
+
     def create_folders(
         self, io_receiver, path, sg_data, is_primary, explicit_child_list, engine
     ):
@@ -54,7 +54,7 @@ def create_single_folder_item(
         # in order to create folders.
         try:
             shotgun_entity_data = folder_obj.extract_shotgun_data_upwards(
-                tk.shotgun, entity_id_seed
+                io_receiver.shotgun_cache, entity_id_seed
             )
         except EntityLinkTypeMismatch:
             # the seed entity id object does not satisfy the link
@@ -95,6 +95,63 @@ def create_single_folder_item(
         )
 
 
+def prefetch_folder_items(config_obj, io_receiver, items, engine):
+    """
+    Retrieves in batch the Shotgun data needed to create folders for several
+    entities, so that creating the folders of each entity doesn't query Shotgun
+    again for each level of the folder configuration.
+
+    For each folder configuration node the entities map to, the data of all the
+    entities is retrieved level by level up to the project. The entities of
+    each level of the folder creation chain and of the children of the entity
+    level are then retrieved the same way.
+
+    :param config_obj: a FolderConfiguration object representing the folder configuration
+    :param io_receiver: a FolderIOReceiver representing the folder operation callbacks
+    :param items: list of dictionaries with keys type, id and sg_task_data, one for each
+                  entity to create folders for.
+    :param engine: Engine to create folders for / indicate second pass if not None.
+    """
+    if len(items) < 2:
+        return
+
+    shotgun_cache = io_receiver.shotgun_cache
+
+    for entity_type in sorted(set(i["type"] for i in items)):
+        entity_id_seeds = [
+            {
+                entity_type: {"type": entity_type, "id": i["id"]},
+                "current_task_data": i["sg_task_data"],
+            }
+            for i in items
+            if i["type"] == entity_type
+        ]
+
+        for folder_obj in config_obj.get_folder_objs_for_entity_type(entity_type):
+
+            # resolve the entities of each level of the chain for all the seeds
+            shotgun_entity_data_list = entity_id_seeds
+            for folder in [folder_obj] + folder_obj.get_parents():
+                shotgun_entity_data_list = folder.prefetch_shotgun_data_upwards(
+                    shotgun_cache, shotgun_entity_data_list
+                )
+            if len(shotgun_entity_data_list) < 2:
+                continue
+
+            # then retrieve the entities folders are created for, from the
+            # project down to the children of the entity folders.
+            for folder in reversed([folder_obj] + folder_obj.get_parents()):
+                if not folder._should_item_be_processed(engine, True):
+                    break
+                folder.prefetch_shotgun_data(
+                    shotgun_cache, shotgun_entity_data_list, engine
+                )
+            else:
+                folder_obj.prefetch_children_shotgun_data(
+                    shotgun_cache, shotgun_entity_data_list, engine
+                )
+
+
 def synchronize_folders(tk, full_sync):
     """
     Synchronizes any remote folders to ensure they are present both
@@ -209,6 +266,9 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
     # create an object to receive all IO requests
     io_receiver = FolderIOReceiver(tk, preview, entity_type, entity_ids)
 
+    # retrieve the shotgun data for all the items at once
+    prefetch_folder_items(config, io_receiver, items, engine)
+
     # now loop over all individual objects and create folders
     for i in items:
         create_single_folder_item(
@@ -0,0 +1,458 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Caching and batching of the Shotgun queries made during folder creation.
+
+"""
+
+import copy
+
+from .. import LogManager
+
+log = LogManager.get_logger(__name__)
+
+
+class ShotgunDataCache(object):
+    """
+    Caches the results of the Shotgun queries made during a folder creation
+    operation and retrieves the results of similar queries in batches.
+
+    Folder nodes query Shotgun once for each parent folder, e.g. the steps
+    node runs one query for each shot. Before recursing down to a node, the
+    folder creation calls :meth:`prefetch` with the queries the node is about
+    to run. The queries are combined into a single one, whose results are then
+    split between them in memory, so that :meth:`find` doesn't need to call
+    Shotgun anymore.
+
+    Two queries are combined when they only differ by the values of ``is``
+    conditions, e.g. ``sg_sequence is <Sequence 1>`` and
+    ``sg_sequence is <Sequence 2>``. The special ``$FROM$`` conditions used
+    by step nodes, e.g. ``$FROM$Task.step.entity is <Shot 1>``, are combined
+    by first retrieving the linking entities, here the tasks of all the shots.
+    Any other query is run as is.
+    """
+
+    # maximum number of queries combined into a single Shotgun query
+    BATCH_SIZE = 200
+
+    def __init__(self, shotgun):
+        """
+        :param shotgun: Shotgun API instance.
+        """
+        self._shotgun = shotgun
+        self._find_cache = {}
+        self._schema_cache = {}
+        self._summarize_cache = {}
+
+    def find(self, entity_type, filters, fields=None):
+        """
+        Finds entities, like :meth:`shotgun_api3.Shotgun.find`.
+
+        :param str entity_type: Shotgun entity type.
+        :param filters: Filters, in the list or the dictionary syntax.
+        :param list fields: Fields to retrieve.
+        :returns: List of entity dictionaries.
+        """
+        fields = sorted(set(fields or []))
+        key = self._get_key(entity_type, filters, fields)
+        if key not in self._find_cache:
+            self._find_cache[key] = self._shotgun.find(entity_type, filters, fields)
+        return copy.deepcopy(self._find_cache[key])
+
+    def find_one(self, entity_type, filters, fields=None):
+        """
+        Finds a single entity, like :meth:`shotgun_api3.Shotgun.find_one`.
+
+        :param str entity_type: Shotgun entity type.
+        :param filters: Filters, in the list or the dictionary syntax.
+        :param list fields: Fields to retrieve.
+        :returns: Entity dictionary, or None if no entity matches the filters.
+        """
+        # queries for a single entity filter by id and return at most one
+        # entity, so this shares the results of prefetched finds.
+        entities = self.find(entity_type, filters, fields)
+        return entities[0] if entities else None
+
+    def schema_field_read(self, entity_type, field_name):
+        """
+        Reads the schema of a field, like :meth:`shotgun_api3.Shotgun.schema_field_read`.
+
+        :param str entity_type: Shotgun entity type.
+        :param str field_name: Name of the field.
+        :returns: Schema dictionary, keyed by field name.
+        """
+        key = (entity_type, field_name)
+        if key not in self._schema_cache:
+            self._schema_cache[key] = self._shotgun.schema_field_read(
+                entity_type, field_name
+            )
+        return copy.deepcopy(self._schema_cache[key])
+
+    def summarize(self, entity_type, filters, summary_fields, grouping=None):
+        """
+        Summarizes field values, like :meth:`shotgun_api3.Shotgun.summarize`.
+
+        :param str entity_type: Shotgun entity type.
+        :param list filters: Filters, in the list syntax.
+        :param list summary_fields: Summaries to compute.
+        :param list grouping: Optional grouping of the summaries.
+        :returns: Summary dictionary.
+        """
+        key = (
+            entity_type,
+            self._get_filters_key(filters),
+            self._get_filters_key(summary_fields),
+            self._get_filters_key(grouping),
+        )
+        if key not in self._summarize_cache:
+            self._summarize_cache[key] = self._shotgun.summarize(
+                entity_type, filters, summary_fields, grouping=grouping
+            )
+        return copy.deepcopy(self._summarize_cache[key])
+
+    def prefetch(self, entity_type, filters_list, fields=None):
+        """
+        Retrieves the results of several queries for the same entity type and
+        fields, combining them into as few Shotgun queries as possible.
+
+        Queries which can't be combined are ignored; they are run when
+        :meth:`find` is called for them.
+
+        :param str entity_type: Shotgun entity type.
+        :param list filters_list: Filters of each query, in the dictionary syntax.
+        :param list fields: Fields to retrieve.
+        """
+        fields = sorted(set(fields or []))
+
+        # skip the queries which already ran
+        pending = {}
+        for filters in filters_list:
+            key = self._get_key(entity_type, filters, fields)
+            if key not in self._find_cache:
+                pending[key] = filters
+        if len(pending) < 2:
+            return
+
+        batch = self._get_batch(list(pending.values()))
+        if batch is None:
+            log.debug(
+                "Cannot combine %d %s queries, they will be run one by one."
+                % (len(pending), entity_type)
+            )
+            return
+        common_conditions, varying_conditions = batch
+
+        items = list(zip(pending.keys(), zip(*varying_conditions.values())))
+        for start in range(0, len(items), self.BATCH_SIZE):
+            results = self._find_batch(
+                entity_type,
+                fields,
+                common_conditions,
+                list(varying_conditions.keys()),
+                items[start : start + self.BATCH_SIZE],
+            )
+            if results is None:
+                return
+            self._find_cache.update(results)
+
+    def _find_batch(self, entity_type, fields, common_conditions, varying, items):
+        """
+        Runs a combined query and splits its results.
+
+        :param str entity_type: Shotgun entity type.
+        :param list fields: Sorted fields to retrieve.
+        :param list common_conditions: Conditions shared by all the queries, in
+            the list syntax.
+        :param list varying: ``(path, relation)`` of the conditions whose value
+            differs between the queries.
+        :param list items: ``(key, values)`` of each query, where values are the
+            values of the varying conditions.
+        :returns: Dictionary of the entities found for each query, keyed by
+            query key, or None if the results can't be split.
+        """
+        direct_paths = [path for (path, _) in varying if not path.startswith("$FROM$")]
+        from_paths = [path for (path, _) in varying if path.startswith("$FROM$")]
+
+        conditions = list(common_conditions)
+
+        if direct_paths:
+            groups = []
+            for _, values in items:
+                group = [
+                    [path, "is", value]
+                    for ((path, _), value) in zip(varying, values)
+                    if not path.startswith("$FROM$")
+                ]
+                groups.append(
+                    group[0]
+                    if len(group) == 1
+                    else {"filter_operator": "all", "filters": group}
+                )
+            conditions.append({"filter_operator": "any", "filters": groups})
+
+        linked_ids = {}
+        if from_paths:
+            # e.g. $FROM$Task.step.entity - the steps linked to the shots
+            # through their tasks. Find the tasks of all the shots first.
+            (from_path,) = from_paths
+            from_index = [path for (path, _) in varying].index(from_path)
+            link_entity_type, link_field, link_path = from_path[len("$FROM$") :].split(
+                ".", 2
+            )
+            link_values = [values[from_index] for (_, values) in items]
+            link_records = self._shotgun.find(
+                link_entity_type,
+                [
+                    {
+                        "filter_operator": "any",
+                        "filters": [
+                            [link_path, "is", value]
+                            for value in self._unique(link_values)
+                        ],
+                    }
+                ],
+                [link_path, link_field],
+            )
+            for value in link_values:
+                ids = set()
+                for link_record in link_records:
+                    if link_path not in link_record or link_field not in link_record:
+                        return None
+                    if self._value_matches(link_record[link_path], value):
+                        ids.update(
+                            self._get_linked_ids(link_record[link_field], entity_type)
+                        )
+                linked_ids[self._get_value_key(value)] = ids
+
+            all_ids = set().union(*linked_ids.values())
+            if not all_ids:
+                return dict((key, []) for (key, _) in items)
+            conditions.append(["id", "in", sorted(all_ids)])
+
+        records = self._shotgun.find(
+            entity_type, conditions, sorted(set(fields) | set(direct_paths))
+        )
+        if any(path not in record for record in records for path in direct_paths):
+            return None
+
+        results = {}
+        for key, values in items:
+            matches = []
+            for record in records:
+                matched = True
+                for (path, _), value in zip(varying, values):
+                    if path.startswith("$FROM$"):
+                        matched = record["id"] in linked_ids[self._get_value_key(value)]
+                    else:
+                        matched = self._value_matches(record[path], value)
+                    if not matched:
+                        break
+                if matched:
+                    matches.append(
+                        dict(
+                            (name, value)
+                            for (name, value) in record.items()
+                            if name in ("type", "id") or name in fields
+                        )
+                    )
+            results[key] = matches
+        return results
+
+    def _get_batch(self, filters_list):
+        """
+        Splits queries into the conditions they share and the conditions
+        whose value differs between them.
+
+        :param list filters_list: Filters of each query, in the dictionary syntax.
+        :returns: Tuple of the shared conditions, in the list syntax, and an
+            ordered dictionary of the values of each differing condition, keyed
+            by ``(path, relation)``. None if the queries can't be combined.
+        """
+        structure = None
+        for filters in filters_list:
+            if (
+                not isinstance(filters, dict)
+                or filters.get("logical_operator") != "and"
+            ):
+                return None
+            conditions = filters["conditions"]
+            if any("path" not in condition for condition in conditions):
+                # nested conditions
+                return None
+            filters_structure = [
+                (condition["path"], condition["relation"]) for condition in conditions
+            ]
+            if structure is None:
+                structure = filters_structure
+            elif filters_structure != structure:
+                return None
+
+        common_conditions = []
+        varying_conditions = {}
+        for index, (path, relation) in enumerate(structure):
+            all_values = [
+                filters["conditions"][index]["values"] for filters in filters_list
+            ]
+            if len(set(self._get_filters_key(values) for values in all_values)) == 1:
+                if path.startswith("$FROM$"):
+                    return None
+                values = all_values[0]
+                common_conditions.append(
+                    [
+                        path,
+                        relation,
+                        (
+                            self._get_entity_value(values[0])
+                            if len(values) == 1
+                            else values
+                        ),
+                    ]
+                )
+            elif relation == "is" and all(
+                len(values) == 1 and self._is_simple_value(values[0])
+                for values in all_values
+            ):
+                varying_conditions[(path, relation)] = [
+                    self._get_entity_value(values[0]) for values in all_values
+                ]
+            else:
+                return None
+
+        from_paths = [
+            path for (path, _) in varying_conditions if path.startswith("$FROM$")
+        ]
+        if not varying_conditions or len(from_paths) > 1:
+            return None
+        for from_path in from_paths:
+            if len(from_path[len("$FROM$") :].split(".", 2)) != 3:
+                return None
+        return common_conditions, varying_conditions
+
+    def _value_matches(self, field_value, value):
+        """
+        Checks if a field value returned by Shotgun matches the value of an
+        ``is`` condition.
+
+        :param field_value: Value of the field.
+        :param value: Value of the condition.
+        :returns: True if the condition is fulfilled.
+        """
+        if isinstance(field_value, list):
+            # multi-entity fields match if any of their entities match.
+            if value is None:
+                return not field_value
+            return any(self._value_matches(item, value) for item in field_value)
+        if isinstance(value, dict):
+            return (
+                isinstance(field_value, dict)
+                and field_value.get("type") == value["type"]
+                and field_value.get("id") == value["id"]
+            )
+        if isinstance(value, str) and isinstance(field_value, str):
+            # text comparisons are case insensitive in Shotgun.
+            return field_value.lower() == value.lower()
+        return field_value == value
+
+    def _get_linked_ids(self, field_value, entity_type):
+        """
+        Returns the ids of the entities of a type found in a link field value.
+
+        :param field_value: Value of an entity or multi-entity field.
+        :param str entity_type: Shotgun entity type.
+        :returns: Set of ids.
+        """
+        if isinstance(field_value, dict):
+            field_value = [field_value]
+        return set(
+            link["id"]
+            for link in field_value or []
+            if isinstance(link, dict) and link.get("type") == entity_type
+        )
+
+    def _is_simple_value(self, value):
+        """
+        Checks if a condition value can be compared in memory.
+
+        :param value: Value of a condition.
+        :returns: True for entity dictionaries and scalar values.
+        """
+        if isinstance(value, dict):
+            return "type" in value and "id" in value
+        return value is None or isinstance(value, (str, int, float, bool))
+
+    def _get_entity_value(self, value):
+        """
+        Strips an entity dictionary down to its type and id.
+
+        :param value: Value of a condition.
+        :returns: The value, with entity dictionaries reduced to their type and id.
+        """
+        if isinstance(value, dict):
+            return {"type": value["type"], "id": value["id"]}
+        return value
+
+    def _unique(self, values):
+        """
+        Removes the duplicates of a list of condition values, keeping their order.
+
+        :param list values: Values of a condition.
+        :returns: List of values.
+        """
+        unique_values = {}
+        for value in values:
+            unique_values.setdefault(self._get_value_key(value), value)
+        return list(unique_values.values())
+
+    def _get_value_key(self, value):
+        """
+        Returns a hashable key for a condition value.
+
+        Text values are compared case insensitively, like Shotgun does.
+
+        :param value: Value of a condition.
+        :returns: Hashable key.
+        """
+        if isinstance(value, str):
+            return value.lower()
+        return self._get_filters_key(value)
+
+    def _get_key(self, entity_type, filters, fields):
+        """
+        Returns a hashable key for a query.
+
+        :param str entity_type: Shotgun entity type.
+        :param filters: Filters, in the list or the dictionary syntax.
+        :param list fields: Sorted fields to retrieve.
+        :returns: Hashable key.
+        """
+        return (entity_type, self._get_filters_key(filters), tuple(fields))
+
+    def _get_filters_key(self, data):
+        """
+        Returns a hashable key for filters or filter values.
+
+        Entity dictionaries are reduced to their type and id, so filters
+        resolved from different folder data point to the same results.
+
+        :param data: Filters, or part of filters.
+        :returns: Hashable key.
+        """
+        if isinstance(data, dict):
+            if "type" in data and "id" in data:
+                return ("entity", data["type"], data["id"])
+            return tuple(
+                sorted(
+                    (key, self._get_filters_key(value)) for (key, value) in data.items()
+                )
+            )
+        if isinstance(data, (list, tuple)):
+            return tuple(self._get_filters_key(value) for value in data)
+        return data
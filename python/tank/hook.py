@@ -12,19 +12,23 @@
 Defines the base class for all Tank Hooks.
 """
 
+import functools
 import inspect
 import logging
 import os
 import sys
 import threading
+import time
 
 from . import LogManager
+from . import constants
 from .errors import (
     TankError,
     TankFileDoesNotExistError,
     TankHookMethodDoesNotExistError,
 )
-from .util.loader import load_plugin
+from .util.loader import PluginIndex, load_plugin
+from .util.local_file_storage import LocalFileStorageManager
 
 log = LogManager.get_logger(__name__)
 
@@ -471,6 +475,13 @@ class _HooksCache(object):
     A thread-safe cache of loaded hooks.  This uses the hook file path
     and base class as the key to cache all hooks loaded by Toolkit in
     the current session.
+
+    Lookups don't take any lock. When several threads need the same hook
+    which isn't loaded yet, only one of them loads it and the others wait
+    for it, while hooks with other keys keep loading concurrently. Since
+    loading a hook runs its module code, which may load other hooks, a
+    thread doesn't wait if that would close a cycle of waiting threads and
+    loads the hook itself instead.
     """
 
     def __init__(self):
@@ -478,39 +489,26 @@ class _HooksCache(object):
         Construction
         """
         self._cache = {}
-        self._cache_lock = threading.Lock()
-
-    def thread_exclusive(func):
-        """
-        function decorator to ensure multiple threads can't access the cache
-        at the same time.
+        # keys being loaded, mapped to an event set once they are loaded.
+        self._loading = {}
+        # keys each thread is waiting for, by thread id.
+        self._waiting = {}
+        # incremented when the cache is cleared, to discard hooks which
+        # were being loaded at that time.
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._waits = 0
+        self._wait_time = 0.0
 
-        :param func:    The function to wrap
-        :returns:       The return value from func
-        """
-
-        def inner(self, *args, **kwargs):
-            """
-            Decorator inner function - executes the function within a lock.
-            :returns:    The return value from func
-            """
-            lock = self._cache_lock
-            lock.acquire()
-            try:
-                return func(self, *args, **kwargs)
-            finally:
-                lock.release()
-
-        return inner
-
-    @thread_exclusive
     def clear(self):
         """
         Clear the hook cache
         """
-        self._cache = {}
+        with self._lock:
+            self._cache = {}
+            self._generation += 1
 
-    @thread_exclusive
     def find(self, hook_path, hook_base_class):
         """
         Find a hook in the cache using the hook path and base class
@@ -524,7 +522,6 @@ class _HooksCache(object):
         key = (hook_path, hook_base_class)
         return self._cache.get(key, None)
 
-    @thread_exclusive
     def add(self, hook_path, hook_base_class, hook_class):
         """
         Add the specified hook to the cache if it isn't already present
@@ -536,10 +533,111 @@ class _HooksCache(object):
         # The unique cache key is a tuple of the path and the base class to allow
         # loading of classes with different bases from the same file
         key = (hook_path, hook_base_class)
-        if key not in self._cache:
-            self._cache[key] = hook_class
+        with self._lock:
+            self._cache.setdefault(key, hook_class)
+
+    def find_or_load(self, hook_path, hook_base_class, load):
+        """
+        Find a hook in the cache, loading it if it isn't there yet.
+
+        Only one thread loads a given hook at a time. Other threads needing it
+        wait for that thread to be done and use the same class.
+
+        :param hook_path:       The path to the hook to find
+        :param hook_base_class: The base class for the hook to find
+        :param load:            Callable returning the Hook class, called if the hook
+                                is not in the cache
+        :returns:               The Hook class
+        """
+        key = (hook_path, hook_base_class)
+        while True:
+            hook_class = self._cache.get(key)
+            if hook_class is not None:
+                return hook_class
+
+            with self._lock:
+                hook_class = self._cache.get(key)
+                if hook_class is not None:
+                    return hook_class
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = (
+                        threading.get_ident(),
+                        threading.Event(),
+                    )
+                    generation = self._generation
+                    self._loads += 1
+                    break
+                if self._is_waited_by(loading[0], threading.get_ident()):
+                    # the hook is being loaded by this thread further up the
+                    # stack, or by a thread waiting for a hook this thread is
+                    # loading. Waiting for it would deadlock.
+                    return load()
+                self._waiting[threading.get_ident()] = key
+                self._waits += 1
+
+            # another thread is loading the hook, wait for it. If it failed to
+            # load the hook, try loading it in this thread.
+            start_time = time.time()
+            try:
+                loading[1].wait()
+            finally:
+                with self._lock:
+                    del self._waiting[threading.get_ident()]
+                    self._wait_time += time.time() - start_time
+
+        try:
+            hook_class = load()
+            with self._lock:
+                if generation == self._generation:
+                    # Use the class which may have been added in the meantime,
+                    # to avoid different threads ending up using different
+                    # instances of the loaded class.
+                    hook_class = self._cache.setdefault(key, hook_class)
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading[1].set()
+        return hook_class
+
+    def _is_waited_by(self, thread_id, waiting_thread_id):
+        """
+        Checks if a thread is, directly or through other threads, waiting for
+        hooks another thread is loading. Must be called with the lock held.
+
+        :param thread_id:         Id of the thread loading a hook.
+        :param waiting_thread_id: Id of the thread which would wait for it.
+        :returns:                 True if waiting would deadlock.
+        """
+        visited = set()
+        while thread_id != waiting_thread_id:
+            if thread_id in visited:
+                return False
+            visited.add(thread_id)
+            key = self._waiting.get(thread_id)
+            loading = self._loading.get(key)
+            if loading is None:
+                return False
+            thread_id = loading[0]
+        return True
+
+    def get_stats(self):
+        """
+        Returns statistics about the hook cache.
+
+        :returns: Dictionary with keys ``size``, the number of hooks in the cache,
+            ``loads``, the number of hooks loaded, ``waits``, the number of times
+            a thread waited for another thread to load a hook, and ``wait_time``,
+            the total time in seconds spent waiting.
+        """
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "loads": self._loads,
+                "waits": self._waits,
+                "wait_time": self._wait_time,
+            }
 
-    @thread_exclusive
     def __len__(self):
         """
         Return the number of items currently in the hook cache
@@ -549,6 +647,31 @@ class _HooksCache(object):
 
 _hooks_cache = _HooksCache()
 _current_hook_baseclass = threading.local()
+_hook_index = None
+
+
+def _get_hook_index():
+    """
+    Returns the persistent index of hook files, if it is enabled.
+
+    The index is stored in the global cache location, and is only used when
+    the ``TK_HOOK_INDEX`` environment variable is set to ``1``.
+
+    :returns: :class:`~tank.util.loader.PluginIndex` instance or None.
+    """
+    global _hook_index
+
+    if os.environ.get(constants.HOOK_INDEX_ENV_VAR) != "1":
+        return None
+
+    root = os.path.join(
+        LocalFileStorageManager.get_global_root(LocalFileStorageManager.CACHE),
+        "hook_index",
+    )
+    # the cache location changes when SHOTGUN_HOME is changed.
+    if _hook_index is None or _hook_index.root != root:
+        _hook_index = PluginIndex(root)
+    return _hook_index
 
 
 def clear_hooks_cache():
@@ -558,6 +681,16 @@ def clear_hooks_cache():
     _hooks_cache.clear()
 
 
+def get_hooks_cache_stats():
+    """
+    Returns statistics about the cache where tank keeps hook classes, e.g.
+    to find out if threads spend time waiting for each other to load hooks.
+
+    :returns: Dictionary with keys ``size``, ``loads``, ``waits`` and ``wait_time``.
+    """
+    return _hooks_cache.get_stats()
+
+
 def execute_hook(hook_path, parent, **kwargs):
     """
     Executes a hook, old-school style.
@@ -680,8 +813,9 @@ def create_hook_instance(hook_paths, parent, base_class=None):
         base_class = Hook
 
     # keep track of the current base class - this is used when loading hooks to dynamically
-    # inherit from the correct base.
-    _current_hook_baseclass.value = base_class
+    # inherit from the correct base. It is kept in a local variable rather than only in
+    # _current_hook_baseclass so the chain is not affected by hooks created while loading.
+    hook_class = base_class
 
     for hook_path in hook_paths:
 
@@ -691,44 +825,52 @@ def create_hook_instance(hook_paths, parent, base_class=None):
                 % hook_path
             )
 
-        # look to see if we've already loaded this hook into the cache
-        found_hook_class = _hooks_cache.find(hook_path, _current_hook_baseclass.value)
-        if not found_hook_class:
-            # load the hook class from the hook file and cache it - this explicitly looks for a
-            # single class from the hook file that is derived from the current base (or 'Hook' for
-            # backwards compatibility).
-
-            # determine any alternate base classes to look for in addition to the current base:
-            alternate_base_classes = []
-            if _current_hook_baseclass.value != Hook:
-                # allow deriving from the Hook base class - this is to support the legacy method of
-                # overriding hooks but without sub-classing them.
-                alternate_base_classes.append(Hook)
-
-            # try to load the hook class:
-            loaded_hook_class = load_plugin(
-                hook_path,
-                valid_base_class=_current_hook_baseclass.value,
-                alternate_base_classes=alternate_base_classes,
-            )
+        # look to see if we've already loaded this hook into the cache, or
+        # load the hook class from the hook file and cache it
+        hook_class = _hooks_cache.find_or_load(
+            hook_path,
+            hook_class,
+            functools.partial(_load_hook_class, hook_path, hook_class),
+        )
 
-            # add it to the cache...
-            _hooks_cache.add(
-                hook_path, _current_hook_baseclass.value, loaded_hook_class
-            )
+    # all class construction done. hook_class contains the last class we
+    # iterated over. An instance of this is what we want to return
+    _current_hook_baseclass.value = hook_class
+    return hook_class(parent)
 
-            # ...and find it again - this is to avoid different threads ending up using
-            # different instances of the loaded class.
-            found_hook_class = _hooks_cache.find(
-                hook_path, _current_hook_baseclass.value
-            )
 
-        # keep track of the current base class:
-        _current_hook_baseclass.value = found_hook_class
+def _load_hook_class(hook_path, hook_base_class):
+    """
+    Loads the hook class from a hook file.
+
+    This explicitly looks for a single class from the hook file that is derived
+    from the given base (or 'Hook' for backwards compatibility).
 
-    # all class construction done. _current_hook_baseclass contains the last
-    # class we iterated over. An instance of this is what we want to return
-    return _current_hook_baseclass.value(parent)
+    :param hook_path: Full path to the hook python file.
+    :param hook_base_class: The base class for the hook, which is also
+        the one returned by :meth:`get_hook_baseclass` while the file is loaded.
+    :returns: The Hook class.
+    """
+    # determine any alternate base classes to look for in addition to the current base:
+    alternate_base_classes = []
+    if hook_base_class != Hook:
+        # allow deriving from the Hook base class - this is to support the legacy method of
+        # overriding hooks but without sub-classing them.
+        alternate_base_classes.append(Hook)
+
+    # the hook code uses get_hook_baseclass() to derive from the correct base.
+    previous_base_class = getattr(_current_hook_baseclass, "value", None)
+    _current_hook_baseclass.value = hook_base_class
+    try:
+        # try to load the hook class:
+        return load_plugin(
+            hook_path,
+            valid_base_class=hook_base_class,
+            alternate_base_classes=alternate_base_classes,
+            plugin_index=_get_hook_index(),
+        )
+    finally:
+        _current_hook_baseclass.value = previous_base_class
 
 
 def get_hook_baseclass():
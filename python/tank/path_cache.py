@@ -15,15 +15,22 @@ all Tank items in the file system are kept.
 """
 
 import collections
+import concurrent.futures
+import hashlib
 import itertools
 import json
 import os
+import pathlib
 import sqlite3
 import sys
+import threading
+import time
 
 from . import LogManager, constants
 from .errors import TankError
 from .platform.engine import clear_global_busy, show_global_busy
+from .util import filesystem
+from .util.local_file_storage import LocalFileStorageManager
 from .util.login import get_current_user
 
 # Shotgun field definitions to store the path cache data
@@ -39,6 +46,51 @@ SG_PIPELINE_CONFIG_FIELD = "pipeline_configuration"
 
 log = LogManager.get_logger(__name__)
 
+# time spent by lookups waiting for locks on local replicas, shared by all
+# path cache instances. See PathCache.get_lookup_lock_wait_stats.
+_lookup_lock_wait_lock = threading.Lock()
+_lookup_lock_wait_stats = {"time": 0.0, "count": 0}
+
+# path cache files whose schema was checked by this process, keyed by path and
+# file identity so that files which were recreated are checked again.
+_checked_schemas_lock = threading.Lock()
+_checked_schemas = set()
+
+# connections reading the data version of the path cache files, keyed by path
+# and file identity and shared by all path cache instances. See
+# PathCache.get_data_version.
+_data_version_connections_lock = threading.Lock()
+_data_version_connections = {}
+
+
+# thread pool used to retrieve FilesystemLocation entities from Shotgun. It is
+# shared by all path cache instances so that its threads, and the Shotgun
+# connections they cache, are reused between synchronizations.
+_query_executor = None
+_query_executor_lock = threading.Lock()
+
+
+def _get_query_executor():
+    """
+    Returns the thread pool used to run Shotgun queries concurrently.
+    """
+    global _query_executor
+    with _query_executor_lock:
+        if _query_executor is None:
+            _query_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=PathCache.SHOTGUN_QUERY_THREADS,
+                thread_name_prefix="sgtk_path_cache",
+            )
+        return _query_executor
+
+
+def _chunks(large_list, chunk_size):
+    """
+    Helper operator to split a large list into smaller chunks
+    """
+    for i in range(0, len(large_list), chunk_size):
+        yield large_list[i : i + chunk_size]
+
 
 class PathCache(object):
     """
@@ -61,6 +113,19 @@ class PathCache(object):
     # to do so.
     SHOTGUN_ENTITY_QUERY_BATCH_SIZE = 500
 
+    # maximum number of batches of FilesystemLocation entities retrieved
+    # concurrently from Shotgun
+    SHOTGUN_QUERY_THREADS = 4
+
+    # maximum time in seconds a lookup waits for the local replica to be unlocked
+    REPLICA_LOCK_TIMEOUT = 5.0
+
+    # size of the memory map used to read the local replica
+    REPLICA_MMAP_SIZE = 256 * 1024 * 1024
+
+    # version of the snapshot format, see export_snapshot
+    SNAPSHOT_VERSION = 2
+
     def __init__(self, tk):
         """
         Constructor.
@@ -68,12 +133,18 @@ class PathCache(object):
         :param tk: Toolkit API instance
         """
         self._connection = None
+        self._path_cache_file = None
+        self._file_id = None
+        self._replica_connection = None
+        self._replica_path = None
         self._tk = tk
         self._sync_with_sg = tk.pipeline_configuration.get_shotgun_path_cache_enabled()
 
         if tk.pipeline_configuration.has_associated_data_roots():
             self._path_cache_disabled = False
             self._init_db()
+            if os.environ.get(constants.PATH_CACHE_REPLICA_ENV_VAR) == "1":
+                self._init_replica()
             self._roots = tk.pipeline_configuration.get_data_roots()
         else:
             # no primary location found. Path cache therefore does not exist!
@@ -89,6 +160,7 @@ class PathCache(object):
         # disk, created with all the right permissions etc.
         path_cache_file = self._get_path_cache_location()
 
+        self._path_cache_file = path_cache_file
         self._connection = sqlite3.connect(path_cache_file)
 
         # this is to handle unicode properly - make sure that sqlite returns
@@ -100,6 +172,42 @@ class PathCache(object):
         # will always be unicode.
         self._connection.text_factory = str
 
+        # the file identity is read once connected, so that it is the identity
+        # of the file the connection uses.
+        self._file_id = self._get_file_id()
+        with _checked_schemas_lock:
+            if (path_cache_file, self._file_id) in _checked_schemas:
+                return
+
+        self._check_schema()
+
+        # new databases only have an identity once their tables are created.
+        self._file_id = self._get_file_id()
+        if self._file_id is not None:
+            with _checked_schemas_lock:
+                _checked_schemas.add((path_cache_file, self._file_id))
+
+    def _get_file_id(self):
+        """
+        Returns the identity of the path cache file on disk.
+
+        :returns: Tuple with the device and inode of the file, or None if the
+                  file doesn't exist or is empty, in which case its schema
+                  has to be checked.
+        """
+        try:
+            stat = os.stat(self._path_cache_file)
+        except OSError:
+            return None
+        if stat.st_size == 0:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def _check_schema(self):
+        """
+        Creates the tables of a new database or upgrades the tables of an
+        existing one.
+        """
         c = self._connection.cursor()
         try:
 
@@ -173,6 +281,201 @@ class PathCache(object):
         finally:
             c.close()
 
+    def _init_replica(self):
+        """
+        Sets up the local replica of the database used for lookups.
+
+        The path cache database is typically shared by many processes and
+        possibly hosted on network storage, where readers and writers compete
+        for locks. When enabled with the ``TK_PATH_CACHE_REPLICA`` environment
+        variable, lookups are done on a copy of the database stored on local
+        storage instead. The replica uses the WAL journal mode, so readers
+        are never blocked while it is refreshed, and is opened read-only
+        with memory mapping enabled.
+
+        The replica is refreshed when the path cache file has changed since it
+        was last copied and after each synchronization or update done through
+        this object.
+        """
+        self._replica_path = self._get_replica_location(self._path_cache_file)
+
+        if self._read_replica_source_signature() != self._get_source_signature():
+            self._refresh_replica()
+
+        if self._replica_path is None:
+            # refreshing failed, lookups are done on the path cache file
+            return
+
+        try:
+            # timeout=0 so that waiting for locks is done, and measured, in
+            # _execute_lookup.
+            self._replica_connection = sqlite3.connect(
+                "%s?mode=ro" % pathlib.Path(self._replica_path).as_uri(),
+                uri=True,
+                timeout=0,
+            )
+            self._replica_connection.text_factory = str
+            self._replica_connection.execute(
+                "PRAGMA mmap_size=%d" % self.REPLICA_MMAP_SIZE
+            )
+        except sqlite3.Error as e:
+            log.warning(
+                "Could not open the path cache replica %s, lookups will use the "
+                "path cache: %s" % (self._replica_path, e)
+            )
+            self._close_replica()
+
+    def _get_replica_location(self, path_cache_file):
+        """
+        Returns the location of the local replica for a path cache file.
+
+        :param path_cache_file: Path to the path cache file.
+        :returns: The path to the replica file.
+        """
+        replica_folder = os.path.join(
+            LocalFileStorageManager.get_global_root(LocalFileStorageManager.CACHE),
+            "path_cache_replicas",
+        )
+        filesystem.ensure_folder_exists(replica_folder)
+        path_hash = hashlib.md5(
+            os.path.normcase(os.path.abspath(path_cache_file)).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(replica_folder, "%s.db" % path_hash)
+
+    def _get_source_signature(self):
+        """
+        Returns a string identifying the current state of the path cache file,
+        based on its modification time and size.
+        """
+        stat = os.stat(self._path_cache_file)
+        return "%d:%d" % (stat.st_mtime_ns, stat.st_size)
+
+    def _read_replica_source_signature(self):
+        """
+        Returns the signature of the path cache file when the replica was
+        last refreshed, or None if the replica doesn't exist.
+        """
+        if not os.path.exists(self._replica_path):
+            return None
+        try:
+            with open("%s.source" % self._replica_path, "r") as fh:
+                return fh.read()
+        except (IOError, OSError):
+            return None
+
+    def _refresh_replica(self):
+        """
+        Copies the path cache database into the local replica.
+
+        The copy is done with the sqlite backup API in a single transaction,
+        so readers of the replica either see the previous or the new content.
+        If the replica can't be refreshed, the replica is disabled and lookups
+        are done on the path cache file.
+        """
+        if self._replica_path is None:
+            return
+
+        signature = self._get_source_signature()
+        is_new_replica = (
+            not os.path.exists(self._replica_path)
+            or os.path.getsize(self._replica_path) == 0
+        )
+        start = time.perf_counter()
+        try:
+            replica_connection = sqlite3.connect(self._replica_path)
+            try:
+                self._connection.backup(replica_connection)
+                if is_new_replica:
+                    # The journal mode can only be set once the page size was
+                    # copied from the path cache. The WAL mode is persistent.
+                    replica_connection.execute("PRAGMA journal_mode=WAL")
+            finally:
+                replica_connection.close()
+        except sqlite3.Error as e:
+            log.warning(
+                "Could not refresh the path cache replica %s, lookups will use the "
+                "path cache: %s" % (self._replica_path, e)
+            )
+            self._close_replica()
+            self._replica_path = None
+            return
+
+        # write the signature of the copied path cache atomically
+        signature_file = "%s.source" % self._replica_path
+        with filesystem.atomic_write(signature_file) as tmp_signature_file:
+            with open(tmp_signature_file, "w") as fh:
+                fh.write(signature)
+
+        log.debug(
+            "Refreshed path cache replica %s in %.3fs."
+            % (self._replica_path, time.perf_counter() - start)
+        )
+
+    def _close_replica(self):
+        """
+        Closes the connection to the local replica, if any.
+        """
+        if self._replica_connection is not None:
+            self._replica_connection.close()
+            self._replica_connection = None
+
+    def _execute_lookup(self, sql, args):
+        """
+        Executes a read-only query, on the local replica if enabled or
+        on the path cache database otherwise.
+
+        Time spent waiting for the replica to be unlocked is recorded, see
+        :meth:`get_lookup_lock_wait_stats`.
+
+        :param str sql: SQL query.
+        :param tuple args: Query arguments.
+        :returns: List of rows.
+        """
+        if self._replica_connection is None:
+            c = self._connection.cursor()
+            try:
+                return list(c.execute(sql, args))
+            finally:
+                c.close()
+
+        wait_start = None
+        delay = 0.001
+        try:
+            while True:
+                try:
+                    return self._replica_connection.execute(sql, args).fetchall()
+                except sqlite3.OperationalError as e:
+                    if "locked" not in str(e) and "busy" not in str(e):
+                        raise
+                    now = time.perf_counter()
+                    if wait_start is None:
+                        wait_start = now
+                    elif now - wait_start > self.REPLICA_LOCK_TIMEOUT:
+                        raise
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.1)
+        finally:
+            if wait_start is not None:
+                wait_time = time.perf_counter() - wait_start
+                with _lookup_lock_wait_lock:
+                    _lookup_lock_wait_stats["time"] += wait_time
+                    _lookup_lock_wait_stats["count"] += 1
+                log.debug(
+                    "Path cache lookup waited %.3fs for the replica lock." % wait_time
+                )
+
+    @classmethod
+    def get_lookup_lock_wait_stats(cls):
+        """
+        Returns how long lookups on local replicas waited for locks, for all the
+        path cache instances of the current process.
+
+        :returns: Dictionary with keys ``time``, the total time waited in seconds,
+                  and ``count``, the number of lookups which had to wait.
+        """
+        with _lookup_lock_wait_lock:
+            return dict(_lookup_lock_wait_stats)
+
     def _get_path_cache_location(self):
         """
         Creates the path cache file and returns its location on disk.
@@ -294,10 +597,58 @@ class PathCache(object):
         """
         Close the database connection.
         """
+        self._close_replica()
         if self._connection is not None:
             self._connection.close()
             self._connection = None
 
+    def get_data_version(self):
+        """
+        Returns a value which changes when the path cache database is modified
+        or replaced, e.g. by a synchronization done by any path cache instance
+        or process.
+
+        Values can be compared between the path cache instances of all the
+        threads of the process.
+
+        :returns: A hashable value, or None if there is no path cache.
+        """
+        if self._path_cache_disabled:
+            return None
+
+        # PRAGMA data_version only reports the changes made by other connections
+        # and its values differ between connections, so it is read from a
+        # connection which is shared by all instances and never modifies the file.
+        key = (self._path_cache_file, self._file_id)
+        with _data_version_connections_lock:
+            connection = _data_version_connections.get(key)
+            if connection is None:
+                connection = sqlite3.connect(
+                    self._path_cache_file, check_same_thread=False
+                )
+                _data_version_connections[key] = connection
+            data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        return (self._file_id, data_version)
+
+    def _prepare_reuse(self):
+        """
+        Checks if this instance can be used for new lookups and refreshes its
+        local replica if the path cache file has changed since it was copied.
+
+        :returns: False if this instance was closed or if the path cache file
+                  was replaced since it was opened, True otherwise.
+        """
+        if self._path_cache_disabled:
+            return True
+        if self._connection is None or self._get_file_id() != self._file_id:
+            return False
+        if (
+            self._replica_path is not None
+            and self._read_replica_source_signature() != self._get_source_signature()
+        ):
+            self._refresh_replica()
+        return True
+
     ############################################################################################
     # shotgun synchronization (PTR data pushed into path cache database)
 
@@ -343,11 +694,15 @@ class PathCache(object):
 
             # expect back something like [(249660,)] for a running cache and [(None,)] for a clear
             if len(data) != 1 or data[0] is None:
-                # we should do a full sync
-                return self._do_full_sync(c)
-
-            # we have an event log id - so check if there are any more recent events
-            event_log_id = data[0]
+                # an empty path cache can be seeded from a snapshot, in which
+                # case only the events since the snapshot need to be synced.
+                event_log_id = self._seed_from_snapshot()
+                if event_log_id is None:
+                    # we should do a full sync
+                    return self._do_full_sync(c)
+            else:
+                # we have an event log id - so check if there are any more recent events
+                event_log_id = data[0]
 
             # note! We search for all events greater than the prev event_log_id-1.
             # this way, the first record returned should be the last record that was
@@ -436,6 +791,273 @@ class PathCache(object):
         finally:
             c.close()
 
+    ############################################################################################
+    # snapshots
+
+    def export_snapshot(self, snapshot_path):
+        """
+        Exports a snapshot of the path cache.
+
+        The snapshot is a compacted copy of the path cache database, which
+        includes the id of the last event log entry synchronized. It can be
+        used to seed the path cache of other machines with
+        :meth:`import_snapshot`, after which only the folder changes made
+        since the snapshot was exported need to be synchronized.
+
+        :param snapshot_path: Path of the snapshot file to write. If this is
+                              an existing folder, the snapshot is written in
+                              this folder with a name based on the project id.
+        :returns: The path of the snapshot file.
+        :raises: :class:`TankError` if the path cache hasn't been synchronized
+                 or the snapshot can't be written.
+        """
+        self._check_snapshot_support()
+        snapshot_path = self.get_snapshot_file(snapshot_path)
+
+        res = self._connection.execute("SELECT max(last_id) FROM event_log_sync")
+        event_log_id = list(res)[0][0]
+        if event_log_id is None:
+            raise TankError(
+                "The path cache has not been synchronized yet, a snapshot can't be "
+                "exported."
+            )
+
+        try:
+            filesystem.ensure_folder_exists(os.path.dirname(snapshot_path))
+            with filesystem.atomic_write(snapshot_path) as temp_path:
+                snapshot_connection = sqlite3.connect(temp_path)
+                try:
+                    self._connection.backup(snapshot_connection)
+                    snapshot_connection.execute(
+                        "CREATE TABLE snapshot_info (name text, value text)"
+                    )
+                    snapshot_connection.executemany(
+                        "INSERT INTO snapshot_info(name, value) VALUES(?, ?)",
+                        [
+                            ("version", str(self.SNAPSHOT_VERSION)),
+                            (
+                                "project_id",
+                                str(self._tk.pipeline_configuration.get_project_id()),
+                            ),
+                            ("roots", self._get_snapshot_roots()),
+                            ("last_event_log_id", str(event_log_id)),
+                            ("created", str(int(time.time()))),
+                        ],
+                    )
+                    snapshot_connection.commit()
+                    # compact the database
+                    snapshot_connection.execute("VACUUM")
+                finally:
+                    snapshot_connection.close()
+        except (sqlite3.Error, OSError) as e:
+            raise TankError(
+                "Could not export the path cache snapshot to '%s': %s"
+                % (snapshot_path, e)
+            )
+
+        log.debug(
+            "Exported path cache snapshot to %s, synchronized up to event log id %s."
+            % (snapshot_path, event_log_id)
+        )
+        return snapshot_path
+
+    def import_snapshot(self, snapshot_path, if_empty=False):
+        """
+        Replaces the content of the path cache with a snapshot exported with
+        :meth:`export_snapshot`.
+
+        The next :meth:`synchronize` will then only synchronize the folder
+        changes made since the snapshot was exported.
+
+        The snapshot is copied in a single transaction, so other processes
+        never see a partially imported path cache.
+
+        :param snapshot_path: Path of the snapshot file, or of the folder it
+                              was exported to.
+        :param bool if_empty: If True, the snapshot is only imported if the path
+                              cache has never been synchronized, which is checked
+                              once the database is locked.
+        :returns: The id of the last event log entry synchronized in the snapshot,
+                  or in the path cache if it was not empty and ``if_empty`` is True.
+        :raises: :class:`TankError` if the snapshot is invalid or was exported
+                 for another project or storage roots.
+        """
+        self._check_snapshot_support()
+        snapshot_path = self.get_snapshot_file(snapshot_path)
+
+        if not os.path.isfile(snapshot_path):
+            raise TankError(
+                "The path cache snapshot '%s' does not exist." % snapshot_path
+            )
+
+        connection = self._connection
+        try:
+            connection.execute("ATTACH DATABASE ? AS snapshot", (snapshot_path,))
+            try:
+                # lock the database before checking it is empty, so that a
+                # synchronization committed by another process in the meantime
+                # is not overwritten.
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    event_log_id = self._copy_snapshot(snapshot_path, if_empty)
+                except BaseException:
+                    connection.rollback()
+                    raise
+                connection.commit()
+            finally:
+                connection.execute("DETACH DATABASE snapshot")
+        except sqlite3.Error as e:
+            raise TankError(
+                "Could not import the path cache snapshot '%s': %s" % (snapshot_path, e)
+            )
+
+        if event_log_id is None:
+            event_log_id = list(
+                connection.execute("SELECT max(last_id) FROM event_log_sync")
+            )[0][0]
+            log.debug(
+                "The path cache was synchronized up to event log id %s while the "
+                "snapshot %s was imported, the snapshot was ignored."
+                % (event_log_id, snapshot_path)
+            )
+            return event_log_id
+
+        self._refresh_replica()
+
+        log.debug(
+            "Imported path cache snapshot %s, synchronized up to event log id %s."
+            % (snapshot_path, event_log_id)
+        )
+        return event_log_id
+
+    def _copy_snapshot(self, snapshot_path, if_empty):
+        """
+        Replaces the content of the path cache tables with the content of the
+        attached snapshot. Must be called inside a transaction.
+
+        :param snapshot_path: Path of the snapshot file.
+        :param bool if_empty: If True, nothing is copied if the path cache has
+                              already been synchronized.
+        :returns: The id of the last event log entry synchronized in the
+                  snapshot, or None if nothing was copied.
+        :raises: :class:`TankError` if the snapshot can't be imported.
+        """
+        connection = self._connection
+        snapshot_info = dict(
+            connection.execute("SELECT name, value FROM snapshot.snapshot_info")
+        )
+        self._validate_snapshot_info(snapshot_path, snapshot_info)
+
+        if if_empty:
+            res = connection.execute("SELECT max(last_id) FROM main.event_log_sync")
+            if list(res)[0][0] is not None:
+                return None
+
+        for table in ("path_cache", "event_log_sync", "shotgun_status"):
+            columns = ", ".join(
+                x[1] for x in connection.execute("PRAGMA main.table_info(%s)" % table)
+            )
+            connection.execute("DELETE FROM main.%s" % table)
+            # row ids are copied, since shotgun_status references path_cache rows.
+            connection.execute(
+                "INSERT INTO main.%s(rowid, %s) SELECT rowid, %s FROM snapshot.%s"
+                % (table, columns, columns, table)
+            )
+        return int(snapshot_info["last_event_log_id"])
+
+    def _check_snapshot_support(self):
+        """
+        Ensures snapshots can be used for this path cache.
+
+        :raises: :class:`TankError` if the project doesn't synchronize its folders.
+        """
+        if self._path_cache_disabled:
+            raise TankError("This project does not have any associated folders.")
+
+        if not self._sync_with_sg:
+            raise TankError(
+                "Folder synchronization is turned off for this project, path cache "
+                "snapshots are not supported."
+            )
+
+    def get_snapshot_file(self, snapshot_path):
+        """
+        Returns the path of the snapshot file for a snapshot path.
+
+        :param snapshot_path: Path to a snapshot file, or to a folder containing
+                              snapshots.
+        :returns: The path to the snapshot file.
+        """
+        if os.path.isdir(snapshot_path):
+            return os.path.join(
+                snapshot_path,
+                "path_cache_%s.snapshot"
+                % self._tk.pipeline_configuration.get_project_id(),
+            )
+        return snapshot_path
+
+    def _validate_snapshot_info(self, snapshot_path, snapshot_info):
+        """
+        Ensures a snapshot can be imported in this path cache.
+
+        :param snapshot_path: Path of the snapshot file.
+        :param dict snapshot_info: Content of the snapshot_info table.
+        :raises: :class:`TankError` if the snapshot can't be imported.
+        """
+        if snapshot_info.get("version") != str(self.SNAPSHOT_VERSION):
+            raise TankError(
+                "The path cache snapshot '%s' has version %s, which is not supported. "
+                "Expected version %s."
+                % (snapshot_path, snapshot_info.get("version"), self.SNAPSHOT_VERSION)
+            )
+
+        project_id = self._tk.pipeline_configuration.get_project_id()
+        if snapshot_info.get("project_id") != str(project_id):
+            raise TankError(
+                "The path cache snapshot '%s' was exported for project id %s, not "
+                "for project id %s."
+                % (snapshot_path, snapshot_info.get("project_id"), project_id)
+            )
+
+        # paths are stored relative to the storage roots they are in.
+        roots = self._get_snapshot_roots()
+        if snapshot_info.get("roots") != roots:
+            raise TankError(
+                "The path cache snapshot '%s' was exported for storage roots %s, not "
+                "for storage roots %s."
+                % (snapshot_path, snapshot_info.get("roots"), roots)
+            )
+
+    def _get_snapshot_roots(self):
+        """
+        Returns the storage roots of the path cache, as stored in snapshots.
+
+        :returns: Json list of the storage root names.
+        """
+        return json.dumps(sorted(self._roots))
+
+    def _seed_from_snapshot(self):
+        """
+        Seeds the path cache from the snapshot set with the
+        ``TK_PATH_CACHE_SNAPSHOT`` environment variable, if any.
+
+        :returns: The id of the last event log entry synchronized in the snapshot,
+                  or None if the path cache wasn't seeded.
+        """
+        snapshot_path = os.environ.get(constants.PATH_CACHE_SNAPSHOT_ENV_VAR)
+        if not snapshot_path:
+            return None
+
+        if not os.path.isfile(self.get_snapshot_file(snapshot_path)):
+            log.debug("No path cache snapshot found in %s." % snapshot_path)
+            return None
+
+        try:
+            return self.import_snapshot(snapshot_path, if_empty=True)
+        except TankError as e:
+            log.warning("Could not seed the path cache from a snapshot: %s" % e)
+            return None
+
     def _upload_cache_data_to_shotgun(self, data, event_log_desc):
         """
         Takes a standard chunk of Shotgun data and uploads it to Shotgun
@@ -775,10 +1397,22 @@ class PathCache(object):
 
         new_items = []
 
+        # entries of consecutive creation events, imported together
+        pending_entities = []
+
         for event in sg_data:
             sg_folder_ids = event["meta"].get("sg_folder_ids")
 
             if event["event_type"] == "Toolkit_Folders_Delete":
+                # Events are replayed in order, so first import the entries
+                # created before this deletion.
+                if pending_entities:
+                    new_items.extend(
+                        self._import_filesystem_location_entries(
+                            cursor, pending_entities
+                        )
+                    )
+                    pending_entities = []
                 # Remove all the entries associated with that event.
                 self._remove_filesystem_location_entities(cursor, sg_folder_ids)
             elif event["event_type"] == "Toolkit_Folders_Create":
@@ -786,16 +1420,17 @@ class PathCache(object):
                 for folder_id in sg_folder_ids:
                     # If the entry is actually part of the end result, we'll add it!
                     if folder_id in created_folder_entities:
-                        new_item = self._import_filesystem_location_entry(
-                            cursor, created_folder_entities[folder_id]
-                        )
-                        # If the entry was actually imported.
-                        if new_item:
-                            new_items.append(new_item)
+                        pending_entities.append(created_folder_entities[folder_id])
+
+        if pending_entities:
+            new_items.extend(
+                self._import_filesystem_location_entries(cursor, pending_entities)
+            )
 
         self._update_last_event_log_synced(cursor, max_event_log_id)
 
         self._connection.commit()
+        self._refresh_replica()
 
         # run the actual sync - and at the end, inser the event_log_sync data marker
         # into the database to show where to start syncing from next time.
@@ -817,72 +1452,131 @@ class PathCache(object):
             - linked_entity_type
             - code
         """
+        sg_data = []
+        for page in self._get_filesystem_location_pages(folder_ids):
+            sg_data.extend(page)
+
+        log.debug("...Retrieved %s records.", len(sg_data))
 
-        # get the ids that are missing from shotgun
-        batches = []
+        return sg_data
 
+    def _get_filesystem_location_pages(self, folder_ids):
+        """
+        Starts retrieving filesystem location entities from Shotgun.
+
+        Entities are retrieved in batches, concurrently. The batches are returned
+        in order as soon as they are available, so that they can be processed
+        while the next ones are being retrieved.
+
+        :param list folder_ids: List of ids of entities to retrieve. If None, every entry is returned.
+
+        :returns: Iterator of lists of FilesystemLocation entity dictionaries,
+                  see :meth:`_get_filesystem_location_entities`.
+        """
         # We check specifically for a None here because it is a valid
         # use case to pass in an empty list of folder ids and get nothing
         # back in return as a result. Only in the case where we were
         # specifically given folder_ids=None would we fall back on
         # collecting all FilesystemLocation entities for the project.
         if folder_ids is not None:
-            entity_filter = [["id", "in"]]
-            batch_count = 0
-
-            # Note: we batch the queries here. We want to avoid paging
-            # for performance purposes when dealing with huge numbers
-            # of entities (thousands+).
-            for folder_id in folder_ids:
-                if batch_count >= self.SHOTGUN_ENTITY_QUERY_BATCH_SIZE:
-                    batches.append(entity_filter)
-                    entity_filter = [["id", "in"]]
-                    batch_count = 0
-
-                entity_filter[0].append(folder_id)
-                batch_count += 1
-
-            # Take care of the last batch, which is likely below our
-            # batch size and needs to be tacked onto the end.
-            if batch_count > 0:
-                batches.append(entity_filter)
-
             log.debug(
                 "Getting FilesystemLocation entries for " "the following ids: %s",
                 folder_ids,
             )
         else:
             project_entity = self._get_project_link()
-            entity_filter = [["project", "is", project_entity]]
-            batches.append(entity_filter)
             log.debug(
                 "Getting all the project's FilesystemLocation entries. "
                 "Project id: %s" % project_entity["id"]
             )
-
-        sg_data = []
-
-        for batched_filter in batches:
-            sg_data.extend(
-                self._tk.shotgun.find(
+            # Only the ids are retrieved first, which is much faster than
+            # retrieving the complete records, so that the records can then be
+            # retrieved concurrently.
+            folder_ids = [
+                x["id"]
+                for x in self._tk.shotgun.find(
                     SHOTGUN_ENTITY,
-                    batched_filter,
-                    [
-                        "id",
-                        SG_METADATA_FIELD,
-                        SG_IS_PRIMARY_FIELD,
-                        SG_ENTITY_ID_FIELD,
-                        SG_PATH_FIELD,
-                        SG_ENTITY_TYPE_FIELD,
-                        SG_ENTITY_NAME_FIELD,
-                    ],
+                    [["project", "is", project_entity]],
+                    ["id"],
                     [{"field_name": "id", "direction": "asc"}],
                 )
+            ]
+
+        # Note: we batch the queries here. We want to avoid paging
+        # for performance purposes when dealing with huge numbers
+        # of entities (thousands+).
+        batches = [
+            [["id", "in"] + batch_ids]
+            for batch_ids in _chunks(
+                list(folder_ids), self.SHOTGUN_ENTITY_QUERY_BATCH_SIZE
             )
+        ]
 
-        log.debug("...Retrieved %s records.", len(sg_data))
+        if len(batches) < 2:
+            # no need for threads
+            return (self._find_filesystem_location_entities(f) for f in batches)
 
-        return sg_data
+        executor = _get_query_executor()
+        futures = [
+            executor.submit(self._find_filesystem_location_entities, batched_filter)
+            for batched_filter in batches
+        ]
+        return self._iter_pages(futures)
+
+    def _iter_pages(self, futures):
+        """
+        Returns the results of futures in order, as they become available,
+        and logs the progress.
+
+        :param futures: List of :class:`concurrent.futures.Future` returning lists.
+        :returns: Iterator of lists.
+        """
+        start = time.perf_counter()
+        record_count = 0
+        try:
+            for index, future in enumerate(futures):
+                page = future.result()
+                record_count += len(page)
+                elapsed = time.perf_counter() - start
+                log.debug(
+                    "Retrieved batch %d/%d of FilesystemLocation entries: "
+                    "%d records in %.2fs (%.0f records/s)."
+                    % (
+                        index + 1,
+                        len(futures),
+                        record_count,
+                        elapsed,
+                        record_count / elapsed if elapsed else 0,
+                    )
+                )
+                yield page
+        finally:
+            # stop retrieving batches if the caller stopped early
+            for future in futures:
+                future.cancel()
+
+    def _find_filesystem_location_entities(self, entity_filter):
+        """
+        Retrieves a batch of filesystem location entities from Shotgun.
+
+        :param entity_filter: Shotgun filter for the entities.
+        :returns: List of FilesystemLocation entity dictionaries,
+                  see :meth:`_get_filesystem_location_entities`.
+        """
+        return self._tk.shotgun.find(
+            SHOTGUN_ENTITY,
+            entity_filter,
+            [
+                "id",
+                SG_METADATA_FIELD,
+                SG_IS_PRIMARY_FIELD,
+                SG_ENTITY_ID_FIELD,
+                SG_PATH_FIELD,
+                SG_ENTITY_TYPE_FIELD,
+                SG_ENTITY_NAME_FIELD,
+            ],
+            [{"field_name": "id", "direction": "asc"}],
+        )
 
     def _replay_folder_entities(self, cursor, max_event_log_id):
         """
@@ -907,7 +1601,7 @@ class PathCache(object):
             "Fetching already registered folders from Flow Production Tracking..."
         )
 
-        sg_data = self._get_filesystem_location_entities(folder_ids=None)
+        pages = self._get_filesystem_location_pages(folder_ids=None)
 
         # complete sync - clear our tables first
         log.debug("Full sync - clearing local sqlite path cache tables...")
@@ -917,10 +1611,18 @@ class PathCache(object):
 
         return_data = []
 
-        for x in sg_data:
-            imported_data = self._import_filesystem_location_entry(cursor, x)
-            if imported_data:
-                return_data.append(imported_data)
+        # import the batches of entries as they are retrieved
+        start = time.perf_counter()
+        record_count = 0
+        for page in pages:
+            record_count += len(page)
+            return_data.extend(self._import_filesystem_location_entries(cursor, page))
+
+        elapsed = time.perf_counter() - start
+        log.debug(
+            "...Retrieved and imported %s records in %.2fs (%.0f records/s)."
+            % (record_count, elapsed, record_count / elapsed if elapsed else 0)
+        )
 
         # lastly, save the id of this event log entry for purpose of future syncing
         # note - we don't maintain a list of event log entries but just a single
@@ -929,6 +1631,7 @@ class PathCache(object):
         self._update_last_event_log_synced(cursor, max_event_log_id)
 
         self._connection.commit()
+        self._refresh_replica()
 
         return return_data
 
@@ -944,13 +1647,17 @@ class PathCache(object):
         cursor.execute("DELETE FROM event_log_sync")
         cursor.execute("INSERT INTO event_log_sync(last_id) VALUES(?)", (event_log_id,))
 
-    def _import_filesystem_location_entry(self, cursor, fsl_entity):
+    def _import_filesystem_location_entries(self, cursor, fsl_entities):
         """
-        Imports a single filesystem location into the path cache.
+        Imports filesystem locations into the path cache.
+
+        Entries are validated and checked against the existing records in order,
+        as if they were added one at a time with :meth:`_add_db_mapping`, and are
+        then inserted with bulk inserts.
 
         :param cursor: Database cursor.
         :type :class:`sqlite3.Cursor`
-        :param dict fsl_entry: Filesystem location entity dictionary with keys:
+        :param list fsl_entities: Filesystem location entity dictionaries with keys:
             - id
             - type
             - configuration_metadata
@@ -959,6 +1666,169 @@ class PathCache(object):
             - path
             - linked_entity_type
             - code
+        :returns: A list of the imported items. These are returned as a list of
+                  dictionaries, each containing keys:
+                    - entity
+                    - metadata
+                    - path
+        """
+        entries = []
+        for fsl_entity in fsl_entities:
+            entry = self._get_filesystem_location_entry(fsl_entity)
+            if entry:
+                entries.append(entry)
+
+        if not entries:
+            return []
+
+        # Make sure this transaction holds the write lock before looking at the
+        # existing records, so that other processes can't change them before the
+        # new records are inserted.
+        cursor.execute("UPDATE path_cache SET rowid = rowid WHERE 0")
+
+        # Get the existing records for the paths to import
+        # {(root, path): [primary entities]}
+        primary_entities = collections.defaultdict(list)
+        # {(root, path, entity_type, entity_id)}
+        path_entities = set()
+        root_db_paths = collections.defaultdict(set)
+        for entry in entries:
+            root_db_paths[entry["root"]].add(entry["db_path"])
+        for root_name, db_paths in root_db_paths.items():
+            # split sql into batches - sqlite has a max number of terms for its in statement
+            for subset_db_paths in _chunks(
+                list(db_paths), self.SQLITE_MAX_ITEMS_FOR_IN_STATEMENT - 1
+            ):
+                res = cursor.execute(
+                    "SELECT path, entity_type, entity_id, entity_name, primary_entity "
+                    "FROM path_cache WHERE root = ? AND path IN (%s)"
+                    % self._gen_param_string(subset_db_paths),
+                    [root_name] + subset_db_paths,
+                )
+                for db_path, entity_type, entity_id, entity_name, primary in res:
+                    path_entities.add((root_name, db_path, entity_type, entity_id))
+                    if primary == 1:
+                        primary_entities[(root_name, db_path)].append(
+                            {
+                                "type": str(entity_type),
+                                "id": entity_id,
+                                "name": str(entity_name),
+                            }
+                        )
+
+        res = cursor.execute("SELECT max(rowid) FROM path_cache")
+        next_rowid = (list(res)[0][0] or 0) + 1
+
+        path_cache_rows = []
+        shotgun_status_rows = []
+        new_items = []
+        for entry in entries:
+            entity = entry["entity"]
+            root_name = entry["root"]
+            db_path = entry["db_path"]
+            path_key = (root_name, db_path, entity["type"], entity["id"])
+
+            if entry["primary"]:
+                # the primary entity must be unique: path/id/type
+                curr_entities = primary_entities[(root_name, db_path)]
+                if len(curr_entities) > 1:
+                    # never supposed to happen!
+                    raise TankError(
+                        "More than one entry in path database for %s!" % entry["path"]
+                    )
+                elif curr_entities:
+                    # this path is already registered. Ensure it is connected to
+                    # our entity! See _add_db_mapping for details.
+                    curr_entity = curr_entities[0]
+                    if (
+                        curr_entity["type"] != entity["type"]
+                        or curr_entity["id"] != entity["id"]
+                    ):
+                        raise TankError(
+                            "Database concurrency problems: The path '%s' is "
+                            "already associated with PTR entity %s. Please re-run "
+                            "folder creation to try again."
+                            % (entry["path"], str(curr_entity))
+                        )
+                    self._log_existing_filesystem_location_entry(entry)
+                    continue
+                curr_entities.append(entity)
+
+            elif path_key in path_entities:
+                # secondary entity
+                # in this case, it is okay with more than one record for a path
+                # but we don't want to insert the exact same record over and over again
+                self._log_existing_filesystem_location_entry(entry)
+                continue
+
+            path_entities.add(path_key)
+            path_cache_rows.append(
+                (
+                    next_rowid,
+                    entity["type"],
+                    entity["id"],
+                    entity["name"],
+                    root_name,
+                    db_path,
+                    entry["primary"],
+                )
+            )
+            # because this record came from shotgun, insert a record in the
+            # shotgun_status table to indicate that this record exists in sg
+            shotgun_status_rows.append((next_rowid, entry["shotgun_id"]))
+            next_rowid += 1
+
+            # and add this entry to our list of new things that we will return later on.
+            new_items.append(
+                {
+                    "entity": entity,
+                    "path": entry["path"],
+                    "metadata": SG_METADATA_FIELD,
+                }
+            )
+
+        cursor.executemany(
+            """INSERT INTO path_cache(rowid,
+                                      entity_type,
+                                      entity_id,
+                                      entity_name,
+                                      root,
+                                      path,
+                                      primary_entity)
+                       VALUES(?, ?, ?, ?, ?, ?, ?)""",
+            path_cache_rows,
+        )
+        cursor.executemany(
+            "INSERT INTO shotgun_status(path_cache_id, shotgun_id) VALUES(?, ?)",
+            shotgun_status_rows,
+        )
+
+        return new_items
+
+    def _log_existing_filesystem_location_entry(self, entry):
+        """
+        Logs that a filesystem location entry is already in the path cache.
+
+        :param dict entry: Entry returned by :meth:`_get_filesystem_location_entry`.
+        """
+        # Note: edge case - for some reason there was already an entry in the path cache
+        # representing this. This could be because of duplicate entries and is
+        # not necessarily an anomaly. It could also happen because a previos sync failed
+        # at some point half way through.
+        log.debug(
+            "Found existing record for '%s', %s. Skipping."
+            % (entry["path"], entry["entity"])
+        )
+
+    def _get_filesystem_location_entry(self, fsl_entity):
+        """
+        Validates a filesystem location entity and extracts the data to
+        store in the path cache.
+
+        :param dict fsl_entry: Filesystem location entity dictionary, see
+                               :meth:`_import_filesystem_location_entries`.
+        :returns: None if the entity can't be imported, otherwise a dictionary
+                  with keys entity, path, root, db_path, primary and shotgun_id.
         """
         # get entity data from our entry
         entity = {
@@ -1040,34 +1910,14 @@ class PathCache(object):
             log.debug("Could not resolve storages - skipping: %s" % e)
             return None
 
-        # all validation checks seem ok - go ahead and make the changes.
-        new_rowid = self._add_db_mapping(cursor, local_os_path, entity, is_primary)
-        if new_rowid:
-            # something was inserted into the db!
-            # because this record came from shotgun, insert a record in the
-            # shotgun_status table to indicate that this record exists in sg
-            cursor.execute(
-                "INSERT INTO shotgun_status(path_cache_id, shotgun_id) " "VALUES(?, ?)",
-                (new_rowid, fsl_entity["id"]),
-            )
-
-            # and add this entry to our list of new things that we will return later on.
-            return {
-                "entity": entity,
-                "path": local_os_path,
-                "metadata": SG_METADATA_FIELD,
-            }
-
-        else:
-            # Note: edge case - for some reason there was already an entry in the path cache
-            # representing this. This could be because of duplicate entries and is
-            # not necessarily an anomaly. It could also happen because a previos sync failed
-            # at some point half way through.
-            log.debug(
-                "Found existing record for '%s', %s. Skipping."
-                % (local_os_path, entity)
-            )
-            return None
+        return {
+            "entity": entity,
+            "path": local_os_path,
+            "root": root_name,
+            "db_path": self._path_to_dbpath(relative_path),
+            "primary": is_primary,
+            "shotgun_id": fsl_entity["id"],
+        }
 
     def _gen_param_string(self, items):
         """
@@ -1092,13 +1942,6 @@ class PathCache(object):
 
         log.debug("Processing %s Toolkit_Folders_Delete events", len(folder_ids))
 
-        def _chunks(large_list, chunk_size):
-            """
-            Helper operator to split a large list into smaller chunks
-            """
-            for i in range(0, len(large_list), chunk_size):
-                yield large_list[i : i + chunk_size]
-
         # For every folder id, find the associated path cache id.
         all_path_cache_ids = []
 
@@ -1126,7 +1969,7 @@ class PathCache(object):
         # The final result is that only add 2 will be in the path cache.
         #
         # While incrementally updating the path cache, entry 1 will never be added to the path cache
-        # because it doesn't exist in Shotgun anymore. Because of this, _import_filesystem_location_entry
+        # because it doesn't exist in Shotgun anymore. Because of this, _import_filesystem_location_entries
         # will skip importing entry 1 because it isn't in the result final set of entities. When this
         # happens, it means that it also can't be removed from the path cache. As such, shotgun_status
         # will not report any mapping between the path cache and the Shotgun filesystem location
@@ -1350,6 +2193,7 @@ class PathCache(object):
         else:
             # Shotgun insert complete! Now we can commit path cache transaction
             self._connection.commit()
+            self._refresh_replica()
 
         finally:
             c.close()
@@ -1498,24 +2342,16 @@ class PathCache(object):
             # eg. doesn't belong to the project
             return None
 
-        # use built in cursor unless specifically provided - means this
-        # is part of a larger transaction
-        c = self._connection.cursor()
-
-        try:
-            db_path = self._path_to_dbpath(relative_path)
-            res = c.execute(
-                """
-                            select ss.shotgun_id
-                            from shotgun_status ss
-                            inner join path_cache pc on pc.rowid = ss.path_cache_id
-                            where pc.path = ? and pc.root = ? and pc.primary_entity = 1
-                            """,
-                (db_path, root_path),
-            )
-            data = list(res)
-        finally:
-            c.close()
+        db_path = self._path_to_dbpath(relative_path)
+        data = self._execute_lookup(
+            """
+                        select ss.shotgun_id
+                        from shotgun_status ss
+                        inner join path_cache pc on pc.rowid = ss.path_cache_id
+                        where pc.path = ? and pc.root = ? and pc.primary_entity = 1
+                        """,
+            (db_path, root_path),
+        )
 
         if len(data) > 1:
             # never supposed to happen!
@@ -1602,37 +2438,30 @@ class PathCache(object):
 
         paths = []
 
-        # use built in cursor unless specifically provided - means this
-        # is part of a larger transaction
-        c = cursor or self._connection.cursor()
+        if primary_only:
+            sql = "SELECT root, path FROM path_cache WHERE entity_type = ? AND entity_id = ? and primary_entity = 1"
+        else:
+            sql = "SELECT root, path FROM path_cache WHERE entity_type = ? AND entity_id = ?"
 
-        try:
-            if primary_only:
-                res = c.execute(
-                    "SELECT root, path FROM path_cache WHERE entity_type = ? AND entity_id = ? and primary_entity = 1",
-                    (entity_type, entity_id),
-                )
-            else:
-                res = c.execute(
-                    "SELECT root, path FROM path_cache WHERE entity_type = ? AND entity_id = ?",
-                    (entity_type, entity_id),
-                )
+        # use the lookup connection unless a cursor is specifically provided -
+        # means this is part of a larger transaction
+        if cursor is None:
+            res = self._execute_lookup(sql, (entity_type, entity_id))
+        else:
+            res = cursor.execute(sql, (entity_type, entity_id))
 
-            for row in res:
-                root_name = row[0]
-                relative_path = row[1]
+        for row in res:
+            root_name = row[0]
+            relative_path = row[1]
 
-                root_path = self._roots.get(root_name)
-                if not root_path:
-                    # The root name doesn't match a recognized name, so skip this entry
-                    continue
+            root_path = self._roots.get(root_name)
+            if not root_path:
+                # The root name doesn't match a recognized name, so skip this entry
+                continue
 
-                # assemble path
-                path_str = self._dbpath_to_path(root_path, relative_path)
-                paths.append(path_str)
-        finally:
-            if cursor is None:
-                c.close()
+            # assemble path
+            path_str = self._dbpath_to_path(root_path, relative_path)
+            paths.append(path_str)
 
         return paths
 
@@ -1666,20 +2495,15 @@ class PathCache(object):
             # eg. doesn't belong to the project
             return None
 
-        # use built in cursor unless specifically provided - means this
-        # is part of a larger transaction
-        c = cursor or self._connection.cursor()
+        db_path = self._path_to_dbpath(relative_path)
+        sql = "SELECT entity_type, entity_id, entity_name FROM path_cache WHERE path = ? AND root = ? and primary_entity = 1"
 
-        try:
-            db_path = self._path_to_dbpath(relative_path)
-            res = c.execute(
-                "SELECT entity_type, entity_id, entity_name FROM path_cache WHERE path = ? AND root = ? and primary_entity = 1",
-                (db_path, root_path),
-            )
-            data = list(res)
-        finally:
-            if cursor is None:
-                c.close()
+        # use the lookup connection unless a cursor is specifically provided -
+        # means this is part of a larger transaction
+        if cursor is None:
+            data = self._execute_lookup(sql, (db_path, root_path))
+        else:
+            data = list(cursor.execute(sql, (db_path, root_path)))
 
         if len(data) > 1:
             # never supposed to happen!
@@ -1692,6 +2516,182 @@ class PathCache(object):
         else:
             return None
 
+    def get_entities(self, paths):
+        """
+        Returns the entities associated with a collection of paths.
+
+        This is the bulk version of :meth:`get_entity`, resolving all the paths
+        with a query for each batch of paths instead of one query per path.
+
+        :param paths: List of paths on disk.
+        :returns: Dictionary keyed by path of Shotgun entity dicts, e.g.
+                  ``{"type": "Shot", "name": "xxx", "id": 123}``, or None
+                  for paths without an entity.
+        """
+        entities = dict((path, None) for path in paths)
+
+        if self._path_cache_disabled:
+            # no entries because we don't have a path cache
+            return entities
+
+        for root_path, db_paths in self._group_db_paths_by_root(entities).items():
+            # split sql into batches - sqlite has a max number of terms for its in statement
+            for subset_db_paths in _chunks(
+                list(db_paths), self.SQLITE_MAX_ITEMS_FOR_IN_STATEMENT - 1
+            ):
+                data = self._execute_lookup(
+                    "SELECT path, entity_type, entity_id, entity_name FROM path_cache "
+                    "WHERE root = ? AND path IN (%s) and primary_entity = 1"
+                    % self._gen_param_string(subset_db_paths),
+                    [root_path] + subset_db_paths,
+                )
+                for db_path, entity_type, entity_id, entity_name in data:
+                    for path in db_paths[db_path]:
+                        if entities[path] is not None:
+                            # never supposed to happen!
+                            raise TankError(
+                                "More than one entry in path database for %s!" % path
+                            )
+                        # convert to string, not unicode!
+                        entities[path] = {
+                            "type": str(entity_type),
+                            "id": entity_id,
+                            "name": str(entity_name),
+                        }
+
+        return entities
+
+    def get_path_entities(self, paths):
+        """
+        Returns the primary and secondary entities associated with a collection
+        of paths.
+
+        This resolves all the paths with a query for each batch of paths instead
+        of a :meth:`get_entity` and a :meth:`get_secondary_entities` query per
+        path, e.g. to look up all the parent folders of a path at once.
+
+        :param paths: List of paths on disk.
+        :returns: Dictionary keyed by path of tuples with the primary entity,
+                  or None, and the list of secondary entities of the path.
+                  Entities are Shotgun entity dicts, e.g.
+                  ``{"type": "Shot", "name": "xxx", "id": 123}``.
+        """
+        path_entities = dict((path, (None, [])) for path in paths)
+
+        if self._path_cache_disabled:
+            # no entries because we don't have a path cache
+            return path_entities
+
+        root_db_paths = self._group_db_paths_by_root(path_entities)
+        for root_path, db_paths in root_db_paths.items():
+            rows = []
+            # split sql into batches - sqlite has a max number of terms for its in statement
+            for subset_db_paths in _chunks(
+                list(db_paths), self.SQLITE_MAX_ITEMS_FOR_IN_STATEMENT - 1
+            ):
+                rows.extend(
+                    self._execute_lookup(
+                        "SELECT rowid, path, entity_type, entity_id, entity_name, "
+                        "primary_entity FROM path_cache WHERE root = ? AND path IN (%s)"
+                        % self._gen_param_string(subset_db_paths),
+                        [root_path] + subset_db_paths,
+                    )
+                )
+
+            # secondary entities are returned in the order they were added
+            rows.sort()
+            for _, db_path, entity_type, entity_id, entity_name, primary in rows:
+                for path in db_paths[db_path]:
+                    # convert to string, not unicode!
+                    entity = {
+                        "type": str(entity_type),
+                        "id": entity_id,
+                        "name": str(entity_name),
+                    }
+                    entity_data, secondary_entities = path_entities[path]
+                    if not primary:
+                        secondary_entities.append(entity)
+                    elif entity_data is not None:
+                        # never supposed to happen!
+                        raise TankError(
+                            "More than one entry in path database for %s!" % path
+                        )
+                    else:
+                        path_entities[path] = (entity, secondary_entities)
+
+        return path_entities
+
+    def _group_db_paths_by_root(self, paths):
+        """
+        Splits paths into roots and db paths.
+
+        Paths which are None or don't belong to the project are skipped.
+
+        :param paths: Paths on disk.
+        :returns: Dictionary keyed by root name of dictionaries keyed by db path
+                  of the list of paths using them.
+        """
+        root_db_paths = collections.defaultdict(lambda: collections.defaultdict(list))
+        for path in paths:
+            if path is None:
+                # basic sanity checking
+                continue
+            try:
+                root_path, relative_path = self._separate_root(path)
+            except TankError:
+                # fail gracefully if path is not a valid path
+                # eg. doesn't belong to the project
+                continue
+            root_db_paths[root_path][self._path_to_dbpath(relative_path)].append(path)
+        return root_db_paths
+
+    def get_paths_many(self, entities, primary_only):
+        """
+        Returns the paths associated with a collection of Shotgun entities.
+
+        This is the bulk version of :meth:`get_paths`, resolving all the entities
+        with a query for each batch of entities of the same type instead of one
+        query per entity.
+
+        :param entities: List of ``(entity_type, entity_id)`` tuples.
+        :param primary_only: Only return items marked as primary
+        :returns: Dictionary keyed by ``(entity_type, entity_id)`` tuples of lists
+                  of paths on disk.
+        """
+        paths = dict((entity, []) for entity in entities)
+
+        if self._path_cache_disabled:
+            # no entries because we don't have a path cache
+            return paths
+
+        entity_ids = collections.defaultdict(list)
+        for entity_type, entity_id in paths:
+            entity_ids[entity_type].append(entity_id)
+
+        sql = "SELECT entity_id, root, path FROM path_cache WHERE entity_type = ? AND entity_id IN (%s)"
+        if primary_only:
+            sql += " and primary_entity = 1"
+
+        for entity_type, ids in entity_ids.items():
+            # split sql into batches - sqlite has a max number of terms for its in statement
+            for subset_ids in _chunks(ids, self.SQLITE_MAX_ITEMS_FOR_IN_STATEMENT - 1):
+                data = self._execute_lookup(
+                    sql % self._gen_param_string(subset_ids),
+                    [entity_type] + subset_ids,
+                )
+                for entity_id, root_name, relative_path in data:
+                    root_path = self._roots.get(root_name)
+                    if not root_path:
+                        # The root name doesn't match a recognized name, so skip this entry
+                        continue
+
+                    # assemble path
+                    paths[(entity_type, entity_id)].append(
+                        self._dbpath_to_path(root_path, relative_path)
+                    )
+
+        return paths
+
     def get_secondary_entities(self, path):
         """
         Returns all the secondary entities for a path.
@@ -1901,3 +2901,36 @@ class PathCache(object):
             "Migration complete. %s records created in Flow Production Tracking"
             % len(sg_valid_records)
         )
+
+
+class PathCachePool(object):
+    """
+    Path cache instances reused for the lookups made with a Toolkit API
+    instance, so that each lookup doesn't have to open the database.
+
+    Sqlite connections can only be used by the thread which created them, so
+    one instance is kept per thread.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, tk):
+        """
+        Returns the path cache instance of the current thread.
+
+        The returned instance is shared and must not be closed. A new instance
+        is created if it was closed anyway, or if the path cache file was
+        replaced since it was opened.
+
+        :param tk: Toolkit API instance
+        :returns: A :class:`PathCache` instance.
+        """
+        path_cache = getattr(self._local, "path_cache", None)
+        if path_cache is not None and not path_cache._prepare_reuse():
+            path_cache.close()
+            path_cache = None
+        if path_cache is None:
+            path_cache = PathCache(tk)
+            self._local.path_cache = path_cache
+        return path_cache
@@ -19,7 +19,14 @@ import pickle
 
 from tank_vendor import yaml
 
-from . import LogManager, constants, hook, pipelineconfig_utils, template_includes
+from . import (
+    LogManager,
+    compiled_config,
+    constants,
+    hook,
+    pipelineconfig_utils,
+    template_includes,
+)
 from .descriptor import Descriptor, create_descriptor, descriptor_uri_to_dict
 from .errors import TankError, TankUnreadableFileError
 from .platform.environment import InstalledEnvironment, WritableEnvironment
@@ -285,9 +292,12 @@ class PipelineConfiguration(object):
                     % (self, self._bundle_cache_fallback_paths)
                 )
 
-        # Populate the global yaml_cache if we find a pickled cache on disk.
+        # Use the compiled config if there is an up to date one on disk,
+        # otherwise populate the global yaml_cache if we find a pickled cache.
         # TODO: For immutable configs, move this into bootstrap
-        self._populate_yaml_cache()
+        self._compiled_config = self._load_compiled_config()
+        if self._compiled_config is None:
+            self._populate_yaml_cache()
 
         # run init hook
         self.execute_core_hook_internal(
@@ -394,6 +404,30 @@ class PipelineConfiguration(object):
         """
         return os.path.join(self._pc_root, "yaml_cache.pickle")
 
+    def get_compiled_config_location(self):
+        """
+        Returns the location of the compiled config for this configuration.
+        """
+        return os.path.join(self._pc_root, compiled_config.COMPILED_CONFIG_FILE)
+
+    def _load_compiled_config(self):
+        """
+        Loads the compiled config of this configuration, or the one shipped
+        with its config folder when the configuration was baked.
+
+        :returns: A :class:`~tank.compiled_config.CompiledConfig` or None if
+                  there is no up to date compiled config.
+        """
+        config_location = self.get_config_location()
+        for path in (
+            self.get_compiled_config_location(),
+            compiled_config.get_config_file_location(config_location),
+        ):
+            data = compiled_config.CompiledConfig.load(path, config_location)
+            if data is not None:
+                return data
+        return None
+
     def _populate_yaml_cache(self):
         """
         Loads pickled yaml_cache items if they are found and merges them into
@@ -1142,6 +1176,28 @@ class PipelineConfiguration(object):
         env_obj = EnvClass(env_file, self, context)
         return env_obj
 
+    def reload_compiled_config(self):
+        """
+        Loads the compiled config from disk again, so that changes made to the
+        configuration files since it was loaded are picked up. The compiled
+        config is only used if it is still up to date with its source files.
+        """
+        self._compiled_config = self._load_compiled_config()
+
+    def get_compiled_environment_data(self, env_path, context):
+        """
+        Returns the data of an environment from the compiled config.
+
+        :param env_path: Path to the environment file.
+        :param context: Context the environment is loaded for.
+        :returns: Dictionary with the environment data, with all the includes
+                  resolved, or None if the environment is not in the compiled
+                  config or its files changed since it was compiled.
+        """
+        if self._compiled_config is None:
+            return None
+        return self._compiled_config.get_environment_data(env_path, context)
+
     def get_environment_path(self, env_name):
         """
         Returns the path to the environment yaml file for the given
@@ -1165,6 +1221,11 @@ class PipelineConfiguration(object):
         """
         Returns the templates configuration as an object
         """
+        if self._compiled_config:
+            data = self._compiled_config.get_templates_config()
+            if data is not None:
+                return data
+
         templates_file = self._get_templates_config_location()
 
         try:
@@ -1177,9 +1238,34 @@ class PipelineConfiguration(object):
 
         return data
 
+    def get_compiled_templates(self):
+        """
+        Returns the templates stored in the compiled config.
+
+        :returns: Dictionary of form {template name: template object}, or None
+                  if the compiled config has no templates for the storage roots
+                  of this configuration.
+        """
+        if self._compiled_config is None:
+            return None
+        return self._compiled_config.get_templates(
+            self.get_all_platform_data_roots(), self.get_primary_data_root_name()
+        )
+
     ########################################################################################
     # helpers and internal
 
+    def _core_hook_exists(self, hook_path):
+        """
+        Checks if a core hook is overridden in the configuration.
+
+        :param hook_path: Path to the hook in the core hooks folder.
+        :returns: True if the hook exists.
+        """
+        if self._compiled_config:
+            return self._compiled_config.has_core_hook(os.path.basename(hook_path))
+        return os.path.exists(hook_path)
+
     def execute_core_hook_internal(self, hook_name, parent, **kwargs):
         """
         Executes an old-style core hook, passing it any keyword arguments supplied.
@@ -1198,7 +1284,7 @@ class PipelineConfiguration(object):
         hook_folder = self.get_core_hooks_location()
         file_name = "%s.py" % hook_name
         hook_path = os.path.join(hook_folder, file_name)
-        if not os.path.exists(hook_path):
+        if not self._core_hook_exists(hook_path):
             # no custom hook detected in the pipeline configuration
             # fall back on the hooks that come with the currently running version
             # of the core API.
@@ -1246,7 +1332,7 @@ class PipelineConfiguration(object):
         # now add a custom hook if that exists.
         hook_folder = self.get_core_hooks_location()
         hook_path = os.path.join(hook_folder, file_name)
-        if os.path.exists(hook_path):
+        if self._core_hook_exists(hook_path):
             hook_paths.append(hook_path)
 
         try:
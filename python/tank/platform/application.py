@@ -289,7 +289,23 @@ class Application(TankBundle):
         self.logger.exception(msg)
 
 
-def get_application(engine, app_folder, descriptor, settings, instance_name, env):
+def get_application_class(app_folder):
+    """
+    Internal helper method.
+    Loads the ``app.py`` file of an app and returns the application class
+    defined in it, without instantiating it.
+
+    :param app_folder: the folder on disk where the app is located
+    :returns: Class derived from :class:`Application`
+    :raises: TankError if the file can't be loaded.
+    """
+    plugin_file = os.path.join(app_folder, constants.APP_FILE)
+    return load_plugin(plugin_file, Application)
+
+
+def get_application(
+    engine, app_folder, descriptor, settings, instance_name, env, app_class=None
+):
     """
     Internal helper method.
     (Removed from the engine base class to make it easier to run unit tests).
@@ -299,10 +315,10 @@ def get_application(engine, app_folder, descriptor, settings, instance_name, env
     :param app_folder: the folder on disk where the app is located
     :param descriptor: descriptor for the app
     :param settings: a settings dict to pass to the app
+    :param app_class: application class already loaded with
+        :func:`get_application_class`. If None, the app file is loaded.
     """
-    plugin_file = os.path.join(app_folder, constants.APP_FILE)
-
     # Instantiate the app
-    class_obj = load_plugin(plugin_file, Application)
+    class_obj = app_class or get_application_class(app_folder)
     obj = class_obj(engine, descriptor, settings, instance_name, env)
     return obj
@@ -53,6 +53,21 @@ BUNDLE_PYTHON_FOLDER = "python"
 # force use old, non-structure preseving parser
 USE_LEGACY_YAML_ENV_VAR = "TK_USE_LEGACY_YAML"
 
+# environment variable setting how many threads the apps of an engine are
+# validated and loaded with.
+APP_LOADING_THREADS_ENV_VAR = "TK_APP_LOADING_THREADS"
+
+# environment variable that if set to 1, registers the commands of apps which
+# support lazy initialization from the commands they registered on a previous
+# run and only initializes the apps when one of their commands is run.
+LAZY_APP_LOADING_ENV_VAR = "TK_LAZY_APP_LOADING"
+
+# file in the engine cache location storing the commands registered by apps
+LAZY_APP_COMMANDS_FILE = "lazy_app_commands.json"
+
+# version of the format of the lazy app commands file
+LAZY_APP_COMMANDS_FORMAT_VERSION = 1
+
 # the file to look for that defines and bootstraps an engine
 ENGINE_FILE = "engine.py"
 
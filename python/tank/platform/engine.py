@@ -14,14 +14,19 @@ Defines the base class for all Tank Engines.
 
 from __future__ import annotations  # required to support python 3.9
 
+import copy
+import hashlib
 import inspect
+import json
 import logging
 import os
 import pprint
 import sys
 import threading
+import time
 import traceback
 import weakref
+from concurrent import futures
 
 from tank.flowam import host as flow_host  # noqa: F401 (used in return annotation)
 from tank.flowam import utils as flow_utils
@@ -29,7 +34,7 @@ from tank.flowam import utils as flow_utils
 from .. import hook
 from ..errors import TankError
 from ..log import LogManager
-from ..util import metrics_cache
+from ..util import filesystem, get_positive_int_env_var, metrics_cache
 from ..util import sgre as re
 from ..util.loader import load_plugin
 from ..util.metrics import EventMetric, MetricsDispatcher
@@ -85,6 +90,11 @@ class Engine(TankBundle):
         self.__command_pool = {}
         self.__panels = {}
         self.__currently_initializing_app = None
+        # commands registered by apps on previous runs, when apps are loaded lazily
+        self.__lazy_app_commands = None
+        self.__lazy_app_commands_updates = {}
+        # apps whose init_app runs when one of their commands is first run
+        self.__lazy_apps = set()
 
         self.__qt_widget_trash = []
         self.__created_qt_dialogs = []
@@ -1092,7 +1102,9 @@ class Engine(TankBundle):
 
         # define a generic callback wrapper for metrics logging
         def callback_wrapper(*args, **kwargs):
-            if properties.get("app"):
+            # apps which are not initialized yet log the metric when the
+            # command they registered once initialized is run.
+            if properties.get("app") and properties["app"] not in self.__lazy_apps:
                 # Track which app command is being launched
                 command_name = properties.get("short_name") or name
                 properties["app"].log_metric(
@@ -1484,6 +1496,10 @@ class Engine(TankBundle):
         self.log_debug("Emitting event: %r" % event)
 
         for app_instance_name, app in self.__applications.items():
+            if app in self.__lazy_apps:
+                # the app isn't initialized yet, it has no state to update.
+                continue
+
             self.log_debug("Sending event to %r..." % app)
 
             # We send the event to the generic engine event handler
@@ -2572,6 +2588,401 @@ class Engine(TankBundle):
     ##########################################################################################
     # private
 
+    def __get_app_loading_threads(self):
+        """
+        Returns the number of threads to validate and load apps with, as set by
+        the ``TK_APP_LOADING_THREADS`` environment variable.
+
+        :returns: Number of threads, 1 if apps should be loaded one after the
+            other, which is the default.
+        """
+        return get_positive_int_env_var(constants.APP_LOADING_THREADS_ENV_VAR, 1)
+
+    def __prepare_apps(self, app_instance_names, reusable_apps):
+        """
+        Validates apps, and loads their code when several threads are used.
+
+        Apps are prepared concurrently when ``TK_APP_LOADING_THREADS`` is greater
+        than 1. They are still returned in order, so that they can be
+        initialized one after the other, on the calling thread.
+
+        :param list app_instance_names: Instance names of the apps to prepare.
+        :param set reusable_apps: Install path and instance name of the apps
+            which are already running and don't need to be loaded.
+        :returns: Generator of (app instance name, prepared app) tuples, see
+            :meth:`__prepare_app`.
+        """
+        max_workers = min(self.__get_app_loading_threads(), len(app_instance_names))
+        if max_workers <= 1:
+            for app_instance_name in app_instance_names:
+                yield app_instance_name, self.__prepare_app(
+                    app_instance_name, reusable_apps, load=False
+                )
+            return
+
+        start_time = time.perf_counter()
+        with futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="app_loading"
+        ) as executor:
+            prepared_apps = [
+                executor.submit(self.__prepare_app, name, reusable_apps, load=True)
+                for name in app_instance_names
+            ]
+            try:
+                for app_instance_name, prepared_app in zip(
+                    app_instance_names, prepared_apps
+                ):
+                    yield app_instance_name, prepared_app.result()
+            finally:
+                for prepared_app in prepared_apps:
+                    prepared_app.cancel()
+        self.log_debug(
+            "Loaded %d apps with %d threads in %.3fs."
+            % (len(app_instance_names), max_workers, time.perf_counter() - start_time)
+        )
+
+    def __prepare_app(self, app_instance_name, reusable_apps, load):
+        """
+        Reads the manifest of an app and validates its settings. This can run
+        concurrently for different apps, as nothing is initialized.
+
+        :param str app_instance_name: Instance name of the app.
+        :param set reusable_apps: Install path and instance name of the apps
+            which are already running and don't need to be loaded.
+        :param bool load: If True, the frameworks the app requires are validated
+            and its app file is loaded as well.
+        :returns: Dictionary with keys ``descriptor``, ``exists``, ``settings``,
+            ``app_class``, ``timings`` and ``validation_error`` or
+            ``loading_error``, the exception to report when the app can't be
+            validated or loaded.
+        """
+        # Get a handle to the app bundle.
+        descriptor = self.__env.get_app_descriptor(
+            self.__engine_instance_name, app_instance_name
+        )
+        prepared_app = {
+            "descriptor": descriptor,
+            "exists": descriptor.exists_local(),
+            "settings": None,
+            "app_class": None,
+            "validation_error": None,
+            "loading_error": None,
+            "timings": {},
+        }
+        if not prepared_app["exists"]:
+            return prepared_app
+
+        start_time = time.perf_counter()
+        try:
+            # get the app settings data and validate it.
+            app_schema = descriptor.configuration_schema
+            app_settings = self.__env.get_app_settings(
+                self.__engine_instance_name, app_instance_name
+            )
+
+            # check that the context contains all the info that the app needs
+            if self.__engine_instance_name != constants.SHOTGUN_ENGINE_NAME:
+                # special case! The shotgun engine is special and does not have a
+                # context until you actually run a command, so disable the validation.
+                validation.validate_context(descriptor, self.context)
+
+            # make sure the current operating system platform is supported
+            validation.validate_platform(descriptor)
+
+            # for multi engine apps, make sure our engine is supported
+            supported_engines = descriptor.supported_engines
+            if supported_engines and self.name not in supported_engines:
+                raise TankError(
+                    "The app could not be loaded since it only supports "
+                    "the following engines: %s. Your current engine has been "
+                    "identified as '%s'" % (supported_engines, self.name)
+                )
+
+            # now validate the configuration
+            validation.validate_settings(
+                app_instance_name, self.tank, self.context, app_schema, app_settings
+            )
+        except Exception as e:
+            prepared_app["validation_error"] = e
+            return prepared_app
+        finally:
+            prepared_app["timings"]["validation"] = time.perf_counter() - start_time
+        prepared_app["settings"] = app_settings
+
+        app_dir = descriptor.get_path()
+        if not load or (app_dir, app_instance_name) in reusable_apps:
+            return prepared_app
+
+        start_time = time.perf_counter()
+        try:
+            # the frameworks are only initialized with the app, check that they
+            # can be found and load the app file.
+            validation.validate_and_return_frameworks(descriptor, self.__env)
+            prepared_app["app_class"] = application.get_application_class(app_dir)
+        except Exception as e:
+            prepared_app["loading_error"] = e
+        finally:
+            prepared_app["timings"]["loading"] = time.perf_counter() - start_time
+        return prepared_app
+
+    def __get_lazy_app_key(self, descriptor, app_instance_name, app_settings):
+        """
+        Returns the key of the commands registered by an app in the lazy app
+        commands file.
+
+        :param descriptor: Descriptor of the app.
+        :param str app_instance_name: Instance name of the app.
+        :param dict app_settings: Settings of the app.
+        :returns: Key string, or None if the app is always initialized at startup.
+        """
+        if descriptor.is_dev() or not descriptor.supports_lazy_init():
+            # the code of dev apps may change at any time.
+            return None
+        context = self.context
+        key_data = {
+            "environment": self.__env.disk_location,
+            "engine": self.__engine_instance_name,
+            "app": app_instance_name,
+            "descriptor": descriptor.get_uri(),
+            "settings": app_settings,
+            # apps usually register commands depending on what the context holds.
+            "context": [
+                context.project is not None,
+                context.entity["type"] if context.entity else None,
+                context.step is not None,
+                context.task is not None,
+            ],
+        }
+        return hashlib.sha1(
+            json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def __get_lazy_app_commands(self, descriptor, app_instance_name, app_settings):
+        """
+        Returns the commands an app registered on a previous run.
+
+        :param descriptor: Descriptor of the app.
+        :param str app_instance_name: Instance name of the app.
+        :param dict app_settings: Settings of the app.
+        :returns: List of (command name, properties) lists, or None if the app
+            has to be initialized at startup.
+        """
+        if self.__lazy_app_commands is None:
+            return None
+        key = self.__get_lazy_app_key(descriptor, app_instance_name, app_settings)
+        return self.__lazy_app_commands.get(key)
+
+    def __record_lazy_app_commands(self, app, app_settings):
+        """
+        Records the commands an app registered when it was initialized, so that
+        it is initialized lazily on the next run.
+
+        Apps which registered panels or no commands are always initialized at
+        startup, as they may be needed before any command is run.
+
+        :param app: Initialized :class:`Application`.
+        :param dict app_settings: Settings of the app.
+        """
+        if self.__lazy_app_commands is None:
+            return
+        key = self.__get_lazy_app_key(app.descriptor, app.instance_name, app_settings)
+        if key is None:
+            return
+
+        commands = []
+        for command_name, command in self.__commands.items():
+            properties = command["properties"]
+            if properties.get("app") is not app:
+                continue
+            if properties.get("prefix"):
+                # the prefix is added again when the command is registered.
+                command_name = command_name[len(properties["prefix"]) + 1 :]
+            commands.append(
+                [
+                    command_name,
+                    dict(
+                        (name, value)
+                        for name, value in properties.items()
+                        if name not in ["app", "prefix"]
+                    ),
+                ]
+            )
+
+        has_panels = any(
+            panel["properties"].get("app") is app for panel in self.__panels.values()
+        )
+        try:
+            if (
+                has_panels
+                or not commands
+                or json.loads(json.dumps(commands)) != commands
+            ):
+                commands = None
+        except (TypeError, ValueError):
+            # the properties can't be stored
+            commands = None
+
+        if self.__lazy_app_commands.get(key) != commands:
+            self.__lazy_app_commands[key] = commands
+            self.__lazy_app_commands_updates[key] = commands
+
+    def __register_lazy_app(self, app, commands):
+        """
+        Registers the commands an app registered on a previous run, without
+        initializing the app.
+
+        :param app: :class:`Application` which hasn't run its init_app.
+        :param list commands: List of (command name, properties) lists.
+        """
+        self.log_debug(
+            "App %s will be initialized when one of its commands is run."
+            % app.instance_name
+        )
+        self.__lazy_apps.add(app)
+        self.__currently_initializing_app = app
+        try:
+            for command_name, properties in commands:
+                self.register_command(
+                    command_name,
+                    self.__get_lazy_command_callback(app, command_name, properties),
+                    copy.deepcopy(properties),
+                )
+        finally:
+            self.__currently_initializing_app = None
+
+    def __init_lazy_app(self, app):
+        """
+        Initializes an app registered by :meth:`__register_lazy_app`, unless
+        it is already initialized. The commands standing for the app are
+        replaced by the ones it registers.
+
+        :param app: :class:`Application` to initialize.
+        """
+        if app not in self.__lazy_apps:
+            return
+        self.__lazy_apps.discard(app)
+
+        self.log_debug("Initializing app %s on demand." % app.instance_name)
+        start_time = time.perf_counter()
+
+        for command_name, command in list(self.__commands.items()):
+            if command["properties"].get("app") is app:
+                del self.__commands[command_name]
+
+        # an app may be initialized while another one is.
+        initializing_app = self.__currently_initializing_app
+        self.__currently_initializing_app = app
+        try:
+            setup_frameworks(self, app, self.__env, app.descriptor)
+            app.init_app()
+        except Exception:
+            if self.__applications.get(app.instance_name) is app:
+                del self.__applications[app.instance_name]
+            raise
+        finally:
+            self.__currently_initializing_app = initializing_app
+
+        app.post_engine_init()
+
+        self.__record_lazy_app_commands(app, app.settings)
+        self.__write_lazy_app_commands()
+
+        # Update the persistent pools for use in context changes.
+        if app.context_change_allowed:
+            self.__application_pool.setdefault(app.descriptor.get_path(), {})[
+                app.instance_name
+            ] = app
+        for command_name, command in self.__commands.items():
+            if command["properties"].get("app") is app:
+                self.__command_pool[command_name] = command
+
+        self.log_debug(
+            "App %s initialized in %.3fs."
+            % (app.instance_name, time.perf_counter() - start_time)
+        )
+
+    def __get_lazy_command_callback(self, app, command_name, properties):
+        """
+        Returns the callback of a command registered for an app which isn't
+        initialized yet. The callback initializes the app and runs the command
+        the app registered.
+
+        :param app: :class:`Application` the command was registered for.
+        :param str command_name: Name of the command.
+        :param dict properties: Properties of the command.
+        :returns: Callback function.
+        """
+
+        def run_command(*args, **kwargs):
+            self.__init_lazy_app(app)
+            for name, command in self.__commands.items():
+                command_properties = command["properties"]
+                if command_properties.get("app") is app and name in [
+                    command_name,
+                    "%s:%s" % (command_properties.get("prefix"), command_name),
+                ]:
+                    return command["callback"](*args, **kwargs)
+            raise TankError(
+                "App %s didn't register the command '%s' when it was initialized."
+                % (app.instance_name, command_name)
+            )
+
+        if properties.get(constants.LEGACY_MULTI_SELECT_ACTION_FLAG):
+            # the engine looks for these arguments to pass the selection.
+            def run_multi_select_command(entity_type, entity_ids):
+                return run_command(entity_type, entity_ids)
+
+            return run_multi_select_command
+        return run_command
+
+    def __get_lazy_app_commands_path(self):
+        """
+        Returns the path to the lazy app commands file.
+        """
+        return os.path.join(self.cache_location, constants.LAZY_APP_COMMANDS_FILE)
+
+    def __read_lazy_app_commands(self):
+        """
+        Reads the lazy app commands file.
+
+        :returns: Dictionary of lists of (command name, properties) lists, keyed
+            by :meth:`__get_lazy_app_key`.
+        """
+        data = filesystem.read_versioned_json(
+            self.__get_lazy_app_commands_path(),
+            constants.LAZY_APP_COMMANDS_FORMAT_VERSION,
+        )
+        if data is None:
+            return {}
+        return data.get("apps", {})
+
+    def __write_lazy_app_commands(self):
+        """
+        Atomically updates the lazy app commands file with the commands recorded
+        since it was last written.
+        """
+        if not self.__lazy_app_commands_updates:
+            return
+
+        path = self.__get_lazy_app_commands_path()
+        # other processes may have recorded commands for other contexts.
+        apps = self.__read_lazy_app_commands()
+        apps.update(self.__lazy_app_commands_updates)
+        self.__lazy_app_commands_updates = {}
+
+        # apps are just initialized at startup if the file can't be written.
+        filesystem.write_versioned_json(
+            path,
+            constants.LAZY_APP_COMMANDS_FORMAT_VERSION,
+            {
+                "apps": dict(
+                    (key, commands)
+                    for key, commands in apps.items()
+                    if commands is not None
+                )
+            },
+        )
+
     def __load_apps(self, reuse_existing_apps=False, old_context=None):
         """
         Populate the __applications dictionary, skip over apps that fail to initialize.
@@ -2595,15 +3006,29 @@ class Engine(TankBundle):
         # or by pulling existing commands for reused apps from the persistant
         # cache of commands.
         self.__commands = dict()
+        self.__lazy_apps = set()
         self.__register_reload_command()
 
-        for app_instance_name in self.__env.get_apps(self.__engine_instance_name):
-            # Get a handle to the app bundle.
-            descriptor = self.__env.get_app_descriptor(
-                self.__engine_instance_name, app_instance_name
-            )
+        if os.environ.get(constants.LAZY_APP_LOADING_ENV_VAR) != "1":
+            self.__lazy_app_commands = None
+        elif self.__lazy_app_commands is None:
+            self.__lazy_app_commands = self.__read_lazy_app_commands()
+
+        app_instance_names = self.__env.get_apps(self.__engine_instance_name)
+
+        # apps which are already running for another context don't need to be loaded again.
+        reusable_apps = set()
+        if reuse_existing_apps and old_context is not None:
+            for app_path, app_instances in self.__application_pool.items():
+                reusable_apps.update((app_path, name) for name in app_instances)
+
+        for app_instance_name, prepared_app in self.__prepare_apps(
+            app_instance_names, reusable_apps
+        ):
+            descriptor = prepared_app["descriptor"]
+            timings = prepared_app["timings"]
 
-            if not descriptor.exists_local():
+            if not prepared_app["exists"]:
                 self.log_error(
                     "Cannot start app! %s does not exist on disk." % descriptor
                 )
@@ -2611,34 +3036,9 @@ class Engine(TankBundle):
 
             # Load settings for app - skip over the ones that don't validate
             try:
-                # get the app settings data and validate it.
-                app_schema = descriptor.configuration_schema
-                app_settings = self.__env.get_app_settings(
-                    self.__engine_instance_name, app_instance_name
-                )
-
-                # check that the context contains all the info that the app needs
-                if self.__engine_instance_name != constants.SHOTGUN_ENGINE_NAME:
-                    # special case! The shotgun engine is special and does not have a
-                    # context until you actually run a command, so disable the validation.
-                    validation.validate_context(descriptor, self.context)
-
-                # make sure the current operating system platform is supported
-                validation.validate_platform(descriptor)
-
-                # for multi engine apps, make sure our engine is supported
-                supported_engines = descriptor.supported_engines
-                if supported_engines and self.name not in supported_engines:
-                    raise TankError(
-                        "The app could not be loaded since it only supports "
-                        "the following engines: %s. Your current engine has been "
-                        "identified as '%s'" % (supported_engines, self.name)
-                    )
-
-                # now validate the configuration
-                validation.validate_settings(
-                    app_instance_name, self.tank, self.context, app_schema, app_settings
-                )
+                if prepared_app["validation_error"]:
+                    raise prepared_app["validation_error"]
+                app_settings = prepared_app["settings"]
 
             except TankError as e:
                 # validation error - probably some issue with the settings!
@@ -2718,11 +3118,21 @@ class Engine(TankBundle):
                         self.__applications[app_instance_name] = app
                         continue
 
+            # apps which support it and registered commands on a previous run
+            # are only initialized when one of these commands is run.
+            lazy_app_commands = self.__get_lazy_app_commands(
+                descriptor, app_instance_name, app_settings
+            )
+
             # load the app
+            start_time = time.perf_counter()
             try:
                 # now get the app location and resolve it into a version object
                 app_dir = descriptor.get_path()
 
+                if prepared_app["loading_error"]:
+                    raise prepared_app["loading_error"]
+
                 # create the object, run the constructor
                 app = application.get_application(
                     self,
@@ -2731,17 +3141,21 @@ class Engine(TankBundle):
                     app_settings,
                     app_instance_name,
                     self.__env,
+                    app_class=prepared_app["app_class"],
                 )
 
-                # load any frameworks required
-                setup_frameworks(self, app, self.__env, descriptor)
+                if lazy_app_commands is not None:
+                    self.__register_lazy_app(app, lazy_app_commands)
+                else:
+                    # load any frameworks required
+                    setup_frameworks(self, app, self.__env, descriptor)
 
-                # track the init of the app
-                self.__currently_initializing_app = app
-                try:
-                    app.init_app()
-                finally:
-                    self.__currently_initializing_app = None
+                    # track the init of the app
+                    self.__currently_initializing_app = app
+                    try:
+                        app.init_app()
+                    finally:
+                        self.__currently_initializing_app = None
 
             except TankError as e:
                 self.log_error(
@@ -2757,6 +3171,20 @@ class Engine(TankBundle):
                 # note! Apps are keyed by their instance name, meaning that we
                 # could theoretically have multiple instances of the same app.
                 self.__applications[app_instance_name] = app
+                if lazy_app_commands is None:
+                    self.__record_lazy_app_commands(app, app_settings)
+
+                timings["initialization"] = time.perf_counter() - start_time
+                self.log_debug(
+                    "App %s startup times: %s"
+                    % (
+                        app_instance_name,
+                        ", ".join(
+                            "%s %.3fs" % (step, duration)
+                            for step, duration in timings.items()
+                        ),
+                    )
+                )
 
             # For the sake of potetial context changes, apps and commands are cached
             # into a persistent pool such that they can be reused at some later time.
@@ -2781,6 +3209,8 @@ class Engine(TankBundle):
                 # We will only track apps that we know can handle a context
                 # change. Any that do not will not be treated as a persistent
                 # app.
+                if app in self.__lazy_apps:
+                    continue
                 if (
                     app.context_change_allowed
                     and app.instance_name == app_instance_name
@@ -2796,6 +3226,8 @@ class Engine(TankBundle):
             for command_name, command in self.__commands.items():
                 self.__command_pool[command_name] = command
 
+        self.__write_lazy_app_commands()
+
     def __destroy_frameworks(self):
         """
         Destroy frameworks
@@ -2816,6 +3248,8 @@ class Engine(TankBundle):
         """
 
         for app in self.__applications.values():
+            if app in self.__lazy_apps:
+                continue
             app._destroy_frameworks()
             self.log_debug("Destroying %s" % app)
             app.destroy_app()
@@ -2860,6 +3294,9 @@ class Engine(TankBundle):
         Executes the post_engine_init method for all running apps.
         """
         for app in self.__applications.values():
+            if app in self.__lazy_apps:
+                # runs when the app is initialized.
+                continue
             try:
                 app.post_engine_init()
             except TankError as e:
@@ -67,11 +67,14 @@ class Environment(object):
 
     def _refresh(self):
         """Refreshes the environment data from disk"""
-        data = self.__load_environment_data()
+        self._env_data = self._get_compiled_data(self.__context)
 
-        self._env_data = environment_includes.process_includes(
-            self._env_path, data, self.__context
-        )
+        if self._env_data is None:
+            data = self.__load_environment_data()
+
+            self._env_data = environment_includes.process_includes(
+                self._env_path, data, self.__context
+            )
 
         if not self._env_data:
             raise TankError("No data in env file: %s" % (self._env_path))
@@ -104,6 +107,17 @@ class Environment(object):
         self.__framework_locations = {}
         self.__extract_locations()
 
+    def _get_compiled_data(self, context):
+        """
+        Returns the environment data, with all includes resolved, from a
+        compiled config.
+
+        :param context: Context the environment is loaded for.
+        :returns: Dictionary with the environment data, or None if it must
+                  be read from the environment file.
+        """
+        return None
+
     def __validate_settings(self, name, settings):
         """
         Validates the engine/app/framework settings dictionary
@@ -247,10 +261,10 @@ class Environment(object):
 
     def __load_data(self, path):
         """
-        loads the main data from disk, raw form
+        loads the main data from disk, raw form, as read-only data.
         """
         logger.debug("Loading environment data from path: %s", path)
-        return g_yaml_cache.get(path) or {}
+        return g_yaml_cache.get(path, frozen_data=True) or {}
 
     def __load_environment_data(self):
         """
@@ -755,8 +769,22 @@ class InstalledEnvironment(Environment):
                         context-based include file resolve will be
                         skipped.
         """
-        super().__init__(env_path, context)
+        # the pipeline configuration is used to load the environment.
         self.__pipeline_config = pipeline_config
+        super().__init__(env_path, context)
+
+    def _get_compiled_data(self, context):
+        """
+        Returns the environment data from the pipeline configuration's
+        compiled config, if any.
+
+        :param context: Context the environment is loaded for.
+        :returns: Dictionary with the environment data, or None if it must
+                  be read from the environment file.
+        """
+        return self.__pipeline_config.get_compiled_environment_data(
+            self._env_path, context
+        )
 
     def get_framework_descriptor(self, framework_name):
         """
@@ -831,6 +859,16 @@ class WritableEnvironment(InstalledEnvironment):
         self.set_yaml_preserve_mode(True)
         super().__init__(env_path, pipeline_config, context)
 
+    def _get_compiled_data(self, context):
+        """
+        Writable environments are always read from the environment files,
+        since they may have been modified since the config was compiled.
+
+        :param context: Context the environment is loaded for.
+        :returns: None
+        """
+        return None
+
     def _get_ruamel_yaml(self):
         vendor_path = os.path.join(os.path.dirname(__file__), "../..", "tank_vendor")
 
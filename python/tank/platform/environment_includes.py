@@ -125,6 +125,8 @@ def _resolve_refs_r(lookup_dict, data):
     # default is no processing
     processed_val = data
 
+    # Note: yaml data is read from the cache as read-only dictionaries and
+    # lists, new containers are always built here so the result can be modified.
     if isinstance(data, list):
         processed_val = []
         for x in data:
@@ -209,7 +211,7 @@ def _process_includes_r(file_name, data, context):
     for include_file in include_files:
 
         # path exists, so try to read it
-        included_data = g_yaml_cache.get(include_file) or {}
+        included_data = g_yaml_cache.get(include_file, frozen_data=True) or {}
 
         # now resolve this data before proceeding
         included_data, included_fw_lookup = _process_includes_r(
@@ -260,7 +262,7 @@ def find_framework_location(file_name, framework_name, context):
                             defined in or None if not found.
     """
     # load the data in for the root file:
-    data = g_yaml_cache.get(file_name) or {}
+    data = g_yaml_cache.get(file_name, frozen_data=True) or {}
 
     # track root frameworks:
     root_fw_lookup = {}
@@ -320,7 +322,7 @@ def find_reference(file_name, context, token, absolute_location=False):
     :rtype: tuple
     """
     # load the data in
-    data = g_yaml_cache.get(file_name) or {}
+    data = g_yaml_cache.get(file_name, frozen_data=True) or {}
 
     # first build our big fat lookup dict
     include_files = _resolve_includes(file_name, data, context)
@@ -329,7 +331,7 @@ def find_reference(file_name, context, token, absolute_location=False):
 
     for include_file in include_files:
         # path exists, so try to read it
-        included_data = g_yaml_cache.get(include_file) or {}
+        included_data = g_yaml_cache.get(include_file, frozen_data=True) or {}
 
         if token in included_data:
             # If we've been asked to ensure an absolute location, we need
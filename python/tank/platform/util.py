@@ -10,6 +10,7 @@
 
 import logging
 
+from .. import folder
 from ..errors import TankError
 from ..log import LogManager
 from .engine import _restart_engine, current_engine
@@ -146,6 +147,9 @@ def restart(new_context=None):
     except TankError as e:
         engine.log_error(e)
 
+    # the folder schema is read again the next time folders are created.
+    folder.clear_schema_cache()
+
     _restart_engine(new_context or engine.context)
 
     engine.log_info("Toolkit platform was restarted.")
@@ -13,6 +13,7 @@ Management of file and directory templates.
 
 """
 
+import collections
 import os
 import sys
 
@@ -21,7 +22,7 @@ from tank.util import sgre as re
 
 from . import constants, templatekey
 from .errors import TankError
-from .template_path_parser import TemplatePathParser
+from .template_path_parser import CompiledTemplatePattern, TemplatePathParser
 
 
 class Template(object):
@@ -30,6 +31,9 @@ class Template(object):
     in the form of :class:`TemplateKey` objects.
     """
 
+    # maximum number of paths cached by _apply_fields
+    _APPLY_FIELDS_CACHE_SIZE = 128
+
     @classmethod
     def _keys_from_definition(cls, definition, template_name, keys):
         """Extracts Template Keys from a definition.
@@ -107,6 +111,13 @@ class Template(object):
         # string which will be prefixed to definition
         self._prefix = ""
         self._static_tokens = []
+        self._compiled_patterns = []
+        # lazily computed by _get_frame_collapse_info
+        self._frame_collapse_info = False
+        # lazily computed by _get_fields_formatters
+        self._fields_formatters = None
+        # most recently built paths, keyed by the frozen field values
+        self._apply_fields_cache = collections.OrderedDict()
 
     def __repr__(self):
         class_name = self.__class__.__name__
@@ -283,6 +294,23 @@ class Template(object):
         """
         ignore_types = ignore_types or []
 
+        formatters = self._get_fields_formatters()
+
+        # templates are often applied repeatedly to the same fields, e.g. when
+        # generating paths for different frames of the same sequence.
+        cache_key = self._get_apply_fields_cache_key(
+            fields, ignore_types, skip_defaults
+        )
+        if cache_key is not None:
+            path = self._apply_fields_cache.get(cache_key)
+            if path is not None:
+                try:
+                    self._apply_fields_cache.move_to_end(cache_key)
+                except KeyError:
+                    # evicted by another thread in the meantime
+                    pass
+                return path
+
         # find largest key mapping without missing values
         keys = None
         # index of matching keys will be used to find cleaned_definition
@@ -307,16 +335,65 @@ class Template(object):
                 "from the input: %s" % (self, fields, missing_keys)
             )
 
-        # Process all field values through template keys
-        processed_fields = {}
-        for key_name, key in keys.items():
-            value = fields.get(key_name)
-            ignore_type = key_name in ignore_types
-            processed_fields[key_name] = key.str_from_value(
-                value, ignore_type=ignore_type
-            )
+        path, used_defaults = formatters[index].format(fields, ignore_types)
+
+        # Default values can change, or be computed at each call for timestamps, so
+        # paths using them are not cached. Unless skip_defaults is set, whether a key
+        # has a default also decides which variation is selected, so only paths
+        # using the most inclusive variation can be cached.
+        if cache_key is not None and not used_defaults:
+            if index == 0 or skip_defaults:
+                self._apply_fields_cache[cache_key] = path
+                while len(self._apply_fields_cache) > self._APPLY_FIELDS_CACHE_SIZE:
+                    try:
+                        self._apply_fields_cache.popitem(last=False)
+                    except KeyError:
+                        # emptied by another thread in the meantime
+                        break
+
+        return path
+
+    def _get_fields_formatters(self):
+        """
+        Returns the formatters used to build strings from fields, one for each
+        definition variation.
+
+        :returns: List of :class:`_FieldsFormatter` instances.
+        """
+        if self._fields_formatters is None:
+            self._fields_formatters = [
+                _FieldsFormatter(cleaned_definition, keys)
+                for cleaned_definition, keys in zip(
+                    self._cleaned_definitions, self._keys
+                )
+            ]
+        return self._fields_formatters
 
-        return self._cleaned_definitions[index] % processed_fields
+    def _get_apply_fields_cache_key(self, fields, ignore_types, skip_defaults):
+        """
+        Builds a hashable key from the values of the fields used by the template.
+        The type of the values is part of the key so that values comparing as equal,
+        e.g. ``1`` and ``"1"``, ``1`` and ``True``, are not mixed up.
+
+        :param fields: Mapping of keys to fields.
+        :param ignore_types: Keys for whom the defined type is ignored as list of strings.
+        :param skip_defaults: If True, default values can be used for missing fields.
+        :returns: Hashable key or None if some values can't be hashed.
+        """
+        values = []
+        for key_name in self._keys[0]:
+            value = fields.get(key_name)
+            values.append((key_name, type(value), value))
+        cache_key = (
+            tuple(values),
+            frozenset(name for name in ignore_types if name in self._keys[0]),
+            skip_defaults,
+        )
+        try:
+            hash(cache_key)
+        except TypeError:
+            return None
+        return cache_key
 
     def _definition_variations(self, definition):
         """
@@ -402,6 +479,31 @@ class Template(object):
         # Remove empty strings
         return [x for x in tokens if x]
 
+    def _calc_compiled_patterns(self):
+        """
+        Compiles each definition variation into a regular expression used to
+        speed up path parsing, if enabled with the ``TK_COMPILED_TEMPLATE_PARSING``
+        environment variable.
+
+        :returns: List with a :class:`CompiledTemplatePattern` or None for each variation.
+        """
+        if os.environ.get(constants.COMPILED_TEMPLATE_PARSING_ENV_VAR) != "1":
+            return [None] * len(self._definitions)
+
+        regex = r"{%s}" % constants.TEMPLATE_KEY_NAME_REGEX
+        compiled_patterns = []
+        for definition, ordered_keys in zip(self._definitions, self._ordered_keys):
+            # same expansion as for the static tokens, but keep empty tokens
+            # so that they can be paired with the keys.
+            expanded_definition = (
+                os.path.join(self._prefix, definition) if definition else self._prefix
+            )
+            tokens = re.split(regex, expanded_definition.lower())
+            compiled_patterns.append(
+                CompiledTemplatePattern.create(ordered_keys, tokens)
+            )
+        return compiled_patterns
+
     @property
     def parent(self):
         """
@@ -501,8 +603,12 @@ class Template(object):
         path_parser = None
         fields = None
 
-        for ordered_keys, static_tokens in zip(self._ordered_keys, self._static_tokens):
-            path_parser = TemplatePathParser(ordered_keys, static_tokens)
+        for ordered_keys, static_tokens, compiled_pattern in zip(
+            self._ordered_keys, self._static_tokens, self._compiled_patterns
+        ):
+            path_parser = TemplatePathParser(
+                ordered_keys, static_tokens, compiled_pattern
+            )
             fields = path_parser.parse_path(input_path, skip_keys)
             if fields is not None:
                 break
@@ -512,6 +618,156 @@ class Template(object):
 
         return fields
 
+    def get_fields_many(self, input_paths, skip_keys=None):
+        """
+        Extracts key name, value pairs from a collection of strings. Results are
+        yielded as they are computed, so large collections can be streamed. Example::
+
+            >>> paths = glob.glob("/studio_root/sgtk/demo_project_1/sequences/seq_1/shot_2/comp/images/*.exr")
+            >>> for path, fields in template_path.get_fields_many(paths):
+            ...     print(path, fields)
+
+            /studio_root/.../henry.v003.1001.exr {'Sequence': 'seq_1', ..., 'SEQ': 1001}
+            /studio_root/.../henry.v003.1002.exr {'Sequence': 'seq_1', ..., 'SEQ': 1002}
+
+        Paths which only differ by the frame number of a :class:`SequenceKey`, for
+        example the frames of an image sequence, don't need to be fully parsed:
+        once the frame number has been identified in two of them, it is simply
+        extracted from the other ones.
+
+        :param input_paths: Iterable of source paths for values
+        :param skip_keys: Optional keys to skip
+        :type skip_keys: List
+
+        :returns: Generator of ``(path, fields)`` tuples, in the order of the input paths,
+                  where fields is the dictionary :meth:`get_fields` returns for the path
+                  or the :class:`TankError` it raises if the path doesn't match the template.
+        """
+        collapse_info = self._get_frame_collapse_info()
+
+        # frame sequences found so far, keyed by their path with the digits removed
+        sequences = {}
+
+        for input_path in input_paths:
+            sequence = None
+            if collapse_info:
+                # split the path into static parts and numbers
+                parts = _DIGITS_REGEX.split(os.path.normpath(input_path))
+                digits = parts[1::2]
+                signature = (tuple(parts[0::2]), tuple(len(d) for d in digits))
+                sequence = sequences.get(signature)
+                if sequence:
+                    fields = sequence.get_fields(parts)
+                    if fields is not None:
+                        yield input_path, fields
+                        continue
+
+            try:
+                fields = self.get_fields(input_path, skip_keys=skip_keys)
+            except TankError as e:
+                yield input_path, e
+                continue
+
+            if collapse_info:
+                if sequence is None:
+                    sequences[signature] = _FrameSequence(collapse_info, parts, fields)
+                else:
+                    sequence.learn(parts, fields)
+
+            yield input_path, fields
+
+    def validate_many(self, paths, fields=None, skip_keys=None):
+        """
+        Validates that a collection of paths can be mapped to the pattern given by
+        the template. Results are yielded as they are computed. Example::
+
+            >>> for path, is_valid in template_path.validate_many(paths):
+            ...     print(path, is_valid)
+
+        See :meth:`get_fields_many` for details on how paths are processed.
+
+        :param paths:       Iterable of paths to validate
+        :param fields:      An optional dictionary of key names to key values. If supplied these values must
+                            be present in the input paths and found by the template.
+        :type fields:       Dictionary
+        :param skip_keys:   Field names whose values should be ignored
+        :type skip_keys:    List
+
+        :returns:           Generator of ``(path, is_valid)`` tuples, in the order of the input paths.
+        """
+        fields = fields or {}
+        skip_keys = skip_keys or []
+
+        for path, path_fields in self.get_fields_many(paths, skip_keys=skip_keys):
+            if isinstance(path_fields, TankError):
+                yield path, False
+                continue
+
+            # Check that all required fields were found in the path:
+            is_valid = True
+            for key, value in fields.items():
+                if (key not in skip_keys) and (path_fields.get(key) != value):
+                    is_valid = False
+                    break
+            yield path, is_valid
+
+    def _get_frame_collapse_info(self):
+        """
+        Analyzes the template to find out if frame numbers can be extracted from
+        paths of a sequence without fully parsing them, see :class:`_FrameSequence`.
+
+        Replacing the digits of a frame number with other digits doesn't change how
+        a path is parsed as long as no key validation depends on the actual digits,
+        and as long as the keys which might hold the frame number are not compared
+        with other values for the same key.
+
+        :returns: A :class:`_FrameCollapseInfo` or None if frame numbers can't be
+                  extracted for this template.
+        """
+        if self._frame_collapse_info is not False:
+            return self._frame_collapse_info
+
+        self._frame_collapse_info = None
+        keys = {}
+        sequence_key_names = set()
+        for ordered_keys in self._ordered_keys:
+            for key in ordered_keys:
+                if not _is_digit_insensitive(key):
+                    return None
+                keys[key.name] = key
+                if isinstance(key, templatekey.SequenceKey):
+                    sequence_key_names.add(key.name)
+        if not sequence_key_names:
+            return None
+
+        # static tokens containing digits
+        digit_tokens = set()
+        for static_tokens in self._static_tokens:
+            digit_tokens.update(t for t in static_tokens if _DIGITS_REGEX.search(t))
+
+        # index of path components holding a key used more than once, as the values
+        # of such a key are compared with each other while parsing.
+        regex = r"{(%s)}" % constants.TEMPLATE_KEY_NAME_REGEX
+        duplicate_key_components = set()
+        for definition, ordered_keys in zip(self._definitions, self._ordered_keys):
+            key_names = [key.name for key in ordered_keys]
+            expanded_definition = (
+                os.path.join(self._prefix, definition) if definition else self._prefix
+            )
+            for index, component in enumerate(expanded_definition.split(os.path.sep)):
+                # keys in definitions use the key names
+                for key_name in re.findall(regex, component):
+                    if key_names.count(key_name) > 1:
+                        duplicate_key_components.add(index)
+
+        self._frame_collapse_info = _FrameCollapseInfo(
+            sequence_key_names,
+            digit_tokens,
+            duplicate_key_components,
+            keys,
+        )
+        return self._frame_collapse_info
+
 
 class TemplatePath(Template):
     """
@@ -548,6 +804,7 @@ class TemplatePath(Template):
         self._static_tokens = []
         for definition in self._definitions:
             self._static_tokens.append(self._calc_static_tokens(definition))
+        self._compiled_patterns = self._calc_compiled_patterns()
 
     @property
     def root_path(self):
@@ -691,6 +948,7 @@ class TemplateString(Template):
         self._static_tokens = []
         for definition in self._definitions:
             self._static_tokens.append(self._calc_static_tokens(definition))
+        self._compiled_patterns = self._calc_compiled_patterns()
 
     @property
     def parent(self):
@@ -721,6 +979,288 @@ class TemplateString(Template):
         adj_path = os.path.join(self._prefix, input_path)
         return super().get_fields(adj_path, skip_keys=skip_keys)
 
+    def _get_frame_collapse_info(self):
+        """
+        Frame numbers are always parsed for template strings, which are
+        matched against the input string joined to a prefix.
+
+        :returns: None
+        """
+        return None
+
+
+class _FieldsFormatter(object):
+    """
+    Builds strings from fields for a definition variation, with a single
+    string formatting.
+
+    Converting a value to a string validates it with its key. Since templates are
+    usually applied to fields where only a few values change, e.g. the frame or the
+    version, the strings for the values already converted are kept and reused.
+    """
+
+    # maximum number of value strings kept
+    _MAX_VALUE_STRINGS = 1024
+
+    def __init__(self, cleaned_definition, keys):
+        """
+        :param cleaned_definition: Definition ready for string substitution.
+        :param keys: Mapping of key names to keys for the variation.
+        """
+        self._cleaned_definition = cleaned_definition
+        self._keys = list(keys.items())
+        self._value_strings = {}
+
+    def format(self, fields, ignore_types):
+        """
+        Builds a string from fields.
+
+        :param fields: Mapping of keys to fields.
+        :param ignore_types: Keys for whom the defined type is ignored as list of strings.
+        :returns: Tuple with the string and True if default values were used.
+        :raises: :class:`TankError` if a value is not valid for its key.
+        """
+        used_defaults = False
+        processed_fields = {}
+        for key_name, key in self._keys:
+            value = fields.get(key_name)
+            ignore_type = key_name in ignore_types
+            if value is None:
+                # defaults are not cached since they can change
+                used_defaults = True
+                processed_fields[key_name] = key.str_from_value(
+                    value, ignore_type=ignore_type
+                )
+                continue
+
+            value_key = (key_name, type(value), value, ignore_type)
+            try:
+                value_string = self._value_strings.get(value_key)
+            except TypeError:
+                # unhashable value
+                value_key = None
+                value_string = None
+
+            if value_string is None:
+                value_string = key.str_from_value(value, ignore_type=ignore_type)
+                if value_key is not None:
+                    if len(self._value_strings) >= self._MAX_VALUE_STRINGS:
+                        self._value_strings.clear()
+                    self._value_strings[value_key] = value_string
+            processed_fields[key_name] = value_string
+
+        return self._cleaned_definition % processed_fields, used_defaults
+
+
+# regular expression used to find numbers in paths
+_DIGITS_REGEX = re.compile(r"([0-9]+)")
+
+
+def _is_digit_insensitive(key):
+    """
+    Checks if a key accepts or rejects a value regardless of the actual digits it
+    contains, as long as the number of digits and the use of a leading zero
+    don't change.
+
+    :param key: :class:`TemplateKey` instance.
+    :returns: True if the key validation doesn't depend on digit values.
+    """
+    if key.choices or key.exclusions:
+        return False
+    if type(key) is templatekey.StringKey:
+        # custom filter_by regular expressions could match specific digits
+        return key.filter_by in (None, "alphanumeric", "alpha")
+    # integer validation only depends on the digits count and leading zeros
+    return type(key) in (templatekey.IntegerKey, templatekey.SequenceKey)
+
+
+class _FrameCollapseInfo(object):
+    """
+    Information about a template used to extract frame numbers from the paths
+    of a sequence without fully parsing them.
+    """
+
+    def __init__(
+        self, sequence_key_names, digit_tokens, duplicate_key_components, keys
+    ):
+        """
+        :param sequence_key_names: Names of the :class:`SequenceKey` used by the template.
+        :param digit_tokens: Static tokens of the template containing digits.
+        :param duplicate_key_components: Indices of the path components with keys
+                                         used more than once by a definition variation.
+        :param keys: Dictionary of key names to keys for the template.
+        """
+        self.sequence_key_names = sequence_key_names
+        self.digit_tokens = digit_tokens
+        self.duplicate_key_components = duplicate_key_components
+        self.keys = keys
+
+    def is_interchangeable(self, parts, other_parts, index):
+        """
+        Checks if a number can be swapped with another one without changing how
+        the rest of the path is parsed.
+
+        :param parts: Path split into static parts and numbers.
+        :param other_parts: Other path with the same static parts and number lengths.
+        :param index: Index of the only number which is different in both paths.
+        :returns: True if the numbers are interchangeable.
+        """
+        number = parts[index]
+        other_number = other_parts[index]
+        # validation of integer keys depend on the use of a leading zero
+        if (number[0] == "0") != (other_number[0] == "0"):
+            return False
+
+        # static tokens containing digits must be found at the same positions
+        start = len("".join(parts[:index]))
+        end = start + len(number)
+        path = "".join(parts).lower()
+        other_path = "".join(other_parts).lower()
+        for token in self.digit_tokens:
+            window_start = max(start - len(token) + 1, 0)
+            window_end = end + len(token) - 1
+            if _find_all(path[window_start:window_end], token) != _find_all(
+                other_path[window_start:window_end], token
+            ):
+                return False
+        return True
+
+    def get_component_index(self, parts, index):
+        """
+        Returns the index of the path component a number is in.
+
+        :param parts: Path split into static parts and numbers.
+        :param index: Index of the number in the parts.
+        :returns: Index of the path component.
+        """
+        return "".join(parts[:index]).count(os.path.sep)
+
+
+def _find_all(text, token):
+    """
+    Finds all the positions of a token in a string, including overlapping ones.
+
+    :param text: String to search.
+    :param token: String to find.
+    :returns: List of positions.
+    """
+    positions = []
+    position = text.find(token)
+    while position != -1:
+        positions.append(position)
+        position = text.find(token, position + 1)
+    return positions
+
+
+class _FrameSequence(object):
+    """
+    Group of paths which only differ by their numbers, e.g. the frames of an
+    image sequence.
+
+    The first path parsed is kept as a reference. When another path of the
+    group which only differs by one number is fully parsed and its fields only
+    differ from the reference by the value of a :class:`SequenceKey` matching
+    that number, this number is known to be the frame number. The fields of
+    subsequent paths which only differ by this frame number are then built from
+    the reference fields.
+    """
+
+    def __init__(self, collapse_info, parts, fields):
+        """
+        :param collapse_info: :class:`_FrameCollapseInfo` for the template.
+        :param parts: Reference path split into static parts and numbers.
+        :param fields: Fields parsed from the reference path.
+        """
+        self._info = collapse_info
+        self._parts = parts
+        self._fields = fields
+        # index of the frame number in the parts and frame key, once known
+        self._frame_index = None
+        self._frame_key = None
+
+    def _get_changed_indices(self, parts):
+        """
+        Returns the indices of the numbers which differ from the reference path.
+        """
+        return [
+            index
+            for index in range(1, len(parts), 2)
+            if parts[index] != self._parts[index]
+        ]
+
+    def learn(self, parts, fields):
+        """
+        Compares a fully parsed path of the group with the reference path to
+        find out which number is the frame number.
+
+        :param parts: Path split into static parts and numbers.
+        :param fields: Fields parsed from the path.
+        """
+        if self._frame_index is not None:
+            return
+
+        changed = self._get_changed_indices(parts)
+        if len(changed) != 1:
+            return
+        index = changed[0]
+
+        changed_keys = [
+            name
+            for name in set(fields) | set(self._fields)
+            if fields.get(name) != self._fields.get(name)
+        ]
+        if len(changed_keys) != 1:
+            return
+        key_name = changed_keys[0]
+        if key_name not in self._info.sequence_key_names:
+            return
+        key = self._info.keys[key_name]
+
+        # the frame key values have to be the numbers
+        try:
+            if key.value_from_str(self._parts[index]) != self._fields[
+                key_name
+            ] or key.value_from_str(parts[index]) != fields.get(key_name):
+                return
+        except TankError:
+            return
+
+        if self._info.get_component_index(
+            parts, index
+        ) in self._info.duplicate_key_components or not self._info.is_interchangeable(
+            self._parts, parts, index
+        ):
+            return
+
+        self._frame_index = index
+        self._frame_key = key
+
+    def get_fields(self, parts):
+        """
+        Builds the fields for a path of the group from the reference fields.
+
+        :param parts: Path split into static parts and numbers.
+        :returns: Dictionary of fields or None if the path needs to be fully parsed.
+        """
+        if self._frame_index is None:
+            return None
+
+        changed = self._get_changed_indices(parts)
+        if any(index != self._frame_index for index in changed):
+            return None
+
+        if not self._info.is_interchangeable(self._parts, parts, self._frame_index):
+            return None
+
+        try:
+            frame = self._frame_key.value_from_str(parts[self._frame_index])
+        except TankError:
+            return None
+
+        fields = dict(self._fields)
+        fields[self._frame_key.name] = frame
+        return fields
+
 
 def split_path(input_path):
     """
@@ -745,8 +1285,29 @@ def read_templates(pipeline_configuration):
 
     :returns: Dictionary of form {template name: template object}
     """
-    per_platform_roots = pipeline_configuration.get_all_platform_data_roots()
-    data = pipeline_configuration.get_templates_config()
+    templates = pipeline_configuration.get_compiled_templates()
+    if templates is not None:
+        return templates
+
+    return make_templates(
+        pipeline_configuration.get_templates_config(),
+        pipeline_configuration.get_all_platform_data_roots(),
+        pipeline_configuration.get_primary_data_root_name(),
+    )
+
+
+def make_templates(data, all_per_platform_roots, default_root=None):
+    """
+    Factory function which creates the keys, paths and strings of a templates
+    configuration.
+
+    :param data: Templates configuration, with keys, paths and strings sections.
+    :param all_per_platform_roots: Root paths for all platforms. nested dictionary first keyed by
+                                   storage root name and then by sys.platform-style os name.
+    :param default_root: Name of the storage root used by paths without a root_name.
+
+    :returns: Dictionary of form {<template name> : <Template object>}
+    """
 
     # get dictionaries from the templates config file:
     def get_data_section(section_name):
@@ -762,8 +1323,8 @@ def read_templates(pipeline_configuration):
     template_paths = make_template_paths(
         get_data_section("paths"),
         keys,
-        per_platform_roots,
-        default_root=pipeline_configuration.get_primary_data_root_name(),
+        all_per_platform_roots,
+        default_root=default_root,
     )
 
     template_strings = make_template_strings(
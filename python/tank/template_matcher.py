@@ -0,0 +1,125 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Prefix index used to quickly narrow down the templates which may match a path.
+"""
+
+import os
+
+from .template import TemplatePath
+
+
+class TemplateMatcher(object):
+    """
+    Precomputed lookup structure for a collection of templates.
+
+    Validating a path against a template is expensive since it requires the
+    full :class:`TemplatePathParser` key resolution. Most path templates
+    however can only match paths starting with their first static token (the
+    storage root followed by the static part of the definition up to the first
+    key). This class stores these leading tokens in a character trie so that,
+    for a given path, only the templates whose static skeleton fits the
+    beginning of the path need to be validated.
+
+    Templates for which such a leading token can't be guaranteed (template
+    strings, or variations with at least as many keys as static tokens where the
+    parser also considers paths starting with a key) are always returned as
+    candidates, so the final result is identical to validating every template.
+    """
+
+    # key used in trie nodes to store the names of the templates ending there
+    _LEAF = None
+
+    def __init__(self, templates):
+        """
+        :param templates: Dictionary of the form {template name: template object}.
+        """
+        # shallow copy used to detect changes made to the source dictionary
+        self._templates = dict(templates)
+        # template position in the source dictionary, used to preserve ordering
+        self._positions = {}
+        self._trie = {}
+        self._unindexed = []
+
+        for position, (name, template) in enumerate(self._templates.items()):
+            self._positions[name] = position
+            anchors = self._get_anchors(template)
+            if anchors is None:
+                self._unindexed.append(name)
+                continue
+            for anchor in anchors:
+                node = self._trie
+                for char in anchor:
+                    node = node.setdefault(char, {})
+                node.setdefault(self._LEAF, []).append(name)
+
+    @classmethod
+    def _get_anchors(cls, template):
+        """
+        Computes the set of leading static tokens a path must start with for
+        the template to be able to match it.
+
+        :param template: :class:`Template` instance.
+        :returns: Set of lower case tokens, one per definition variation, or None
+                  if the template can't be anchored and must always be validated.
+        """
+        if not isinstance(template, TemplatePath):
+            # template strings parse the path relative to a prefix, always
+            # validate them.
+            return None
+
+        anchors = set()
+        for ordered_keys, static_tokens in zip(
+            template._ordered_keys, template._static_tokens
+        ):
+            if not static_tokens:
+                return None
+            # When there are at least as many keys as static tokens the parser also
+            # tries to match the path starting with a key value, in which case the
+            # first token doesn't have to be at the start of the path.
+            if ordered_keys and len(ordered_keys) >= len(static_tokens):
+                return None
+            anchors.add(static_tokens[0])
+        return anchors
+
+    def is_current(self, templates):
+        """
+        Checks if this matcher was built for the given templates.
+
+        :param templates: Dictionary of the form {template name: template object}.
+        :returns: True if the templates are unchanged since the matcher was built.
+        """
+        # Templates don't implement equality so this compares template instances.
+        return self._templates == templates
+
+    def get_candidates(self, path):
+        """
+        Returns the templates which may match the given path, in the order they
+        were defined. Candidates still need to be validated against the path.
+
+        :param path: Path to match against the templates.
+        :returns: List of :class:`Template` instances.
+        """
+        # same normalization as the one done by the TemplatePathParser
+        lower_path = os.path.normpath(path).lower()
+
+        names = set(self._unindexed)
+        node = self._trie
+        for char in lower_path:
+            node = node.get(char)
+            if node is None:
+                break
+            names.update(node.get(self._LEAF, ()))
+
+        return [
+            self._templates[name]
+            for name in sorted(names, key=self._positions.__getitem__)
+        ]
@@ -15,6 +15,120 @@ Parsing of template paths into values for specified keys using a list of static
 import os
 
 from .errors import TankError
+from .util import sgre as re
+
+
+class CompiledTemplatePattern(object):
+    """
+    Anchored regular expression equivalent of a template definition variation.
+
+    Each key is turned into a group matching a run of the characters the key
+    accepts, as returned by :meth:`TemplateKey._get_value_char_pattern`, so any
+    path the recursive :class:`TemplatePathParser` resolution accepts is matched
+    by the expression. Paths which are not matched can therefore be rejected
+    straight away.
+
+    When each key is separated from the next one by a static token starting with
+    a character the key can't contain, the values extracted by the expression are
+    the only ones the recursive resolution could find and the pattern is flagged
+    as exact. Matches for other patterns are ambiguous and still need to be
+    resolved recursively.
+    """
+
+    def __init__(self, ordered_keys, tokens, regex, is_exact):
+        """
+        Use :meth:`create` to build instances of this class.
+
+        :param ordered_keys: Template key objects in order that they appear in the
+                             template definition.
+        :param tokens: Lower case static tokens surrounding the keys, including
+                       empty tokens, one more than the number of keys.
+        :param regex: Compiled regular expression for the variation.
+        :param is_exact: True if matches can't be ambiguous.
+        """
+        self.ordered_keys = ordered_keys
+        self.key_names = set(key.name for key in ordered_keys)
+        self.regex = regex
+        self.is_exact = is_exact
+        self.leading_token = tokens[0]
+        # when the definition ends with a key, the recursive parser also tries
+        # to match paths starting with a key value.
+        self.ends_with_key = not tokens[-1]
+        # tokens followed by a key, the recursive parser accepts paths ending
+        # with one of them and leaves the remaining keys unresolved.
+        self.inner_tokens = tokens[1:-1]
+        # The recursive parser only finds non-overlapping occurrences of a
+        # token. Keep track of the strings made of two overlapping occurrences
+        # of tokens which can overlap themselves, e.g. "/a/" and "/a/a/".
+        self.overlapping_tokens = set()
+        for token in tokens:
+            for i in range(1, len(token)):
+                if token[:i] == token[-i:]:
+                    self.overlapping_tokens.add(token + token[i:])
+
+    @classmethod
+    def create(cls, ordered_keys, tokens):
+        """
+        Compiles a template definition variation.
+
+        :param ordered_keys: Template key objects in order that they appear in the
+                             template definition.
+        :param tokens: Lower case static tokens surrounding the keys, including
+                       empty tokens, one more than the number of keys.
+        :returns: A :class:`CompiledTemplatePattern` or None if the variation
+                  can't be compiled.
+        """
+        if not ordered_keys or len(tokens) != len(ordered_keys) + 1:
+            return None
+
+        # keys must all be separated by static tokens
+        if not all(tokens[:-1]):
+            return None
+
+        separator = re.escape(os.path.sep)
+        is_exact = True
+        expression = "^%s" % re.escape(tokens[0])
+        for key, token in zip(ordered_keys, tokens[1:]):
+            char_pattern = key._get_value_char_pattern()
+            if char_pattern is None:
+                char_pattern = "[^%s]" % separator
+            else:
+                # key values can never contain a path separator.
+                char_pattern = "(?:(?!%s)(?:%s))" % (separator, char_pattern)
+
+            # the value of the key is unambiguous if it has to end where the
+            # next token starts
+            if token and re.match(char_pattern, token[0], re.UNICODE):
+                is_exact = False
+
+            expression += "(%s+)%s" % (char_pattern, re.escape(token))
+        expression += r"\Z"
+
+        return cls(ordered_keys, tokens, re.compile(expression, re.UNICODE), is_exact)
+
+    def is_unambiguous(self, lower_path, skip_keys):
+        """
+        Checks if the regular expression can be used to parse the given path.
+
+        :param lower_path: Normalized lower case path to parse.
+        :param skip_keys: List of keys for whom we do not need to find values.
+        :returns: True if the path can be parsed with the regular expression.
+        """
+        # skipped keys are not validated and can contain any character
+        if skip_keys and not self.key_names.isdisjoint(skip_keys):
+            return False
+        # path starting with a key value
+        if self.ends_with_key and lower_path.find(self.leading_token, 1) != -1:
+            return False
+        # path ending before all keys are found
+        for token in self.inner_tokens:
+            if lower_path.endswith(token):
+                return False
+        # tokens which might be missed by the recursive parser
+        for token in self.overlapping_tokens:
+            if token in lower_path:
+                return False
+        return True
 
 
 class TemplatePathParser(object):
@@ -49,16 +163,19 @@ class TemplatePathParser(object):
             self.fully_resolved = fully_resolved
             self.last_error = last_error
 
-    def __init__(self, ordered_keys, static_tokens):
+    def __init__(self, ordered_keys, static_tokens, compiled_pattern=None):
         """
         Construction
 
         :param ordered_keys:    Template key objects in order that they appear in the
                                 template definition.
         :param static_tokens:   Pieces of the definition that don't represent Template Keys.
+        :param compiled_pattern: Optional :class:`CompiledTemplatePattern` used to parse
+                                 paths without the recursive resolution when possible.
         """
         self.ordered_keys = ordered_keys
         self.static_tokens = static_tokens
+        self.compiled_pattern = compiled_pattern
         self.fields = {}
         self.input_path = None
         self.last_error = "Unable to parse path"
@@ -96,6 +213,24 @@ class TemplatePathParser(object):
         # all token comparisons are done case insensitively.
         lower_path = input_path.lower()
 
+        # use the compiled pattern unless the path needs the recursive resolution.
+        # Positions in the lower case path must match the ones in the input path.
+        if (
+            self.compiled_pattern is not None
+            and len(lower_path) == len(input_path)
+            and self.compiled_pattern.is_unambiguous(lower_path, skip_keys)
+        ):
+            match = self.compiled_pattern.regex.match(lower_path)
+            if match is None:
+                self.last_error = (
+                    "Tried to extract fields from path '%s', "
+                    "but the path does not fit the template." % input_path
+                )
+                return None
+            if self.compiled_pattern.is_exact:
+                return self.__fields_from_match(input_path, match)
+            # ambiguous match, carry on with the recursive resolution.
+
         # if no keys, nothing to discover
         if not self.ordered_keys:
             if lower_path == self.static_tokens[0]:
@@ -261,6 +396,45 @@ class TemplatePathParser(object):
         # return the single unique set of fields:
         return fields
 
+    def __fields_from_match(self, input_path, match):
+        """
+        Extracts the fields from an exact match of the compiled pattern.
+
+        :param input_path:  The normalized path to parse.
+        :param match:       Match of the compiled pattern for the lower case path.
+
+        :returns:           If succesful, a dictionary of fields mapping key names to
+                            their values. None if the fields can't be resolved.
+        """
+        fields = {}
+        str_values = {}
+        for index, key in enumerate(self.ordered_keys):
+            start, end = match.span(index + 1)
+            value_str = input_path[start:end]
+
+            # can't have two different values for the same key:
+            if key.name in str_values:
+                if value_str != str_values[key.name]:
+                    self.last_error = (
+                        "%s: Conflicting values found for key %s: %s and %s"
+                        % (self, key.name, str_values[key.name], value_str)
+                    )
+                    return None
+                continue
+
+            try:
+                fields[key.name] = key.value_from_str(value_str)
+            except TankError as e:
+                self.last_error = "%s: Failed to get value for key '%s' - %r" % (
+                    self,
+                    key.name,
+                    e,
+                )
+                return None
+            str_values[key.name] = value_str
+
+        return fields
+
     def __find_possible_key_values_recursive(
         self,
         path,
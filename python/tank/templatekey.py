@@ -294,6 +294,32 @@ class TemplateKey(object):
     def _as_value(self, str_value):
         return str_value
 
+    def _get_value_char_pattern(self):
+        """
+        Returns a regular expression matching any single character which can
+        appear in the lower case string representation of a value for this key.
+
+        This is used when compiling templates into regular expressions. The
+        expression only needs to be permissive enough to never reject a valid
+        value, values are always validated with :meth:`value_from_str` afterwards.
+
+        :returns: Regular expression string or None if any character can be used.
+        """
+        return None
+
+    def _get_choices_char_pattern(self):
+        """
+        Returns a regular expression matching any single character used by the
+        lower case choices for this key.
+
+        :returns: Regular expression string.
+        """
+        chars = sorted(set("".join(str(choice).lower() for choice in self.choices)))
+        if not chars:
+            # nothing can match
+            return "(?!)"
+        return "[%s]" % "".join(re.escape(char) for char in chars)
+
     def __repr__(self):
         return "<Sgtk %s %s>" % (self.__class__.__name__, self.name)
 
@@ -487,6 +513,22 @@ class StringKey(TemplateKey):
             raise TankError(self._last_error)
         return value
 
+    def _get_value_char_pattern(self):
+        """
+        Returns a regular expression matching any single character which can
+        appear in the lower case string representation of a value for this key.
+
+        :returns: Regular expression string or None if any character can be used.
+        """
+        if self.choices:
+            return self._get_choices_char_pattern()
+        if self._filter_by == "alphanumeric":
+            return r"[^\W_]"
+        if self._filter_by == "alpha":
+            return r"[^\W_0-9]"
+        # no restriction can be inferred from a custom regex.
+        return None
+
     def _as_string(self, value):
         """
         Converts the given value to a string representation.
@@ -970,6 +1012,25 @@ class IntegerKey(TemplateKey):
             return False
         return True
 
+    def _get_value_char_pattern(self):
+        """
+        Returns a regular expression matching any single character which can
+        appear in the lower case string representation of a value for this key.
+
+        :returns: Regular expression string or None if any character can be used.
+        """
+        if self.choices:
+            return self._get_choices_char_pattern()
+        if self.strict_matching:
+            # padding and ascii digits only.
+            return "[0-9]" if self._zero_padded else "[ 0-9]"
+        # loose matching relies on str.isdigit, which accepts some unicode
+        # characters. These are all word characters.
+        if self._zero_padded:
+            return r"[^\W_]"
+        # leading whitespaces are stripped.
+        return r"[^\W_]|\s"
+
     def _as_string(self, value):
         """
         Converts value into a string.
@@ -1125,6 +1186,17 @@ class SequenceKey(IntegerKey):
         else:
             return super().validate(value)
 
+    def _get_value_char_pattern(self):
+        """
+        Returns a regular expression matching any single character which can
+        appear in the lower case string representation of a value for this key.
+
+        :returns: Regular expression string or None if any character can be used.
+        """
+        # frame numbers, frame specs (%04d, ####, @@@@, $F4, <UDIM>, $UDIM),
+        # FORMAT: directives and flame patterns ([1001-1100]).
+        return r"[^\W_]|[\s:%#@$<>\[\]\-]"
+
     def _as_string(self, value):
 
         if isinstance(value, str) and value.startswith(self.FRAMESPEC_FORMAT_INDICATOR):
@@ -9,7 +9,11 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 from . import filesystem, json, pickle
-from .environment import append_path_to_env_var, prepend_path_to_env_var
+from .environment import (
+    append_path_to_env_var,
+    get_positive_int_env_var,
+    prepend_path_to_env_var,
+)
 from .errors import (
     EnvironmentVariableFileLookupError,
     PublishPathNotDefinedError,
@@ -14,8 +14,11 @@ Helper methods that do environment management
 
 import os
 
+from .. import LogManager
 from .platforms import is_windows
 
+log = LogManager.get_logger(__name__)
+
 
 def append_path_to_env_var(env_var_name, path):
     """
@@ -37,6 +40,30 @@ def prepend_path_to_env_var(env_var_name, path):
     return _add_path_to_env_var(env_var_name, path, prepend=True)
 
 
+def get_positive_int_env_var(env_var_name, default):
+    """
+    Reads a positive integer, e.g. a number of threads, from an environment variable.
+
+    A warning is logged if the value isn't an integer. Values lower than 1 are
+    clamped to 1.
+
+    :param str env_var_name: Name of the environment variable.
+    :param int default: Value returned if the variable is not set, empty or invalid.
+    :returns: The value of the environment variable, at least 1.
+    """
+    value = os.environ.get(env_var_name)
+    if not value:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        log.warning(
+            "Invalid value '%s' for %s, using %d instead."
+            % (value, env_var_name, default)
+        )
+        return default
+
+
 def _add_path_to_env_var(env_var_name, path, prepend=False):
     """
     Append or prepend the path to the given environment variable.
@@ -14,12 +14,14 @@ Utility methods for manipulating files and folders
 import datetime
 import errno
 import functools
+import json
 import os
 import re
 import shutil
 import stat
 import subprocess
 import sys
+import uuid
 from contextlib import contextmanager
 
 from .. import LogManager
@@ -214,6 +216,101 @@ def safe_delete_file(path):
         log.warning("File '%s' could not be deleted, skipping: %s" % (path, e))
 
 
+@contextmanager
+def atomic_write(path):
+    """
+    A context manager for atomically replacing a file.
+
+    The content is written to a temporary file next to the given path, which
+    then replaces the file when the context exits without error, so the file
+    is never seen partially written. The temporary file is removed if an error
+    is raised.
+
+    Usage example::
+
+        with filesystem.atomic_write(path) as temp_path:
+            with open(temp_path, "wb") as fh:
+                fh.write(data)
+
+    :param path: Path to the file to replace.
+    :return: Path to the temporary file to write.
+    """
+    temp_path = "%s.%s" % (path, uuid.uuid4().hex)
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_file_atomically(path, content):
+    """
+    Atomically replaces the content of a file, creating its folder if needed.
+
+    Meant for cache files: errors are logged as debug and reported by the
+    return value rather than raised.
+
+    :param path: Path to the file to replace.
+    :param content: Content of the file, as str or bytes.
+    :returns: True if the file was written, False otherwise.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_write(path) as temp_path:
+            with open(temp_path, "wb" if isinstance(content, bytes) else "wt") as fh:
+                fh.write(content)
+    except Exception as e:
+        log.debug("Could not write '%s': %s" % (path, e))
+        return False
+    return True
+
+
+def read_versioned_json(path, version):
+    """
+    Reads a json file written with :meth:`write_versioned_json`.
+
+    :param path: Path to the json file.
+    :param version: Expected format version of the file.
+    :returns: Dictionary with the content of the file, or None if it doesn't
+              exist, can't be read or has another format version.
+    """
+    try:
+        with open(path, "rt") as fh:
+            data = json.load(fh)
+    except (IOError, OSError):
+        return None
+    except Exception as e:
+        log.debug("Could not read '%s': %s" % (path, e))
+        return None
+
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def write_versioned_json(path, version, data):
+    """
+    Atomically replaces a json file, storing the format version of its content
+    in the ``version`` key.
+
+    :param path: Path to the json file.
+    :param version: Format version of the content.
+    :param dict data: Content of the file.
+    :returns: True if the file was written, False otherwise.
+    """
+    data = dict(data, version=version)
+    try:
+        content = json.dumps(data)
+    except (TypeError, ValueError) as e:
+        log.debug("Could not write '%s': %s" % (path, e))
+        return False
+    return write_file_atomically(path, content)
+
+
 @with_cleared_umask
 def copy_folder(src, dst, folder_permissions=0o775, skip_list=None):
     """
@@ -13,13 +13,18 @@ Methods for loading and managing plugins, e.g. Apps, Engines, Hooks etc.
 
 """
 
+import hashlib
 import importlib.util
 import inspect
+import marshal
+import os
 import sys
 import traceback
+import uuid
 
 from .. import LogManager
 from ..errors import TankError
+from . import filesystem
 
 log = LogManager.get_logger(__name__)
 
@@ -32,7 +37,156 @@ class TankLoadPluginError(TankError):
     pass
 
 
-def load_plugin(plugin_file, valid_base_class, alternate_base_classes=None):
+class PluginIndex(object):
+    """
+    Persistent index of compiled plugin files, shared by all processes.
+
+    Loading a plugin compiles its file and searches the resulting module for
+    the plugin class. Python only caches the compiled code next to the source
+    file, which is often not writable for configurations on shared storage.
+    For each plugin file, the index stores the compiled code and the name of
+    the class found for each base class in a single file, so loading the
+    plugin again, even in another process, is reduced to executing that code
+    and looking the class up by name.
+
+    Entries are invalidated when the modification time, size or content hash
+    of the plugin file changes.
+    """
+
+    # version of the entry format
+    FORMAT_VERSION = 1
+
+    def __init__(self, root):
+        """
+        :param str root: Folder in which the index is stored.
+        """
+        self._root = root
+
+    @property
+    def root(self):
+        """
+        Folder in which the index is stored.
+        """
+        return self._root
+
+    def get_code(self, plugin_file):
+        """
+        Returns the compiled code of a plugin file, compiling it and storing it
+        in the index if needed.
+
+        :param str plugin_file: Path to the plugin file.
+        :returns: Tuple of the code object and a dictionary of the names of the
+            classes found in the plugin file, keyed by base class name.
+        """
+        with open(plugin_file, "rb") as fh:
+            source = fh.read()
+            stat = os.fstat(fh.fileno())
+        signature = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            hashlib.sha1(source).hexdigest(),
+        )
+
+        entry = self._read(plugin_file)
+        if entry is not None and entry["signature"] == signature:
+            return entry["code"], entry["class_names"]
+
+        code = self._compile(source, plugin_file)
+        self._write(
+            plugin_file,
+            {"signature": signature, "code": code, "class_names": {}},
+        )
+        return code, {}
+
+    def set_class_name(self, plugin_file, base_class_name, class_name):
+        """
+        Records the plugin class found in a plugin file for a base class.
+
+        :param str plugin_file: Path to the plugin file.
+        :param str base_class_name: Name of the base class the plugin class derives from.
+        :param str class_name: Name of the plugin class.
+        """
+        entry = self._read(plugin_file)
+        if entry is None:
+            return
+        entry["class_names"][base_class_name] = class_name
+        self._write(plugin_file, entry)
+
+    def _compile(self, source, plugin_file):
+        """
+        Compiles the source of a plugin file, like importing it would.
+
+        :param bytes source: Content of the plugin file.
+        :param str plugin_file: Path to the plugin file.
+        :returns: Code object.
+        """
+        return compile(source, plugin_file, "exec", dont_inherit=True)
+
+    def _get_entry_path(self, plugin_file):
+        """
+        Returns the path of the index entry of a plugin file.
+
+        :param str plugin_file: Path to the plugin file.
+        :returns: Path to the entry file.
+        """
+        key = hashlib.sha1(os.path.normpath(plugin_file).encode("utf-8")).hexdigest()
+        return os.path.join(self._root, "%s.idx" % key)
+
+    def _read(self, plugin_file):
+        """
+        Reads the index entry of a plugin file.
+
+        :param str plugin_file: Path to the plugin file.
+        :returns: Dictionary with keys ``signature``, ``code`` and ``class_names``,
+            or None if there is no valid entry.
+        """
+        try:
+            with open(self._get_entry_path(plugin_file), "rb") as fh:
+                data = fh.read()
+        except (IOError, OSError):
+            return None
+
+        magic_length = len(importlib.util.MAGIC_NUMBER)
+        if data[:magic_length] != importlib.util.MAGIC_NUMBER:
+            # written by another version of Python
+            return None
+        try:
+            version, indexed_file, signature, class_names, code = marshal.loads(
+                data[magic_length:]
+            )
+        except Exception as e:
+            log.debug(
+                "Could not read plugin index entry for '%s': %s" % (plugin_file, e)
+            )
+            return None
+
+        if version != self.FORMAT_VERSION or indexed_file != plugin_file:
+            return None
+        return {"signature": signature, "code": code, "class_names": class_names}
+
+    def _write(self, plugin_file, entry):
+        """
+        Atomically writes the index entry of a plugin file.
+
+        :param str plugin_file: Path to the plugin file.
+        :param dict entry: Dictionary with keys ``signature``, ``code`` and ``class_names``.
+        """
+        data = importlib.util.MAGIC_NUMBER + marshal.dumps(
+            (
+                self.FORMAT_VERSION,
+                plugin_file,
+                entry["signature"],
+                entry["class_names"],
+                entry["code"],
+            )
+        )
+        # the index is just not used if it can't be written.
+        filesystem.write_file_atomically(self._get_entry_path(plugin_file), data)
+
+
+def load_plugin(
+    plugin_file, valid_base_class, alternate_base_classes=None, plugin_index=None
+):
     """
     Load a plugin into memory and extract its single interface class.
 
@@ -40,6 +194,8 @@ def load_plugin(plugin_file, valid_base_class, alternate_base_classes=None):
     :param valid_base_class:        A type to use when searching for a derived class.
     :param alternate_base_classes:  A list of alternate base classes to be searched for if a class deriving
                                     from valid_base_class can't be found
+    :param plugin_index:            Optional :class:`PluginIndex` used to reuse the compiled code of the
+                                    file and the class previously found in it.
     :returns:                       A class derived from the base class if found
     :raises:                        Raises a TankError if it fails to load the file or doesn't find exactly
                                     one matching class.
@@ -50,15 +206,18 @@ def load_plugin(plugin_file, valid_base_class, alternate_base_classes=None):
 
     # construct a uuid and use this as the module name to ensure
     # that each import is unique
-    import uuid
-
     module_uid = uuid.uuid4().hex
     module = None
+    class_names = {}
     try:
         plugin_spec = importlib.util.spec_from_file_location(module_uid, plugin_file)
         module = importlib.util.module_from_spec(plugin_spec)
         sys.modules[module.__name__] = module
-        plugin_spec.loader.exec_module(module)
+        if plugin_index:
+            code, class_names = plugin_index.get_code(plugin_file)
+            exec(code, module.__dict__)
+        else:
+            plugin_spec.loader.exec_module(module)
     except Exception:
         # log the full callstack to make sure that whatever the
         # calling code is doing, this error is logged to help
@@ -77,6 +236,15 @@ def load_plugin(plugin_file, valid_base_class, alternate_base_classes=None):
         message += "\n".join(traceback.format_tb(exc_traceback))
         raise TankLoadPluginError(message)
 
+    # if the index knows which class to pick, use it as long as it still fits
+    indexed_class = module.__dict__.get(class_names.get(valid_base_class.__name__))
+    if (
+        inspect.isclass(indexed_class)
+        and indexed_class.__module__ == module.__name__
+        and issubclass(indexed_class, tuple(valid_base_classes))
+    ):
+        return indexed_class
+
     # cool, now validate the module
     found_classes = list()
     try:
@@ -135,5 +303,10 @@ def load_plugin(plugin_file, valid_base_class, alternate_base_classes=None):
 
         raise TankLoadPluginError(msg)
 
+    if plugin_index:
+        plugin_index.set_class_name(
+            plugin_file, valid_base_class.__name__, found_classes[0].__name__
+        )
+
     # return the class that was found.
     return found_classes[0]
@@ -16,6 +16,7 @@ from .connection import (
     get_deferred_sg_connection,
     get_project_name_studio_hook_location,
     get_sg_connection,
+    get_sg_connection_lock,
 )
 from .download import (
     download_and_unpack_attachment,
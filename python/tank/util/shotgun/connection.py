@@ -15,6 +15,7 @@ Methods for connecting to Shotgun
 import os
 import threading
 import urllib.parse
+import weakref
 
 from tank_vendor import shotgun_api3
 
@@ -381,6 +382,35 @@ def get_sg_connection():
     return sg
 
 
+_g_sg_connection_locks = weakref.WeakKeyDictionary()
+_g_sg_connection_locks_lock = threading.Lock()
+_g_sg_connection_fallback_lock = threading.RLock()
+
+
+def get_sg_connection_lock(sg_connection):
+    """
+    Returns the lock to hold while using a Shotgun connection which is shared
+    by several threads.
+
+        .. note:: Shotgun API instances are not safe to share across threads.
+                  Code which uses a connection created by another thread, e.g.
+                  descriptors downloading bundles concurrently, must hold this
+                  lock while making calls with it.
+
+    :param sg_connection: Shotgun API instance.
+    :returns: Reentrant lock, the same for all callers using the connection.
+    """
+    with _g_sg_connection_locks_lock:
+        try:
+            lock = _g_sg_connection_locks.get(sg_connection)
+            if lock is None:
+                lock = _g_sg_connection_locks[sg_connection] = threading.RLock()
+        except TypeError:
+            # the connection can't be weak referenced
+            lock = _g_sg_connection_fallback_lock
+    return lock
+
+
 @LogManager.log_timing
 def create_sg_connection(user="default"):
     """
@@ -22,6 +22,123 @@ from tank_vendor import yaml
 from ..errors import TankError, TankFileDoesNotExistError, TankUnreadableFileError
 
 
+def _read_only(*args, **kwargs):
+    """
+    Replaces the methods modifying :class:`ReadOnlyDict` and
+    :class:`ReadOnlyList` objects.
+    """
+    raise TypeError(
+        "Data cached by the YamlCache is read-only, a copy has to be modified instead."
+    )
+
+
+class ReadOnlyDict(dict):
+    """
+    Read-only dictionary returned by :meth:`YamlCache.get` when frozen data is
+    requested.
+
+    Instances are shared between all the callers reading the same file, so
+    they can't copy themselves when they are modified: all methods modifying
+    the dictionary raise a ``TypeError`` instead. Callers needing to modify
+    the data copy it first: :meth:`copy` returns a ``dict`` and
+    :func:`copy.deepcopy` returns a deep copy made of ``dict`` and ``list``
+    objects which can be safely modified.
+    """
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def copy(self):
+        """
+        Returns a shallow, mutable, copy of the dictionary.
+        """
+        return dict(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        result = {}
+        memo[id(self)] = result
+        for key, value in self.items():
+            result[copy.deepcopy(key, memo)] = copy.deepcopy(value, memo)
+        return result
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class ReadOnlyList(list):
+    """
+    Read-only list returned by :meth:`YamlCache.get` when frozen data is
+    requested.
+
+    Like :class:`ReadOnlyDict`, all methods modifying the list raise a
+    ``TypeError``. :meth:`copy` returns a ``list`` and :func:`copy.deepcopy`
+    returns a deep copy which can be safely modified.
+    """
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __iadd__ = _read_only
+    __imul__ = _read_only
+    append = _read_only
+    clear = _read_only
+    extend = _read_only
+    insert = _read_only
+    pop = _read_only
+    remove = _read_only
+    reverse = _read_only
+    sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        result = []
+        memo[id(self)] = result
+        for value in self:
+            result.append(copy.deepcopy(value, memo))
+        return result
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+def _freeze(data, memo):
+    """
+    Returns a read-only version of the given yaml data.
+
+    :param data: Data loaded from a yaml file.
+    :param dict memo: Frozen containers, keyed by the id of their source, so
+                      that containers shared with yaml anchors are only
+                      frozen once.
+    :returns: The data, where dictionaries and lists are replaced by
+              :class:`ReadOnlyDict` and :class:`ReadOnlyList` objects.
+    """
+    if isinstance(data, dict):
+        frozen = memo.get(id(data))
+        if frozen is None:
+            frozen = ReadOnlyDict(
+                (key, _freeze(value, memo)) for key, value in data.items()
+            )
+            memo[id(data)] = frozen
+        return frozen
+    elif isinstance(data, list):
+        frozen = memo.get(id(data))
+        if frozen is None:
+            frozen = ReadOnlyList(_freeze(value, memo) for value in data)
+            memo[id(data)] = frozen
+        return frozen
+    return data
+
+
 class CacheItem(object):
     """
     Represents a single item in the global yaml cache.
@@ -43,6 +160,7 @@ class CacheItem(object):
         """
         self._path = os.path.normpath(path)
         self._data = data
+        self._frozen_data = None
 
         if stat is None:
             try:
@@ -60,9 +178,24 @@ class CacheItem(object):
 
     def _set_data(self, config_data):
         self._data = config_data
+        self._frozen_data = None
 
     data = property(_get_data, _set_data)
 
+    @property
+    def frozen_data(self):
+        """
+        A read-only version of the item's data, built the first time it is
+        requested. See :meth:`YamlCache.get`.
+        """
+        # items unpickled from caches written by older versions don't have
+        # the attribute.
+        frozen_data = getattr(self, "_frozen_data", None)
+        if frozen_data is None:
+            frozen_data = _freeze(self._data, {})
+            self._frozen_data = frozen_data
+        return frozen_data
+
     @property
     def path(self):
         """The path to the file on disk that the item was sourced from."""
@@ -119,6 +252,12 @@ class CacheItem(object):
     def __str__(self):
         return str(self.path)
 
+    def __getstate__(self):
+        # The frozen data is not pickled, it is rebuilt when needed.
+        state = self.__dict__.copy()
+        state.pop("_frozen_data", None)
+        return state
+
 
 class YamlCache(object):
     """
@@ -155,14 +294,24 @@ class YamlCache(object):
             if path in self._cache:
                 del self._cache[path]
 
-    def get(self, path, deepcopy_data=True):
+    def get(self, path, deepcopy_data=True, frozen_data=False):
         """
         Retrieve the yaml data for the specified path.  If it's not already
         in the cache of the cached version is out of date then this will load
         the Yaml file from disk.
 
+        When frozen data is requested, the data is returned as read-only
+        :class:`ReadOnlyDict` and :class:`ReadOnlyList` objects which are
+        shared by all callers, so no copy is made. Modifying them raises a
+        ``TypeError`` rather than copying them: callers needing to modify the
+        data have to copy it first, with :func:`copy.deepcopy` for example,
+        which returns mutable ``dict`` and ``list`` objects.
+
         :param path:            The path of the yaml file to load.
         :param deepcopy_data:   Return deepcopy of data. Default is True.
+                                Ignored if frozen_data is True.
+        :param frozen_data:     Return read-only data shared with other
+                                callers. Default is False.
         :returns:               The raw yaml data loaded from the file.
         """
         # Adding a new CacheItem to the cache will cause the file mtime
@@ -173,6 +322,9 @@ class YamlCache(object):
         # the existing cached data.
         item = self._add(CacheItem(path))
 
+        if frozen_data:
+            return item.frozen_data
+
         # If asked to, return a deep copy of the cached data to ensure that
         # the cached data is not updated accidentally!
         if deepcopy_data:
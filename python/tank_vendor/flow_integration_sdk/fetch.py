@@ -16,9 +16,12 @@ This module provides asset download/fetching utilities.
 
 from __future__ import annotations  # needed for python 3.9 support
 
+import concurrent.futures
 import fileseq
 import os
+import struct
 import zipfile
+import zlib
 from collections.abc import Iterator
 from functools import cache
 
@@ -38,7 +41,29 @@ from .storage import (
     get_storage_component_path,
     get_storage_revision_dir,
 )
-from .utils import cleanpath, download_file, get_logger, trace
+from .utils import (
+    cleanpath,
+    download_file,
+    ensure_dir,
+    get_logger,
+    open_download,
+    trace,
+)
+
+# Default number of blobs downloaded at the same time
+DOWNLOAD_WORKERS = 4
+# Size in bytes of the reads from a downloaded zip file
+ZIP_CHUNK_SIZE = 65536
+
+# Zip file format, see https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT
+_ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_ZIP_CENTRAL_DIRECTORY_SIGNATURE = b"PK\x01\x02"
+_ZIP_END_OF_CENTRAL_DIRECTORY_SIGNATURE = b"PK\x05\x06"
+_ZIP_FLAG_ENCRYPTED = 0x1
+_ZIP_FLAG_DATA_DESCRIPTOR = 0x8
+_ZIP_FLAG_UTF8 = 0x800
+_ZIP64_LIMIT = 0xFFFFFFFF
 
 
 # urn to url cache - optimization to avoid re-querying urls that are fixed
@@ -109,19 +134,25 @@ def download(
     directory: str,
     file_sequence: bool = False,
     skip_download: bool = False,
+    max_workers: int = DOWNLOAD_WORKERS,
 ) -> dict[int, str]:
     """Download all binary blobs in component to given directory.
     Directory must exist, and component must be a binary component.
 
+    Blobs are downloaded concurrently, and their size is checked against
+    the size recorded in the component when there is one.
+
     Args:
         component: Component to be downloaded.
         project_id: Project that component belongs to.
         directory: Existing folder location to be downloaded to.
         file_sequence: If True, expect the component to contain a
                        zipped file sequence, and automatically expand it.
+                       Frames are extracted while the zip file downloads.
         skip_download: Only relevant for file sequences. Used when
                        the source zip file has already been downloaded, but
                        the files haven't been extracted.
+        max_workers: Maximum number of blobs downloaded at the same time.
 
     Returns:
         Dictionary of blob index to full path of downloaded file.
@@ -130,50 +161,312 @@ def download(
         FlowError
     """
     # Get list of urls for each component blob
-    urns = [blob["uri"] for blob in component.data.get("data", [])]
+    blobs = component.data.get("data", [])
+    urns = [blob["uri"] for blob in blobs]
     urls = fetch_blob_urls(project_id, urns)
 
-    result = {}
-    for i, url in enumerate(urls):
+    def download_blob(i, url):
         # Determine destination path
         # NOTE: this blob index is guaranteed to exist because we retrieved its url
-        blob_path = component.data["data"][i]["path"]
+        blob_path = blobs[i]["path"]
         file_path = cleanpath(directory, blob_path)
 
         # Finally download the file and save to disk
         try:
+            if file_sequence and i == 0:
+                # NOTE: This is a temporary solution. When we cease to zip
+                #       up file sequences, this code block and parameter can be removed!
+                if skip_download:
+                    frames = _extract_zip(file_path, directory)
+                else:
+                    frames = _download_zip(
+                        url, file_path, directory, blobs[i].get("size")
+                    )
+                return file_path, frames
             if not skip_download:
-                download_file(url, file_path)
+                download_file(url, file_path, expected_size=blobs[i].get("size"))
         except Exception as exc:  # pylint: disable=broad-except
             raise FlowError(
                 f'Failed to download blob {i} with url "{url}". {exc}'
             ) from exc
-        result[i] = file_path
+        return file_path, None
+
+    result = {}
+    frames = None
+    if len(urls) <= 1 or max_workers <= 1:
+        for i, url in enumerate(urls):
+            result[i], blob_frames = download_blob(i, url)
+            frames = frames if blob_frames is None else blob_frames
+    else:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(urls)),
+            thread_name_prefix="flow_download",
+        ) as executor:
+            futures = {
+                executor.submit(download_blob, i, url): i for i, url in enumerate(urls)
+            }
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    i = futures[future]
+                    result[i], blob_frames = future.result()
+                    frames = frames if blob_frames is None else blob_frames
+            except BaseException:
+                # Don't start the downloads which are still queued
+                for future in futures:
+                    future.cancel()
+                raise
+        result = dict(sorted(result.items()))
 
     if file_sequence:
-        # NOTE: This is a temporary solution. When we cease to zip
-        #       up file sequences, this code block and parameter can be removed!
-        zip_file_path = result[0]
-        with zipfile.ZipFile(zip_file_path, "r") as zip_file:
-            # Update result dictionary to reflect frames extracted
-            # (Do this to mimic the future behaviour where each frame
-            #  will be stored as its own blob)
-            result = {}
-            blob_index = 0
-            for file_name in zip_file.namelist():
-                result[blob_index] = cleanpath(directory, file_name)
-                blob_index += 1
-                # Check for unsafe file paths within zip
-                # We don't want to allow extracting outside of download directory
-                if file_name.startswith("/") or ".." in file_name:
-                    msg = f"Unsafe file path detected in zip file: {file_name} - aborting extraction."
-                    raise FlowError(msg)
-            # Extract the files
-            zip_file.extractall(directory)
+        # Update result dictionary to reflect frames extracted
+        # (Do this to mimic the future behaviour where each frame
+        #  will be stored as its own blob)
+        result = {
+            blob_index: cleanpath(directory, file_name)
+            for blob_index, file_name in enumerate(frames)
+        }
 
     return result
 
 
+def _check_zip_member_name(file_name: str):
+    """Raise if a file of a zipped file sequence would be extracted outside
+    of the download directory.
+
+    Args:
+        file_name: Name of the file in the zip file.
+
+    Raises:
+        FlowError
+    """
+    if file_name.startswith("/") or ".." in file_name:
+        msg = (
+            f"Unsafe file path detected in zip file: {file_name} - aborting extraction."
+        )
+        raise FlowError(msg)
+
+
+def _extract_zip(zip_file_path: str, directory: str) -> list[str]:
+    """Extract a zipped file sequence which was already downloaded.
+
+    Args:
+        zip_file_path: Path to the zip file.
+        directory: Folder to extract the files to.
+
+    Returns:
+        Names of the files in the zip file.
+
+    Raises:
+        FlowError
+    """
+    with zipfile.ZipFile(zip_file_path, "r") as zip_file:
+        file_names = zip_file.namelist()
+        # Check for unsafe file paths within zip
+        # We don't want to allow extracting outside of download directory
+        for file_name in file_names:
+            _check_zip_member_name(file_name)
+        # Extract the files
+        zip_file.extractall(directory)
+    return file_names
+
+
+class _TeeReader:
+    """File-like object reading from a stream and copying all the data read
+    to another file.
+    """
+
+    def __init__(self, stream, copy_file):
+        """
+        Args:
+            stream: File-like object to read from.
+            copy_file: File-like object the data read is written to.
+        """
+        self._stream = stream
+        self._copy_file = copy_file
+
+    def read(self, size: int) -> bytes:
+        """Read up to size bytes from the stream."""
+        data = self._stream.read(size)
+        self._copy_file.write(data)
+        return data
+
+    def read_exactly(self, size: int) -> bytes:
+        """Read exactly size bytes from the stream.
+
+        Raises:
+            EOFError: If the stream ends before.
+        """
+        chunks = []
+        while size > 0:
+            chunk = self.read(min(size, ZIP_CHUNK_SIZE))
+            if not chunk:
+                raise EOFError("Unexpected end of zip file.")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+
+def _extract_zip_stream(reader: _TeeReader, directory: str) -> list[str] | None:
+    """Extract the files of a zip file while it is being read.
+
+    Zip files store their file list at the end, so the files are read from the
+    local headers which precede the data of each file. This only works for files
+    stored or deflated with their sizes in the local header, which is how
+    zipfile writes file sequences on publish. Each file is written next to its
+    destination and moved in place once its checksum is verified.
+
+    Args:
+        reader: Stream of the zip file.
+        directory: Folder to extract the files to.
+
+    Returns:
+        Names of the extracted files, or None if the zip file can't be extracted
+        as a stream. In that case some of its files may have been extracted, and
+        the stream is left at an arbitrary position.
+
+    Raises:
+        FlowError: If the zip file is corrupted or contains unsafe paths.
+    """
+    logger = get_logger(__name__)
+
+    file_names = []
+    while True:
+        try:
+            signature = reader.read_exactly(len(_ZIP_LOCAL_HEADER_SIGNATURE))
+        except EOFError:
+            # Let zipfile report what is wrong with the zip file
+            return None
+        if signature in (
+            _ZIP_CENTRAL_DIRECTORY_SIGNATURE,
+            _ZIP_END_OF_CENTRAL_DIRECTORY_SIGNATURE,
+        ):
+            # This is the end of the files, which may be an empty zip file
+            # only made of its end of central directory record
+            return file_names
+        if signature != _ZIP_LOCAL_HEADER_SIGNATURE:
+            logger.debug("Zip file can't be extracted while downloading.")
+            return None
+
+        header = signature + reader.read_exactly(
+            _ZIP_LOCAL_HEADER.size - len(signature)
+        )
+
+        (
+            _signature,
+            _version,
+            flags,
+            method,
+            _time,
+            _date,
+            crc,
+            compressed_size,
+            _size,
+            name_length,
+            extra_length,
+        ) = _ZIP_LOCAL_HEADER.unpack(header)
+        name = reader.read_exactly(name_length)
+        reader.read_exactly(extra_length)
+
+        if (
+            flags & (_ZIP_FLAG_ENCRYPTED | _ZIP_FLAG_DATA_DESCRIPTOR)
+            or method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+            or compressed_size == _ZIP64_LIMIT
+        ):
+            logger.debug("Zip file can't be extracted while downloading.")
+            return None
+
+        file_name = name.decode("utf-8" if flags & _ZIP_FLAG_UTF8 else "cp437")
+        _check_zip_member_name(file_name)
+        file_names.append(file_name)
+
+        file_path = cleanpath(directory, file_name)
+        if file_name.endswith("/"):
+            ensure_dir(file_path)
+            continue
+        ensure_dir(os.path.dirname(file_path))
+
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        part_path = f"{file_path}.{os.getpid()}.part"
+        file_crc = 0
+        try:
+            with open(part_path, "wb") as f:
+                remaining = compressed_size
+                while remaining:
+                    chunk = reader.read(min(remaining, ZIP_CHUNK_SIZE))
+                    if not chunk:
+                        raise EOFError("Unexpected end of zip file.")
+                    remaining -= len(chunk)
+                    if method == zipfile.ZIP_DEFLATED:
+                        chunk = decompressor.decompress(chunk)
+                    file_crc = zlib.crc32(chunk, file_crc)
+                    f.write(chunk)
+                if method == zipfile.ZIP_DEFLATED:
+                    chunk = decompressor.flush()
+                    file_crc = zlib.crc32(chunk, file_crc)
+                    f.write(chunk)
+            if file_crc != crc:
+                raise FlowError(f"Bad CRC-32 for file {file_name} in zip file.")
+            os.replace(part_path, file_path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+
+def _download_zip(
+    url: str, zip_file_path: str, directory: str, expected_size: int | None
+) -> list[str]:
+    """Download a zipped file sequence and extract its files.
+
+    The files are extracted while the zip file is downloaded, instead of once
+    the download is complete, so the first frames are available sooner and
+    the zip file doesn't have to be read again from disk. The zip file is
+    still saved, as it is the source file of the component.
+
+    Args:
+        url: Url of the zip file.
+        zip_file_path: Path the zip file is saved to.
+        directory: Folder to extract the files to.
+        expected_size: If provided, size in bytes the zip file must have.
+
+    Returns:
+        Names of the files in the zip file.
+
+    Raises:
+        FlowError
+    """
+    ensure_dir(os.path.dirname(zip_file_path))
+    part_path = f"{zip_file_path}.{os.getpid()}.part"
+    try:
+        with open_download(url) as response, open(part_path, "wb") as zip_part:
+            reader = _TeeReader(response, zip_part)
+            try:
+                file_names = _extract_zip_stream(reader, directory)
+            except (EOFError, zlib.error) as exc:
+                raise FlowError(f"Zip file is corrupted. {exc}") from exc
+            # Read the rest of the zip file, this is its central directory
+            # if all the files could be extracted
+            while reader.read(ZIP_CHUNK_SIZE):
+                pass
+            size = zip_part.tell()
+
+        if expected_size is not None and size != expected_size:
+            msg = f"Downloaded {size} bytes for {zip_file_path}, expected {expected_size}."
+            raise FlowError(msg)
+        os.replace(part_path, zip_file_path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+    if file_names is None:
+        # Fall back to extracting the downloaded zip file
+        return _extract_zip(zip_file_path, directory)
+
+    with zipfile.ZipFile(zip_file_path, "r") as zip_file:
+        if zip_file.namelist() != file_names:
+            raise FlowError("Zip file content doesn't match its file list.")
+    return file_names
+
+
 @trace
 def fetch(
     revision: medm_model.AssetRevision,
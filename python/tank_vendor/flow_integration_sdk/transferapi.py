@@ -17,11 +17,18 @@ API methods for transfering files to the remote server
 from __future__ import annotations  # needed for python 3.9 support
 
 import base64
+import concurrent.futures
 import hashlib
+import json
 import math
+import mmap
 import os
+import threading
+import time
 import urllib.error
 import urllib.request
+from dataclasses import dataclass, field
+from typing import Callable
 
 from tank_vendor.flow_data_sdk.base import model as medm_model
 from tank_vendor.flow_data_sdk.base.exceptions import GQLAPIError
@@ -29,6 +36,19 @@ from tank_vendor.flow_data_sdk.base.exceptions import GQLAPIError
 from .exceptions import FileUploadError
 from .utils import get_logger, trace
 
+# Minimum size of an upload part, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+# Maximum number of parts of a multipart upload
+MAX_PARTS = 10000
+# Default number of parts uploaded concurrently
+UPLOAD_WORKERS = 4
+# Default number of times the upload of a part is retried
+UPLOAD_RETRIES = 3
+# Delay in seconds before the first retry, doubled for each following retry
+RETRY_DELAY = 1.0
+# Version of the resume journal format
+JOURNAL_VERSION = 1
+
 
 @trace
 def open_upload_file(client, urn_id: str, upload_uri: str) -> medm_model.UploadFileJob:
@@ -154,60 +174,117 @@ def close_upload_file(
         ) from e
 
 
-@trace
-def upload_blob(client, file_path, urn_id, upload_uri):
-    """Upload a file to remote storage using multipart upload.
-
-    Upload workflow:
-      1. Opens an upload session and obtains a job ID
-      2. Splits the file into chunks and uploads each part
-      3. Closes the upload session to finalize
+@dataclass
+class _UploadJournal:
+    """Resume journal of a multipart upload.
 
-    Args:
-        client: The GraphQL client instance
-        file_path: The local filename of the file to be uploaded
-        urn_id: URN of the blob component to upload to
-        upload_uri: URI needed for API transfer
+    Records the upload job and the ETags of the parts which were uploaded,
+    so an interrupted upload can continue without sending them again.
+    The journal is only valid for the file and the destination it was
+    created for.
     """
-    logger = get_logger(__name__)
-
-    # Create the UploadFileJob
-    upload_job = open_upload_file(client=client, urn_id=urn_id, upload_uri=upload_uri)
-    async_job_id = upload_job.id
-    logger.info(f"Opened upload job: {async_job_id} (state: {upload_job.state})")
 
-    # Keep track of etags
-    etags = []
+    path: str
+    signature: dict
+    job_id: str
+    etags: dict[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str, signature: dict) -> _UploadJournal | None:
+        """Load a journal if it exists and matches the upload.
+
+        Args:
+            path: Path to the journal file.
+            signature: Description of the file and destination of the upload.
+
+        Returns:
+            The journal, or None if there is no journal for this upload.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != JOURNAL_VERSION or data.get("signature") != signature:
+            return None
+
+        etags = {int(part_num): etag for part_num, etag in data["etags"].items()}
+        return cls(path=path, signature=signature, job_id=data["job_id"], etags=etags)
+
+    def save(self):
+        """Atomically write the journal to disk."""
+        data = {
+            "version": JOURNAL_VERSION,
+            "signature": self.signature,
+            "job_id": self.job_id,
+            "etags": {str(part_num): etag for part_num, etag in self.etags.items()},
+        }
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def remove(self):
+        """Delete the journal file."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _md5_base64(data) -> str:
+    """Return the base64-encoded MD5 hash of some data."""
+    # MD5 Hash is only used as a checksum so there is
+    # no security risk for using it here
+    return base64.b64encode(hashlib.md5(data).digest()).decode("utf-8")
+
+
+def _upload_part(
+    client,
+    client_lock: threading.Lock,
+    async_job_id: str,
+    mapped_file,
+    part_num: int,
+    start: int,
+    end: int,
+    retries: int,
+) -> str:
+    """Hash and upload a single part of a file.
+
+    Runs in a worker thread. The part is read from the memory-mapped file,
+    so only the parts being uploaded are loaded in memory. Failed uploads are
+    retried with a new upload URL.
 
-    # Split file into chunks for upload
-    total_size = os.path.getsize(file_path)
-    part_size = max(5 * 1024 * 1024, math.ceil(total_size / 10000))
-    total_parts = math.ceil(total_size / part_size)
-
-    logger.info(f"Uploading {file_path} in {total_parts} chunks of {part_size} bytes")
-
-    upload_state = "SUCCEEDED"
+    Args:
+        client: The GraphQL client instance.
+        client_lock: Lock serializing the calls made with the client.
+        async_job_id: The async job ID returned from open_upload_file.
+        mapped_file: Memory-mapped file to upload.
+        part_num: The part number to upload (1-based index).
+        start: Offset of the part in the file.
+        end: Offset of the end of the part in the file.
+        retries: Number of times a failed upload is retried.
 
-    try:
-        with open(file_path, "rb") as f:
-            for part_num in range(1, total_parts + 1):
-                # Read chunk data
-                chunk_data = f.read(part_size)
-                # MD5 Hash is only used as a checksum so there is
-                # no security risk for using it here
-                md5_hash = base64.b64encode(hashlib.md5(chunk_data).digest()).decode(
-                    "utf-8"
-                )
+    Returns:
+        The ETag of the uploaded part.
+    """
+    logger = get_logger(__name__)
 
-                logger.info(f" - Uploading chunk {part_num} : {md5_hash}")
+    with memoryview(mapped_file) as view, view[start:end] as chunk_data:
+        md5_hash = _md5_base64(chunk_data)
+        logger.info(f" - Uploading chunk {part_num} : {md5_hash}")
 
+        for attempt in range(retries + 1):
+            try:
                 # Get the upload URL for this part
-                part_info = get_upload_file_part(
-                    client=client,
-                    async_job_id=async_job_id,
-                    part_num=part_num,
-                    md5_hash=md5_hash,
-                )
+                with client_lock:
+                    part_info = get_upload_file_part(
+                        client=client,
+                        async_job_id=async_job_id,
+                        part_num=part_num,
+                        md5_hash=md5_hash,
+                    )
                 upload_url = part_info.send_url
                 # Confirm that upload url is a web url and not a file:// url
                 # which could present a security breach
@@ -223,7 +300,7 @@ def upload_blob(client, file_path, urn_id, upload_uri):
                 req = urllib.request.Request(
                     upload_url, data=chunk_data, headers=headers, method="PUT"
                 )
-                with urllib.request.urlopen(req, timeout=120) as response:
+                with urllib.request.urlopen(req, timeout=120) as response:  # nosec B310
                     if response.status not in (200, 201):
                         raise ValueError(
                             f"Failed to upload part {part_num}: HTTP {response.status}"
@@ -233,19 +310,265 @@ def upload_blob(client, file_path, urn_id, upload_uri):
                         raise ValueError(
                             f"ETag not found in response for part {part_num}"
                         )
-                    etags.append(etag)
-                logger.info(f"  Part {part_num}/{total_parts} uploaded successfully")
+                return etag
+
+            except RuntimeError:
+                raise
+            except Exception as e:  # pylint: disable=broad-except
+                if attempt == retries:
+                    raise
+                delay = RETRY_DELAY * 2**attempt
+                logger.warning(
+                    f"  Part {part_num} upload failed ({e}), retrying in {delay}s..."
+                )
+                time.sleep(delay)
 
-    except Exception as e:
-        upload_state = "FAILED"
 
-        raise FileUploadError(file_path=file_path, details=str(e)) from e
+def _run_upload_job(
+    client,
+    file_path,
+    async_job_id: str,
+    journal: _UploadJournal | None,
+    part_size: int,
+    max_workers: int,
+    progress_callback: Callable[[int, int], None] | None,
+    retries: int,
+):
+    """Upload the missing parts of a file to an upload job and close it.
+
+    Args:
+        client: The GraphQL client instance
+        file_path: The local filename of the file to be uploaded
+        async_job_id: The async job ID returned from open_upload_file.
+        journal: Resume journal of the upload, if any.
+        part_size: Size of the parts of the file.
+        max_workers: Number of parts uploaded concurrently.
+        progress_callback: Called with the number of bytes uploaded and the
+            size of the file, each time a part is uploaded.
+        retries: Number of times the upload of a part is retried.
+
+    Raises:
+        FileUploadError: If the upload fails. The job is left open if it
+            has a journal, so the upload can be resumed.
+    """
+    logger = get_logger(__name__)
+
+    total_size = os.path.getsize(file_path)
+    total_parts = math.ceil(total_size / part_size)
+
+    # Keep track of etags, by part number
+    etags = dict(journal.etags) if journal else {}
+
+    def part_range(part_num):
+        start = (part_num - 1) * part_size
+        return start, min(start + part_size, total_size)
+
+    uploaded_size = sum(
+        end - start for start, end in (part_range(part_num) for part_num in etags)
+    )
+    if progress_callback:
+        progress_callback(uploaded_size, total_size)
+
+    pending_parts = [
+        part_num for part_num in range(1, total_parts + 1) if part_num not in etags
+    ]
+    logger.info(
+        f"Uploading {file_path} in {total_parts} chunks of {part_size} bytes "
+        f"({len(pending_parts)} remaining)"
+    )
+
+    upload_state = "SUCCEEDED"
+
+    try:
+        if pending_parts:
+            client_lock = threading.Lock()
+            with open(file_path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped_file:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max(1, min(max_workers, len(pending_parts))),
+                    thread_name_prefix="flow_upload",
+                )
+                try:
+                    futures = {
+                        executor.submit(
+                            _upload_part,
+                            client,
+                            client_lock,
+                            async_job_id,
+                            mapped_file,
+                            part_num,
+                            *part_range(part_num),
+                            retries,
+                        ): part_num
+                        for part_num in pending_parts
+                    }
+                    for future in concurrent.futures.as_completed(futures):
+                        part_num = futures[future]
+                        etags[part_num] = future.result()
+                        start, end = part_range(part_num)
+                        uploaded_size += end - start
+                        if journal:
+                            journal.etags[part_num] = etags[part_num]
+                            journal.save()
+                        logger.info(
+                            f"  Part {part_num}/{total_parts} uploaded successfully"
+                        )
+                        if progress_callback:
+                            progress_callback(uploaded_size, total_size)
+                finally:
+                    # Stop uploading the remaining parts if one of them failed
+                    executor.shutdown(wait=True, cancel_futures=True)
+
+    except BaseException as e:
+        upload_state = "FAILED"
+        if isinstance(e, Exception):
+            raise FileUploadError(file_path=file_path, details=str(e)) from e
+        raise
 
     finally:
-        # Finally close the file upload job
-        close_upload_file(
-            client=client,
-            async_job_id=async_job_id,
-            etags=etags,
-            state=upload_state,
+        if upload_state == "SUCCEEDED" or not journal:
+            # Close the file upload job, unless it can be resumed
+            close_upload_file(
+                client=client,
+                async_job_id=async_job_id,
+                etags=[etags[part_num] for part_num in sorted(etags)],
+                state=upload_state,
+            )
+        else:
+            logger.info(
+                f"Upload job {async_job_id} left open, it can be resumed with "
+                f"journal {journal.path}"
+            )
+
+
+@trace
+def upload_blob(
+    client,
+    file_path,
+    urn_id,
+    upload_uri,
+    max_workers: int = UPLOAD_WORKERS,
+    progress_callback: Callable[[int, int], None] | None = None,
+    journal_path: str | None = None,
+    retries: int = UPLOAD_RETRIES,
+):
+    """Upload a file to remote storage using multipart upload.
+
+    Upload workflow:
+      1. Opens an upload session and obtains a job ID
+      2. Splits the file into chunks and uploads several parts concurrently
+      3. Closes the upload session to finalize
+
+    When a journal path is given, the upload job and the uploaded parts are
+    recorded in it. If the upload fails or is interrupted, the job is left
+    open and calling this function again with the same journal resumes the
+    upload, only sending the missing parts. The journal is deleted once the
+    upload succeeds. If no part can be uploaded to the job of a resumed
+    upload, e.g. because it expired on the server, the job is closed and
+    the upload starts again from scratch, once.
+
+    Args:
+        client: The GraphQL client instance
+        file_path: The local filename of the file to be uploaded
+        urn_id: URN of the blob component to upload to
+        upload_uri: URI needed for API transfer
+        max_workers: Number of parts uploaded concurrently.
+        progress_callback: Called with the number of bytes uploaded and the
+            size of the file, each time a part is uploaded. It is always
+            called from the calling thread.
+        journal_path: Path to the resume journal of the upload.
+        retries: Number of times the upload of a part is retried.
+
+    Raises:
+        FileUploadError: If the upload fails.
+    """
+    logger = get_logger(__name__)
+
+    # Split file into chunks for upload
+    file_stat = os.stat(file_path)
+    total_size = file_stat.st_size
+    part_size = max(MIN_PART_SIZE, math.ceil(total_size / MAX_PARTS))
+    total_parts = math.ceil(total_size / part_size)
+
+    journal = None
+    if journal_path:
+        signature = {
+            "file_path": os.path.abspath(file_path),
+            "size": total_size,
+            "mtime": file_stat.st_mtime_ns,
+            "part_size": part_size,
+            "urn_id": urn_id,
+            "upload_uri": upload_uri,
+        }
+        journal = _UploadJournal.load(journal_path, signature)
+
+    if journal:
+        resumed_parts = len(journal.etags)
+        logger.info(
+            f"Resuming upload job: {journal.job_id} "
+            f"({resumed_parts}/{total_parts} parts uploaded)"
+        )
+        try:
+            _run_upload_job(
+                client,
+                file_path,
+                journal.job_id,
+                journal,
+                part_size,
+                max_workers,
+                progress_callback,
+                retries,
+            )
+        except FileUploadError:
+            if len(journal.etags) != resumed_parts:
+                # The job is still alive, the upload can be resumed again.
+                raise
+
+            # The job may have expired on the server. Abandon it and start
+            # the upload again from scratch.
+            logger.warning(
+                f"Could not resume upload job {journal.job_id}, starting a new upload."
+            )
+            try:
+                close_upload_file(
+                    client=client,
+                    async_job_id=journal.job_id,
+                    etags=[
+                        journal.etags[part_num] for part_num in sorted(journal.etags)
+                    ],
+                    state="FAILED",
+                )
+            except FileUploadError:
+                # The job is not known to the server anymore.
+                pass
+            journal.remove()
+        else:
+            journal.remove()
+            return
+
+    # Create the UploadFileJob
+    upload_job = open_upload_file(client=client, urn_id=urn_id, upload_uri=upload_uri)
+    async_job_id = upload_job.id
+    logger.info(f"Opened upload job: {async_job_id} (state: {upload_job.state})")
+
+    journal = None
+    if journal_path:
+        journal = _UploadJournal(
+            path=journal_path, signature=signature, job_id=async_job_id
         )
+        journal.save()
+
+    _run_upload_job(
+        client,
+        file_path,
+        async_job_id,
+        journal,
+        part_size,
+        max_workers,
+        progress_callback,
+        retries,
+    )
+
+    if journal:
+        journal.remove()
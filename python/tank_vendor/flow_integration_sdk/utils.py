@@ -25,6 +25,8 @@ import sys
 import time
 import traceback
 import urllib
+import urllib.error
+import urllib.request
 from functools import wraps
 from typing import Callable
 
@@ -346,16 +348,18 @@ def mimetype(ext: str):
 
 
 @trace
-def download_file(url, local_filename):
+def download_file(url, local_filename, expected_size: int | None = None):
     """Download a file from the passed in URL and save it in the specified location.
     Create any folders as necessary.
 
     Args:
         url: The remote URL to download
         local_filename: The full path to the local destination file
+        expected_size: If provided, size in bytes the downloaded file must have.
 
     Raises:
         DirctoryNotCreatedError: If we couldn't create the folder for the download
+        FlowError: If the download failed or the file doesn't have the expected size
     """
     # Check if path exists, and create it if it doesn't
     local_dir = os.path.dirname(local_filename)
@@ -363,19 +367,49 @@ def download_file(url, local_filename):
     # This can raise an exception
     ensure_dir(local_dir)
 
+    # Download next to the destination and only move the file in place once
+    # complete, so an interrupted download never leaves a truncated file
+    part_filename = f"{local_filename}.{os.getpid()}.part"
     try:
-        with urllib.request.urlopen(url) as r:  # nosec B210
+        with open_download(url) as r:
+            size = 0
             try:
-                with open(local_filename, "wb") as f:
+                with open(part_filename, "wb") as f:
                     while True:
-                        chunk = r.read(8192)
+                        chunk = r.read(65536)
                         if not chunk:
                             break
                         f.write(chunk)
+                        size += len(chunk)
             except Exception as exc:  # pylint: disable=broad-except
                 msg = f"Failed to write to local file: {local_filename}"
                 traceback.print_exc()
                 raise FlowError(msg) from exc
+
+        if expected_size is not None and size != expected_size:
+            msg = f"Downloaded {size} bytes for {local_filename}, expected {expected_size}."
+            raise FlowError(msg)
+
+        os.replace(part_filename, local_filename)
+    finally:
+        if os.path.exists(part_filename):
+            os.remove(part_filename)
+
+
+def open_download(url):
+    """Open the passed in URL for download.
+
+    Args:
+        url: The remote URL to download
+
+    Returns:
+        The HTTP response, to be used as a context manager.
+
+    Raises:
+        FlowError: If the request failed
+    """
+    try:
+        return urllib.request.urlopen(url)  # nosec B210
     except urllib.error.HTTPError as exc:
         msg = f'HTTP error occurred while accessing url "{url}". {exc}'
         traceback.print_exc()
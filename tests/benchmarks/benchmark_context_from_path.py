@@ -0,0 +1,128 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Compares building contexts from deep paths when the entities of each parent
+folder are looked up one folder at a time and all at once.
+"""
+
+import contextlib
+import os
+import time
+
+from tank import path_cache
+from tank_test.tank_test_base import setUpModule  # noqa
+from tank_test.tank_test_base import TankTestBase, mock
+
+# number of times the context of each path is built
+ITERATIONS = 20
+# depth of the generated folders, below the project root
+DEPTH = 12
+# number of leaf folders
+PATH_COUNT = 50
+
+
+def _get_path_entities_per_path(self, paths):
+    """
+    Looks up the entities of each path with its own queries.
+    """
+    return dict(
+        (path, (self.get_entity(path), self.get_secondary_entities(path)))
+        for path in paths
+    )
+
+
+class BenchmarkContextFromPath(TankTestBase):
+    """
+    Benchmarks context_from_path on folders nested under many entity folders.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.setup_fixtures()
+        self.paths = self._build_path_cache()
+
+    def _build_path_cache(self):
+        """
+        Registers nested entity folders in the path cache, with a secondary
+        entity on each leaf folder.
+
+        :returns: List of the leaf folder paths.
+        """
+        pc = path_cache.PathCache(self.tk)
+        self.addCleanup(pc.close)
+
+        data = []
+        entity_id = 0
+        leaves = []
+        for path_index in range(PATH_COUNT):
+            path = self.project_root
+            for level in range(DEPTH):
+                path = os.path.join(path, "level%d_%d" % (level, path_index))
+                entity_id += 1
+                data.append(
+                    {
+                        "entity": {
+                            "type": "CustomEntity%02d" % (level + 1),
+                            "id": entity_id,
+                            "name": os.path.basename(path),
+                        },
+                        "path": path,
+                        "primary": True,
+                        "metadata": {},
+                    }
+                )
+            data.append(
+                {
+                    "entity": {"type": "Step", "id": path_index, "name": "step"},
+                    "path": path,
+                    "primary": False,
+                    "metadata": {},
+                }
+            )
+            leaves.append(path)
+
+        pc.add_mappings(data, None, [])
+        return leaves
+
+    def _time_contexts(self, per_path):
+        """
+        Builds the context of all the paths and returns the elapsed time and
+        the contexts.
+        """
+        if per_path:
+            patcher = mock.patch.object(
+                path_cache.PathCache, "get_path_entities", _get_path_entities_per_path
+            )
+        else:
+            patcher = contextlib.nullcontext()
+
+        with patcher:
+            start = time.perf_counter()
+            for _ in range(ITERATIONS):
+                contexts = [self.tk.context_from_path(path) for path in self.paths]
+            elapsed = time.perf_counter() - start
+
+        return elapsed, [context.to_dict() for context in contexts]
+
+    def test_context_from_path(self):
+        per_path_time, per_path_contexts = self._time_contexts(True)
+        single_query_time, single_query_contexts = self._time_contexts(False)
+
+        # both modes have to give the same results.
+        self.assertEqual(per_path_contexts, single_query_contexts)
+
+        print()
+        print(
+            "Built contexts for %d paths %d levels deep %d times."
+            % (PATH_COUNT, DEPTH, ITERATIONS)
+        )
+        print("Queries per folder: %.3fs" % per_path_time)
+        print("Single query:       %.3fs" % single_query_time)
@@ -0,0 +1,179 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Compares starting an engine on a large config when the yaml data is deep
+copied by the yaml cache and when read-only data is shared.
+"""
+
+import contextlib
+import copy
+import os
+import time
+
+import sgtk
+from tank.util import yaml_cache
+from tank_test.tank_test_base import setUpModule  # noqa
+from tank_test.tank_test_base import TankTestBase, mock
+from tank_vendor import yaml
+
+# number of times the engine is started
+ITERATIONS = 5
+# size of the generated config
+INCLUDE_COUNT = 10
+APP_COUNT = 40
+SETTING_COUNT = 20
+
+APP_FILE = """
+from tank.platform import Application
+
+
+class BenchmarkApp(Application):
+    def init_app(self):
+        self.engine.register_command(self.instance_name, lambda: None)
+"""
+
+
+class BenchmarkEngineStartup(TankTestBase):
+    """
+    Benchmarks starting an engine with many apps configured in include files.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.setup_fixtures()
+
+        shot = {"type": "Shot", "name": "shot_name", "id": 2, "project": self.project}
+        shot_path = os.path.join(self.project_root, "shot_code")
+        self.add_production_path(shot_path, shot)
+        step_path = os.path.join(shot_path, "step_name")
+        self.add_production_path(step_path, {"type": "Step", "name": "step", "id": 4})
+        self.context = self.tk.context_from_path(step_path)
+
+        env_path = self._build_config(os.path.join(self.tank_temp, "big_config"))
+        patcher = mock.patch.object(
+            self.tk.pipeline_configuration,
+            "get_environment_path",
+            return_value=env_path,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _build_config(self, root):
+        """
+        Writes an environment where the apps of the test engine are defined in
+        include files, and the app they use.
+
+        :returns: Path to the environment file.
+        """
+        app_root = os.path.join(root, "benchmark_app")
+        os.makedirs(app_root)
+        with open(os.path.join(app_root, "app.py"), "w") as fh:
+            fh.write(APP_FILE)
+        schema = {}
+        for setting_index in range(SETTING_COUNT):
+            schema["setting%d" % setting_index] = {
+                "type": "list",
+                "values": {"type": "int"},
+                "default_value": [],
+            }
+        self._write_yaml(
+            os.path.join(app_root, "info.yml"),
+            {"display_name": "Benchmark App", "configuration": schema},
+        )
+
+        env_root = os.path.join(root, "env")
+        os.makedirs(os.path.join(env_root, "includes"))
+        apps = {}
+        includes = []
+        for include_index in range(INCLUDE_COUNT):
+            app_settings = {}
+            for app_index in range(APP_COUNT):
+                app_name = "benchmark_app%d_%d" % (include_index, app_index)
+                settings = {"location": {"type": "path", "path": app_root}}
+                for setting_index in range(SETTING_COUNT):
+                    settings["setting%d" % setting_index] = list(
+                        range(setting_index + 1)
+                    )
+                app_settings[app_name] = settings
+                apps[app_name] = "@%s" % app_name
+            include_name = "includes/benchmark_apps%d.yml" % include_index
+            self._write_yaml(os.path.join(env_root, include_name), app_settings)
+            includes.append(include_name)
+
+        env_path = os.path.join(env_root, "benchmark.yml")
+        self._write_yaml(
+            env_path,
+            {
+                "includes": includes,
+                "engines": {
+                    "test_engine": {
+                        "location": {
+                            "type": "dev",
+                            "path": "{CONFIG_FOLDER}/bundles/test_engine",
+                        },
+                        "apps": apps,
+                    }
+                },
+            },
+        )
+        return env_path
+
+    def _write_yaml(self, path, data):
+        with open(path, "w") as fh:
+            fh.write(yaml.dump(data))
+
+    def _time_startup(self, frozen):
+        """
+        Starts the engine and returns the elapsed time and its commands.
+        """
+        get = yaml_cache.g_yaml_cache.get
+
+        def deepcopy_get(path, deepcopy_data=True, frozen_data=False):
+            # data read by the environment is always deep copied
+            return copy.deepcopy(get(path, frozen_data=True))
+
+        if frozen:
+            patcher = contextlib.nullcontext()
+        else:
+            patcher = mock.patch.object(yaml_cache.g_yaml_cache, "get", deepcopy_get)
+
+        with patcher:
+            start = time.perf_counter()
+            engine = sgtk.platform.start_engine("test_engine", self.tk, self.context)
+            elapsed = time.perf_counter() - start
+        commands = sorted(engine.commands)
+        engine.destroy()
+        return elapsed, commands
+
+    def test_engine_startup(self):
+        # make sure the files are in the cache and the apps are imported.
+        sgtk.platform.start_engine("test_engine", self.tk, self.context).destroy()
+
+        # both modes are timed in turn, as startup times vary over the run.
+        deepcopy_time = frozen_time = 0
+        for _ in range(ITERATIONS):
+            elapsed, deepcopy_commands = self._time_startup(False)
+            deepcopy_time += elapsed
+            elapsed, frozen_commands = self._time_startup(True)
+            frozen_time += elapsed
+
+        # both modes have to start the same apps.
+        app_commands = [x for x in frozen_commands if x.startswith("benchmark_app")]
+        self.assertEqual(len(app_commands), INCLUDE_COUNT * APP_COUNT)
+        self.assertEqual(deepcopy_commands, frozen_commands)
+
+        print()
+        print(
+            "Started an engine with %d apps %d times."
+            % (INCLUDE_COUNT * APP_COUNT, ITERATIONS)
+        )
+        print("Deep copied yaml data: %.3fs" % deepcopy_time)
+        print("Read-only yaml data:   %.3fs" % frozen_time)
@@ -0,0 +1,96 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Compares the recursive and compiled template path parsing on the fixture configs.
+"""
+
+import os
+import time
+
+from tank import TankError, constants
+from tank.template import read_templates
+from tank.templatekey import IntegerKey, SequenceKey, StringKey, TimestampKey
+from tank_test.tank_test_base import setUpModule  # noqa
+from tank_test.tank_test_base import TankTestBase, mock
+
+# number of times each path is parsed by each template
+ITERATIONS = 20
+
+
+class BenchmarkTemplateParsing(TankTestBase):
+    """
+    Benchmarks Template.get_fields with both parsing modes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.setup_fixtures()
+        self.paths = self._build_paths(read_templates(self.tk.pipeline_configuration))
+
+    def _build_paths(self, templates):
+        """
+        Builds a list of paths from the templates, with a few values for each key.
+        """
+        values = {
+            StringKey: ["seq_010", "shot_010", "comp", "main", "ma"],
+            IntegerKey: [1, 12, 1920],
+            SequenceKey: [1001, "FORMAT: %d"],
+        }
+        paths = []
+        for template in templates.values():
+            for index in range(3):
+                fields = {}
+                for key in template.keys.values():
+                    if key.choices:
+                        fields[key.name] = key.choices[index % len(key.choices)]
+                    elif isinstance(key, TimestampKey):
+                        fields[key.name] = None
+                    else:
+                        key_values = values[type(key)]
+                        fields[key.name] = key_values[index % len(key_values)]
+                try:
+                    paths.append(template.apply_fields(fields))
+                except TankError:
+                    pass
+        return paths
+
+    def _time_mode(self, enabled):
+        """
+        Parses all the paths with all the templates and returns the elapsed time.
+        """
+        with mock.patch.dict(
+            os.environ,
+            {constants.COMPILED_TEMPLATE_PARSING_ENV_VAR: "1" if enabled else "0"},
+        ):
+            templates = read_templates(self.tk.pipeline_configuration)
+
+        results = []
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            for template in templates.values():
+                for path in self.paths:
+                    try:
+                        results.append(template.get_fields(path))
+                    except TankError:
+                        results.append(None)
+        return time.perf_counter() - start, results
+
+    def test_get_fields(self):
+        recursive_time, recursive_results = self._time_mode(False)
+        compiled_time, compiled_results = self._time_mode(True)
+
+        # both modes have to give the same results.
+        self.assertEqual(recursive_results, compiled_results)
+
+        print()
+        print("Parsed %d paths %d times." % (len(self.paths), ITERATIONS))
+        print("Recursive parsing: %.3fs" % recursive_time)
+        print("Compiled parsing:  %.3fs" % compiled_time)
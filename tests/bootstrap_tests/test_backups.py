@@ -15,6 +15,7 @@ from shutil import copytree
 
 import sgtk
 from sgtk.pipelineconfig_utils import get_metadata
+from tank import compiled_config
 from tank.util import is_windows
 from tank_test.tank_test_base import setUpModule  # noqa
 from tank_test.tank_test_base import (
@@ -275,3 +276,26 @@ class TestBackups(ShotgunTestBase):
                 local_bundle_cache_path
                 in config_metadata["bundle_cache_fallback_roots"]
             )
+
+    def test_compiled_config(self):
+        """
+        Ensures that the configuration is compiled during updates.
+        """
+        resolver = sgtk.bootstrap.resolver.ConfigurationResolver(
+            plugin_id="backup_tests"
+        )
+        with temp_env_var(SGTK_REPO_ROOT=self._core_repo_path):
+            config = resolver.resolve_configuration(
+                {"type": "dev", "name": "backup_tests", "path": self._temp_test_path},
+                self.mockgun,
+            )
+            config.update_configuration()
+
+            compiled_path = os.path.join(
+                config.path.current_os, compiled_config.COMPILED_CONFIG_FILE
+            )
+            self.assertIsNotNone(
+                compiled_config.CompiledConfig.load(
+                    compiled_path, config.descriptor.get_config_folder()
+                )
+            )
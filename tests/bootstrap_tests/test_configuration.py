@@ -10,6 +10,8 @@
 
 import os
 import sys
+import threading
+import time
 import uuid
 
 import sgtk
@@ -612,6 +614,185 @@ class TestCachedConfiguration(ShotgunTestBase):
             self._cached_config.status(), self._cached_config.LOCAL_CFG_DIFFERENT
         )
 
+    def test_download_bundles(self):
+        """
+        Ensures missing bundles are downloaded once per location and progress
+        is reported for every bundle.
+        """
+
+        def make_descriptor(uri, location, exists):
+            descriptor = mock.Mock()
+            descriptor.__str__ = mock.Mock(return_value=uri)
+            descriptor.get_uri.return_value = uri
+            descriptor.exists_local.return_value = exists
+            descriptor._io_descriptor._get_primary_cache_path.return_value = location
+            return descriptor
+
+        descriptors = [
+            make_descriptor("cached", "/cache/cached", True),
+            make_descriptor("app", "/cache/app", False),
+            make_descriptor("same_app", "/cache/app", False),
+            make_descriptor("failing", "/cache/failing", False),
+            make_descriptor("engine", "/cache/engine", False),
+        ]
+
+        downloaded = []
+        threads = set()
+
+        def download_bundle(descriptor):
+            threads.add(threading.current_thread().name)
+            if descriptor.get_uri() == "failing":
+                raise Exception("Download failed.")
+            downloaded.append(descriptor.get_uri())
+
+        progress = []
+        self._cached_config._bundle_downloader = None
+        with mock.patch.object(
+            self._cached_config, "_download_bundle", side_effect=download_bundle
+        ):
+            self._cached_config._download_bundles(
+                descriptors, lambda msg, idx, total: progress.append((idx, total))
+            )
+
+        self.assertEqual(["app", "engine"], sorted(downloaded))
+        self.assertEqual([(idx, 5) for idx in range(5)], progress)
+        self.assertNotIn(threading.current_thread().name, threads)
+
+        # downloads can be made one at a time.
+        downloaded[:] = []
+        progress[:] = []
+        with mock.patch.object(
+            self._cached_config, "_download_bundle", side_effect=download_bundle
+        ), mock.patch.dict(
+            os.environ,
+            {sgtk.bootstrap.constants.BUNDLE_DOWNLOAD_THREADS_ENV_VAR: "1"},
+        ):
+            self.assertEqual(1, self._cached_config._get_bundle_download_threads())
+            self._cached_config._download_bundles(
+                descriptors, lambda msg, idx, total: progress.append((idx, total))
+            )
+        self.assertEqual(["app", "engine"], sorted(downloaded))
+        self.assertEqual([(idx, 5) for idx in range(5)], progress)
+
+    def test_download_bundles_share_site_connection(self):
+        """
+        Ensures bundles downloaded concurrently with the site connection
+        never use it from two threads at the same time.
+        """
+        from sgtk.bootstrap.bundle_downloader import BundleDownloader
+
+        self._cached_config._bundle_downloader = BundleDownloader(
+            self.mockgun, None, self._cached_config._descriptor
+        )
+        self.assertIs(
+            self._cached_config._bundle_downloader._hook_lock,
+            sgtk.util.shotgun.get_sg_connection_lock(self.mockgun),
+        )
+
+        descriptors = [
+            sgtk.descriptor.create_descriptor(
+                self.mockgun,
+                sgtk.descriptor.Descriptor.APP,
+                {
+                    "type": "shotgun",
+                    "entity_type": "CustomNonProjectEntity01",
+                    "id": idx,
+                    "field": "sg_payload",
+                    "version": 100 + idx,
+                },
+                bundle_cache_root_override=os.path.join(
+                    self.tank_temp, self.short_test_name, "bundle_cache"
+                ),
+            )
+            for idx in range(6)
+        ]
+
+        lock = threading.Lock()
+        active = []
+        max_active = []
+
+        def download_and_unpack_attachment(sg, attachment_id, target, **kwargs):
+            with lock:
+                active.append(attachment_id)
+                max_active.append(len(active))
+            # leave other threads a chance to run.
+            time.sleep(0.05)
+            os.makedirs(target, exist_ok=True)
+            with open(os.path.join(target, "info.yml"), "w") as fh:
+                fh.write("attachment: %s\n" % attachment_id)
+            with lock:
+                active.remove(attachment_id)
+
+        with mock.patch(
+            "tank.util.shotgun.download_and_unpack_attachment",
+            side_effect=download_and_unpack_attachment,
+        ):
+            self._cached_config._download_bundles(
+                descriptors, lambda msg, idx, total: None
+            )
+
+        self.assertEqual(6, len(max_active))
+        self.assertEqual(1, max(max_active))
+        for descriptor in descriptors:
+            self.assertTrue(descriptor.exists_local())
+
+    def test_download_bundles_thread_safe_hook(self):
+        """
+        Ensures bundles are downloaded concurrently through a bootstrap hook
+        which declares itself thread safe.
+        """
+        from sgtk.bootstrap.bundle_downloader import BundleDownloader
+
+        lock = threading.Lock()
+        active = [0]
+        max_active = []
+
+        class ThreadSafeHook(object):
+            THREAD_SAFE = True
+
+            def init(self, *args):
+                pass
+
+            def can_cache_bundle(self, descriptor):
+                return True
+
+            def populate_bundle_cache_entry(self, destination, descriptor):
+                with lock:
+                    active[0] += 1
+                    max_active.append(active[0])
+                # leave other threads a chance to run.
+                time.sleep(0.05)
+                os.makedirs(destination, exist_ok=True)
+                with open(os.path.join(destination, "info.yml"), "w") as fh:
+                    fh.write("version: %s\n" % descriptor.version)
+                with lock:
+                    active[0] -= 1
+
+        with mock.patch(
+            "tank.hook.create_hook_instance", return_value=ThreadSafeHook()
+        ):
+            self._cached_config._bundle_downloader = BundleDownloader(
+                self.mockgun, None, self._cached_config._descriptor
+            )
+
+        descriptors = [
+            sgtk.descriptor.create_descriptor(
+                self.mockgun,
+                sgtk.descriptor.Descriptor.APP,
+                {"type": "app_store", "name": "tk-app%d" % idx, "version": "v1.0.0"},
+                bundle_cache_root_override=os.path.join(
+                    self.tank_temp, self.short_test_name, "bundle_cache"
+                ),
+            )
+            for idx in range(6)
+        ]
+        self._cached_config._download_bundles(descriptors, lambda msg, idx, total: None)
+
+        self.assertEqual(6, len(max_active))
+        self.assertGreater(max(max_active), 1)
+        for descriptor in descriptors:
+            self.assertTrue(descriptor.exists_local())
+
     def _update_deploy_file(self, generation=None, descriptor=None, corrupt=False):
         """
         Updates the deploy file.
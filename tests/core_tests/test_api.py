@@ -12,6 +12,7 @@ import os
 
 import tank
 from tank.api import Tank
+from tank.errors import TankMultipleMatchingTemplatesError
 from tank.template import TemplatePath, TemplateString
 from tank.templatekey import IntegerKey, SequenceKey, StringKey
 from tank_test.tank_test_base import setUpModule  # noqa
@@ -65,6 +66,61 @@ class TestTemplateFromPath(TankTestBase):
         self.assertIsNotNone(template)
         self.assertIsInstance(template, TemplateString)
 
+    def test_matches_all_templates_validation(self):
+        """
+        Check the indexed lookup returns the same templates as validating
+        every single template.
+        """
+        paths = [
+            os.path.join(
+                self.project_root,
+                "sequences/Sequence_1/shot_010/Anm/publish/shot_010.jfk.v001.ma",
+            ),
+            os.path.join(self.project_root, "sequences/Sequence_1/shot_010"),
+            os.path.join(self.project_root, "sequences/Sequence_1"),
+            os.path.join(self.project_root, "assets/char/Car/Anm/work/maya"),
+            self.project_root,
+            "Nuke Script Name, v002",
+            "/some/other/path",
+        ]
+        for path in paths:
+            expected = [t for t in self.tk.templates.values() if t.validate(path)]
+            self.assertEqual(expected, self.tk.templates_from_path(path))
+
+    def test_modified_templates(self):
+        """
+        Check templates added to the templates dictionary are matched.
+        """
+        keys = {"Shot": StringKey("Shot")}
+        template = TemplatePath("matcher_test/{Shot}", keys, self.project_root)
+        path = os.path.join(self.project_root, "matcher_test", "shot_010")
+        self.assertIsNone(self.tk.template_from_path(path))
+
+        self.tk.templates["matcher_test"] = template
+        self.assertEqual(self.tk.template_from_path(path), template)
+
+        del self.tk.templates["matcher_test"]
+        self.assertIsNone(self.tk.template_from_path(path))
+
+    def test_ambiguous_path(self):
+        """
+        Check an error is raised when several templates match a path.
+        """
+        keys = {"Shot": StringKey("Shot"), "name": StringKey("name")}
+        self.tk.templates = {
+            "a": TemplatePath("matcher_test/{Shot}", keys, self.project_root),
+            "b": TemplatePath("matcher_test/{name}", keys, self.project_root),
+            "c": TemplatePath("other/{name}", keys, self.project_root),
+        }
+        path = os.path.join(self.project_root, "matcher_test", "shot_010")
+        self.assertEqual(
+            [self.tk.templates["a"], self.tk.templates["b"]],
+            self.tk.templates_from_path(path),
+        )
+        self.assertRaises(
+            TankMultipleMatchingTemplatesError, self.tk.template_from_path, path
+        )
+
 
 class TestTemplatesLoaded(TankTestBase):
     """Test case for the loading of templates from project level config."""
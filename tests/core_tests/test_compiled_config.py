@@ -0,0 +1,328 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import logging
+import os
+
+import tank
+from tank import TankError, compiled_config
+from tank.template import read_templates
+from tank.util import yaml_cache
+from tank_test.tank_test_base import setUpModule  # noqa
+from tank_test.tank_test_base import TankTestBase, mock
+from tank_vendor import yaml
+
+
+class TestCompiledConfig(TankTestBase):
+    """
+    Tests compiling configurations and loading them.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # the tests modify the config files, so work on a copy of them.
+        self.setup_fixtures(parameters={"installed_config": True})
+        self.config_location = self.tk.pipeline_configuration.get_config_location()
+        self.compiled_path = self._compile()
+
+    def _compile(self, path=None):
+        pc = self.tk.pipeline_configuration
+        return compiled_config.compile_config(
+            self.config_location, path or pc.get_compiled_config_location(), pc
+        )
+
+    def _get_pipeline_configuration(self):
+        return tank.pipelineconfig.PipelineConfiguration(self.pipeline_config_root)
+
+    def test_compiled_data(self):
+        """
+        Tests that the compiled data matches the YAML files and that no YAML
+        file is read when it is used.
+        """
+        self.assertEqual(
+            self.compiled_path,
+            self.tk.pipeline_configuration.get_compiled_config_location(),
+        )
+        pc = self._get_pipeline_configuration()
+        self.assertIsNotNone(pc._compiled_config)
+
+        with mock.patch.object(
+            yaml_cache.g_yaml_cache, "get", side_effect=AssertionError
+        ):
+            templates_config = pc.get_templates_config()
+            templates = read_templates(pc)
+            environments = {}
+            for env_name in pc.get_environments():
+                environments[env_name] = pc.get_environment(env_name)._env_data
+
+        self.assertEqual(
+            templates_config, self.tk.pipeline_configuration.get_templates_config()
+        )
+        self.assertEqual(
+            sorted(templates), sorted(read_templates(self.tk.pipeline_configuration))
+        )
+        self.assertIn("test", environments)
+        for env_name, env_data in environments.items():
+            self.assertEqual(
+                env_data,
+                self.tk.pipeline_configuration.get_environment(
+                    env_name, writable=True
+                )._env_data,
+            )
+
+        # each call returns new data which can be modified.
+        self.assertIsNot(templates_config, pc.get_templates_config())
+
+    def test_core_hooks(self):
+        """
+        Tests that core hooks are found with the compiled config.
+        """
+        pc = self._get_pipeline_configuration()
+        hooks_folder = pc.get_core_hooks_location()
+        with mock.patch("os.path.exists", side_effect=AssertionError):
+            self.assertTrue(
+                pc._core_hook_exists(os.path.join(hooks_folder, "pick_environment.py"))
+            )
+            self.assertFalse(
+                pc._core_hook_exists(os.path.join(hooks_folder, "unknown.py"))
+            )
+
+    def test_out_of_date(self):
+        """
+        Tests that the compiled config is ignored when its sources change.
+        """
+        env_path = os.path.join(
+            self.config_location, "env", "includes", "empty_config.yml"
+        )
+        with open(env_path, "a") as fh:
+            fh.write("\n# modified\n")
+        self.assertIsNone(self._get_pipeline_configuration()._compiled_config)
+
+        self.compiled_path = self._compile()
+        self.assertIsNotNone(self._get_pipeline_configuration()._compiled_config)
+
+        # adding a core hook also invalidates it
+        hook_path = os.path.join(self.config_location, "core", "hooks", "new_hook.py")
+        with open(hook_path, "w") as fh:
+            fh.write("\n")
+        self.assertIsNone(self._get_pipeline_configuration()._compiled_config)
+
+    def test_reload(self):
+        """
+        Tests that the compiled config is checked again when templates are
+        reloaded, which also happens when the engine is restarted.
+        """
+        tk = tank.Tank(self._get_pipeline_configuration())
+        pc = tk.pipeline_configuration
+        self.assertIsNotNone(pc._compiled_config)
+
+        templates_path = os.path.join(self.config_location, "core", "templates.yml")
+        with open(templates_path) as fh:
+            data = yaml.load(fh, Loader=yaml.FullLoader)
+        data["strings"]["reload_test"] = "reloaded"
+        with open(templates_path, "w") as fh:
+            fh.write(yaml.dump(data))
+
+        tk.reload_templates()
+        self.assertIsNone(pc._compiled_config)
+        self.assertEqual(tk.templates["reload_test"].definition, "reloaded")
+
+        # once compiled again, the new compiled config is used.
+        self._compile()
+        tk.reload_templates()
+        self.assertIsNotNone(pc._compiled_config)
+        self.assertEqual(tk.templates["reload_test"].definition, "reloaded")
+
+    def test_invalid_file(self):
+        """
+        Tests that invalid compiled configs are ignored.
+        """
+        with open(self.compiled_path, "wb") as fh:
+            fh.write(b"not a compiled config")
+        self.assertIsNone(self._get_pipeline_configuration()._compiled_config)
+
+        with mock.patch.object(compiled_config, "FORMAT_VERSION", 1234):
+            self._compile()
+        self.assertIsNone(self._get_pipeline_configuration()._compiled_config)
+
+    def test_context_dependent_includes(self):
+        """
+        Tests that environments with context based includes are only used
+        without a context.
+        """
+        env_path = self.tk.pipeline_configuration.get_environment_path("test")
+        with open(env_path, "a") as fh:
+            fh.write("\ninclude: ./{Shot}/shot.yml\n")
+        self._compile()
+
+        pc = self._get_pipeline_configuration()
+        self.assertIsNotNone(pc.get_compiled_environment_data(env_path, None))
+        context = self.tk.context_from_entity(self.project["type"], self.project["id"])
+        self.assertIsNone(pc.get_compiled_environment_data(env_path, context))
+
+    def test_environment_variable_includes(self):
+        """
+        Tests that environments with includes depending on environment
+        variables are not compiled.
+        """
+        env_path = self.tk.pipeline_configuration.get_environment_path("test")
+        with open(env_path, "a") as fh:
+            fh.write("\ninclude: $TK_TEST_INCLUDE_FOLDER/empty_config.yml\n")
+        include_folder = os.path.join(os.path.dirname(env_path), "includes")
+        with mock.patch.dict(os.environ, {"TK_TEST_INCLUDE_FOLDER": include_folder}):
+            self._compile()
+            pc = self._get_pipeline_configuration()
+        self.assertIsNone(pc.get_compiled_environment_data(env_path, None))
+        self.assertIsNotNone(
+            pc.get_compiled_environment_data(
+                self.tk.pipeline_configuration.get_environment_path("entity"), None
+            )
+        )
+
+    def test_command(self):
+        """
+        Tests the compile_config tank command.
+        """
+        os.remove(self.compiled_path)
+        command = self.tk.get_command("compile_config")
+        command.set_logger(logging.getLogger("/dev/null"))
+        self.assertEqual(command.execute({}), self.compiled_path)
+        self.assertIsNotNone(self._get_pipeline_configuration()._compiled_config)
+
+    def test_write_error(self):
+        """
+        Tests that errors writing the compiled config are reported.
+        """
+        with self.assertRaises(TankError):
+            self._compile(
+                os.path.join(self.tank_temp, "missing_folder", "compiled.bin")
+            )
+
+    def test_yaml_cache_skipped(self):
+        """
+        Tests that the pickled yaml cache is only read without a compiled
+        config.
+        """
+        with mock.patch.object(
+            tank.pipelineconfig.PipelineConfiguration, "_populate_yaml_cache"
+        ) as populate_yaml_cache:
+            self._get_pipeline_configuration()
+            populate_yaml_cache.assert_not_called()
+
+            os.remove(self.compiled_path)
+            self._get_pipeline_configuration()
+            populate_yaml_cache.assert_called_once_with()
+
+    def test_compiled_templates(self):
+        """
+        Tests that the templates stored in the compiled config are used for
+        the storage roots they were built for.
+        """
+        pc = self._get_pipeline_configuration()
+        with mock.patch.object(
+            tank.template, "make_templates", side_effect=AssertionError
+        ):
+            templates = read_templates(pc)
+        expected = read_templates(self.tk.pipeline_configuration)
+        self.assertEqual(sorted(templates), sorted(expected))
+        for name, template in templates.items():
+            self.assertEqual(type(template), type(expected[name]))
+            self.assertEqual(template.definition, expected[name].definition)
+            self.assertEqual(
+                getattr(template, "root_path", None),
+                getattr(expected[name], "root_path", None),
+            )
+
+        # templates are built again for other roots.
+        roots = pc.get_all_platform_data_roots()
+        roots = dict(
+            (
+                name,
+                dict((os_name, "/other" + (path or "")) for os_name, path in x.items()),
+            )
+            for name, x in roots.items()
+        )
+        with mock.patch.object(pc, "get_all_platform_data_roots", return_value=roots):
+            self.assertIsNone(pc.get_compiled_templates())
+            templates = read_templates(pc)
+        for name, template in templates.items():
+            if isinstance(template, tank.TemplatePath):
+                self.assertTrue(template.root_path.startswith("/other"))
+
+    def test_stale_environment(self):
+        """
+        Tests that environments changed since the compiled config was loaded
+        are read from their files.
+        """
+        pc = self._get_pipeline_configuration()
+        env_path = pc.get_environment_path("test")
+        self.assertIsNotNone(pc.get_compiled_environment_data(env_path, None))
+
+        with open(env_path, "a") as fh:
+            fh.write("\n# modified\n")
+        self.assertIsNone(pc.get_compiled_environment_data(env_path, None))
+        # other environments are still read from the compiled config.
+        self.assertIsNotNone(
+            pc.get_compiled_environment_data(pc.get_environment_path("entity"), None)
+        )
+
+        env_data = pc.get_environment("test")._env_data
+        self.assertEqual(
+            env_data,
+            self.tk.pipeline_configuration.get_environment(
+                "test", writable=True
+            )._env_data,
+        )
+
+    def test_file_not_held(self):
+        """
+        Tests that the compiled config can be replaced or removed while it is
+        used.
+        """
+        pc = self._get_pipeline_configuration()
+        os.remove(self.compiled_path)
+        self.assertIsNotNone(
+            pc.get_compiled_environment_data(pc.get_environment_path("test"), None)
+        )
+        self._compile()
+        self.assertIsNotNone(pc.get_templates_config())
+
+    def test_config_file_location(self):
+        """
+        Tests that the compiled config shipped with a config folder is used
+        when the pipeline configuration has none.
+        """
+        os.remove(self.compiled_path)
+        compiled_config.compile_config(
+            self.config_location,
+            compiled_config.get_config_file_location(self.config_location),
+        )
+        pc = self._get_pipeline_configuration()
+        self.assertIsNotNone(pc._compiled_config)
+        self.assertIsNotNone(
+            pc.get_compiled_environment_data(pc.get_environment_path("test"), None)
+        )
+        # the templates are only resolved for a pipeline configuration.
+        self.assertIsNone(pc.get_compiled_templates())
+        self.assertEqual(
+            sorted(read_templates(pc)),
+            sorted(read_templates(self.tk.pipeline_configuration)),
+        )
+
+    def test_cache_yaml_command(self):
+        """
+        Tests that the cache_yaml tank command writes the compiled config.
+        """
+        os.remove(self.compiled_path)
+        command = self.tk.get_command("cache_yaml")
+        command.set_logger(logging.getLogger("/dev/null"))
+        command.execute({})
+        self.assertTrue(os.path.exists(self.compiled_path))
+        self.assertIsNotNone(self._get_pipeline_configuration()._compiled_config)
@@ -14,18 +14,20 @@ import copy
 import datetime
 import json
 import os
+import threading
 
 import tank
 from sgtk.util import pickle
 from tank import context
 from tank.authentication import ShotgunAuthenticator
 from tank.errors import TankContextDeserializationError, TankError
-from tank.template import TemplatePath
+from tank.template import TemplatePath, TemplateString
 from tank.templatekey import IntegerKey, StringKey
 from tank_test.tank_test_base import setUpModule  # noqa
 from tank_test.tank_test_base import (
     TankTestBase,
     mock,
+    temp_env_var,
 )
 from tank_vendor import yaml
 
@@ -707,6 +709,131 @@ class TestFromEntity(TestContext):
             context.from_entity(self.tk, "PublishedFile", -1)
 
 
+class TestContextCache(TestContext):
+    """
+    Tests the contexts cached by the toolkit instance.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.task = {
+            "id": 1,
+            "type": "Task",
+            "content": "task_content",
+            "project": self.project,
+            "entity": self.shot,
+            "step": self.step,
+        }
+        self.add_to_sg_mock_db(self.task)
+
+    def _get_stats(self):
+        stats = self.tk.context_cache.get_stats()
+        return stats["hits"], stats["misses"]
+
+    def test_from_path(self):
+        result = self.tk.context_from_path(self.step_path)
+        self.assertEqual((0, 1), self._get_stats())
+
+        # the path cache isn't queried again
+        with mock.patch.object(
+            tank.path_cache.PathCache, "get_path_entities", side_effect=AssertionError
+        ):
+            cached_result = self.tk.context_from_path(self.step_path)
+        self.assertEqual((1, 1), self._get_stats())
+        self.assertEqual(result, cached_result)
+        self.assertEqual(result.to_dict(), cached_result.to_dict())
+
+        # contexts are copies of the cached data
+        self.assertIsNot(result.entity, cached_result.entity)
+        cached_result.entity["name"] = "modified"
+        self.assertEqual(
+            self.shot["code"], self.tk.context_from_path(self.step_path).entity["name"]
+        )
+
+        # previous contexts are applied to cached contexts
+        prev_ctx = self.tk.context_from_entity("Task", self.task["id"])
+        result = self.tk.context_from_path(self.shot_path, prev_ctx)
+        self.assertEqual(self.task["id"], result.task["id"])
+        result = self.tk.context_from_path(self.shot_path, prev_ctx)
+        self.assertEqual(self.task["id"], result.task["id"])
+        self.assertIsNone(self.tk.context_from_path(self.shot_path).task)
+
+    def test_from_entity(self):
+        # contexts built from entities are not cached by default, since
+        # their Shotgun data can change.
+        self.tk.context_from_entity("Task", self.task["id"])
+        self.tk.context_from_entity("Task", self.task["id"])
+        self.assertEqual((0, 0), self._get_stats())
+
+        with temp_env_var(**{tank.constants.CONTEXT_CACHE_ENTITIES_ENV_VAR: "1"}):
+            cache = context.ContextCache()
+        self.assertTrue(cache.entities_enabled)
+        with mock.patch.object(self.tk, "_Sgtk__context_cache", cache):
+            result = self.tk.context_from_entity("Task", self.task["id"])
+            with mock.patch.object(
+                self.tk.shotgun, "find_one", side_effect=AssertionError
+            ), mock.patch.object(self.tk.shotgun, "find", side_effect=AssertionError):
+                cached_result = self.tk.context_from_entity("Task", self.task["id"])
+        self.assertEqual({"hits": 1, "misses": 1, "size": 1}, cache.get_stats())
+        self.assertEqual(result.to_dict(), cached_result.to_dict())
+        self.assertIsNot(result, cached_result)
+
+    def test_threads(self):
+        """
+        Tests that contexts cached by a thread are used by other threads.
+        """
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(self.tk.context_from_path(self.step_path))
+        )
+        thread.start()
+        thread.join()
+        self.assertEqual((0, 1), self._get_stats())
+
+        self.assertEqual(results[0], self.tk.context_from_path(self.step_path))
+        self.assertEqual((1, 1), self._get_stats())
+
+    def test_path_cache_changes(self):
+        """
+        Tests that cached contexts are discarded when the path cache is modified.
+        """
+        task_path = os.path.join(self.step_path, "task")
+        self.assertIsNone(self.tk.context_from_path(task_path).task)
+        self.assertIsNone(self.tk.context_from_path(task_path).task)
+        self.assertEqual((1, 1), self._get_stats())
+
+        self.add_to_path_cache(
+            task_path, {"type": "Task", "id": self.task["id"], "name": "task"}
+        )
+        self.assertEqual(
+            self.task["id"], self.tk.context_from_path(task_path).task["id"]
+        )
+        self.assertEqual((1, 2), self._get_stats())
+
+    def test_size(self):
+        self.tk.context_cache._size = 2
+        for path in (self.seq_path, self.shot_path, self.step_path):
+            self.tk.context_from_path(path)
+        self.assertEqual(2, self.tk.context_cache.get_stats()["size"])
+
+        # the least recently used context was discarded
+        self.tk.context_from_path(self.step_path)
+        self.tk.context_from_path(self.seq_path)
+        self.assertEqual((1, 4), self._get_stats())
+
+        self.tk.context_cache.clear()
+        self.assertEqual(0, self.tk.context_cache.get_stats()["size"])
+
+    def test_disabled(self):
+        with temp_env_var(**{tank.constants.CONTEXT_CACHE_SIZE_ENV_VAR: "0"}):
+            cache = context.ContextCache()
+        self.assertFalse(cache.enabled)
+        with mock.patch.object(self.tk, "_Sgtk__context_cache", cache):
+            self.tk.context_from_path(self.step_path)
+            self.tk.context_from_path(self.step_path)
+        self.assertEqual({"hits": 0, "misses": 0, "size": 0}, cache.get_stats())
+
+
 class TestAsTemplateFields(TestContext):
     def setUp(self):
         super().setUp()
@@ -939,6 +1066,127 @@ class TestAsTemplateFields(TestContext):
         # Check that the shotgun method find_one was not used
         self.assertEqual(finds, self.tk.shotgun.finds)
 
+    def test_query_batched(self):
+        """
+        Test that all the fields of an entity are retrieved with a single query.
+        """
+        self.keys["shot_extra"] = StringKey(
+            "shot_extra", shotgun_entity_type="Shot", shotgun_field_name="extra_field"
+        )
+        self.keys["shot_seq"] = StringKey(
+            "shot_seq", shotgun_entity_type="Shot", shotgun_field_name="sg_sequence"
+        )
+        template_def = (
+            "/sequence/{Sequence}/{Shot}/{Step}/work/{shot_extra}_{shot_seq}.ext"
+        )
+        template = TemplatePath(template_def, self.keys, self.project_root)
+
+        finds = self.tk.shotgun.finds
+        result = self.ctx.as_template_fields(template)
+        self.assertEqual("extravalue", result["shot_extra"])
+        self.assertEqual("seq_name", result["shot_seq"])
+        self.assertEqual(finds + 1, self.tk.shotgun.finds)
+
+    def test_query_memo(self):
+        """
+        Test that values are shared between contexts inside a memo block.
+        """
+        query_key = StringKey(
+            "shot_extra", shotgun_entity_type="Shot", shotgun_field_name="extra_field"
+        )
+        self.keys["shot_extra"] = query_key
+        template_def = "/sequence/{Sequence}/{Shot}/{Step}/work/{shot_extra}.ext"
+        template = TemplatePath(template_def, self.keys, self.project_root)
+
+        finds = self.tk.shotgun.finds
+        with context.shotgun_fields_memo():
+            for _ in range(3):
+                ctx = context.Context(
+                    self.tk, project=self.project, entity=self.shot, step=self.step
+                )
+                result = ctx.as_template_fields(template)
+                self.assertEqual("extravalue", result["shot_extra"])
+        self.assertEqual(finds + 1, self.tk.shotgun.finds)
+
+        # values are discarded at the end of the block
+        ctx = context.Context(
+            self.tk, project=self.project, entity=self.shot, step=self.step
+        )
+        ctx.as_template_fields(template)
+        self.assertEqual(finds + 2, self.tk.shotgun.finds)
+
+        # values shared from another context are validated against the key
+        self.keys["shot_extra"] = IntegerKey(
+            "shot_extra", shotgun_entity_type="Shot", shotgun_field_name="extra_field"
+        )
+        int_template = TemplatePath(template_def, self.keys, self.project_root)
+        with context.shotgun_fields_memo():
+            ctx.as_template_fields(template)
+            other_ctx = context.Context(
+                self.tk, project=self.project, entity=self.shot, step=self.step
+            )
+            self.assertRaises(TankError, other_ctx.as_template_fields, int_template)
+
+    def test_query_memo_prefetch(self):
+        """
+        Test that the fields prefetched for several contexts are retrieved
+        with a single query per entity type.
+        """
+        self.keys["shot_extra"] = StringKey(
+            "shot_extra", shotgun_entity_type="Shot", shotgun_field_name="extra_field"
+        )
+        self.keys["project_name"] = StringKey(
+            "project_name", shotgun_entity_type="Project", shotgun_field_name="name"
+        )
+        template = TemplateString("{project_name}_{shot_extra}", self.keys)
+
+        shots = []
+        for idx in range(4):
+            shot = {
+                "type": "Shot",
+                "code": "prefetch_shot_%d" % idx,
+                "id": 1000 + idx,
+                "extra_field": "extra%d" % idx,
+                "project": self.project,
+            }
+            self.add_to_sg_mock_db(shot)
+            shots.append(shot)
+        contexts = [
+            context.Context(self.tk, project=self.project, entity=shot)
+            for shot in shots
+        ]
+
+        finds = self.tk.shotgun.finds
+        with context.shotgun_fields_memo() as memo:
+            for ctx in contexts:
+                memo.prefetch(ctx, template)
+            for idx, ctx in enumerate(contexts):
+                result = ctx.as_template_fields(template)
+                self.assertEqual("extra%d" % idx, result["shot_extra"])
+                self.assertEqual(self.project["name"], result["project_name"])
+        self.assertEqual(finds + 2, self.tk.shotgun.finds)
+
+        # without prefetching, each context queries its shot.
+        finds = self.tk.shotgun.finds
+        contexts = [
+            context.Context(self.tk, project=self.project, entity=shot)
+            for shot in shots
+        ]
+        with context.shotgun_fields_memo():
+            for ctx in contexts:
+                ctx.as_template_fields(template)
+        self.assertEqual(finds + 5, self.tk.shotgun.finds)
+
+        # prefetched values are validated against each key.
+        self.keys["shot_extra"] = IntegerKey(
+            "shot_extra", shotgun_entity_type="Shot", shotgun_field_name="extra_field"
+        )
+        int_template = TemplateString("{shot_extra}", self.keys)
+        with context.shotgun_fields_memo() as memo:
+            ctx = context.Context(self.tk, project=self.project, entity=shots[0])
+            memo.prefetch(ctx, int_template)
+            self.assertRaises(TankError, ctx.as_template_fields, int_template)
+
     def test_shot_step(self):
         expected_step_name = "step_short_name"
         expected_shot_name = "shot_code"
@@ -0,0 +1,260 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import http.server
+import io
+import os
+import tempfile
+import threading
+import time
+import types
+import unittest
+import zipfile
+from unittest import mock
+
+from tank_vendor.flow_integration_sdk import fetch
+from tank_vendor.flow_integration_sdk.exceptions import FlowError
+
+
+class _BlobHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Stands in for the storage service blobs are downloaded from.
+    """
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        data = server.blobs.get(self.path)
+        if data is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        # leave other downloads a chance to start.
+        time.sleep(0.05)
+        with server.lock:
+            server.active -= 1
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _UnseekableFile(object):
+    """
+    File which can only be written to, which makes zipfile write data
+    descriptors after the data of each file.
+    """
+
+    def __init__(self):
+        self.data = io.BytesIO()
+
+    def write(self, data):
+        return self.data.write(data)
+
+    def flush(self):
+        pass
+
+
+class TestDownload(unittest.TestCase):
+    """
+    Tests downloading the blobs of a component.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.server = http.server.ThreadingHTTPServer(("localhost", 0), _BlobHandler)
+        self.server.lock = threading.Lock()
+        self.server.blobs = {}
+        self.server.active = 0
+        self.server.max_active = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = "http://localhost:%d" % self.server.server_address[1]
+
+        # blob urls are the urns of the blobs on the local server.
+        patcher = mock.patch.object(
+            fetch,
+            "fetch_blob_urls",
+            side_effect=lambda project_id, urns: [self.url + urn for urn in urns],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+    def _make_component(self, blobs, sizes=None):
+        """
+        Serves blobs and returns a component made of them.
+        """
+        data = []
+        for path, content in blobs.items():
+            self.server.blobs["/" + path] = content
+            size = len(content) if sizes is None else sizes.get(path, len(content))
+            data.append({"uri": "/" + path, "path": path, "size": size})
+        return types.SimpleNamespace(data={"data": data})
+
+    def _make_zip(self, frames, compression=zipfile.ZIP_DEFLATED, seekable=True):
+        """
+        Returns the content of a zipped file sequence.
+        """
+        zip_data = io.BytesIO() if seekable else _UnseekableFile()
+        with zipfile.ZipFile(zip_data, "w", compression) as zip_file:
+            for name, content in frames.items():
+                zip_file.writestr(name, content)
+        return zip_data.getvalue() if seekable else zip_data.data.getvalue()
+
+    def test_concurrent_download(self):
+        """
+        Tests that blobs are downloaded concurrently.
+        """
+        blobs = dict(("blob%d.bin" % idx, os.urandom(1000 + idx)) for idx in range(6))
+        result = fetch.download(
+            self._make_component(blobs), "project", self.directory, max_workers=3
+        )
+        self.assertEqual(list(range(6)), list(result))
+        for idx, path in enumerate(blobs):
+            self.assertEqual(os.path.join(self.directory, path), result[idx])
+            with open(result[idx], "rb") as fh:
+                self.assertEqual(blobs[path], fh.read())
+        self.assertGreater(self.server.max_active, 1)
+        self.assertLessEqual(self.server.max_active, 3)
+        # no partial download is left behind.
+        self.assertEqual(sorted(blobs), sorted(os.listdir(self.directory)))
+
+    def test_size_check(self):
+        """
+        Tests that downloads are checked against the size of their blob.
+        """
+        blobs = {"blob.bin": os.urandom(1000), "other.bin": os.urandom(1000)}
+        component = self._make_component(blobs, sizes={"blob.bin": 1001})
+        with self.assertRaises(FlowError):
+            fetch.download(component, "project", self.directory)
+        self.assertNotIn("blob.bin", os.listdir(self.directory))
+        self.assertFalse(
+            [name for name in os.listdir(self.directory) if name.endswith(".part")]
+        )
+
+        # missing blobs are reported as well.
+        component.data["data"][0]["uri"] = "/missing.bin"
+        with self.assertRaises(FlowError):
+            fetch.download(component, "project", self.directory)
+
+    def test_streamed_extraction(self):
+        """
+        Tests that file sequences are extracted while they are downloaded.
+        """
+        frames = dict(
+            ("frames/frame.%04d.exr" % idx, os.urandom(5000) * 2) for idx in range(5)
+        )
+        for compression in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            zip_data = self._make_zip(frames, compression)
+            directory = os.path.join(self.directory, str(compression))
+            with mock.patch.object(
+                fetch, "_extract_zip", side_effect=AssertionError
+            ), mock.patch.object(fetch, "ZIP_CHUNK_SIZE", 1000):
+                result = fetch.download(
+                    self._make_component({"frames.zip": zip_data}),
+                    "project",
+                    directory,
+                    file_sequence=True,
+                )
+            self.assertEqual(
+                [os.path.join(directory, name) for name in frames],
+                list(result.values()),
+            )
+            for name, content in frames.items():
+                with open(os.path.join(directory, name), "rb") as fh:
+                    self.assertEqual(content, fh.read())
+            # the zip file is kept as the source file of the component.
+            with open(os.path.join(directory, "frames.zip"), "rb") as fh:
+                self.assertEqual(zip_data, fh.read())
+
+    def test_streamed_extraction_fallback(self):
+        """
+        Tests that zip files which can't be extracted while they are
+        downloaded are extracted once downloaded.
+        """
+        frames = {"frame.0001.exr": b"1" * 1000, "frame.0002.exr": b"2" * 1000}
+        zip_data = self._make_zip(frames, seekable=False)
+        with mock.patch.object(
+            fetch, "_extract_zip", wraps=fetch._extract_zip
+        ) as extract_zip:
+            result = fetch.download(
+                self._make_component({"frames.zip": zip_data}),
+                "project",
+                self.directory,
+                file_sequence=True,
+            )
+        self.assertEqual(1, extract_zip.call_count)
+        self.assertEqual(
+            [os.path.join(self.directory, name) for name in frames],
+            list(result.values()),
+        )
+
+    def test_empty_zip(self):
+        """
+        Tests downloading a zip file with no files, which only has an end of
+        central directory record.
+        """
+        zip_data = self._make_zip({})
+        self.assertEqual(22, len(zip_data))
+        result = fetch.download(
+            self._make_component({"frames.zip": zip_data}),
+            "project",
+            self.directory,
+            file_sequence=True,
+        )
+        self.assertEqual({}, result)
+
+    def test_corrupted_zip(self):
+        """
+        Tests that corrupted zip files are reported.
+        """
+        zip_data = self._make_zip({"frame.0001.exr": os.urandom(1000)})
+        for corrupted_data in (
+            zip_data[:100],
+            zip_data[:60] + bytes([zip_data[60] ^ 0xFF]) + zip_data[61:],
+            zip_data[:2],
+            b"not a zip file",
+        ):
+            directory = tempfile.mkdtemp(dir=self.directory)
+            with self.assertRaises(FlowError):
+                fetch.download(
+                    self._make_component({"frames.zip": corrupted_data}),
+                    "project",
+                    directory,
+                    file_sequence=True,
+                )
+            self.assertNotIn("frame.0001.exr", os.listdir(directory))
+
+        # unsafe paths are not extracted.
+        zip_data = self._make_zip({"../frame.0001.exr": b"data"})
+        with self.assertRaises(FlowError):
+            fetch.download(
+                self._make_component({"frames.zip": zip_data}),
+                "project",
+                self.directory,
+                file_sequence=True,
+            )
+        self.assertFalse(
+            os.path.exists(os.path.join(self.directory, "..", "frame.0001.exr"))
+        )
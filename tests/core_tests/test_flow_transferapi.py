@@ -0,0 +1,293 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import hashlib
+import http.server
+import json
+import os
+import tempfile
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+from tank_vendor.flow_data_sdk.base.exceptions import GQLAPIError
+from tank_vendor.flow_integration_sdk import transferapi
+from tank_vendor.flow_integration_sdk.exceptions import FileUploadError
+
+PART_SIZE = 1024
+
+
+class _StorageHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Stands in for the storage service parts are uploaded to.
+    """
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_PUT(self):
+        server = self.server
+        data = self.rfile.read(int(self.headers["Content-Length"]))
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            failures = server.failures.get(self.path, 0)
+            if failures:
+                server.failures[self.path] = failures - 1
+        # leave other uploads a chance to start.
+        time.sleep(0.01)
+        with server.lock:
+            server.active -= 1
+            if not failures:
+                server.parts[self.path] = data
+
+        if failures:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", '"%s"' % hashlib.md5(data).hexdigest())
+        self.end_headers()
+
+
+class _BinaryService(object):
+    """
+    Stands in for the GraphQL binary service managing the upload jobs.
+    """
+
+    def __init__(self, storage_url):
+        self._storage_url = storage_url
+        self._lock = threading.Lock()
+        # state and etags of each job, by job id
+        self.jobs = {}
+        # ids of the jobs which expired on the server
+        self.expired = set()
+        # if set, no part can be uploaded to any job
+        self.parts_unavailable = False
+
+    def _operation(self, func):
+        return types.SimpleNamespace(call=func)
+
+    def _raise_error(self, message, status_code):
+        error = GQLAPIError(message)
+        error.status_code = status_code
+        raise error
+
+    def _check_job(self, job_id):
+        if job_id in self.expired or self.jobs[job_id]["state"] != "OPEN":
+            self._raise_error("Unknown upload job %s" % job_id, 404)
+
+    def open_upload_file(self, variables):
+        def call():
+            with self._lock:
+                job_id = "job%d" % (len(self.jobs) + 1)
+                self.jobs[job_id] = {"state": "OPEN", "etags": None}
+            return types.SimpleNamespace(
+                job=types.SimpleNamespace(id=job_id, state="OPEN")
+            )
+
+        return self._operation(call)
+
+    def get_upload_file_part(self, variables):
+        def call():
+            self._check_job(variables.async_job_id)
+            if self.parts_unavailable:
+                self._raise_error("Service unavailable", 503)
+            return types.SimpleNamespace(
+                send_url="%s/%s/%d"
+                % (self._storage_url, variables.async_job_id, variables.part_num)
+            )
+
+        return self._operation(call)
+
+    def close_upload_file(self, variables):
+        def call():
+            self._check_job(variables.async_job_id)
+            self.jobs[variables.async_job_id] = {
+                "state": variables.state,
+                "etags": variables.etags,
+            }
+            return types.SimpleNamespace(
+                job=types.SimpleNamespace(
+                    id=variables.async_job_id, state=variables.state
+                )
+            )
+
+        return self._operation(call)
+
+
+class TestUploadBlob(unittest.TestCase):
+    """
+    Tests uploading files with the transfer API.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.server = http.server.ThreadingHTTPServer(("localhost", 0), _StorageHandler)
+        self.server.lock = threading.Lock()
+        self.server.parts = {}
+        self.server.failures = {}
+        self.server.active = 0
+        self.server.max_active = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.service = _BinaryService(
+            "http://localhost:%d" % self.server.server_address[1]
+        )
+        self.client = types.SimpleNamespace(service_binary=self.service)
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, "blob.bin")
+        self.data = os.urandom(PART_SIZE * 10 + 100)
+        with open(self.file_path, "wb") as fh:
+            fh.write(self.data)
+        self.journal_path = os.path.join(temp_dir.name, "blob.journal")
+
+        for name, value in (("MIN_PART_SIZE", PART_SIZE), ("RETRY_DELAY", 0)):
+            patcher = mock.patch.object(transferapi, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _upload(self, **kwargs):
+        transferapi.upload_blob(
+            self.client, self.file_path, "urn:blob", "upload:uri", **kwargs
+        )
+
+    def _get_uploaded_data(self, job_id):
+        """
+        Returns the data uploaded to a job, checking the job was closed
+        with the ETags of its parts.
+        """
+        job = self.service.jobs[job_id]
+        self.assertEqual("SUCCEEDED", job["state"])
+        parts = [self.server.parts["/%s/%d" % (job_id, idx)] for idx in range(1, 12)]
+        self.assertEqual(
+            ['"%s"' % hashlib.md5(part).hexdigest() for part in parts], job["etags"]
+        )
+        return b"".join(parts)
+
+    def test_concurrent_upload(self):
+        """
+        Tests that parts are uploaded concurrently.
+        """
+        self._upload(max_workers=4)
+        self.assertEqual(self.data, self._get_uploaded_data("job1"))
+        self.assertGreater(self.server.max_active, 1)
+        self.assertLessEqual(self.server.max_active, 4)
+
+    def test_part_retry(self):
+        """
+        Tests that the upload of a failing part is retried.
+        """
+        self.server.failures["/job1/3"] = 2
+        self._upload(retries=2)
+        self.assertEqual(self.data, self._get_uploaded_data("job1"))
+
+        # the job is closed when a part still fails after the retries.
+        self.server.failures["/job2/3"] = 2
+        with self.assertRaises(FileUploadError):
+            self._upload(retries=1)
+        self.assertEqual("FAILED", self.service.jobs["job2"]["state"])
+
+    def test_progress_callback(self):
+        """
+        Tests that progress is reported from the calling thread.
+        """
+        progress = []
+
+        def progress_callback(uploaded_size, total_size):
+            self.assertIs(threading.main_thread(), threading.current_thread())
+            progress.append((uploaded_size, total_size))
+
+        self._upload(progress_callback=progress_callback)
+        self.assertEqual(12, len(progress))
+        self.assertEqual((0, len(self.data)), progress[0])
+        self.assertEqual((len(self.data), len(self.data)), progress[-1])
+        self.assertEqual(sorted(progress), progress)
+
+    def test_resume(self):
+        """
+        Tests that an upload is resumed from its journal.
+        """
+        self.server.failures["/job1/5"] = 1
+        with self.assertRaises(FileUploadError):
+            self._upload(journal_path=self.journal_path, retries=0, max_workers=1)
+        # the job is left open so it can be resumed.
+        self.assertEqual("OPEN", self.service.jobs["job1"]["state"])
+        self.assertTrue(os.path.exists(self.journal_path))
+        with open(self.journal_path) as fh:
+            uploaded_parts = json.load(fh)["etags"]
+        self.assertIn("4", uploaded_parts)
+        self.assertNotIn("5", uploaded_parts)
+
+        progress = []
+        with mock.patch.object(
+            transferapi, "_upload_part", wraps=transferapi._upload_part
+        ) as upload_part:
+            self._upload(
+                journal_path=self.journal_path,
+                progress_callback=lambda *args: progress.append(args),
+            )
+        self.assertEqual(["job1"], list(self.service.jobs))
+        self.assertEqual(self.data, self._get_uploaded_data("job1"))
+        self.assertFalse(os.path.exists(self.journal_path))
+
+        # only the missing parts were uploaded.
+        self.assertEqual(11 - len(uploaded_parts), upload_part.call_count)
+        self.assertEqual(PART_SIZE * len(uploaded_parts), progress[0][0])
+
+    def test_expired_job(self):
+        """
+        Tests that an upload starts again from scratch when the job of the
+        resumed upload expired.
+        """
+        self.server.failures["/job1/5"] = 1
+        with self.assertRaises(FileUploadError):
+            self._upload(journal_path=self.journal_path, retries=0, max_workers=1)
+
+        self.service.expired.add("job1")
+        self._upload(journal_path=self.journal_path, retries=0)
+        self.assertEqual(["job1", "job2"], sorted(self.service.jobs))
+        self.assertEqual(self.data, self._get_uploaded_data("job2"))
+        self.assertFalse(os.path.exists(self.journal_path))
+
+        # a job which can't be resumed is abandoned and the upload is only
+        # started again once.
+        self.server.failures["/job3/5"] = 1
+        with self.assertRaises(FileUploadError):
+            self._upload(journal_path=self.journal_path, retries=0, max_workers=1)
+        self.service.expired.add("job3")
+        self.server.failures["/job4/1"] = 1
+        with self.assertRaises(FileUploadError):
+            self._upload(journal_path=self.journal_path, retries=0, max_workers=1)
+        self.assertEqual(["job1", "job2", "job3", "job4"], sorted(self.service.jobs))
+        # the new job can be resumed.
+        self.assertEqual("OPEN", self.service.jobs["job4"]["state"])
+        self._upload(journal_path=self.journal_path)
+        self.assertEqual(self.data, self._get_uploaded_data("job4"))
+
+        # a resumed job which was not closed is closed before starting again.
+        self.server.failures["/job5/5"] = 1
+        with self.assertRaises(FileUploadError):
+            self._upload(journal_path=self.journal_path, retries=0, max_workers=1)
+        self.service.parts_unavailable = True
+        with self.assertRaises(FileUploadError):
+            self._upload(journal_path=self.journal_path, retries=0)
+        self.assertEqual("FAILED", self.service.jobs["job5"]["state"])
+        self.assertEqual("OPEN", self.service.jobs["job6"]["state"])
+        self.assertEqual(6, len(self.service.jobs))
@@ -8,10 +8,15 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import os
 import sys
+import threading
+from unittest import mock
 
 import sgtk
+import tank
 from tank.util import is_windows
+from tank.util.loader import PluginIndex
 from tank_test.tank_test_base import TankTestBase, setUpModule  # noqa
 
 
@@ -175,3 +180,209 @@ class TestHookGetPublishPath(TankTestBase):
         self.assertEqual(
             hook.get_publish_paths([sg_dict, sg_dict]), [expected_path, expected_path]
         )
+
+
+class TestHookIndex(TankTestBase):
+    """
+    Tests the persistent hook index
+    """
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(os.environ, {"TK_HOOK_INDEX": "1"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tank.hook.clear_hooks_cache()
+        self.addCleanup(tank.hook.clear_hooks_cache)
+
+        hooks_root = os.path.join(self.tank_temp, "hook_index_test")
+        os.makedirs(hooks_root, exist_ok=True)
+        self.base_hook_path = os.path.join(hooks_root, "base_hook.py")
+        self.hook_path = os.path.join(hooks_root, "hook.py")
+        self._write_hook(
+            self.base_hook_path,
+            "class Intermediate(sgtk.get_hook_baseclass()):\n"
+            "    def value(self):\n"
+            "        return 'intermediate'\n"
+            "class BaseHook(Intermediate):\n"
+            "    def value(self):\n"
+            "        return 'base'\n",
+        )
+        self._write_hook(
+            self.hook_path,
+            "class MyHook(sgtk.get_hook_baseclass()):\n"
+            "    def value(self):\n"
+            "        return 'my ' + super().value()\n",
+        )
+
+    def _write_hook(self, path, code):
+        """
+        Writes a hook file.
+        """
+        with open(path, "w") as fh:
+            fh.write("import sgtk\n")
+            fh.write(code)
+
+    def _create_hook(self):
+        """
+        Creates an instance of the test hook, without using the in memory cache.
+        """
+        tank.hook.clear_hooks_cache()
+        return tank.hook.create_hook_instance(
+            [self.base_hook_path, self.hook_path], parent=None
+        )
+
+    def test_index_reused(self):
+        """
+        Ensures hooks are loaded from the index once indexed.
+        """
+        self.assertEqual(self._create_hook().value(), "my base")
+        index = tank.hook._get_hook_index()
+        self.assertTrue(os.path.exists(index._get_entry_path(self.hook_path)))
+
+        with mock.patch.object(
+            PluginIndex, "_compile", side_effect=AssertionError
+        ), mock.patch.object(
+            tank.util.loader.inspect, "getmembers", side_effect=AssertionError
+        ):
+            hook = self._create_hook()
+        self.assertEqual(hook.value(), "my base")
+        self.assertEqual(type(hook).__name__, "MyHook")
+        self.assertEqual(type(hook).__bases__[0].__name__, "BaseHook")
+
+    def test_index_invalidated(self):
+        """
+        Ensures modified hook files are loaded again.
+        """
+        self.assertEqual(self._create_hook().value(), "my base")
+        # same size and modification time, only the content differs.
+        stat = os.stat(self.hook_path)
+        self._write_hook(
+            self.hook_path,
+            "class MyHook(sgtk.get_hook_baseclass()):\n"
+            "    def value(self):\n"
+            "        return 'MY ' + super().value()\n",
+        )
+        os.utime(self.hook_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self._create_hook().value(), "MY base")
+
+    def test_index_disabled(self):
+        """
+        Ensures the index is not used unless enabled.
+        """
+        with mock.patch.dict(os.environ, {"TK_HOOK_INDEX": "0"}):
+            self.assertEqual(self._create_hook().value(), "my base")
+        index = tank.hook._get_hook_index()
+        self.assertFalse(os.path.exists(index._get_entry_path(self.hook_path)))
+
+
+class TestHooksCacheThreading(TankTestBase):
+    """
+    Tests loading hooks from several threads at once
+    """
+
+    def setUp(self):
+        super().setUp()
+        tank.hook.clear_hooks_cache()
+        self.addCleanup(tank.hook.clear_hooks_cache)
+
+        hooks_root = os.path.join(self.tank_temp, "hooks_cache_threading_test")
+        os.makedirs(hooks_root, exist_ok=True)
+        self.hook_paths = {}
+        for name in ["A", "B", "C"]:
+            self.hook_paths[name] = os.path.join(hooks_root, "hook_%s.py" % name)
+            with open(self.hook_paths[name], "w") as fh:
+                fh.write(
+                    "import time\n"
+                    "import sgtk\n"
+                    "# make threads load hooks at the same time\n"
+                    "time.sleep(0.05)\n"
+                    "class Hook%s(sgtk.get_hook_baseclass()):\n"
+                    "    def chain(self):\n"
+                    "        return getattr(super(), 'chain', list)() + ['%s']\n"
+                    % (name, name)
+                )
+
+    def test_inheritance_chains(self):
+        """
+        Ensures threads creating hooks with different inheritance chains from
+        the same files get the right chains, and that each hook is only loaded once.
+        """
+        chains = [["A", "B", "C"], ["A", "C"], ["B", "C"], ["C"], ["B"], ["A", "B"]]
+        # hook file and base class of each hook to load: (A, Hook), (B, Hook),
+        # (C, Hook), (B, A), (C, A), (C, B), (C, A->B)
+        expected_loads = 7
+        num_threads = 24
+        barrier = threading.Barrier(num_threads)
+        results = {}
+        errors = []
+        initial_stats = tank.hook.get_hooks_cache_stats()
+
+        def create_hooks(thread_index):
+            try:
+                barrier.wait()
+                for i in range(len(chains)):
+                    # start each thread on a different chain
+                    chain = chains[(thread_index + i) % len(chains)]
+                    hook = tank.hook.create_hook_instance(
+                        [self.hook_paths[name] for name in chain], parent=None
+                    )
+                    results.setdefault(tuple(chain), set()).add(type(hook))
+                    self.assertEqual(hook.chain(), chain)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=create_hooks, args=(i,)) for i in range(num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        # all threads got the same class for each chain.
+        for chain, hook_classes in results.items():
+            self.assertEqual(len(hook_classes), 1, chain)
+
+        stats = tank.hook.get_hooks_cache_stats()
+        self.assertEqual(stats["size"], expected_loads)
+        self.assertEqual(stats["loads"] - initial_stats["loads"], expected_loads)
+        self.assertGreater(stats["waits"], initial_stats["waits"])
+
+    def test_load_cycle(self):
+        """
+        Ensures threads loading hooks which load each other don't deadlock.
+        """
+        hooks_cache = tank.hook._HooksCache()
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def load(name, other, nested):
+            if not nested:
+                # make sure both threads are loading their hook before
+                # loading the other one.
+                barrier.wait()
+                hooks_cache.find_or_load(
+                    other, object, lambda: load(other, name, nested=True)
+                )
+            return type(name, (object,), {})
+
+        def load_hook(name, other):
+            results[name] = hooks_cache.find_or_load(
+                name, object, lambda: load(name, other, nested=False)
+            )
+
+        threads = [
+            threading.Thread(target=load_hook, args=args, daemon=True)
+            for args in [("A", "B"), ("B", "A")]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+            self.assertFalse(thread.is_alive(), "Loading the hooks deadlocked.")
+
+        self.assertEqual(["A", "B"], sorted(results))
+        self.assertEqual(results["A"], hooks_cache.find("A", object))
+        self.assertEqual(results["B"], hooks_cache.find("B", object))
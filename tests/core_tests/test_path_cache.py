@@ -13,6 +13,7 @@ import logging
 import os
 import shutil
 import sys
+import threading
 import time
 from io import StringIO
 from queue import Empty
@@ -88,6 +89,25 @@ class TestInit(TestPathCache):
         pc.close()
         self.assertTrue(os.path.exists(self.path_cache_location))
 
+    def test_schema_checked_once(self):
+        """
+        Tests that the schema of a path cache file is only checked once per process.
+        """
+        with mock.patch.object(
+            path_cache.PathCache,
+            "_check_schema",
+            autospec=True,
+            side_effect=path_cache.PathCache._check_schema,
+        ) as check_mock:
+            path_cache.PathCache(self.tk).close()
+            check_mock.assert_not_called()
+
+            # a file which was recreated is checked again
+            self.path_cache.close()
+            os.remove(self.path_cache_location)
+            path_cache.PathCache(self.tk).close()
+            self.assertEqual(check_mock.call_count, 1)
+
     def test_root_map(self):
         """Test that mapping of project root locations is created"""
         # More specific testing of loading roots happens in test_root
@@ -554,6 +574,290 @@ class TestGetPaths(TestPathCache):
         self.assertIn(self.alt_root_1, result)
 
 
+class TestBulkLookups(TestPathCache):
+    """
+    Tests for get_entities, get_path_entities and get_paths_many.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.shots = []
+        for shot_id in range(1, 401):
+            shot = {"type": "Shot", "id": shot_id, "name": "shot_%d" % shot_id}
+            self.shots.append(shot)
+            add_item_to_cache(
+                self.path_cache,
+                shot,
+                os.path.join(self.project_root, "seq", shot["name"]),
+            )
+        self.seq = {"type": "Sequence", "id": 1, "name": "seq"}
+        self.seq_path = os.path.join(self.project_root, "seq")
+        add_item_to_cache(self.path_cache, self.seq, self.seq_path)
+        add_item_to_cache(
+            self.path_cache, self.seq, os.path.join(self.alt_root_1, "seq")
+        )
+
+    def test_get_entities(self):
+        paths = [os.path.join(self.project_root, "seq", s["name"]) for s in self.shots]
+        paths += [
+            self.seq_path,
+            os.path.join(self.alt_root_1, "seq"),
+            os.path.join(self.project_root, "unknown"),
+            os.path.join("path", "not", "in", "project"),
+            None,
+        ]
+        entities = self.path_cache.get_entities(paths)
+        self.assertEqual(
+            dict((path, self.path_cache.get_entity(path)) for path in paths),
+            entities,
+        )
+        self.assertEqual(self.shots[-1], entities[paths[399]])
+        self.assertEqual(self.seq, entities[self.seq_path])
+        self.assertIsNone(entities[None])
+
+    def test_get_path_entities(self):
+        shot_path = os.path.join(self.project_root, "seq", "shot_1")
+        secondary_entities = [
+            {"type": "Task", "id": 2, "name": "task"},
+            {"type": "Step", "id": 1, "name": "step"},
+        ]
+        for entity in secondary_entities:
+            add_item_to_cache(self.path_cache, entity, shot_path, primary=False)
+
+        paths = [os.path.join(self.project_root, "seq", s["name"]) for s in self.shots]
+        paths += [
+            self.seq_path,
+            os.path.join(self.project_root, "unknown"),
+            os.path.join("path", "not", "in", "project"),
+            None,
+        ]
+        path_entities = self.path_cache.get_path_entities(paths)
+        self.assertEqual(
+            dict(
+                (
+                    path,
+                    (
+                        self.path_cache.get_entity(path),
+                        (
+                            self.path_cache.get_secondary_entities(path)
+                            if path is not None
+                            else []
+                        ),
+                    ),
+                )
+                for path in paths
+            ),
+            path_entities,
+        )
+        self.assertEqual((self.shots[0], secondary_entities), path_entities[shot_path])
+        self.assertEqual((self.seq, []), path_entities[self.seq_path])
+        self.assertEqual((None, []), path_entities[None])
+
+    def test_get_paths_many(self):
+        entities = [("Shot", s["id"]) for s in self.shots]
+        entities += [("Sequence", 1), ("Sequence", 2), ("Asset", 1)]
+        for primary_only in (True, False):
+            self.assertEqual(
+                dict(
+                    (entity, self.path_cache.get_paths(*entity, primary_only))
+                    for entity in entities
+                ),
+                self.path_cache.get_paths_many(entities, primary_only),
+            )
+        paths = self.path_cache.get_paths_many(entities, True)
+        self.assertEqual(
+            [os.path.join(self.project_root, "seq", "shot_1")], paths[("Shot", 1)]
+        )
+        self.assertEqual(2, len(paths[("Sequence", 1)]))
+        self.assertEqual([], paths[("Asset", 1)])
+
+    def test_sgtk_methods(self):
+        paths = [self.seq_path, os.path.join(self.project_root, "unknown")]
+        self.assertEqual(
+            {paths[0]: self.seq, paths[1]: None}, self.tk.entities_from_paths(paths)
+        )
+        self.assertEqual(
+            {("Shot", 1): [os.path.join(self.project_root, "seq", "shot_1")]},
+            self.tk.paths_from_entities([("Shot", 1)]),
+        )
+
+
+class TestPathCacheReplica(TestPathCache):
+    """
+    Tests for the lookups done on a local replica of the path cache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.shot = {"type": "Shot", "id": 999, "name": "shot_name"}
+        self.shot_path = os.path.join(self.project_root, "seq", "shot_name")
+
+    def _create_replica_path_cache(self):
+        with temp_env_var(**{tank.constants.PATH_CACHE_REPLICA_ENV_VAR: "1"}):
+            pc = path_cache.PathCache(self.tk)
+        self.addCleanup(pc.close)
+        return pc
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.path_cache._replica_connection)
+
+    def test_lookups(self):
+        pc = self._create_replica_path_cache()
+        self.assertIsNotNone(pc._replica_connection)
+        self.assertTrue(os.path.exists(pc._replica_path))
+
+        add_item_to_cache(pc, self.shot, self.shot_path)
+        self.assertEqual(self.shot, pc.get_entity(self.shot_path))
+        self.assertEqual([self.shot_path], pc.get_paths("Shot", 999, True))
+        self.assertEqual(
+            self.path_cache.get_shotgun_id_from_path(self.shot_path),
+            pc.get_shotgun_id_from_path(self.shot_path),
+        )
+
+        # lookups don't use the path cache database
+        with mock.patch.object(pc, "_connection") as connection_mock:
+            self.assertEqual(self.shot, pc.get_entity(self.shot_path))
+        connection_mock.cursor.assert_not_called()
+
+    def test_wal_read_only(self):
+        pc = self._create_replica_path_cache()
+        self.assertEqual(
+            "wal",
+            pc._replica_connection.execute("PRAGMA journal_mode").fetchone()[0],
+        )
+        self.assertRaises(
+            path_cache.sqlite3.OperationalError,
+            pc._replica_connection.execute,
+            "DELETE FROM path_cache",
+        )
+
+    def test_refreshed_on_changes(self):
+        """
+        Changes done by other path cache instances are picked up.
+        """
+        pc = self._create_replica_path_cache()
+        self.assertIsNone(pc.get_entity(self.shot_path))
+        add_item_to_cache(self.path_cache, self.shot, self.shot_path)
+        # the open replica is not changed
+        self.assertIsNone(pc.get_entity(self.shot_path))
+
+        pc = self._create_replica_path_cache()
+        self.assertEqual(self.shot, pc.get_entity(self.shot_path))
+
+        # the replica is not copied again when nothing changed
+        with mock.patch.object(
+            path_cache.PathCache, "_refresh_replica"
+        ) as refresh_mock:
+            self._create_replica_path_cache()
+        refresh_mock.assert_not_called()
+
+    def test_refresh_failure(self):
+        """
+        Lookups are done on the path cache if the replica can't be refreshed.
+        """
+        # a folder can't be opened as a database
+        with mock.patch.object(
+            path_cache.PathCache, "_get_replica_location", return_value=self.tank_temp
+        ):
+            pc = self._create_replica_path_cache()
+        self.assertIsNone(pc._replica_connection)
+        add_item_to_cache(pc, self.shot, self.shot_path)
+        self.assertEqual(self.shot, pc.get_entity(self.shot_path))
+
+    def test_lock_wait_stats(self):
+        pc = self._create_replica_path_cache()
+        add_item_to_cache(pc, self.shot, self.shot_path)
+        stats = path_cache.PathCache.get_lookup_lock_wait_stats()
+
+        replica_connection = pc._replica_connection
+        results = [
+            path_cache.sqlite3.OperationalError("database is locked"),
+            path_cache.sqlite3.OperationalError("database is locked"),
+        ]
+
+        def execute(*args):
+            if results:
+                raise results.pop()
+            return replica_connection.execute(*args)
+
+        with mock.patch.object(pc, "_replica_connection") as connection_mock:
+            connection_mock.execute.side_effect = execute
+            self.assertEqual(self.shot, pc.get_entity(self.shot_path))
+
+        new_stats = path_cache.PathCache.get_lookup_lock_wait_stats()
+        self.assertEqual(stats["count"] + 1, new_stats["count"])
+        self.assertGreater(new_stats["time"], stats["time"])
+
+        # other errors are raised
+        with mock.patch.object(pc, "_replica_connection") as connection_mock:
+            connection_mock.execute.side_effect = path_cache.sqlite3.OperationalError(
+                "no such table"
+            )
+            self.assertRaises(
+                path_cache.sqlite3.OperationalError, pc.get_entity, self.shot_path
+            )
+
+
+class TestPathCachePool(TestPathCache):
+    """
+    Tests the path cache instances shared by the lookups of a Toolkit instance.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.shot = {"type": "Shot", "id": 999, "name": "shot_name"}
+        self.shot_path = os.path.join(self.project_root, "seq", "shot_name")
+
+    def test_shared_per_thread(self):
+        pc = self.tk.get_path_cache()
+        self.assertIs(pc, self.tk.get_path_cache())
+
+        other_thread_pcs = []
+        thread = threading.Thread(
+            target=lambda: other_thread_pcs.append(self.tk.get_path_cache())
+        )
+        thread.start()
+        thread.join()
+        self.assertIsNot(pc, other_thread_pcs[0])
+
+        # changes made by other instances are seen by the shared one
+        self.assertIsNone(self.tk.entity_from_path(self.shot_path))
+        add_item_to_cache(self.path_cache, self.shot, self.shot_path)
+        self.assertEqual(self.shot, self.tk.entity_from_path(self.shot_path))
+        self.assertEqual([self.shot_path], self.tk.paths_from_entity("Shot", 999))
+        self.assertIs(pc, self.tk.get_path_cache())
+
+    def test_closed(self):
+        pc = self.tk.get_path_cache()
+        pc.close()
+        new_pc = self.tk.get_path_cache()
+        self.assertIsNot(pc, new_pc)
+        self.assertIsNone(new_pc.get_entity(self.shot_path))
+
+    def test_replaced_file(self):
+        pc = self.tk.get_path_cache()
+        add_item_to_cache(self.path_cache, self.shot, self.shot_path)
+        self.assertEqual(self.shot, self.tk.entity_from_path(self.shot_path))
+
+        self.path_cache.close()
+        os.remove(self.path_cache_location)
+        path_cache.PathCache(self.tk).close()
+
+        self.assertIsNone(self.tk.entity_from_path(self.shot_path))
+        self.assertIsNot(pc, self.tk.get_path_cache())
+
+    def test_replica(self):
+        with temp_env_var(**{tank.constants.PATH_CACHE_REPLICA_ENV_VAR: "1"}):
+            pc = self.tk.get_path_cache()
+        self.assertIsNotNone(pc._replica_connection)
+        self.assertIsNone(self.tk.entity_from_path(self.shot_path))
+
+        # the replica is refreshed when the path cache file was modified
+        add_item_to_cache(self.path_cache, self.shot, self.shot_path)
+        self.assertEqual(self.shot, self.tk.entity_from_path(self.shot_path))
+        self.assertIs(pc, self.tk.get_path_cache())
+
+
 class Test_SeperateRoots(TestPathCache):
     def test_different_case(self):
         """
@@ -779,6 +1083,250 @@ class TestShotgunSync(TankTestBase):
         # and make sure the sync generated new records
         self.assertEqual(len(self._get_path_cache()), 4)
 
+    def _create_shot_folders(self, count):
+        """
+        Creates shots in the mocked database and their folders.
+
+        :returns: List of the shot entities.
+        """
+        shots = []
+        for index in range(count):
+            shot = {
+                "type": "Shot",
+                "id": 100 + index,
+                "code": "shot_%03d" % index,
+                "sg_sequence": self.seq,
+                "project": self.project,
+            }
+            self.add_to_sg_mock_db([shot])
+            folder.process_filesystem_structure(
+                self.tk, shot["type"], shot["id"], preview=False, engine=None
+            )
+            shots.append(shot)
+        return shots
+
+    @mock.patch.object(tank.path_cache.PathCache, "SHOTGUN_ENTITY_QUERY_BATCH_SIZE", 3)
+    def test_batched_full_sync(self):
+        """
+        Tests a full sync retrieving entries in multiple concurrent batches.
+        """
+        self._create_shot_folders(10)
+        # project, sequence, shots and their steps
+        path_cache_contents = sorted(self._get_path_cache())
+        self.assertEqual(len(path_cache_contents), 22)
+
+        path_cache = tank.path_cache.PathCache(self.tk)
+        pcl = path_cache._get_path_cache_location()
+        path_cache.close()
+        os.remove(pcl)
+
+        with mock.patch.object(
+            tank.path_cache.PathCache,
+            "_import_filesystem_location_entries",
+            autospec=True,
+            side_effect=tank.path_cache.PathCache._import_filesystem_location_entries,
+        ) as import_mock:
+            log = sync_path_cache(self.tk)
+
+        self.assertTrue("Performing a complete PTR folder sync" in log)
+        self.assertTrue("Retrieved batch 8/8 of FilesystemLocation entries" in log)
+        # entries are imported batch by batch
+        self.assertEqual(import_mock.call_count, 8)
+        self.assertEqual(sorted(self._get_path_cache()), path_cache_contents)
+
+    @mock.patch.object(tank.path_cache.PathCache, "SHOTGUN_ENTITY_QUERY_BATCH_SIZE", 3)
+    def test_batched_incremental_sync(self):
+        """
+        Tests that an incremental sync replays creations and deletions in order
+        when entries are retrieved in multiple concurrent batches.
+        """
+        path_cache = tank.path_cache.PathCache(self.tk)
+        pcl = path_cache._get_path_cache_location()
+        path_cache.close()
+
+        folder.process_filesystem_structure(
+            self.tk, self.seq["type"], self.seq["id"], preview=False, engine=None
+        )
+        shutil.copy(pcl, "%s.snap1" % pcl)
+
+        shots = self._create_shot_folders(10)
+
+        # unregister a shot and create its folders again, under a new name.
+        path_cache = tank.path_cache.PathCache(self.tk)
+        shot_path = path_cache.get_paths("Shot", shots[0]["id"], True)[0]
+        path_cache.remove_filesystem_location_entries(
+            self.tk, [path_cache.get_shotgun_id_from_path(shot_path)]
+        )
+        path_cache.close()
+        self.tk.shotgun.update("Shot", shots[0]["id"], {"code": "renamed"})
+        folder.process_filesystem_structure(
+            self.tk, "Shot", shots[0]["id"], preview=False, engine=None
+        )
+        path_cache_contents = sorted(self._get_path_cache())
+
+        shutil.copy("%s.snap1" % pcl, pcl)
+        self.assertEqual(len(self._get_path_cache()), 2)
+
+        log = sync_path_cache(self.tk)
+        self.assertTrue("Doing an incremental sync" in log)
+        self.assertEqual(sorted(self._get_path_cache()), path_cache_contents)
+        path_cache = tank.path_cache.PathCache(self.tk)
+        self.assertEqual(
+            [shot_path.replace("shot_000", "renamed")],
+            path_cache.get_paths("Shot", shots[0]["id"], True),
+        )
+        path_cache.close()
+
+    def test_snapshot_seeding(self):
+        """
+        Tests that an empty path cache is seeded from a snapshot and then
+        incrementally synchronized.
+        """
+        folder.process_filesystem_structure(
+            self.tk, self.seq["type"], self.seq["id"], preview=False, engine=None
+        )
+        snapshot_folder = os.path.join(self.tank_temp, "snapshots")
+        os.makedirs(snapshot_folder)
+
+        path_cache = tank.path_cache.PathCache(self.tk)
+        pcl = path_cache._get_path_cache_location()
+        snapshot_file = path_cache.export_snapshot(snapshot_folder)
+        path_cache.close()
+        self.assertEqual(os.path.dirname(snapshot_file), snapshot_folder)
+
+        # create more folders after the snapshot was exported.
+        folder.process_filesystem_structure(
+            self.tk, self.task["type"], self.task["id"], preview=False, engine=None
+        )
+        path_cache_contents = self._get_path_cache()
+        self.assertEqual(len(path_cache_contents), 4)
+
+        os.remove(pcl)
+        with temp_env_var(TK_PATH_CACHE_SNAPSHOT=snapshot_folder):
+            log = sync_path_cache(self.tk)
+        self.assertFalse("Performing a complete PTR folder sync" in log)
+        self.assertTrue("Doing an incremental sync" in log)
+        self.assertEqual(self._get_path_cache(), path_cache_contents)
+
+        # snapshots are only used to seed empty path caches
+        with temp_env_var(TK_PATH_CACHE_SNAPSHOT=snapshot_folder):
+            log = sync_path_cache(self.tk)
+        self.assertTrue("Path cache syncing not necessary" in log)
+
+        # without a snapshot for the project, a full sync is done.
+        os.remove(pcl)
+        os.remove(snapshot_file)
+        with temp_env_var(TK_PATH_CACHE_SNAPSHOT=snapshot_folder):
+            log = sync_path_cache(self.tk)
+        self.assertTrue("Performing a complete PTR folder sync" in log)
+        self.assertEqual(self._get_path_cache(), path_cache_contents)
+
+    def test_snapshot_seeding_synchronized_path_cache(self):
+        """
+        Tests that a snapshot doesn't replace a path cache which was
+        synchronized before the snapshot could be imported.
+        """
+        folder.process_filesystem_structure(
+            self.tk, self.seq["type"], self.seq["id"], preview=False, engine=None
+        )
+        snapshot_file = os.path.join(self.tank_temp, "seeding.snapshot")
+        path_cache = tank.path_cache.PathCache(self.tk)
+        try:
+            path_cache.export_snapshot(snapshot_file)
+            folder.process_filesystem_structure(
+                self.tk, self.task["type"], self.task["id"], preview=False, engine=None
+            )
+            path_cache_contents = self._get_path_cache()
+            event_log_id = list(
+                path_cache._connection.execute(
+                    "SELECT max(last_id) FROM event_log_sync"
+                )
+            )[0][0]
+
+            self.assertEqual(
+                event_log_id, path_cache.import_snapshot(snapshot_file, if_empty=True)
+            )
+            self.assertEqual(self._get_path_cache(), path_cache_contents)
+
+            # explicit imports replace the content of the path cache, including
+            # the Shotgun ids of the entries.
+            self.assertLess(path_cache.import_snapshot(snapshot_file), event_log_id)
+            self.assertEqual(len(self._get_path_cache()), 2)
+            seq_path = path_cache.get_paths("Sequence", self.seq["id"], True)[0]
+            self.assertIsNotNone(path_cache.get_shotgun_id_from_path(seq_path))
+        finally:
+            path_cache.close()
+
+    def test_invalid_snapshots(self):
+        """
+        Tests that invalid snapshots are rejected.
+        """
+        snapshot_file = os.path.join(self.tank_temp, "invalid.snapshot")
+        path_cache = tank.path_cache.PathCache(self.tk)
+        try:
+            # the path cache has never been synchronized
+            path_cache._connection.execute("DELETE FROM event_log_sync")
+            path_cache._connection.commit()
+            with self.assertRaisesRegex(tank.TankError, "not been synchronized"):
+                path_cache.export_snapshot(snapshot_file)
+            path_cache.synchronize()
+            path_cache.export_snapshot(snapshot_file)
+
+            with mock.patch.object(
+                self.tk.pipeline_configuration, "get_project_id", return_value=1234
+            ):
+                with self.assertRaisesRegex(tank.TankError, "project id"):
+                    path_cache.import_snapshot(snapshot_file)
+
+            with mock.patch.object(path_cache, "SNAPSHOT_VERSION", 3):
+                with self.assertRaisesRegex(tank.TankError, "version"):
+                    path_cache.import_snapshot(snapshot_file)
+
+            roots = dict(path_cache._roots, other_root=None)
+            with mock.patch.object(path_cache, "_roots", roots):
+                with self.assertRaisesRegex(tank.TankError, "storage roots"):
+                    path_cache.import_snapshot(snapshot_file)
+
+            with open(snapshot_file, "w") as fh:
+                fh.write("not a snapshot")
+            with self.assertRaises(tank.TankError):
+                path_cache.import_snapshot(snapshot_file)
+        finally:
+            path_cache.close()
+
+        # invalid snapshots fall back on a full sync
+        os.remove(path_cache._get_path_cache_location())
+        with temp_env_var(TK_PATH_CACHE_SNAPSHOT=snapshot_file):
+            log = sync_path_cache(self.tk)
+        self.assertTrue("Performing a complete PTR folder sync" in log)
+
+    def test_snapshot_command(self):
+        """
+        Tests the path_cache_snapshot tank command.
+        """
+        folder.process_filesystem_structure(
+            self.tk, self.task["type"], self.task["id"], preview=False, engine=None
+        )
+        path_cache_contents = self._get_path_cache()
+        snapshot_file = os.path.join(self.tank_temp, "command.snapshot")
+
+        command = self.tk.get_command("path_cache_snapshot")
+        command.set_logger(logging.getLogger("/dev/null"))
+        self.assertEqual(
+            command.execute({"operation": "export", "path": snapshot_file}),
+            snapshot_file,
+        )
+
+        path_cache = tank.path_cache.PathCache(self.tk)
+        os.remove(path_cache._get_path_cache_location())
+        path_cache.close()
+
+        command.execute({"operation": "import", "path": snapshot_file})
+        self.assertEqual(self._get_path_cache(), path_cache_contents)
+
+        with self.assertRaises(tank.TankError):
+            command.execute({"operation": "unknown", "path": snapshot_file})
+
     def test_missing_roots_mapping(self):
         """
         Tests that invalid roots.yml lookups result in ignored records
@@ -1172,8 +1720,8 @@ class TestPathCacheDelete(TankTestBase):
 
         # Wrap some methods in a mock so we can track their usage.
         self._pc._do_full_sync = mock.Mock(wraps=self._pc._do_full_sync)
-        self._pc._import_filesystem_location_entry = mock.Mock(
-            wraps=self._pc._import_filesystem_location_entry
+        self._pc._import_filesystem_location_entries = mock.Mock(
+            wraps=self._pc._import_filesystem_location_entries
         )
         self._pc._remove_filesystem_location_entities = mock.Mock(
             wraps=self._pc._remove_filesystem_location_entities
@@ -1292,7 +1840,7 @@ class TestPathCacheDelete(TankTestBase):
         self.assertEqual(self._pc._remove_filesystem_location_entities.call_count, 1)
         # However, since there is no filsystem location anymore in Shotgun, we shouldn't have even tried
         # to import it.
-        self.assertEqual(self._pc._import_filesystem_location_entry.call_count, 0)
+        self.assertEqual(self._pc._import_filesystem_location_entries.call_count, 0)
 
         # The entry should have been created and deleted, so there should be no paths.
         paths = self._pc.get_paths(
@@ -1495,13 +2043,27 @@ class TestPathCacheBatchOperation(TankTestBase):
         ]
 
         def our_find_mock(*args, **kwargs):
+            self.assertEqual(kwargs, {})
 
-            # assert the expected request from the method
+            # the ids of the project's entities are retrieved first
+            if args[1] == [["project", "is", {"type": "Project", "id": 1}]]:
+                self.assertEqual(
+                    args,
+                    (
+                        "FilesystemLocation",
+                        [["project", "is", {"type": "Project", "id": 1}]],
+                        ["id"],
+                        [{"direction": "asc", "field_name": "id"}],
+                    ),
+                )
+                return [{"type": "FilesystemLocation", "id": 1234}]
+
+            # and then the entities themselves
             self.assertEqual(
                 args,
                 (
                     "FilesystemLocation",
-                    [["project", "is", {"type": "Project", "id": 1}]],
+                    [["id", "in", 1234]],
                     [
                         "id",
                         "configuration_metadata",
@@ -1514,7 +2076,6 @@ class TestPathCacheBatchOperation(TankTestBase):
                     [{"direction": "asc", "field_name": "id"}],
                 ),
             )
-            self.assertEqual(kwargs, {})
 
             return find_return_payload
 
@@ -1522,6 +2083,7 @@ class TestPathCacheBatchOperation(TankTestBase):
 
         entities = self._pc._get_filesystem_location_entities(None)
 
+        self.assertEqual(find_mock.call_count, 2)
         self.assertEqual(entities, find_return_payload)
 
     @mock.patch("tank_vendor.shotgun_api3.lib.mockgun.Shotgun.find")
@@ -1578,7 +2140,8 @@ class TestPathCacheBatchOperation(TankTestBase):
                 )
             )
 
-        find_mock.assert_has_calls(expected_calls)
+        # batches are retrieved concurrently
+        find_mock.assert_has_calls(expected_calls, any_order=True)
 
-        # we expect eight return values from find()
+        # we expect eight return values from find(), in order
         self.assertEqual(entities, ["dummy_data"] * 8)
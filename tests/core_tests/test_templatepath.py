@@ -11,11 +11,12 @@
 import os
 
 import tank
-from tank import TankError
-from tank.template import TemplatePath
+from tank import TankError, constants
+from tank.template import Template, TemplatePath
+from tank.template_path_parser import TemplatePathParser
 from tank.templatekey import IntegerKey, SequenceKey, StringKey
 from tank.util import is_windows
-from tank_test.tank_test_base import ShotgunTestBase, setUpModule  # noqa
+from tank_test.tank_test_base import ShotgunTestBase, mock, setUpModule  # noqa
 
 
 class TestTemplatePath(ShotgunTestBase):
@@ -690,6 +691,125 @@ class Test_ApplyFields(TestTemplatePath):
         self.assertEqual(result, expected)
 
 
+class TestApplyFieldsCache(TestTemplatePath):
+    """Tests for the caching of the paths and values built by apply_fields"""
+
+    def setUp(self):
+        super().setUp()
+        self.fields = {
+            "Sequence": "seq_1",
+            "Shot": "s1",
+            "Step": "Anm",
+            "branch": "mmm",
+            "version": 3,
+            "snapshot": 2,
+        }
+        self.expected = os.path.join(
+            self.project_root,
+            "shots",
+            "seq_1",
+            "s1",
+            "Anm",
+            "work",
+            "s1.mmm.v003.002.ma",
+        )
+
+    def test_cached_path(self):
+        self.assertEqual(self.expected, self.template_path.apply_fields(self.fields))
+        with mock.patch.object(
+            StringKey, "str_from_value", side_effect=AssertionError
+        ), mock.patch.object(IntegerKey, "str_from_value", side_effect=AssertionError):
+            # extra fields are ignored
+            fields = dict(self.fields, name="foo")
+            self.assertEqual(self.expected, self.template_path.apply_fields(fields))
+
+    def test_cached_values(self):
+        """
+        Only the values which changed are converted.
+        """
+        self.template_path.apply_fields(self.fields)
+        with mock.patch.object(
+            IntegerKey,
+            "str_from_value",
+            autospec=True,
+            side_effect=IntegerKey.str_from_value,
+        ) as str_mock:
+            path = self.template_path.apply_fields(dict(self.fields, snapshot=3))
+        self.assertEqual(self.expected.replace("002", "003"), path)
+        self.assertEqual(1, str_mock.call_count)
+
+    def test_value_types(self):
+        """
+        Values comparing as equal but with different types are not mixed up.
+        """
+        fields = dict(self.fields, version="3")
+        self.assertEqual(
+            self.expected.replace("v003", "v3"),
+            self.template_path._apply_fields(fields, ignore_types=["version"]),
+        )
+        self.assertRaises(TankError, self.template_path.apply_fields, fields)
+        self.assertEqual(self.expected, self.template_path.apply_fields(self.fields))
+        self.assertEqual(
+            self.expected.replace("v003", "v3"),
+            self.template_path._apply_fields(self.fields, ignore_types=["version"]),
+        )
+
+    def test_unhashable_value(self):
+        template = TemplatePath("{Step}", self.keys, self.project_root)
+        for _ in range(2):
+            self.assertEqual(
+                os.path.join(self.project_root, "['a']"),
+                template._apply_fields({"Step": ["a"]}, ignore_types=["Step"]),
+            )
+
+    def test_defaults(self):
+        """
+        Paths using default values are not cached.
+        """
+        keys = dict(self.keys, name=StringKey("name", default="foo"))
+        template = TemplatePath("{Step}/[{name}.]{version}", keys, self.project_root)
+        fields = {"Step": "Anm", "version": 1}
+        self.assertEqual(
+            os.path.join(self.project_root, "Anm", "foo.001"),
+            template.apply_fields(fields),
+        )
+        keys["name"].default = "bar"
+        self.assertEqual(
+            os.path.join(self.project_root, "Anm", "bar.001"),
+            template.apply_fields(fields),
+        )
+        keys["name"].default = None
+        self.assertEqual(
+            os.path.join(self.project_root, "Anm", "001"),
+            template.apply_fields(fields),
+        )
+        # the shortest variation was selected because name has no default
+        keys["name"].default = "foo"
+        self.assertEqual(
+            os.path.join(self.project_root, "Anm", "foo.001"),
+            template.apply_fields(fields),
+        )
+        self.assertEqual(
+            os.path.join(self.project_root, "Anm", "001"),
+            template._apply_fields(fields, skip_defaults=True),
+        )
+
+    def test_cache_size(self):
+        for version in range(Template._APPLY_FIELDS_CACHE_SIZE * 2):
+            self.template_path.apply_fields(dict(self.fields, version=version))
+        self.assertEqual(
+            Template._APPLY_FIELDS_CACHE_SIZE,
+            len(self.template_path._apply_fields_cache),
+        )
+
+    def test_errors(self):
+        keys = {"Shot": StringKey("Shot", choices=["s1", "s2"])}
+        template = TemplatePath("{Shot}", keys, self.project_root)
+        for _ in range(2):
+            self.assertRaises(TankError, template.apply_fields, {"Shot": "s3"})
+            self.assertRaises(TankError, template.apply_fields, {})
+
+
 class TestGetFields(TestTemplatePath):
     def test_anim_path(self):
         relative_path = os.path.join(
@@ -1180,3 +1300,234 @@ class TestParent(TestTemplatePath):
         template = TemplatePath(definition, keys, root_path=self.project_root)
         result = template.parent
         self.assertEqual("{new_name}", result.definition)
+
+
+class TestGetFieldsMany(TestTemplatePath):
+    def setUp(self):
+        super().setUp()
+        self.template = TemplatePath(
+            "shots/{Sequence}/{Step}/{name}.v{version}.{frame}.exr",
+            self.keys,
+            self.project_root,
+        )
+
+    def _frame_paths(self, frames, name="comp", version="003"):
+        return [
+            os.path.join(
+                self.project_root,
+                "shots",
+                "seq_1",
+                "comp",
+                "%s.v%s.%s.exr" % (name, version, frame),
+            )
+            for frame in frames
+        ]
+
+    def assert_same_fields(self, template, paths):
+        """
+        Checks get_fields_many gives the same results as get_fields.
+        """
+        results = list(template.get_fields_many(paths))
+        self.assertEqual(paths, [path for path, _ in results])
+        for path, fields in results:
+            try:
+                expected = template.get_fields(path)
+            except TankError:
+                self.assertIsInstance(fields, TankError)
+            else:
+                self.assertEqual(expected, fields)
+
+    def test_sequence(self):
+        paths = self._frame_paths(["1001", "1002", "1003", "1004"])
+        results = list(self.template.get_fields_many(paths))
+        self.assertEqual(1004, results[-1][1]["frame"])
+        self.assert_same_fields(self.template, paths)
+
+    def test_frames_not_parsed(self):
+        """
+        Frames after the first two of a sequence are not fully parsed.
+        """
+        paths = self._frame_paths(range(1001, 1101))
+        with mock.patch.object(
+            TemplatePathParser,
+            "parse_path",
+            autospec=True,
+            side_effect=TemplatePathParser.parse_path,
+        ) as parse_mock:
+            results = list(self.template.get_fields_many(paths))
+        self.assertEqual(2, parse_mock.call_count)
+        self.assertEqual(list(range(1001, 1101)), [f["frame"] for _, f in results])
+
+    def test_mixed_paths(self):
+        paths = (
+            self._frame_paths(["1001", "1002", "0999", "9999"])
+            + self._frame_paths(["1001", "1002"], version="004")
+            + self._frame_paths(["1001", "1002"], name="comp2")
+            + self._frame_paths(["1001", "1002"], version="abc")
+            + ["not/a/match.1001.exr", "not/a/match.1002.exr"]
+            + self._frame_paths(["1003", "1004"], version="004")
+        )
+        self.assert_same_fields(self.template, paths)
+
+    def test_versions(self):
+        """
+        Numbers which are not frames are always parsed.
+        """
+        paths = self._frame_paths(["1001"])
+        paths += self._frame_paths(["1001"], version="004")
+        paths += self._frame_paths(["1001"], version="005")
+        results = list(self.template.get_fields_many(paths))
+        self.assertEqual([3, 4, 5], [f["version"] for _, f in results])
+
+    def test_duplicated_key(self):
+        template = TemplatePath(
+            "{Sequence}/{frame}/{Sequence}.{frame}.exr", self.keys, self.project_root
+        )
+        paths = [
+            os.path.join(self.project_root, "seq", "1001", "seq.1001.exr"),
+            os.path.join(self.project_root, "seq", "1001", "seq.1002.exr"),
+            os.path.join(self.project_root, "seq", "1001", "seq.1003.exr"),
+            os.path.join(self.project_root, "seq", "1002", "seq.1002.exr"),
+            os.path.join(self.project_root, "seq", "1003", "seq.1002.exr"),
+        ]
+        self.assert_same_fields(template, paths)
+
+    def test_digit_sensitive_keys(self):
+        """
+        Frames are always parsed for templates with keys validating digits.
+        """
+        keys = dict(self.keys)
+        keys["frame"] = SequenceKey("frame", format_spec="04", choices=[1001, 1002])
+        template = TemplatePath("{name}.{frame}.exr", keys, self.project_root)
+        self.assertIsNone(template._get_frame_collapse_info())
+        paths = [
+            os.path.join(self.project_root, "a.%s.exr" % frame)
+            for frame in [1001, 1002, 1003]
+        ]
+        self.assert_same_fields(template, paths)
+
+    def test_skip_keys(self):
+        paths = self._frame_paths(["1001", "1002", "1003"])
+        for _, fields in self.template.get_fields_many(paths, skip_keys=["frame"]):
+            self.assertNotIn("frame", fields)
+
+    def test_validate_many(self):
+        paths = self._frame_paths(["1001", "1002", "1003"])
+        paths += self._frame_paths(["1001"], version="004")
+        paths += self._frame_paths(["1001"], version="abc")
+        for fields, skip_keys in [
+            (None, None),
+            ({"version": 4}, None),
+            ({"version": 4}, ["version"]),
+            ({"frame": 1002}, None),
+        ]:
+            self.assertEqual(
+                [
+                    (path, self.template.validate(path, fields, skip_keys))
+                    for path in paths
+                ],
+                list(self.template.validate_many(paths, fields, skip_keys)),
+            )
+
+
+class _CompiledParsingMixin(object):
+    """
+    Runs the tests of a TemplatePath test case with compiled template parsing.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.dict(
+            os.environ, {constants.COMPILED_TEMPLATE_PARSING_ENV_VAR: "1"}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+class TestCompiledValidate(_CompiledParsingMixin, TestValidate):
+    """Runs the validation tests with compiled template parsing."""
+
+
+class TestCompiledGetFields(_CompiledParsingMixin, TestGetFields):
+    """Runs the get_fields tests with compiled template parsing."""
+
+
+class TestCompiledGetKeysSepInValue(_CompiledParsingMixin, TestGetKeysSepInValue):
+    """Runs the path separator tests with compiled template parsing."""
+
+
+class TestCompiledPatterns(_CompiledParsingMixin, TestTemplatePath):
+    """Tests for the compiled template patterns."""
+
+    def test_disabled_by_default(self):
+        with mock.patch.dict(os.environ):
+            del os.environ[constants.COMPILED_TEMPLATE_PARSING_ENV_VAR]
+            template = TemplatePath(self.definition, self.keys, self.project_root)
+        self.assertEqual([None], template._compiled_patterns)
+
+    def test_exact_pattern(self):
+        """
+        Keys followed by a token starting with a character they can't contain
+        are extracted with the regular expression only.
+        """
+        template = TemplatePath(
+            "shots/{Sequence}/{Shot}/{name_alpha}.v{version}.{frame}.exr",
+            self.keys,
+            self.project_root,
+        )
+        self.assertTrue(template._compiled_patterns[0].is_exact)
+        path = os.path.join(
+            self.project_root, "shots", "seq_1", "s1", "comp.v003.1001.exr"
+        )
+        expected = {
+            "Sequence": "seq_1",
+            "Shot": "s1",
+            "name_alpha": "comp",
+            "version": 3,
+            "frame": 1001,
+        }
+        with mock.patch.object(
+            TemplatePathParser,
+            "_TemplatePathParser__find_possible_key_values_recursive",
+        ) as recursive_mock:
+            self.assertEqual(expected, template.get_fields(path))
+            # non matching paths are rejected
+            self.assertFalse(template.validate(path.replace("exr", "dpx")))
+            self.assertFalse(template.validate(path.replace("v003", "vabc")))
+        recursive_mock.assert_not_called()
+
+    def test_ambiguous_pattern(self):
+        """
+        Matches of keys which can contain the next token are resolved recursively.
+        """
+        template = TemplatePath("{name}.{ext}", self.keys, self.project_root)
+        self.assertFalse(template._compiled_patterns[0].is_exact)
+        self.assertEqual(
+            {"name": "a", "ext": "b"},
+            template.get_fields(os.path.join(self.project_root, "a.b")),
+        )
+        self.assertRaises(
+            TankError,
+            template.get_fields,
+            os.path.join(self.project_root, "a.b.c"),
+        )
+
+    def test_choices(self):
+        template = TemplatePath("{Shot}.{name}", self.keys, self.project_root)
+        self.assertTrue(template._compiled_patterns[0].is_exact)
+        self.assertEqual(
+            {"Shot": "shot_1", "name": "a.b"},
+            template.get_fields(os.path.join(self.project_root, "shot_1.a.b")),
+        )
+        self.assertFalse(template.validate(os.path.join(self.project_root, "s3.a")))
+
+    def test_conflicting_values(self):
+        template = TemplatePath(
+            "{Shot}/{version}/{Shot}.ma", self.keys, self.project_root
+        )
+        self.assertTrue(
+            template.validate(os.path.join(self.project_root, "s1", "001", "s1.ma"))
+        )
+        self.assertFalse(
+            template.validate(os.path.join(self.project_root, "s1", "001", "s2.ma"))
+        )
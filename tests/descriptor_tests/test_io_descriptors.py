@@ -9,10 +9,14 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import shutil
+import threading
 
 import sgtk
+from sgtk.descriptor.io_descriptor.bundle_cache_index import BundleCacheIndex
+from sgtk.descriptor.io_descriptor.downloadable import IODescriptorDownloadable
 from tank_test.tank_test_base import setUpModule  # noqa
-from tank_test.tank_test_base import ShotgunTestBase, temp_env_var
+from tank_test.tank_test_base import ShotgunTestBase, mock, temp_env_var
 
 
 class TestIODescriptors(ShotgunTestBase):
@@ -268,3 +272,155 @@ class TestIODescriptors(ShotgunTestBase):
 
         self.assertEqual(d.get_path(), bundle_path)
         self.assertEqual(d.find_latest_cached_version(), d)
+
+    def test_bundle_cache_index(self):
+        """
+        Tests that fallback roots are looked up in their bundle cache index.
+        """
+        sg = self.mockgun
+        root = os.path.join(self.project_root, "cache_root")
+        fallback_root = os.path.join(self.project_root, "fallback_cache_root")
+
+        def create_descriptor(version, bundle_cache_root, fallback_roots=None):
+            return sgtk.descriptor.create_descriptor(
+                sg,
+                sgtk.descriptor.Descriptor.APP,
+                {"type": "app_store", "version": version, "name": "tk-bundle"},
+                bundle_cache_root_override=bundle_cache_root,
+                fallback_roots=fallback_roots,
+            )
+
+        def download(version):
+            io_descriptor = create_descriptor(version, fallback_root)._io_descriptor
+            with io_descriptor.open_write_location() as temporary_path:
+                os.makedirs(temporary_path)
+                with open(os.path.join(temporary_path, "info.yml"), "wt") as fh:
+                    fh.write("test data\n")
+
+        def make_bundle(version):
+            bundle_path = os.path.join(fallback_root, "app_store", "tk-bundle", version)
+            os.makedirs(bundle_path)
+            with open(os.path.join(bundle_path, "info.yml"), "wt") as fh:
+                fh.write("test data\n")
+            return bundle_path
+
+        def get_path(version):
+            # simulate a new process
+            with mock.patch.dict(BundleCacheIndex._indexes, clear=True):
+                d = create_descriptor(version, root, [fallback_root])
+                with mock.patch.object(
+                    IODescriptorDownloadable,
+                    "_exists_local",
+                    autospec=True,
+                    side_effect=lambda self, path: os.path.isdir(path),
+                ) as exists_local:
+                    path = d.get_path()
+            return path, [call[0][1] for call in exists_local.call_args_list]
+
+        # bundles in the root before the index was created are found by the
+        # scan done at the first download.
+        v1_path = make_bundle("v1.0.0")
+        download("v2.0.0")
+        self.assertTrue(
+            os.path.exists(os.path.join(fallback_root, BundleCacheIndex.FILE_NAME))
+        )
+
+        path, probed = get_path("v1.0.0")
+        self.assertEqual(v1_path, path)
+        self.assertEqual([], probed)
+
+        # missing bundles are only probed in the primary root.
+        path, probed = get_path("v3.0.0")
+        self.assertIsNone(path)
+        self.assertTrue(probed)
+        self.assertFalse([p for p in probed if p.startswith(fallback_root)])
+
+        # a download which doesn't update the index makes it stale.
+        os.makedirs(os.path.join(fallback_root, "tmp", "old_core_download"))
+        v3_path = make_bundle("v3.0.0")
+        path, probed = get_path("v3.0.0")
+        self.assertEqual(v3_path, path)
+        self.assertIn(v3_path, probed)
+
+        # and the index is rebuilt at the next download.
+        download("v4.0.0")
+        for version in ("v1.0.0", "v3.0.0", "v4.0.0"):
+            path, probed = get_path(version)
+            self.assertTrue(path.startswith(fallback_root))
+            self.assertEqual([], probed)
+
+        # bundles removed since the index was written are not returned.
+        shutil.rmtree(v1_path)
+        path, probed = get_path("v1.0.0")
+        self.assertIsNone(path)
+        self.assertFalse([p for p in probed if p.startswith(fallback_root)])
+
+    def test_bundle_cache_index_concurrent_downloads(self):
+        """
+        Tests that concurrent downloads of a process don't make the bundle
+        cache index stale for each other.
+        """
+        root = os.path.join(self.project_root, "concurrent_cache_root")
+        nb_downloads = 8
+        barrier = threading.Barrier(nb_downloads)
+
+        def download(version, wait=False):
+            io_descriptor = sgtk.descriptor.create_descriptor(
+                self.mockgun,
+                sgtk.descriptor.Descriptor.APP,
+                {"type": "app_store", "version": version, "name": "tk-bundle"},
+                bundle_cache_root_override=root,
+            )._io_descriptor
+            with io_descriptor.open_write_location() as temporary_path:
+                os.makedirs(temporary_path)
+                if wait:
+                    # make sure all the downloads are staged at the same time.
+                    barrier.wait(timeout=10)
+                with open(os.path.join(temporary_path, "info.yml"), "wt") as fh:
+                    fh.write("test data\n")
+
+        index = BundleCacheIndex.get(root)
+        with mock.patch.object(index, "_scan", wraps=index._scan) as scan:
+            # the first download creates the index.
+            download("v0.0.0")
+            self.assertEqual(1, scan.call_count)
+
+            threads = [
+                threading.Thread(target=download, args=("v1.0.%d" % idx, True))
+                for idx in range(nb_downloads)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(1, scan.call_count)
+
+        # the staging folder is removed and the index is still up to date.
+        self.assertEqual([], os.listdir(os.path.join(root, "tmp")))
+        with mock.patch.dict(BundleCacheIndex._indexes, clear=True):
+            for idx in range(nb_downloads):
+                self.assertTrue(
+                    BundleCacheIndex.get(root).contains(
+                        os.path.join(root, "app_store", "tk-bundle", "v1.0.%d" % idx)
+                    )
+                )
+
+        # a download made by another process during a download of this
+        # process makes the index stale.
+        with mock.patch.object(index, "_scan", wraps=index._scan) as scan:
+            io_descriptor = sgtk.descriptor.create_descriptor(
+                self.mockgun,
+                sgtk.descriptor.Descriptor.APP,
+                {"type": "app_store", "version": "v2.0.0", "name": "tk-bundle"},
+                bundle_cache_root_override=root,
+            )._io_descriptor
+            with io_descriptor.open_write_location() as temporary_path:
+                os.makedirs(temporary_path)
+                with open(os.path.join(temporary_path, "info.yml"), "wt") as fh:
+                    fh.write("test data\n")
+                tmp_folder = os.path.join(root, "tmp")
+                os.makedirs(os.path.join(tmp_folder, "other_process_download"))
+                # the modification time may not change within a clock tick.
+                mtime = os.stat(tmp_folder).st_mtime_ns + 10**9
+                os.utime(tmp_folder, ns=(mtime, mtime))
+            self.assertEqual(1, scan.call_count)
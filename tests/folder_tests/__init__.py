@@ -133,3 +133,64 @@ def execute_folder_creation_proxy(self):
     g_paths_created = folders
 
     return folders
+
+
+class ShotgunRoundTripCounter(object):
+    """
+    Counts the queries sent to Shotgun during folder creation.
+
+    Use it as a context manager around the code to measure::
+
+        with ShotgunRoundTripCounter(tk.shotgun) as counter:
+            folder.process_filesystem_structure(tk, "Shot", shot_ids, True, None)
+        counter.count
+    """
+
+    METHODS = ["find", "find_one", "schema_field_read", "summarize"]
+
+    def __init__(self, shotgun):
+        """
+        :param shotgun: Shotgun API instance to count the queries of.
+        """
+        self._shotgun = shotgun
+        self._depth = 0
+        self.counts = dict((method, 0) for method in self.METHODS)
+
+    @property
+    def count(self):
+        """
+        Total number of queries.
+        """
+        return sum(self.counts.values())
+
+    def __enter__(self):
+        for method in self.METHODS:
+            if hasattr(self._shotgun, method):
+                setattr(
+                    self._shotgun,
+                    method,
+                    self._wrap(method, getattr(self._shotgun, method)),
+                )
+        return self
+
+    def __exit__(self, *args):
+        for method in self.METHODS:
+            self._shotgun.__dict__.pop(method, None)
+
+    def _wrap(self, method, func):
+        """
+        Wraps an API method to count the calls made to it.
+
+        Calls made by another API method, e.g. find_one calling find, are not counted.
+        """
+
+        def wrapper(*args, **kwargs):
+            if self._depth == 0:
+                self.counts[method] += 1
+            self._depth += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._depth -= 1
+
+        return wrapper
@@ -9,6 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+from unittest import mock
 
 from tank import TankError, folder
 from tank_test.tank_test_base import setUpModule  # noqa
@@ -78,3 +79,114 @@ class TestFolderConfiguration(TankTestBase):
             self.tk,
             self.schema_location,
         )
+
+
+class TestFolderConfigurationCache(TankTestBase):
+    """
+    Tests the cache of the scanned schema.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # the schema is modified, so it has to be a copy of the fixtures
+        self.setup_fixtures(parameters={"installed_config": True})
+        self.schema_location = (
+            self.tk.pipeline_configuration.get_schema_config_location()
+        )
+        self.cache_path = os.path.join(
+            self.tk.pipeline_configuration.get_shotgun_menu_cache_location(),
+            folder.configuration.FolderConfiguration.SCHEMA_CACHE_FILE_NAME,
+        )
+        folder.configuration.FolderConfiguration._schema_scans.clear()
+
+    def _get_entity_types(self, config):
+        """
+        Returns the entity types of the folders of a configuration.
+        """
+        return sorted(config._entity_nodes_by_type)
+
+    def test_unchanged_schema(self):
+        """
+        Checks that an unchanged schema is only scanned once.
+        """
+        with mock.patch.object(
+            folder.configuration.FolderConfiguration,
+            "_scan_schema",
+            autospec=True,
+            side_effect=folder.configuration.FolderConfiguration._scan_schema,
+        ) as scan_mock:
+            first = folder.configuration.FolderConfiguration(
+                self.tk, self.schema_location
+            )
+            second = folder.configuration.FolderConfiguration(
+                self.tk, self.schema_location
+            )
+
+        self.assertEqual(scan_mock.call_count, 1)
+        self.assertEqual(self._get_entity_types(first), self._get_entity_types(second))
+        # each configuration has its own folder objects
+        self.assertIsNot(
+            first.get_folder_objs_for_entity_type("Shot")[0],
+            second.get_folder_objs_for_entity_type("Shot")[0],
+        )
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_changed_schema(self):
+        """
+        Checks that the schema is scanned again when its top level changes or
+        when the cache is cleared.
+        """
+        folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+
+        with mock.patch.object(
+            folder.configuration.FolderConfiguration,
+            "_scan_schema",
+            autospec=True,
+            side_effect=folder.configuration.FolderConfiguration._scan_schema,
+        ) as scan_mock, mock.patch.object(
+            folder.configuration.FolderConfiguration,
+            "_get_schema_fingerprint",
+            side_effect=AssertionError,
+        ):
+            # changes deeper in the schema are not checked.
+            shot_yml = os.path.join(
+                self.schema_location, "project", "sequences", "sequence", "shot.yml"
+            )
+            with open(shot_yml, "a") as fh:
+                fh.write("\n# modified\n")
+            folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+            self.assertEqual(scan_mock.call_count, 0)
+
+            folder.clear_schema_cache()
+            folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+            self.assertEqual(scan_mock.call_count, 1)
+
+            # the schema is scanned again when an item is added at its top level.
+            with open(os.path.join(self.schema_location, "ignore_files"), "a") as fh:
+                fh.write("\n*.bak\n")
+            folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+            self.assertEqual(scan_mock.call_count, 2)
+
+    def test_cache_file(self):
+        """
+        Checks that the schema scan stored on disk is used by other processes.
+        """
+        with mock.patch.dict(os.environ, {"TK_FOLDER_SCHEMA_CACHE": "1"}):
+            expected = folder.configuration.FolderConfiguration(
+                self.tk, self.schema_location
+            )
+            self.assertTrue(os.path.exists(self.cache_path))
+
+            # simulate another process
+            folder.configuration.FolderConfiguration._schema_scans.clear()
+            with mock.patch.object(
+                folder.configuration.FolderConfiguration, "_scan_schema"
+            ) as scan_mock:
+                config = folder.configuration.FolderConfiguration(
+                    self.tk, self.schema_location
+                )
+
+        scan_mock.assert_not_called()
+        self.assertEqual(
+            self._get_entity_types(expected), self._get_entity_types(config)
+        )
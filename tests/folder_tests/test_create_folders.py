@@ -15,7 +15,11 @@ import shutil
 from tank import TankError, folder, path_cache
 from tank_test.tank_test_base import TankTestBase
 
-from . import assert_paths_to_create, execute_folder_creation_proxy
+from . import (
+    ShotgunRoundTripCounter,
+    assert_paths_to_create,
+    execute_folder_creation_proxy,
+)
 
 
 class TestSchemaCreateFolders(TankTestBase):
@@ -1052,3 +1056,98 @@ class TestFolderCreationEdgeCases(TankTestBase):
             preview=False,
             engine=None,
         )
+
+
+class TestFolderCreationShotgunQueries(TankTestBase):
+    """
+    Tests that creating folders for several entities retrieves their data in batch.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.setup_fixtures()
+
+        self.seqs = [
+            {
+                "type": "Sequence",
+                "id": 100 + i,
+                "code": "seq_%d" % i,
+                "project": self.project,
+            }
+            for i in range(2)
+        ]
+        self.steps = [
+            {
+                "type": "Step",
+                "id": 200 + i,
+                "code": "step_%d" % i,
+                "entity_type": "Shot",
+                "short_name": "step_%d" % i,
+            }
+            for i in range(2)
+        ]
+        self.shots = [
+            {
+                "type": "Shot",
+                "id": 300 + i,
+                "code": "shot_%02d" % i,
+                "sg_sequence": self.seqs[i % 2],
+                "project": self.project,
+            }
+            for i in range(12)
+        ]
+        self.tasks = [
+            {
+                "type": "Task",
+                "id": 400 + len(self.steps) * i + j,
+                "entity": shot,
+                "step": step,
+                "project": self.project,
+            }
+            for (i, shot) in enumerate(self.shots)
+            for (j, step) in enumerate(self.steps)
+        ]
+
+        self.add_to_sg_mock_db(
+            [self.project] + self.seqs + self.steps + self.shots + self.tasks
+        )
+
+    def _create_folders(self, shots):
+        """
+        Computes the folders to create for shots.
+
+        :returns: Tuple of the list of folders and the number of Shotgun queries.
+        """
+        with ShotgunRoundTripCounter(self.tk.shotgun) as counter:
+            folders = folder.process_filesystem_structure(
+                self.tk,
+                "Shot",
+                [shot["id"] for shot in shots],
+                preview=True,
+                engine=None,
+            )
+        return folders, counter.count
+
+    def test_query_count(self):
+        """
+        Checks that the number of queries doesn't depend on the number of shots.
+        """
+        _, few_shots_count = self._create_folders(self.shots[:3])
+        _, all_shots_count = self._create_folders(self.shots)
+        self.assertEqual(few_shots_count, all_shots_count)
+
+    def test_same_folders(self):
+        """
+        Checks that the folders are the same as when created one shot at a time.
+        """
+        batched_folders, _ = self._create_folders(self.shots)
+
+        folders = []
+        for shot in self.shots:
+            shot_folders, _ = self._create_folders([shot])
+            folders.extend(shot_folders)
+
+        self.assertEqual(sorted(set(batched_folders)), sorted(set(folders)))
+        self.assertTrue(
+            any(path.endswith(os.path.join("shot_11", "step_1")) for path in folders)
+        )
@@ -0,0 +1,195 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+from unittest import mock
+
+from tank.folder import FolderCreationExecutor
+from tank.util import is_windows
+from tank_test.tank_test_base import TankTestBase, setUpModule  # noqa
+
+
+class TestFolderCreationExecutor(TankTestBase):
+    """
+    Tests the concurrent processing of folder creation items.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.setup_fixtures()
+
+        self.seq = {
+            "type": "Sequence",
+            "id": 100,
+            "code": "seq_code",
+            "project": self.project,
+        }
+        self.shots = [
+            {
+                "type": "Shot",
+                "id": 100 + i,
+                "code": "shot_%02d" % i,
+                "sg_sequence": self.seq,
+                "project": self.project,
+            }
+            for i in range(10)
+        ]
+        self.add_to_sg_mock_db([self.seq] + self.shots)
+
+    def _get_items(self, root):
+        """
+        Returns folder creation items creating content in a folder.
+        """
+        source_path = os.path.join(self.tank_temp, "source.txt")
+        with open(source_path, "w") as fh:
+            fh.write("source")
+
+        items = []
+        for i in range(5):
+            folder = os.path.join(root, "folder_%d" % i)
+            items.extend(
+                [
+                    {"action": "folder", "path": folder, "metadata": {}},
+                    {
+                        "action": "entity_folder",
+                        "path": os.path.join(folder, "sub", "entity"),
+                        "metadata": {},
+                        "entity": {"type": "Shot", "id": i, "name": "shot"},
+                    },
+                    {
+                        "action": "copy",
+                        "source_path": source_path,
+                        "target_path": os.path.join(folder, "copy.txt"),
+                        "metadata": {},
+                    },
+                    {
+                        "action": "create_file",
+                        "path": os.path.join(folder, "new", "file.txt"),
+                        "content": "content",
+                        "metadata": {},
+                    },
+                    {
+                        "action": "symlink",
+                        "path": os.path.join(folder, "link"),
+                        "target": "../folder_0",
+                        "metadata": {},
+                    },
+                    # processed twice
+                    {"action": "folder", "path": folder, "metadata": {}},
+                ]
+            )
+        return items
+
+    def _execute_hook(self, items, preview_mode, threads):
+        """
+        Runs the default process_folder_creation hook.
+        """
+        with mock.patch.dict(os.environ, {"TK_FOLDER_CREATION_THREADS": str(threads)}):
+            return self.tk.execute_core_hook(
+                "process_folder_creation", items=items, preview_mode=preview_mode
+            )
+
+    def test_same_results(self):
+        """
+        Checks that the items are processed like the default hook does.
+        """
+        serial_root = os.path.join(self.tank_temp, "serial")
+        parallel_root = os.path.join(self.tank_temp, "parallel")
+        serial_items = self._get_items(serial_root)
+        parallel_items = self._get_items(parallel_root)
+
+        def relative(paths, root):
+            return [os.path.relpath(path, root) for path in paths]
+
+        for preview_mode in [True, False, False]:
+            serial_locations = self._execute_hook(serial_items, preview_mode, 1)
+            parallel_locations = self._execute_hook(parallel_items, preview_mode, 4)
+            self.assertEqual(
+                relative(serial_locations, serial_root),
+                relative(parallel_locations, parallel_root),
+            )
+
+        # the last run found everything in place
+        self.assertEqual(parallel_locations, [])
+
+        folder = os.path.join(parallel_root, "folder_3")
+        self.assertTrue(os.path.isdir(os.path.join(folder, "sub", "entity")))
+        with open(os.path.join(folder, "copy.txt")) as fh:
+            self.assertEqual(fh.read(), "source")
+        with open(os.path.join(folder, "new", "file.txt")) as fh:
+            self.assertEqual(fh.read(), "content")
+        if not is_windows():
+            self.assertTrue(os.path.islink(os.path.join(folder, "link")))
+
+    def test_new_folders_not_checked(self):
+        """
+        Checks that the content of folders which were just created is not
+        looked up on disk.
+        """
+        root = os.path.join(self.tank_temp, "new_folders")
+        items = [
+            item
+            for item in self._get_items(root)
+            if item["action"] in ["folder", "entity_folder"]
+        ]
+
+        with mock.patch("os.path.exists", wraps=os.path.exists) as exists_mock:
+            FolderCreationExecutor(4).execute(items, False)
+        # os.makedirs also checks the parent folders it creates
+        checked_paths = set(call.args[0] for call in exists_mock.call_args_list)
+
+        self.assertEqual(
+            sorted(checked_paths & set(item["path"] for item in items)),
+            sorted(os.path.join(root, "folder_%d" % i) for i in range(5)),
+        )
+
+    def test_parent_before_child(self):
+        """
+        Checks that folders are processed before their content, whatever the
+        order of the items.
+        """
+        root = os.path.join(self.tank_temp, "reversed")
+        items = list(reversed(self._get_items(root)))
+
+        locations = FolderCreationExecutor(4).execute(items, False)
+
+        self.assertEqual(len(locations), len(set(locations)))
+        self.assertTrue(
+            os.path.isfile(os.path.join(root, "folder_2", "new", "file.txt"))
+        )
+
+    def test_create_filesystem_structure(self):
+        """
+        Checks that folder creation gives the same results with the executor.
+        """
+        shot_ids = [shot["id"] for shot in self.shots]
+
+        serial_folders = self.tk.preview_filesystem_structure("Shot", shot_ids)
+        with mock.patch.dict(os.environ, {"TK_FOLDER_CREATION_THREADS": "4"}):
+            parallel_folders = self.tk.preview_filesystem_structure("Shot", shot_ids)
+            self.assertEqual(serial_folders, parallel_folders)
+
+            self.tk.create_filesystem_structure("Shot", shot_ids)
+
+        for path in serial_folders:
+            self.assertTrue(os.path.exists(path), path)
+
+    def test_max_workers(self):
+        """
+        Checks the number of threads set by the environment.
+        """
+        for value, max_workers in [(None, 1), ("1", 1), ("6", 6), ("foo", 1)]:
+            environ = {}
+            if value is not None:
+                environ["TK_FOLDER_CREATION_THREADS"] = value
+            with mock.patch.dict(os.environ, environ):
+                if value is None:
+                    os.environ.pop("TK_FOLDER_CREATION_THREADS", None)
+                self.assertEqual(FolderCreationExecutor.get_max_workers(), max_workers)
@@ -689,3 +689,172 @@ class TestShowDialog(TestEngineBase):
         self.engine.apps["test_app"].dismiss_button.click()
         # Process the remaining events.
         self._app.processEvents()
+
+
+class TestAppLoading(TestEngineBase):
+    """
+    Tests loading the apps of an engine with several threads.
+    """
+
+    def _start_engine(self, threads):
+        """
+        Starts the test engine, loading apps with the given number of threads.
+
+        :returns: The engine and the names of the threads app files were loaded in.
+        """
+        thread_names = []
+        get_application_class = sgtk.platform.application.get_application_class
+        get_apps = sgtk.platform.environment.Environment.get_apps
+
+        def get_application_class_wrapper(app_folder):
+            thread_names.append(threading.current_thread().name)
+            return get_application_class(app_folder)
+
+        def get_apps_wrapper(env, engine_name):
+            # the test environment only has one app, load it more than once.
+            return get_apps(env, engine_name) * 3
+
+        with mock.patch.dict(os.environ, {"TK_APP_LOADING_THREADS": threads}):
+            with mock.patch(
+                "sgtk.platform.application.get_application_class",
+                side_effect=get_application_class_wrapper,
+            ), mock.patch.object(
+                sgtk.platform.environment.Environment,
+                "get_apps",
+                autospec=True,
+                side_effect=get_apps_wrapper,
+            ):
+                cur_engine = sgtk.platform.start_engine(
+                    "test_engine", self.tk, self.context
+                )
+        return cur_engine, thread_names
+
+    def test_same_apps(self):
+        """
+        Checks that apps are loaded concurrently and initialized in order.
+        """
+        cur_engine, thread_names = self._start_engine("1")
+        expected_apps = list(cur_engine.apps)
+        expected_commands = sorted(cur_engine.commands)
+        self.assertEqual(set(thread_names), {threading.current_thread().name})
+        cur_engine.destroy()
+
+        cur_engine, thread_names = self._start_engine("4")
+        self.assertEqual(list(cur_engine.apps), expected_apps)
+        self.assertEqual(sorted(cur_engine.commands), expected_commands)
+        self.assertEqual(len(thread_names), 3)
+        self.assertNotIn(threading.current_thread().name, thread_names)
+
+    def test_invalid_threads(self):
+        """
+        Checks that apps are loaded one at a time when the number of threads is invalid.
+        """
+        cur_engine, thread_names = self._start_engine("foo")
+        self.assertTrue(cur_engine.apps)
+        self.assertEqual(set(thread_names), {threading.current_thread().name})
+
+
+class TestLazyAppLoading(TestEngineBase):
+    """
+    Tests initializing apps when one of their commands is run.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # apps from dev descriptors are always initialized at startup.
+        patcher = mock.patch.object(
+            sgtk.descriptor.Descriptor, "is_dev", return_value=False
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.supports_lazy_init = True
+        patcher = mock.patch.object(
+            sgtk.descriptor.AppDescriptor,
+            "supports_lazy_init",
+            side_effect=lambda: self.supports_lazy_init,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(os.environ, {"TK_LAZY_APP_LOADING": "1"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.commands_path = None
+
+    def tearDown(self):
+        if self.commands_path and os.path.exists(self.commands_path):
+            os.remove(self.commands_path)
+        super().tearDown()
+
+    def _start_engine(self):
+        """
+        Starts the test engine.
+
+        :returns: The engine and whether the test app was initialized.
+        """
+        cur_engine = sgtk.platform.start_engine("test_engine", self.tk, self.context)
+        self.commands_path = os.path.join(
+            cur_engine.cache_location, "lazy_app_commands.json"
+        )
+        # the test app sets its button when it is initialized.
+        return cur_engine, hasattr(cur_engine.apps["test_app"], "dismiss_button")
+
+    def test_lazy_app(self):
+        """
+        Checks that the app is only initialized when its command is run
+        on the second run.
+        """
+        cur_engine, initialized = self._start_engine()
+        self.assertTrue(initialized)
+        expected_commands = dict(
+            (name, dict(command["properties"], app=None))
+            for name, command in cur_engine.commands.items()
+        )
+        self.assertTrue(os.path.exists(self.commands_path))
+        cur_engine.destroy()
+
+        cur_engine, initialized = self._start_engine()
+        self.assertFalse(initialized)
+        app = cur_engine.apps["test_app"]
+        self.assertIsInstance(app, sgtk.platform.application.Application)
+        self.assertEqual(app.name, "test_app")
+        self.assertEqual(
+            dict(
+                (name, dict(command["properties"], app=None))
+                for name, command in cur_engine.commands.items()
+            ),
+            expected_commands,
+        )
+        self.assertIs(cur_engine.commands["test_app"]["properties"]["app"], app)
+
+        # running the command initializes the app and runs the command it
+        # registered.
+        with mock.patch.object(type(app), "_show_app") as show_app:
+            cur_engine.commands["test_app"]["callback"]()
+            self.assertEqual(show_app.call_count, 1)
+            self.assertIs(cur_engine.apps["test_app"], app)
+            self.assertTrue(hasattr(app, "dismiss_button"))
+            self.assertIs(cur_engine.commands["test_app"]["properties"]["app"], app)
+
+            # the app is only initialized once.
+            with mock.patch.object(app, "init_app") as init_app:
+                cur_engine.commands["test_app"]["callback"]()
+            self.assertEqual(init_app.call_count, 0)
+            self.assertEqual(show_app.call_count, 2)
+
+    def test_not_supported(self):
+        """
+        Checks that apps which don't support it are initialized at startup.
+        """
+        self._start_engine()[0].destroy()
+        self.supports_lazy_init = False
+        cur_engine, initialized = self._start_engine()
+        self.assertTrue(initialized)
+
+    def test_disabled(self):
+        """
+        Checks that apps are initialized at startup by default.
+        """
+        self._start_engine()[0].destroy()
+        with mock.patch.dict(os.environ, {"TK_LAZY_APP_LOADING": "0"}):
+            cur_engine, initialized = self._start_engine()
+        self.assertTrue(initialized)
@@ -0,0 +1,38 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+
+from sgtk.util import get_positive_int_env_var
+from tank_test.tank_test_base import setUpModule  # noqa
+from tank_test.tank_test_base import ShotgunTestBase, mock
+
+
+class TestPositiveIntEnvVar(ShotgunTestBase):
+    def test_values(self):
+        """
+        Checks the values read from the environment.
+        """
+        for value, expected in [
+            (None, 4),
+            ("", 4),
+            ("1", 1),
+            ("6", 6),
+            ("0", 1),
+            ("-3", 1),
+            ("foo", 4),
+        ]:
+            with mock.patch.dict(os.environ):
+                os.environ.pop("TK_TEST_THREADS", None)
+                if value is not None:
+                    os.environ["TK_TEST_THREADS"] = value
+                self.assertEqual(
+                    expected, get_positive_int_env_var("TK_TEST_THREADS", 4), value
+                )
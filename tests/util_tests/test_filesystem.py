@@ -227,6 +227,65 @@ class TestFileSystem(TankTestBase):
         # Clean up everything
         fs.safe_delete_folder(copy_test_root_folder)
 
+    def test_atomic_write(self):
+        """
+        Test the atomic_write helper
+        """
+        test_folder = os.path.join(self.tank_temp, "atomic_tests")
+        path = os.path.join(test_folder, "file.json")
+
+        # the folder is created and the file replaced.
+        self.assertTrue(fs.write_file_atomically(path, "first"))
+        self.assertTrue(fs.write_file_atomically(path, b"second"))
+        with open(path, "rb") as fh:
+            self.assertEqual(b"second", fh.read())
+
+        # the file is left untouched and no temporary file is left behind
+        # if an error is raised while writing.
+        with self.assertRaises(RuntimeError):
+            with fs.atomic_write(path) as temp_path:
+                with open(temp_path, "wt") as fh:
+                    fh.write("third")
+                raise RuntimeError()
+        with open(path, "rb") as fh:
+            self.assertEqual(b"second", fh.read())
+        self.assertEqual(["file.json"], os.listdir(test_folder))
+
+        # errors are reported by the return value.
+        with mock.patch("os.replace", side_effect=OSError("failed")):
+            self.assertFalse(fs.write_file_atomically(path, "fourth"))
+        self.assertEqual(["file.json"], os.listdir(test_folder))
+
+        # Clean up
+        fs.safe_delete_folder(test_folder)
+
+    def test_versioned_json(self):
+        """
+        Test the read_versioned_json and write_versioned_json helpers
+        """
+        test_folder = os.path.join(self.tank_temp, "json_tests")
+        path = os.path.join(test_folder, "file.json")
+        self.assertIsNone(fs.read_versioned_json(path, 1))
+
+        self.assertTrue(fs.write_versioned_json(path, 1, {"data": [1, 2]}))
+        self.assertEqual(
+            {"version": 1, "data": [1, 2]}, fs.read_versioned_json(path, 1)
+        )
+        # files written with another format version are ignored.
+        self.assertIsNone(fs.read_versioned_json(path, 2))
+
+        # as are invalid files.
+        for content in ("[1, 2]", "{invalid"):
+            with open(path, "wt") as fh:
+                fh.write(content)
+            self.assertIsNone(fs.read_versioned_json(path, 1))
+
+        # data json can't represent is not written.
+        self.assertFalse(fs.write_versioned_json(path, 1, {"data": object()}))
+
+        # Clean up
+        fs.safe_delete_folder(test_folder)
+
 
 class TestOpenInFileBrowser(TankTestBase):
     """
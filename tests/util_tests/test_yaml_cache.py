@@ -10,9 +10,10 @@
 
 import copy
 import os
+import pickle
 
 from sgtk import TankError
-from sgtk.util.yaml_cache import YamlCache
+from sgtk.util.yaml_cache import ReadOnlyDict, ReadOnlyList, YamlCache
 from tank_test.tank_test_base import setUpModule  # noqa
 from tank_test.tank_test_base import ShotgunTestBase
 from tank_vendor import yaml
@@ -128,3 +129,74 @@ class TestYamlCache(ShotgunTestBase):
 
         # ...and check that the data in the cache has been updated:
         self.assertEqual(read_data, modified_test_data)
+
+    def test_frozen_data(self):
+        """
+        Tests that frozen data is read-only, shared between callers and
+        copied into mutable data.
+        """
+        yaml_path = os.path.join(self.tank_temp, "test_frozen_data.yml")
+        test_data = {"one": [1, {"two": 2}], "three": {"four": [4]}}
+        with open(yaml_path, "w") as yaml_file:
+            yaml_file.write(yaml.dump(test_data))
+
+        yaml_cache = YamlCache()
+        frozen_data = yaml_cache.get(yaml_path, frozen_data=True)
+        self.assertEqual(frozen_data, test_data)
+        self.assertIsInstance(frozen_data, ReadOnlyDict)
+        self.assertIsInstance(frozen_data["one"], ReadOnlyList)
+        # the data has the same types as the mutable data.
+        self.assertIsInstance(frozen_data, dict)
+        self.assertIsInstance(frozen_data["one"], list)
+        self.assertIsInstance(frozen_data["one"][1], ReadOnlyDict)
+
+        # the same data is returned to all callers
+        self.assertIs(frozen_data, yaml_cache.get(yaml_path, frozen_data=True))
+        self.assertIsNot(frozen_data, yaml_cache.get(yaml_path, deepcopy_data=False))
+
+        # and it can't be modified.
+        with self.assertRaises(TypeError):
+            frozen_data["one"] = 1
+        with self.assertRaises(TypeError):
+            del frozen_data["one"]
+        with self.assertRaises(TypeError):
+            frozen_data["three"].update({"five": 5})
+        with self.assertRaises(TypeError):
+            frozen_data.pop("one")
+        with self.assertRaises(TypeError):
+            frozen_data.setdefault("five", 5)
+        with self.assertRaises(TypeError):
+            frozen_data["one"].append(5)
+        with self.assertRaises(TypeError):
+            frozen_data["one"][0] = 5
+        with self.assertRaises(TypeError):
+            frozen_data["three"]["four"] += [5]
+        with self.assertRaises(TypeError):
+            frozen_data["three"]["four"].sort()
+        self.assertEqual(frozen_data, test_data)
+
+        # copies are mutable
+        data = copy.deepcopy(frozen_data)
+        self.assertEqual(data, test_data)
+        self.assertIs(type(data), dict)
+        self.assertIs(type(data["one"]), list)
+        self.assertIs(type(data["one"][1]), dict)
+        data["one"][1]["two"] = 3
+        self.assertEqual(frozen_data["one"][1]["two"], 2)
+        self.assertIs(type(frozen_data.copy()), dict)
+        self.assertIs(type(copy.copy(frozen_data["one"])), list)
+        self.assertIs(type(frozen_data["one"].copy()), list)
+
+        # frozen data can be pickled
+        self.assertEqual(pickle.loads(pickle.dumps(frozen_data)), frozen_data)
+
+        # and the cached items can still be pickled
+        items = pickle.loads(pickle.dumps(yaml_cache.get_cached_items()))
+        self.assertEqual(items[0].frozen_data, frozen_data)
+
+        # frozen data is refreshed when the file changes.
+        test_data["six"] = 6
+        with open(yaml_path, "w") as yaml_file:
+            yaml_file.write(yaml.dump(test_data))
+        os.utime(yaml_path, (0, 0))
+        self.assertEqual(yaml_cache.get(yaml_path, frozen_data=True)["six"], 6)